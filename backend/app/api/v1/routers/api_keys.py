@@ -9,7 +9,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.auth import CurrentUser, require_admin
-from app.core.api_key_auth import generate_api_key
+from app.core.api_key_auth import generate_api_key, invalidate_api_key_cache
 from app.core.db import get_db_session
 from app.models.api_key import APIKey
 from app.schemas.api_key import (
@@ -113,6 +113,9 @@ async def update_api_key(
     await db.commit()
     await db.refresh(api_key)
 
+    # Scope or status changes must apply to the next request, not after the cache TTL
+    invalidate_api_key_cache(api_key.id)
+
     logger.info("API key updated", key_prefix=api_key.key_prefix, user_id=current_user.id)
 
     return APIKeyResponse(
@@ -146,6 +149,8 @@ async def delete_api_key(
     api_key.is_active = False
     await db.commit()
 
+    invalidate_api_key_cache(api_key.id)
+
     logger.info("API key deleted", key_prefix=api_key.key_prefix, user_id=current_user.id)
 
     return APIKeyDeleteResponse(
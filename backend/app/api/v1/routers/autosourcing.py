@@ -2,20 +2,27 @@
 AutoSourcing API endpoints for intelligent product discovery.
 Provides REST interface for running searches, managing profiles, and tracking actions.
 """
+import asyncio
+import json
+import logging
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.db import get_db_session
+from app.core.db import get_db_session, db_manager
+from app.core.exceptions import AppException
 from app.services.autosourcing_service import AutoSourcingService
+from app.services.background_jobs import background_jobs
 from app.services.keepa_service import KeepaService, get_keepa_service
 from app.services.autosourcing_cost_estimator import AutoSourcingCostEstimator
 from app.services.autosourcing_validator import AutoSourcingValidator
-from app.models.autosourcing import JobStatus, ActionStatus
+from app.models.autosourcing import AutoSourcingJob, JobStatus, ActionStatus
 from app.models.webhook_config import WebhookConfig
 from app.schemas.webhook import WebhookConfigCreate, WebhookConfigResponse
 from app.core.auth import get_current_user, CurrentUser
@@ -30,6 +37,11 @@ from app.schemas.autosourcing_safeguards import (
 )
 
 router = APIRouter(prefix="/autosourcing", tags=["AutoSourcing"])
+logger = logging.getLogger(__name__)
+
+AUTOSOURCING_JOB_KIND = "autosourcing_run"
+PROGRESS_POLL_SECONDS = 1.0
+PROGRESS_KEEPALIVE_SECONDS = 15.0
 
 # ============================================================================
 # PYDANTIC SCHEMAS
@@ -120,6 +132,8 @@ class AutoSourcingJobResponse(BaseModel):
     status: JobStatus
     total_tested: int
     total_selected: int
+    progress: Optional[Dict[str, Any]] = None
+    error_message: Optional[str] = None
     picks: List[AutoSourcingPickResponse] = []
 
     class Config:
@@ -197,7 +211,7 @@ async def estimate_job_cost(
     estimator = AutoSourcingCostEstimator(settings)
     estimated_tokens = estimator.estimate_total_job_cost(request.discovery_config)
 
-    # Get current balance
+    # Get current balance (ledger read, no token cost)
     current_balance = await keepa_service.check_api_balance()
 
     # Determine safety
@@ -220,12 +234,17 @@ async def estimate_job_cost(
     return CostEstimateResponse(
         estimated_tokens=estimated_tokens,
         current_balance=current_balance,
+        balance_age_seconds=keepa_service.balance_age_seconds,
         safe_to_proceed=safe_to_proceed,
         warning_message=warning_message,
         suggestion=suggestion
     )
 
-@router.post("/run-custom", response_model=AutoSourcingJobResponse)
+@router.post(
+    "/run-custom",
+    response_model=AutoSourcingJobResponse,
+    status_code=status.HTTP_202_ACCEPTED
+)
 async def run_custom_search(
     request: RunCustomSearchRequest,
     service: AutoSourcingService = Depends(get_autosourcing_service),
@@ -233,25 +252,17 @@ async def run_custom_search(
     current_user: CurrentUser = Depends(require_autosourcing_write),
 ):
     """
-    Run custom AutoSourcing search with user-defined criteria.
+    Queue a custom AutoSourcing search with user-defined criteria.
 
     SAFEGUARDS (Phase 7.0):
     - Cost validation (MAX_TOKENS_PER_JOB)
     - Balance validation (MIN_TOKEN_BALANCE_REQUIRED)
-    - Timeout protection (TIMEOUT_PER_JOB = 120s)
+    - Timeout protection (TIMEOUT_PER_JOB = 120s, enforced by the worker)
 
-    This endpoint orchestrates the complete discovery pipeline:
-    1. Product discovery via Keepa Product Finder
-    2. Advanced scoring with v1.5.0 system
-    3. Filtering and ranking by user criteria
-    4. Duplicate removal and result optimization
+    Returns the PENDING job immediately; the background job pool runs the
+    discovery pipeline (discover -> dedup -> score -> persist). Follow it with
+    GET /autosourcing/jobs/{id} (polling) or /jobs/{id}/events (SSE).
     """
-    import asyncio
-    import traceback
-    import logging
-
-    logger = logging.getLogger(__name__)
-
     # === VALIDATION BEFORE EXECUTION (Phase 7.0) ===
     settings = get_settings()
     validator = AutoSourcingValidator(settings=settings, keepa_service=keepa_service)
@@ -261,37 +272,83 @@ async def run_custom_search(
         scoring_config=request.scoring_config.dict()
     )
 
-    # Timeout protection is handled inside AutoSourcingService.run_custom_search()
-    # Do NOT wrap with a second asyncio.timeout here (causes double-timeout conflicts)
     try:
-        logger.info(f"[DEBUG] run-custom called with profile_name={request.profile_name}")
-        logger.info(f"[DEBUG] discovery_config: {request.discovery_config.dict()}")
-        logger.info(f"[DEBUG] scoring_config: {request.scoring_config.dict()}")
+        logger.info(f"run-custom queued with profile_name={request.profile_name}")
 
-        job = await service.run_custom_search(
+        job = await service.create_job(
             discovery_config=request.discovery_config.dict(),
             scoring_config=request.scoring_config.dict(),
             profile_name=request.profile_name,
             profile_id=request.profile_id
         )
-
-        logger.info(f"[DEBUG] Job created successfully: {job.id}")
+        background_jobs.submit(AUTOSOURCING_JOB_KIND, str(job.id))
         return job
 
-    except HTTPException:
-        # Re-raise HTTP exceptions (408 timeout, etc.) from service
+    except (HTTPException, AppException):
+        # Token check failures keep their own status codes
         raise
 
     except Exception as e:
-        logger.error(f"[ERROR] AutoSourcing search failed - Exception type: {type(e).__name__}")
-        logger.error(f"[ERROR] Exception message: {str(e)}")
-        logger.error(f"[ERROR] Full traceback:\n{traceback.format_exc()}")
-
+        logger.error(f"AutoSourcing job could not be queued: {type(e).__name__}: {e}", exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"AutoSourcing search failed: {type(e).__name__}: {str(e)}"
         )
 
+
+async def process_autosourcing_job(job_id: str):
+    """Background pool handler: run one queued AutoSourcing job."""
+    async with db_manager.session() as db:
+        keepa_service = await get_keepa_service()
+        async with keepa_service:
+            service = AutoSourcingService(db, keepa_service)
+            job = await service.claim_job(UUID(job_id))
+            if job is None:
+                return
+            try:
+                await service.execute_job(job)
+            except (HTTPException, AppException) as e:
+                # Failure (timeout, Keepa error) is already recorded on the job
+                logger.warning(f"AutoSourcing job {job_id} finished with error: {e}")
+            except asyncio.CancelledError:
+                # Shutdown: requeue so the next start runs it again
+                try:
+                    await service.release_job(job.id)
+                except Exception as e:
+                    logger.warning(f"Could not requeue AutoSourcing job {job_id}: {e}")
+                raise
+
+
+# Follow-up recovery scheduled while recently launched jobs are still RUNNING
+_recovery_recheck: Optional[asyncio.Task] = None
+
+
+async def recover_autosourcing_jobs() -> List[str]:
+    global _recovery_recheck
+    async with db_manager.session() as db:
+        interrupted = await AutoSourcingService.fail_interrupted_jobs(db)
+        if interrupted:
+            logger.warning(f"Marked {interrupted} interrupted AutoSourcing job(s) as failed")
+        recheck_in = await AutoSourcingService.seconds_until_running_jobs_expire(db)
+        pending = [str(job_id) for job_id in await AutoSourcingService.get_pending_job_ids(db)]
+
+    if recheck_in is not None and (_recovery_recheck is None or _recovery_recheck.done()):
+        _recovery_recheck = asyncio.create_task(_recover_autosourcing_jobs_later(recheck_in))
+    return pending
+
+
+async def _recover_autosourcing_jobs_later(delay: float):
+    """Fail jobs a crash left RUNNING once they are past the timeout, and requeue pending ones."""
+    await asyncio.sleep(delay)
+    try:
+        for job_id in await recover_autosourcing_jobs():
+            background_jobs.submit(AUTOSOURCING_JOB_KIND, job_id)
+    except Exception as e:
+        logger.error(f"AutoSourcing job recovery re-check failed: {e}")
+
+
+background_jobs.register(AUTOSOURCING_JOB_KIND, process_autosourcing_job, recover=recover_autosourcing_jobs)
+
 @router.get("/latest", response_model=Optional[AutoSourcingJobResponse])
 async def get_latest_results(
     service: AutoSourcingService = Depends(get_autosourcing_service),
@@ -354,6 +411,82 @@ async def get_job_details(
         
     return job
 
+@router.get("/jobs/{job_id}/events")
+async def stream_job_progress(
+    job_id: UUID,
+    current_user: CurrentUser = Depends(require_autosourcing_job_read),
+):
+    """
+    Server-Sent Events stream of a job's progress.
+
+    Emits a `progress` event whenever the job's stage or counters change and
+    a final `complete` event once it succeeds or fails.
+    """
+    snapshot = await _load_job_progress(job_id)
+    if snapshot is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+
+    return StreamingResponse(
+        job_progress_events(job_id, first=snapshot),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+async def _load_job_progress(job_id: UUID) -> Optional[Dict[str, Any]]:
+    """Status columns only (no picks), read in a short-lived session."""
+    async with db_manager.session() as db:
+        row = (await db.execute(
+            select(
+                AutoSourcingJob.status,
+                AutoSourcingJob.progress,
+                AutoSourcingJob.total_tested,
+                AutoSourcingJob.total_selected,
+                AutoSourcingJob.error_message,
+            ).where(AutoSourcingJob.id == job_id)
+        )).one_or_none()
+
+    if row is None:
+        return None
+    return {
+        "job_id": str(job_id),
+        "status": row.status.value,
+        "progress": row.progress or {},
+        "total_tested": row.total_tested,
+        "total_selected": row.total_selected,
+        "error_message": row.error_message,
+    }
+
+
+async def job_progress_events(job_id: UUID, first: Optional[Dict[str, Any]] = None, load=_load_job_progress):
+    """Yield SSE frames for a job until it reaches a terminal status."""
+    terminal = {JobStatus.SUCCESS.value, JobStatus.ERROR.value, JobStatus.CANCELLED.value}
+    snapshot = first or await load(job_id)
+    last_sent = None
+    idle = 0.0
+
+    while snapshot is not None:
+        if snapshot["status"] in terminal:
+            yield f"event: complete\ndata: {json.dumps(snapshot)}\n\n"
+            return
+        if snapshot != last_sent:
+            yield f"event: progress\ndata: {json.dumps(snapshot)}\n\n"
+            last_sent = snapshot
+            idle = 0.0
+        elif idle >= PROGRESS_KEEPALIVE_SECONDS:
+            # Comment frame keeps proxies from closing an idle stream
+            yield ": keepalive\n\n"
+            idle = 0.0
+
+        await asyncio.sleep(PROGRESS_POLL_SECONDS)
+        idle += PROGRESS_POLL_SECONDS
+        snapshot = await load(job_id)
+
+    yield f"event: error\ndata: {json.dumps({'job_id': str(job_id), 'detail': 'Job not found'})}\n\n"
+
 # ============================================================================
 # PROFILE MANAGEMENT
 # ============================================================================
@@ -1,6 +1,5 @@
 """Cowork API - External agent endpoints for dashboard, fetch-and-score, and buy list."""
 import logging
-from collections import defaultdict
 from datetime import datetime, timedelta, timezone
 
 from fastapi import APIRouter, Depends, HTTPException, status, Security, Query
@@ -15,7 +14,8 @@ from app.core.rate_limiter import rate_limit_reads, rate_limit_writes
 from app.models.autosourcing import AutoSourcingPick, AutoSourcingJob
 from app.services.autosourcing_service import AutoSourcingService
 from app.services.keepa_service import get_keepa_service
-from app.services.daily_review_service import generate_daily_review, generate_actionable_review
+from app.services.daily_review_service import generate_actionable_review
+from app.services.daily_review_store import get_daily_summary, latest_per_asin, sighting_summaries
 from app.schemas.cowork import (
     CoworkBuyListItem,
     CoworkBuyListResponse,
@@ -72,6 +72,68 @@ async def get_autosourcing_service(
     return AutoSourcingService(db, keepa_service)
 
 
+# Pick columns read by the daily review classification
+_PICK_COLUMNS = (
+    AutoSourcingPick.asin,
+    AutoSourcingPick.job_id,
+    AutoSourcingPick.title,
+    AutoSourcingPick.roi_percentage,
+    AutoSourcingPick.bsr,
+    AutoSourcingPick.amazon_on_listing,
+    AutoSourcingPick.current_price,
+    AutoSourcingPick.estimated_buy_cost,
+    AutoSourcingPick.condition_signal,
+    AutoSourcingPick.stability_score,
+)
+
+
+def _picks_since(cutoff: datetime):
+    return and_(
+        AutoSourcingJob.created_at >= cutoff,
+        AutoSourcingPick.is_ignored == False,
+    )
+
+
+def _latest_picks_query(cutoff: datetime, dialect_name: str):
+    """Most recent non-ignored pick per ASIN among jobs created since cutoff."""
+    query = select(*_PICK_COLUMNS).join(AutoSourcingJob).where(_picks_since(cutoff))
+    newest_first = (AutoSourcingPick.created_at.desc(), AutoSourcingPick.id.desc())
+    return latest_per_asin(query, AutoSourcingPick.asin, newest_first, dialect_name)
+
+
+async def _load_latest_picks(db: AsyncSession, cutoff: datetime) -> list:
+    """Latest pick per ASIN in the window, as dicts ready for classification."""
+    result = await db.execute(_latest_picks_query(cutoff, db.bind.dialect.name))
+    return [
+        {
+            "asin": row.asin,
+            "job_id": row.job_id,
+            "title": row.title or "",
+            "roi_percentage": float(row.roi_percentage or 0),
+            "bsr": int(row.bsr) if row.bsr is not None else -1,
+            "amazon_on_listing": bool(row.amazon_on_listing) if row.amazon_on_listing is not None else False,
+            "current_price": float(row.current_price) if row.current_price else None,
+            "buy_price": float(row.estimated_buy_cost) if row.estimated_buy_cost else None,
+            "condition_signal": row.condition_signal,
+            "stability_score": float(row.stability_score) if row.stability_score else 0.0,
+        }
+        for row in result.all()
+    ]
+
+
+async def _load_sighting_summaries(db: AsyncSession, picks: list) -> dict:
+    """Earlier sightings of each picked ASIN, as stored when its job completed."""
+    asins_by_job: dict = {}
+    for pick in picks:
+        asins_by_job.setdefault(pick["job_id"], []).append(pick["asin"])
+
+    now = _utcnow_naive()
+    summaries: dict = {}
+    for job_id, asins in asins_by_job.items():
+        summaries.update(await sighting_summaries(db, job_id, asins, now))
+    return summaries
+
+
 @router.get(
     "/dashboard-summary",
     response_model=CoworkDashboardResponse,
@@ -140,7 +202,7 @@ async def get_dashboard_summary(
             extra={"error": str(e), "error_type": type(e).__name__},
         )
 
-    # Daily review classification stats
+    # Daily review classification stats (summary row maintained at job completion)
     total_picks = 0
     jackpot = 0
     stable = 0
@@ -148,87 +210,14 @@ async def get_dashboard_summary(
     fluke = 0
     reject = 0
     try:
-        picks_query = (
-            select(AutoSourcingPick)
-            .join(AutoSourcingJob)
-            .where(
-                and_(
-                    AutoSourcingJob.created_at >= cutoff,
-                    AutoSourcingPick.is_ignored == False,
-                )
-            )
-        )
-        result = await db.execute(picks_query)
-        picks_rows = result.scalars().all()
-
-        # Deduplicate by ASIN: keep the most recent pick per ASIN
-        seen_asins: dict = {}
-        for pick in picks_rows:
-            if pick.asin not in seen_asins or (pick.created_at and pick.created_at > seen_asins[pick.asin].created_at):
-                seen_asins[pick.asin] = pick
-
-        picks_dicts = []
-        for pick in seen_asins.values():
-            picks_dicts.append({
-                "asin": pick.asin,
-                "title": pick.title or "",
-                "roi_percentage": float(pick.roi_percentage or 0),
-                "bsr": int(pick.bsr) if pick.bsr is not None else -1,
-                "amazon_on_listing": bool(pick.amazon_on_listing) if pick.amazon_on_listing is not None else False,
-                "current_price": float(pick.current_price) if pick.current_price else None,
-                "buy_price": float(pick.estimated_buy_cost) if pick.estimated_buy_cost else None,
-                "condition_signal": getattr(pick, "condition_signal", None),
-                "stability_score": float(pick.stability_score) if getattr(pick, "stability_score", None) else 0.0,
-            })
-
-        # Build history_map for proper classification (not empty!)
-        history_map: dict = defaultdict(list)
-        if picks_dicts:
-            asin_set = list({p["asin"] for p in picks_dicts})
-            history_cutoff = _utcnow_naive() - timedelta(days=30)
-            try:
-                history_query = (
-                    select(AutoSourcingPick)
-                    .join(AutoSourcingJob)
-                    .where(
-                        and_(
-                            AutoSourcingPick.asin.in_(asin_set),
-                            AutoSourcingJob.created_at >= history_cutoff,
-                            AutoSourcingPick.is_ignored == False,
-                        )
-                    )
-                    .order_by(AutoSourcingPick.created_at.asc())
-                )
-                history_result = await db.execute(history_query)
-                for h in history_result.scalars().all():
-                    history_map[h.asin].append({
-                        "tracked_at": h.created_at,
-                        "bsr": int(h.bsr or -1),
-                        "price": float(h.current_price) if h.current_price else None,
-                    })
-            except Exception as exc:
-                data_quality = "degraded"
-                logger.warning(
-                    "cowork dashboard: history_map query failed, falling back to empty",
-                    exc_info=True,
-                    extra={"error": str(exc)},
-                )
-
-        if picks_dicts:
-            review = generate_daily_review(picks=picks_dicts, history_map=dict(history_map))
-            total_picks = review.get("total", 0)
-            for item in review.get("classified_products", []):
-                classification = item.get("classification", "").upper()
-                if classification == "JACKPOT":
-                    jackpot += 1
-                elif classification == "STABLE":
-                    stable += 1
-                elif classification == "REVENANT":
-                    revenant += 1
-                elif classification == "FLUKE":
-                    fluke += 1
-                elif classification == "REJECT":
-                    reject += 1
+        summary = await get_daily_summary(db, _utcnow_naive().date())
+        if summary is not None:
+            total_picks = summary.total
+            jackpot = summary.jackpot
+            stable = summary.stable
+            revenant = summary.revenant
+            fluke = summary.fluke
+            reject = summary.reject
     except Exception as e:
         data_quality = "degraded"
         logger.error(
@@ -338,20 +327,9 @@ async def get_daily_buy_list(
     cutoff = _utcnow_naive() - timedelta(days=days_back)
     now_naive = _utcnow_naive()
 
-    # Fetch picks from the requested window
+    # Latest pick per ASIN from the requested window
     try:
-        picks_query = (
-            select(AutoSourcingPick)
-            .join(AutoSourcingJob)
-            .where(
-                and_(
-                    AutoSourcingJob.created_at >= cutoff,
-                    AutoSourcingPick.is_ignored == False,
-                )
-            )
-        )
-        result = await db.execute(picks_query)
-        picks_rows = result.scalars().all()
+        picks = await _load_latest_picks(db, cutoff)
     except Exception as e:
         logger.error(
             "cowork daily-buy-list: picks query failed",
@@ -366,7 +344,7 @@ async def get_daily_buy_list(
             data_quality="unavailable",
         )
 
-    if not picks_rows:
+    if not picks:
         return CoworkBuyListResponse(
             generated_at=now_naive.isoformat(),
             days_back=days_back,
@@ -374,31 +352,11 @@ async def get_daily_buy_list(
             items=[],
         )
 
-    # Build history_map: all past sightings for these ASINs over 30 days
-    asins = list({pick.asin for pick in picks_rows})
-    history_cutoff = _utcnow_naive() - timedelta(days=30)
-    history_map: dict = defaultdict(list)
+    # Earlier sightings per ASIN over the history window (same as the stored review)
+    history_map: dict = {}
     buy_list_quality = "full"
     try:
-        history_query = (
-            select(AutoSourcingPick)
-            .join(AutoSourcingJob)
-            .where(
-                and_(
-                    AutoSourcingPick.asin.in_(asins),
-                    AutoSourcingJob.created_at >= history_cutoff,
-                    AutoSourcingPick.is_ignored == False,
-                )
-            )
-            .order_by(AutoSourcingPick.created_at.asc())
-        )
-        history_result = await db.execute(history_query)
-        for h in history_result.scalars().all():
-            history_map[h.asin].append({
-                "tracked_at": h.created_at,
-                "bsr": int(h.bsr or -1),
-                "price": float(h.current_price) if h.current_price else None,
-            })
+        history_map = await _load_sighting_summaries(db, picks)
     except Exception as e:
         buy_list_quality = "degraded"
         logger.warning(
@@ -424,26 +382,11 @@ async def get_daily_buy_list(
             extra={"error": str(e), "error_type": type(e).__name__},
         )
 
-    # Convert to dicts for classification
-    picks = []
-    for pick in picks_rows:
-        picks.append({
-            "asin": pick.asin,
-            "title": pick.title or "",
-            "roi_percentage": float(pick.roi_percentage or 0),
-            "bsr": int(pick.bsr) if pick.bsr is not None else -1,
-            "amazon_on_listing": bool(pick.amazon_on_listing) if pick.amazon_on_listing is not None else False,
-            "current_price": float(pick.current_price) if pick.current_price else None,
-            "buy_price": float(pick.estimated_buy_cost) if pick.estimated_buy_cost else None,
-            "condition_signal": getattr(pick, "condition_signal", None),
-            "stability_score": float(pick.stability_score) if getattr(pick, "stability_score", None) else 0.0,
-        })
-
     # Generate actionable review with real history and correct source_price_factor
     try:
         review = generate_actionable_review(
             picks=picks,
-            history_map=dict(history_map),
+            history_map=history_map,
             source_price_factor=source_price_factor,
         )
         items = [
@@ -529,8 +472,12 @@ async def get_last_job_stats(
     dependencies=[Depends(require_cowork_token), Depends(rate_limit_reads)],
 )
 async def get_keepa_balance() -> CoworkKeepaBalanceResponse:
-    """Return current Keepa token balance. Uses 60s cache when available (0 token cost)."""
-    import time
+    """Return current Keepa token balance from the process-wide ledger (0 token cost).
+
+    The ledger is updated by every Keepa response; Keepa's free /token
+    endpoint is only queried when it is older than 60s.
+    """
+    from app.services.keepa_models import BALANCE_MAX_AGE_SECONDS
     from app.core.token_costs import CRITICAL_THRESHOLD, WARNING_THRESHOLD, SAFE_THRESHOLD, TOKEN_COSTS
 
     settings = get_settings()
@@ -543,20 +490,16 @@ async def get_keepa_balance() -> CoworkKeepaBalanceResponse:
     try:
         keepa_service = await get_keepa_service()
 
-        # Check if cached balance is fresh (< 60s)
-        now = time.time()
-        is_cached = (
-            keepa_service.api_balance_cache is not None
-            and (now - keepa_service.last_api_balance_check) < 60
-        )
-        cache_age = int(now - keepa_service.last_api_balance_check) if keepa_service.last_api_balance_check else 0
+        # Served from the ledger unless it is stale
+        age = keepa_service.balance_age_seconds
+        is_cached = age is not None and age <= BALANCE_MAX_AGE_SECONDS
 
         tokens_left = await keepa_service.check_api_balance()
 
         return CoworkKeepaBalanceResponse(
             tokens_left=tokens_left,
             is_cached=is_cached,
-            cache_age_seconds=min(cache_age, 60) if is_cached else 0,
+            cache_age_seconds=keepa_service.balance_age_seconds or 0,
             thresholds={
                 "critical": CRITICAL_THRESHOLD,
                 "warning": WARNING_THRESHOLD,
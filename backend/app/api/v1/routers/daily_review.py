@@ -4,15 +4,15 @@ from datetime import datetime, timedelta
 
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, text
+from sqlalchemy import text
 
 from app.core.db import get_db_session
 from app.core.auth import CurrentUser, get_current_user
 from app.core.api_key_auth import require_daily_review_read
 
-from app.models.autosourcing import AutoSourcingPick, AutoSourcingJob
 from app.schemas.daily_review import ActionableBuyList, DailyReviewResponse
-from app.services.daily_review_service import generate_actionable_review, generate_daily_review
+from app.services.daily_review_service import select_actionable, summarize_daily_review
+from app.services.daily_review_store import load_review_products
 
 logger = logging.getLogger(__name__)
 
@@ -42,90 +42,22 @@ async def get_daily_review(
     db: AsyncSession = Depends(get_db_session),
     current_user: CurrentUser = Depends(require_daily_review_read),
 ):
-    """Generate today's daily review from recent AutoSourcing picks."""
-    # Use naive UTC datetime - autosourcing_jobs.created_at is TIMESTAMP without timezone
+    """Today's daily review from the classifications stored at job completion."""
+    # Use naive UTC datetime - review items store TIMESTAMP without timezone
     cutoff = datetime.utcnow() - timedelta(days=days_back)
 
-    # Step 1: Fetch recent picks from AutoSourcing jobs
+    # Latest stored classification per ASIN picked in the window
     try:
-        picks_query = (
-            select(AutoSourcingPick)
-            .join(AutoSourcingJob)
-            .where(
-                and_(
-                    AutoSourcingJob.created_at >= cutoff,
-                    AutoSourcingPick.is_ignored == False,
-                )
-            )
-        )
-        result = await db.execute(picks_query)
-        picks_rows = result.scalars().all()
+        products = await load_review_products(db, cutoff)
     except Exception as e:
         logger.error(
-            "daily_review: picks query failed",
+            "daily_review: review items query failed",
             exc_info=True,
             extra={"error": str(e), "error_type": type(e).__name__},
         )
-        picks_rows = []
-
-    # Step 2: Deduplicate by ASIN (keep most recent pick per ASIN) and convert to dicts
-    seen_asins: dict = {}
-    for pick in picks_rows:
-        if pick.asin not in seen_asins or (pick.created_at and pick.created_at > seen_asins[pick.asin].created_at):
-            seen_asins[pick.asin] = pick
-
-    picks = []
-    asin_set = set()
-    for pick in seen_asins.values():
-        asin_set.add(pick.asin)
-        picks.append({
-            "asin": pick.asin,
-            "title": pick.title or "",
-            "roi_percentage": float(pick.roi_percentage or 0),
-            "bsr": int(pick.bsr) if pick.bsr is not None else -1,
-            "amazon_on_listing": bool(pick.amazon_on_listing) if pick.amazon_on_listing is not None else False,
-            "current_price": float(pick.current_price) if pick.current_price else None,
-            "buy_price": float(pick.estimated_buy_cost) if pick.estimated_buy_cost else None,
-            "condition_signal": getattr(pick, "condition_signal", None),
-            "stability_score": float(pick.stability_score) if getattr(pick, "stability_score", None) else 0.0,
-            "velocity_score": float(pick.velocity_score) if getattr(pick, "velocity_score", None) else 0.0,
-            "confidence_score": float(pick.confidence_score) if getattr(pick, "confidence_score", None) else 0.0,
-        })
-
-    # Step 3: Fetch ASIN history from AutoSourcingPick sightings (30 days)
-    history_map: dict = {}
-    if asin_set:
-        asin_list = list(asin_set)
-        history_cutoff = datetime.utcnow() - timedelta(days=30)
-        try:
-            history_query = (
-                select(AutoSourcingPick)
-                .join(AutoSourcingJob)
-                .where(
-                    and_(
-                        AutoSourcingPick.asin.in_(asin_list),
-                        AutoSourcingJob.created_at >= history_cutoff,
-                        AutoSourcingPick.is_ignored == False,
-                    )
-                )
-                .order_by(AutoSourcingPick.created_at.asc())
-            )
-            hist_result = await db.execute(history_query)
-            for row in hist_result.scalars().all():
-                history_map.setdefault(row.asin, []).append({
-                    "tracked_at": row.created_at,
-                    "bsr": int(row.bsr or -1),
-                    "price": float(row.current_price) if row.current_price else None,
-                })
-        except Exception as e:
-            logger.error(
-                "daily_review: history query failed, continuing without history",
-                exc_info=True,
-                extra={"error": str(e), "error_type": type(e).__name__},
-            )
+        products = []
 
-    # Step 4: Generate and return review
-    review = generate_daily_review(picks=picks, history_map=history_map)
+    review = summarize_daily_review(products)
     return DailyReviewResponse(**review)
 
 
@@ -140,90 +72,16 @@ async def get_actionable_buy_list(
     """Return pre-filtered STABLE-only actionable buy list for N8N/agent consumption."""
     cutoff = datetime.utcnow() - timedelta(days=days_back)
 
-    # Step 1: Fetch recent picks from AutoSourcing jobs
+    # Latest stored classification per ASIN picked in the window
     try:
-        picks_query = (
-            select(AutoSourcingPick)
-            .join(AutoSourcingJob)
-            .where(
-                and_(
-                    AutoSourcingJob.created_at >= cutoff,
-                    AutoSourcingPick.is_ignored == False,
-                )
-            )
-        )
-        result = await db.execute(picks_query)
-        picks_rows = result.scalars().all()
+        products = await load_review_products(db, cutoff)
     except Exception as e:
         logger.error(
-            "actionable_buy_list: picks query failed",
+            "actionable_buy_list: review items query failed",
             exc_info=True,
             extra={"error": str(e), "error_type": type(e).__name__},
         )
-        picks_rows = []
-
-    # Step 2: Deduplicate by ASIN (keep most recent pick per ASIN) and convert to dicts
-    seen_asins: dict = {}
-    for pick in picks_rows:
-        if pick.asin not in seen_asins or (pick.created_at and pick.created_at > seen_asins[pick.asin].created_at):
-            seen_asins[pick.asin] = pick
-
-    picks = []
-    asin_set = set()
-    for pick in seen_asins.values():
-        asin_set.add(pick.asin)
-        picks.append({
-            "asin": pick.asin,
-            "title": pick.title or "",
-            "category": pick.category or None,
-            "roi_percentage": float(pick.roi_percentage or 0),
-            "bsr": int(pick.bsr) if pick.bsr is not None else -1,
-            "amazon_on_listing": bool(pick.amazon_on_listing) if pick.amazon_on_listing is not None else False,
-            "current_price": float(pick.current_price) if pick.current_price else None,
-            "buy_price": float(pick.estimated_buy_cost) if pick.estimated_buy_cost else None,
-            "condition_signal": getattr(pick, "condition_signal", None),
-            "stability_score": float(pick.stability_score) if getattr(pick, "stability_score", None) else 0.0,
-            "velocity_score": float(pick.velocity_score) if getattr(pick, "velocity_score", None) else 0.0,
-            "confidence_score": float(pick.confidence_score) if getattr(pick, "confidence_score", None) else 0.0,
-        })
-
-    # Step 3: Fetch ASIN history from AutoSourcingPick sightings (30 days)
-    history_map: dict = {}
-    if asin_set:
-        asin_list = list(asin_set)
-        history_cutoff = datetime.utcnow() - timedelta(days=30)
-        try:
-            history_query = (
-                select(AutoSourcingPick)
-                .join(AutoSourcingJob)
-                .where(
-                    and_(
-                        AutoSourcingPick.asin.in_(asin_list),
-                        AutoSourcingJob.created_at >= history_cutoff,
-                        AutoSourcingPick.is_ignored == False,
-                    )
-                )
-                .order_by(AutoSourcingPick.created_at.asc())
-            )
-            hist_result = await db.execute(history_query)
-            for row in hist_result.scalars().all():
-                history_map.setdefault(row.asin, []).append({
-                    "tracked_at": row.created_at,
-                    "bsr": int(row.bsr or -1),
-                    "price": float(row.current_price) if row.current_price else None,
-                })
-        except Exception as e:
-            logger.error(
-                "actionable_buy_list: history query failed, continuing without history",
-                exc_info=True,
-                extra={"error": str(e), "error_type": type(e).__name__},
-            )
+        products = []
 
-    # Step 4: Generate and return actionable buy list
-    actionable = generate_actionable_review(
-        picks=picks,
-        history_map=history_map,
-        min_roi=min_roi,
-        max_results=max_results,
-    )
+    actionable = select_actionable(products, min_roi=min_roi, max_results=max_results)
     return ActionableBuyList(**actionable)
@@ -8,18 +8,22 @@ Sub-modules:
 - keepa_schemas: Pydantic request/response schemas
 - keepa_utils: Utility functions (trace_id, normalize, analyze)
 - keepa_debug: Debug/Health/Test endpoints
+- keepa_jobs: Async ingest job status/results
 """
 
 import asyncio
+import json
 import uuid
 import logging
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, AsyncIterator
 
-from fastapi import APIRouter, Query, Depends, HTTPException, BackgroundTasks, Request
+from fastapi import APIRouter, Query, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
 
 from app.services.keepa_service import KeepaService, get_keepa_service
 from app.services.business_config_service import BusinessConfigService, get_business_config_service
+from app.services.keepa_models import MAX_ASINS_PER_REQUEST
 
 # Import from specialized modules - maintain backward compatibility
 from .keepa_schemas import (
@@ -41,16 +45,18 @@ from .keepa_utils import (
     analyze_product,
 )
 
-from .keepa_debug import (
-    router as debug_router,
-    process_batch_async,
-)
+from .keepa_debug import router as debug_router
+from .keepa_jobs import router as jobs_router
+
+from app.services.background_jobs import background_jobs
+from app.services.keepa_ingest_service import INGEST_JOB_KIND, KeepaIngestJobService
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 # Include debug router endpoints
 router.include_router(debug_router, tags=["keepa-debug"])
+router.include_router(jobs_router, tags=["keepa-jobs"])
 
 
 # === MAIN ENDPOINTS ===
@@ -59,13 +65,13 @@ router.include_router(debug_router, tags=["keepa-debug"])
 async def ingest_batch(
     http_request: Request,
     request: IngestBatchRequest,
-    background_tasks: BackgroundTasks,
     keepa_service: KeepaService = Depends(get_keepa_service),
     config_service: BusinessConfigService = Depends(get_business_config_service)
 ) -> IngestResponse:
     """
     Ingest batch of identifiers for analysis.
-    Supports both sync and async processing based on batch size.
+    Supports both sync and async processing based on batch size, and an
+    opt-in streaming mode (NDJSON or SSE) via `stream` or the Accept header.
     """
     trace_id = generate_trace_id()
     batch_id = request.batch_id or str(uuid.uuid4())
@@ -86,7 +92,6 @@ async def ingest_batch(
 
         # DEV/TEST ONLY: Feature flags override via header
         if "X-Feature-Flags-Override" in http_request.headers:
-            import json
             try:
                 override_flags = json.loads(http_request.headers["X-Feature-Flags-Override"])
                 if not config.get("feature_flags"):
@@ -96,20 +101,35 @@ async def ingest_batch(
             except (json.JSONDecodeError, TypeError) as e:
                 logger.warning(f"[DEV] Invalid feature flags override header: {e}")
 
+        log_validation = "X-Feature-Flags-Override" in http_request.headers
+
+        # Streaming mode (opt-in): one record per identifier as soon as it is
+        # analyzed; takes precedence over the async job threshold
+        stream_format = _stream_format(request, http_request)
+        if stream_format:
+            return StreamingResponse(
+                _stream_ingest(request, config, keepa_service, batch_id, trace_id, stream_format, log_validation),
+                media_type=STREAM_MEDIA_TYPES[stream_format],
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no", "X-Trace-Id": trace_id}
+            )
+
         # Check if async mode needed
         if len(request.identifiers) > request.async_threshold:
-            job_id = str(uuid.uuid4())
-
-            # Start background job
-            background_tasks.add_task(
-                process_batch_async,
-                job_id,
+            # Persist the batch, then hand it to the background job pool;
+            # progress and results survive restarts
+            job = await KeepaIngestJobService().create_job(
                 request.identifiers,
                 config,
                 batch_id,
-                trace_id,
-                keepa_service
+                trace_id=trace_id,
+                options={
+                    "force_refresh": request.force_refresh,
+                    "source_price": request.source_price,
+                    "condition_filter": request.condition_filter,
+                }
             )
+            job_id = str(job.id)
+            background_jobs.submit(INGEST_JOB_KIND, job_id)
 
             return IngestResponse(
                 batch_id=batch_id,
@@ -125,73 +145,23 @@ async def ingest_batch(
 
         # Sync processing
         results = []
-        successful = 0
-        failed = 0
 
         async with keepa_service:
-            for identifier in request.identifiers:
-                try:
-                    normalized_id = normalize_identifier(identifier)
-
-                    # Get product data
-                    keepa_data = await keepa_service.get_product_data(
-                        normalized_id,
-                        force_refresh=request.force_refresh
-                    )
-
-                    if keepa_data is None:
-                        results.append(BatchResult(
-                            identifier=identifier,
-                            asin=None,
-                            status="not_found",
-                            analysis=None,
-                            error="Product not found in Keepa"
-                        ))
-                        failed += 1
-                        continue
-
-                    asin = keepa_data.get('asin', normalized_id)
-
-                    # Analyze product with optional source_price and condition_filter
-                    analysis = await analyze_product(
-                        asin,
-                        keepa_data,
-                        config,
-                        keepa_service,
-                        source_price=request.source_price,
-                        condition_filter=request.condition_filter
-                    )
+            # Fetch all products in batched Keepa calls (100 ASINs per request)
+            normalized_ids = [normalize_identifier(identifier) for identifier in request.identifiers]
+            products = await keepa_service.get_products_batch(
+                normalized_ids,
+                force_refresh=request.force_refresh
+            )
 
-                    # DEV/TEST ONLY: Validation logging if feature flags overridden
-                    if "X-Feature-Flags-Override" in http_request.headers:
-                        logger.info(
-                            f"[VALIDATION] ASIN={asin} | "
-                            f"strategy={analysis.strategy_profile} | "
-                            f"method={analysis.calculation_method} | "
-                            f"roi={analysis.roi.get('roi_percentage', 0):.1f}% | "
-                            f"buy=${analysis.roi.get('buy_cost', 'N/A')} | "
-                            f"sell=${analysis.current_price}"
-                        )
-
-                    results.append(BatchResult(
-                        identifier=identifier,
-                        asin=asin,
-                        status="success",
-                        analysis=analysis,
-                        error=None
-                    ))
-                    successful += 1
+            for identifier, normalized_id in zip(request.identifiers, normalized_ids):
+                results.append(await _build_batch_result(
+                    identifier, normalized_id, products.get(normalized_id),
+                    config, keepa_service, request, trace_id, log_validation
+                ))
 
-                except Exception as e:
-                    logger.error(f"[{trace_id}] Failed processing {identifier}: {e}")
-                    results.append(BatchResult(
-                        identifier=identifier,
-                        asin=None,
-                        status="error",
-                        analysis=None,
-                        error=str(e)
-                    ))
-                    failed += 1
+        successful = sum(1 for result in results if result.status == "success")
+        failed = len(results) - successful
 
         return IngestResponse(
             batch_id=batch_id,
@@ -216,6 +186,166 @@ async def ingest_batch(
         )
 
 
+STREAM_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "sse": "text/event-stream",
+}
+
+
+def _stream_format(request: IngestBatchRequest, http_request: Request) -> Optional[str]:
+    """Streaming format requested via the `stream` field or the Accept header."""
+    if request.stream:
+        return request.stream
+    accept = http_request.headers.get("accept", "")
+    for stream_format, media_type in STREAM_MEDIA_TYPES.items():
+        if media_type in accept:
+            return stream_format
+    return None
+
+
+def _encode_record(stream_format: str, record_type: str, payload: Dict[str, Any]) -> str:
+    """One NDJSON line or SSE event."""
+    if stream_format == "sse":
+        return f"event: {record_type}\ndata: {json.dumps(payload, default=str)}\n\n"
+    return json.dumps({"type": record_type, **payload}, default=str) + "\n"
+
+
+async def _build_batch_result(
+    identifier: str,
+    normalized_id: str,
+    keepa_data: Optional[Dict[str, Any]],
+    config: Dict[str, Any],
+    keepa_service: KeepaService,
+    request: IngestBatchRequest,
+    trace_id: str,
+    log_validation: bool = False
+) -> BatchResult:
+    """Analyze one fetched identifier into its BatchResult."""
+    if keepa_data is None:
+        return BatchResult(
+            identifier=identifier,
+            asin=None,
+            status="not_found",
+            analysis=None,
+            error="Product not found in Keepa"
+        )
+
+    try:
+        asin = keepa_data.get('asin', normalized_id)
+
+        # Analyze product with optional source_price and condition_filter
+        analysis = await analyze_product(
+            asin,
+            keepa_data,
+            config,
+            keepa_service,
+            source_price=request.source_price,
+            condition_filter=request.condition_filter
+        )
+
+        # DEV/TEST ONLY: Validation logging if feature flags overridden
+        if log_validation:
+            logger.info(
+                f"[VALIDATION] ASIN={asin} | "
+                f"strategy={analysis.strategy_profile} | "
+                f"method={analysis.calculation_method} | "
+                f"roi={analysis.roi.get('roi_percentage', 0):.1f}% | "
+                f"buy=${analysis.roi.get('buy_cost', 'N/A')} | "
+                f"sell=${analysis.current_price}"
+            )
+
+        return BatchResult(
+            identifier=identifier,
+            asin=asin,
+            status="success",
+            analysis=analysis,
+            error=None
+        )
+
+    except Exception as e:
+        logger.error(f"[{trace_id}] Failed processing {identifier}: {e}")
+        return BatchResult(
+            identifier=identifier,
+            asin=None,
+            status="error",
+            analysis=None,
+            error=str(e)
+        )
+
+
+async def _stream_ingest(
+    request: IngestBatchRequest,
+    config: Dict[str, Any],
+    keepa_service: KeepaService,
+    batch_id: str,
+    trace_id: str,
+    stream_format: str,
+    log_validation: bool
+) -> AsyncIterator[str]:
+    """
+    Yield each BatchResult as soon as its analysis completes, then a summary.
+
+    Identifiers are fetched one Keepa batch (100 ASINs) at a time and only
+    counters are kept, so memory stays flat regardless of batch size. Result
+    records carry `index` (position in the request) since they are emitted
+    in completion order.
+    """
+    successful = 0
+    failed = 0
+    pending: List[asyncio.Task] = []
+
+    async def analyze_at(index: int, identifier: str, normalized_id: str, keepa_data):
+        result = await _build_batch_result(
+            identifier, normalized_id, keepa_data, config, keepa_service, request, trace_id, log_validation
+        )
+        return index, result
+
+    try:
+        async with keepa_service:
+            for start in range(0, len(request.identifiers), MAX_ASINS_PER_REQUEST):
+                chunk = request.identifiers[start:start + MAX_ASINS_PER_REQUEST]
+                normalized_ids = [normalize_identifier(identifier) for identifier in chunk]
+
+                try:
+                    products = await keepa_service.get_products_batch(
+                        normalized_ids,
+                        force_refresh=request.force_refresh
+                    )
+                except Exception as e:
+                    logger.error(f"[{trace_id}] Batch fetch failed for items {start}-{start + len(chunk) - 1}: {e}")
+                    for offset, identifier in enumerate(chunk):
+                        failed += 1
+                        result = BatchResult(identifier=identifier, asin=None, status="error", analysis=None, error=str(e))
+                        yield _encode_record(stream_format, "result", {"index": start + offset, **result.model_dump(mode="json")})
+                    continue
+
+                pending = [
+                    asyncio.create_task(analyze_at(start + offset, identifier, normalized_id, products.get(normalized_id)))
+                    for offset, (identifier, normalized_id) in enumerate(zip(chunk, normalized_ids))
+                ]
+                for next_done in asyncio.as_completed(pending):
+                    index, result = await next_done
+                    if result.status == "success":
+                        successful += 1
+                    else:
+                        failed += 1
+                    yield _encode_record(stream_format, "result", {"index": index, **result.model_dump(mode="json")})
+                pending = []
+    finally:
+        # Client disconnected mid-chunk: don't leave analyses running
+        for task in pending:
+            task.cancel()
+
+    yield _encode_record(stream_format, "summary", {
+        "batch_id": batch_id,
+        "total_items": len(request.identifiers),
+        "processed": successful + failed,
+        "successful": successful,
+        "failed": failed,
+        "trace_id": trace_id,
+    })
+
+
 @router.get("/{asin}/metrics", response_model=MetricsResponse)
 async def get_product_metrics(
     asin: str,
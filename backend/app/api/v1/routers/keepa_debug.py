@@ -6,11 +6,10 @@ Debug, health check, and test endpoints for Keepa integration.
 Separated from keepa.py for SRP compliance.
 """
 
-import asyncio
 import logging
 from datetime import datetime
 from decimal import Decimal
-from typing import Dict, Any, List
+from typing import Dict, Any
 
 from fastapi import APIRouter, Query, Depends
 
@@ -204,52 +203,6 @@ async def debug_analyze_endpoint(
         }
 
 
-async def process_batch_async(
-    job_id: str,
-    identifiers: List[str],
-    config: Dict[str, Any],
-    batch_id: str,
-    trace_id: str,
-    keepa_service: KeepaService
-):
-    """Process large batch asynchronously."""
-    logger.info(f"[{trace_id}] Starting async batch processing", extra={
-        "job_id": job_id,
-        "batch_id": batch_id,
-        "count": len(identifiers)
-    })
-
-    # TODO: Implement async job processing with database persistence
-    # For now, this is a placeholder for the async workflow
-
-    try:
-        # Process identifiers in chunks
-        chunk_size = 10
-        for i in range(0, len(identifiers), chunk_size):
-            chunk = identifiers[i:i + chunk_size]
-
-            async with keepa_service:
-                for identifier in chunk:
-                    try:
-                        normalized_id = normalize_identifier(identifier)
-                        keepa_data = await keepa_service.get_product_data(normalized_id)
-
-                        if keepa_data:
-                            # Analyze and store result
-                            # TODO: Store in database with job_id reference
-                            pass
-
-                    except Exception as e:
-                        logger.error(f"[{trace_id}] Async processing failed for {identifier}: {e}")
-
-            # Small delay between chunks to be API-friendly
-            await asyncio.sleep(1)
-
-    except Exception as e:
-        logger.error(f"[{trace_id}] Async batch processing failed: {e}")
-        # TODO: Update job status in database
-
-
 @router.get("/health")
 async def keepa_health_check(
     keepa_service: KeepaService = Depends(get_keepa_service)
@@ -297,7 +250,7 @@ async def keepa_health_check(
                     "failure_count": getattr(keepa_service._circuit_breaker, 'failure_count', 0)
                 },
                 "performance": {
-                    "concurrency_limit": keepa_service.concurrency,
+                    "concurrency_limit": keepa_service.concurrency_limiter.limit,
                     "average_latency_ms": 0
                 }
             }
@@ -374,7 +327,6 @@ async def test_keepa_connection(
 __all__ = [
     'router',
     'debug_analyze_endpoint',
-    'process_batch_async',
     'keepa_health_check',
     'test_keepa_connection',
 ]
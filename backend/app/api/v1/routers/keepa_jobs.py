@@ -0,0 +1,126 @@
+"""
+Keepa Router - Async Ingest Jobs
+================================
+Status/results endpoint and background handler for /keepa/ingest batches
+above the async threshold.
+
+Separated from keepa.py for SRP compliance.
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+
+from app.services.background_jobs import background_jobs
+from app.services.keepa_ingest_service import INGEST_JOB_KIND, KeepaIngestJobService
+from app.services.keepa_service import get_keepa_service
+from .keepa_schemas import BatchResult, IngestJobResponse
+from .keepa_utils import analyze_product, normalize_identifier
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+
+async def _analyze_with_options(asin: str, keepa_data: Dict[str, Any], config: Dict[str, Any],
+                                keepa_service, options: Dict[str, Any]):
+    return await analyze_product(
+        asin,
+        keepa_data,
+        config,
+        keepa_service,
+        source_price=options.get("source_price"),
+        condition_filter=options.get("condition_filter")
+    )
+
+
+async def process_ingest_job(job_id: str):
+    """Background pool handler: run (or resume) one persisted ingest job."""
+    await KeepaIngestJobService().run_job(
+        job_id,
+        keepa_service_factory=get_keepa_service,
+        analyze=_analyze_with_options,
+        normalize=normalize_identifier,
+    )
+
+
+# Follow-up recovery scheduled while jobs of another worker still look alive
+_recovery_recheck: Optional[asyncio.Task] = None
+
+
+async def recover_ingest_jobs() -> List[str]:
+    global _recovery_recheck
+    service = KeepaIngestJobService()
+    job_ids = await service.resumable_job_ids()
+    recheck_in = await service.seconds_until_orphans_claimable()
+
+    if recheck_in is not None and (_recovery_recheck is None or _recovery_recheck.done()):
+        _recovery_recheck = asyncio.create_task(_recover_ingest_jobs_later(recheck_in))
+    return job_ids
+
+
+async def _recover_ingest_jobs_later(delay: float):
+    """Resubmit jobs a crash left RUNNING once their heartbeat has gone stale."""
+    await asyncio.sleep(delay)
+    try:
+        for job_id in await recover_ingest_jobs():
+            background_jobs.submit(INGEST_JOB_KIND, job_id)
+    except Exception as e:
+        logger.error(f"Ingest job recovery re-check failed: {e}")
+
+
+background_jobs.register(INGEST_JOB_KIND, process_ingest_job, recover=recover_ingest_jobs)
+
+
+@router.get("/jobs/{job_id}", response_model=IngestJobResponse)
+async def get_ingest_job(
+    job_id: str,
+    offset: int = Query(0, ge=0, description="First result position to return"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum results to return")
+) -> IngestJobResponse:
+    """Progress and (paginated) results of an async ingest job."""
+    service = KeepaIngestJobService()
+    try:
+        job = await service.get_job(job_id)
+    except ValueError:
+        job = None
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Ingest job {job_id} not found")
+
+    results = await service.get_results(job_id, offset=offset, limit=limit)
+
+    return IngestJobResponse(
+        job_id=str(job.id),
+        batch_id=job.batch_id,
+        status=job.status.value,
+        total_items=job.total_items,
+        processed=job.processed,
+        successful=job.successful,
+        failed=job.failed,
+        attempts=job.attempts,
+        error=job.error_message,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        completed_at=job.completed_at,
+        results=[
+            BatchResult(
+                identifier=result.identifier,
+                asin=result.asin,
+                status=result.status,
+                analysis=result.analysis,
+                error=result.error
+            )
+            for result in results
+        ],
+        results_offset=offset,
+        results_limit=limit,
+        trace_id=job.trace_id
+    )
+
+
+__all__ = [
+    'router',
+    'process_ingest_job',
+    'recover_ingest_jobs',
+]
@@ -7,7 +7,7 @@ Separated from keepa.py for SRP compliance.
 """
 
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Literal, Optional
 
 from pydantic import BaseModel, Field, validator
 
@@ -24,6 +24,10 @@ class IngestBatchRequest(BaseModel):
         None,
         description="Filter offers by condition: new, very_good, good, acceptable. Default: include all."
     )
+    stream: Optional[Literal["ndjson", "sse"]] = Field(
+        None,
+        description="Stream each result as it completes (NDJSON lines or SSE events) followed by a summary record"
+    )
 
     @validator('identifiers')
     def validate_identifiers(cls, v):
@@ -175,6 +179,26 @@ class IngestResponse(BaseModel):
     trace_id: str
 
 
+class IngestJobResponse(BaseModel):
+    """Status and results of an async ingest job."""
+    job_id: str
+    batch_id: str
+    status: str  # "pending", "running", "success", "error"
+    total_items: int
+    processed: int
+    successful: int
+    failed: int
+    attempts: int
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    results: List[BatchResult]
+    results_offset: int
+    results_limit: int
+    trace_id: Optional[str] = None
+
+
 class StandardError(BaseModel):
     """Standard error format."""
     code: str
@@ -194,5 +218,6 @@ __all__ = [
     'MetricsResponse',
     'BatchResult',
     'IngestResponse',
+    'IngestJobResponse',
     'StandardError',
 ]
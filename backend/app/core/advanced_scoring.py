@@ -11,6 +11,8 @@ import statistics
 from datetime import datetime
 from typing import Dict, List, Any, Tuple
 
+from app.utils.keepa_series import KeepaSeries
+
 logger = logging.getLogger(__name__)
 
 
@@ -28,8 +30,8 @@ def compute_advanced_velocity_score(
     Returns:
         Tuple of (raw_score, normalized_0_100, level, notes)
     """
-    # Safety: Ensure bsr_history is a list
-    if not isinstance(bsr_history, list):
+    # Safety: Ensure bsr_history is a list (or KeepaSeries)
+    if not isinstance(bsr_history, (list, KeepaSeries)):
         return (0.5, 50, "unknown", "Invalid data type for bsr_history")
 
     try:
@@ -92,8 +94,8 @@ def compute_advanced_stability_score(
     Returns:
         Tuple of (raw_score, normalized_0_100, level, notes)
     """
-    # Safety: Ensure price_history is a list
-    if not isinstance(price_history, list):
+    # Safety: Ensure price_history is a list (or KeepaSeries)
+    if not isinstance(price_history, (list, KeepaSeries)):
         return (0.5, 50, "unknown", "Invalid data type for price_history")
 
     try:
@@ -153,10 +155,10 @@ def compute_advanced_confidence_score(
     Returns:
         Tuple of (raw_score, normalized_0_100, level, notes)
     """
-    # Safety: Ensure price_history and bsr_data are lists
-    if not isinstance(price_history, list):
+    # Safety: Ensure price_history and bsr_data are lists (or KeepaSeries)
+    if not isinstance(price_history, (list, KeepaSeries)):
         return (0.5, 50, "unknown", "Invalid data type for price_history")
-    if not isinstance(bsr_data, list):
+    if not isinstance(bsr_data, (list, KeepaSeries)):
         return (0.5, 50, "unknown", "Invalid data type for bsr_data")
 
     try:
@@ -2,12 +2,22 @@
 
 This module provides API key generation, verification, and a dual-auth
 dependency that accepts both X-API-Key headers and Firebase Bearer tokens.
+
+Verified keys are cached in-process for API_KEY_CACHE_TTL_SECONDS and
+last_used_at is written in coalesced batches, so a cached request does
+no auth-related DB work. Changes made through /api-keys invalidate the
+cache immediately in the process that handled them; other processes pick
+them up within the TTL.
 """
 
 import hashlib
 import secrets
+import threading
+import time
 from collections.abc import Callable
-from typing import Optional, Tuple
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, FrozenSet, Optional, Tuple
 
 import structlog
 from fastapi import Depends, Header, HTTPException, status
@@ -19,6 +29,7 @@ from .auth import CurrentUser, get_current_user, http_bearer
 from .db import get_db_session
 from .logging import set_user_context
 from .security import scopes_for_role
+from .usage_recorder import CoalescedTimestampRecorder
 
 logger = structlog.get_logger()
 
@@ -26,6 +37,84 @@ logger = structlog.get_logger()
 API_KEY_PREFIX = "avk_"
 API_KEY_RANDOM_LENGTH = 32
 
+# Verified-key cache and last_used_at write coalescing
+API_KEY_CACHE_TTL_SECONDS = 60
+API_KEY_CACHE_MAX_ENTRIES = 1024
+LAST_USED_FLUSH_SECONDS = 30
+
+
+@dataclass(frozen=True)
+class _CachedAPIKey:
+    """A key that passed verification, with its owner's identity."""
+
+    key_id: str
+    user_id: str
+    email: str
+    role: str
+    scopes: FrozenSet[str]
+    expires_at: Optional[datetime]
+    cached_at: float
+
+    def is_fresh(self) -> bool:
+        if time.monotonic() - self.cached_at > API_KEY_CACHE_TTL_SECONDS:
+            return False
+        return not (self.expires_at and self.expires_at < datetime.now(timezone.utc))
+
+
+_key_cache: Dict[str, _CachedAPIKey] = {}
+_key_cache_lock = threading.Lock()
+
+
+def invalidate_api_key_cache(key_id: Optional[str] = None) -> None:
+    """Drop cached verifications for one key (by id), or all keys."""
+    with _key_cache_lock:
+        if key_id is None:
+            _key_cache.clear()
+            return
+        for key_hash in [h for h, entry in _key_cache.items() if entry.key_id == str(key_id)]:
+            del _key_cache[key_hash]
+
+
+def _cache_get(key_hash: str) -> Optional[_CachedAPIKey]:
+    with _key_cache_lock:
+        entry = _key_cache.get(key_hash)
+        if entry is not None and not entry.is_fresh():
+            del _key_cache[key_hash]
+            return None
+        return entry
+
+
+def _cache_put(key_hash: str, entry: _CachedAPIKey) -> None:
+    with _key_cache_lock:
+        if len(_key_cache) >= API_KEY_CACHE_MAX_ENTRIES and key_hash not in _key_cache:
+            # Evict the oldest verification
+            oldest = min(_key_cache, key=lambda h: _key_cache[h].cached_at)
+            del _key_cache[oldest]
+        _key_cache[key_hash] = entry
+
+
+class APIKeyUsageRecorder(CoalescedTimestampRecorder):
+    """Coalesces last_used_at updates for API keys."""
+
+    label = "API key last_used_at"
+
+    def __init__(self, flush_interval: float = LAST_USED_FLUSH_SECONDS):
+        super().__init__(flush_interval)
+
+    def _model(self):
+        from ..models.api_key import APIKey
+
+        return APIKey
+
+    def _now(self) -> datetime:
+        return datetime.now(timezone.utc)
+
+    def _row(self, row_id: str, touched_at: datetime) -> dict:
+        return {"id": row_id, "last_used_at": touched_at}
+
+
+api_key_usage = APIKeyUsageRecorder()
+
 
 def generate_api_key() -> Tuple[str, str, str]:
     """Generate a new API key.
@@ -69,7 +158,7 @@ async def verify_api_key(
 
     Args:
         api_key: The raw API key from the request header.
-        db: Database session.
+        db: Database session (only used on a cache miss).
         required_scopes: Optional set of scopes required for this request.
 
     Returns:
@@ -78,11 +167,51 @@ async def verify_api_key(
     Raises:
         HTTPException: 401 for invalid/expired/inactive keys, 403 for wrong scopes.
     """
-    from ..models.api_key import APIKey
-    from datetime import datetime, timezone
-
     key_hash = hash_api_key(api_key)
 
+    entry = _cache_get(key_hash)
+    if entry is None:
+        entry = await _load_api_key(api_key, key_hash, db)
+        _cache_put(key_hash, entry)
+
+    # Check required scopes (per request: the cache holds the key, not the decision)
+    if required_scopes and not required_scopes.issubset(entry.scopes):
+        missing = required_scopes - entry.scopes
+        logger.warning(
+            "API key missing required scopes",
+            key_prefix=api_key[:8],
+            missing_scopes=list(missing),
+        )
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"Insufficient scopes. Required: {sorted(required_scopes)}",
+        )
+
+    # Update last used timestamp (coalesced, written by the next flush)
+    api_key_usage.record(entry.key_id)
+
+    set_user_context(entry.user_id)
+
+    logger.debug(
+        "User authenticated via API key",
+        user_id=entry.user_id,
+        key_prefix=api_key[:8],
+        scopes=list(entry.scopes),
+    )
+
+    return CurrentUser(
+        id=entry.user_id,
+        email=entry.email,
+        role=entry.role,
+        scopes=set(entry.scopes),
+        is_active=True,
+    )
+
+
+async def _load_api_key(api_key: str, key_hash: str, db: AsyncSession) -> _CachedAPIKey:
+    """Look up and validate a key and its owner in the database."""
+    from ..models.api_key import APIKey
+
     # Look up key by hash (include inactive keys so we can give specific messages)
     result = await db.execute(
         select(APIKey).where(APIKey.key_hash == key_hash)
@@ -128,40 +257,14 @@ async def verify_api_key(
         )
 
     # Build scopes from the API key's scopes (not the user's role scopes)
-    api_key_scopes = set(api_key_record.scopes) if api_key_record.scopes else set()
-
-    # Check required scopes
-    if required_scopes and not required_scopes.issubset(api_key_scopes):
-        missing = required_scopes - api_key_scopes
-        logger.warning(
-            "API key missing required scopes",
-            key_prefix=api_key[:8],
-            missing_scopes=list(missing),
-        )
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail=f"Insufficient scopes. Required: {sorted(required_scopes)}",
-        )
-
-    # Update last used timestamp
-    api_key_record.last_used_at = datetime.now(timezone.utc)
-    await db.commit()
-
-    set_user_context(user.id)
-
-    logger.debug(
-        "User authenticated via API key",
+    return _CachedAPIKey(
+        key_id=str(api_key_record.id),
         user_id=user.id,
-        key_prefix=api_key[:8],
-        scopes=list(api_key_scopes),
-    )
-
-    return CurrentUser(
-        id=user.id,
         email=user.email,
         role=user.role,
-        scopes=api_key_scopes,
-        is_active=user.is_active,
+        scopes=frozenset(api_key_record.scopes or ()),
+        expires_at=api_key_record.expires_at,
+        cached_at=time.monotonic(),
     )
 
 
@@ -142,8 +142,61 @@ async def lifespan(app):
     except Exception as e:
         logger.warning("Firebase Admin SDK initialization failed - auth endpoints may not work", error=str(e))
 
+    # Configure persistent Keepa response cache tier
+    try:
+        from app.services.keepa_cache_l2 import configure_l2_backend
+        settings = get_settings()
+        configure_l2_backend(settings.keepa_l2_cache_backend, settings.keepa_l2_cache_path)
+    except Exception as e:
+        logger.warning("Keepa L2 cache configuration failed - running with in-memory cache only", error=str(e))
+
+    # Warm up shared Keepa library clients
+    try:
+        from app.services.keepa_service import warm_up_keepa_client_pool
+        pool_stats = await warm_up_keepa_client_pool(get_settings().keepa_client_pool_size)
+        logger.info("Keepa client pool warmed up", **pool_stats)
+    except Exception as e:
+        logger.warning("Keepa client pool warm-up failed - clients will be created on demand", error=str(e))
+
+    # Store the daily review of recent jobs that completed before it was materialized
+    try:
+        from app.services.daily_review_store import backfill_daily_reviews
+        async with db_manager.session() as session:
+            replayed = await backfill_daily_reviews(session)
+        logger.info("Daily review backfilled", jobs=replayed)
+    except Exception as e:
+        logger.warning("Daily review backfill failed - reviews fill as jobs complete", error=str(e))
+
+    # Resume background jobs interrupted by the previous shutdown
+    try:
+        from app.services.background_jobs import background_jobs
+        recovered = await background_jobs.recover()
+        logger.info("Background jobs recovered", **recovered)
+    except Exception as e:
+        logger.warning("Background job recovery failed - unfinished jobs stay pending", error=str(e))
+
     yield
 
     # Shutdown
     logger.info("Shutting down application")
+    try:
+        from app.services.background_jobs import background_jobs
+        await background_jobs.shutdown()
+    except Exception as e:
+        logger.warning("Background job pool shutdown failed", error=str(e))
+
+    # Write coalesced API key last_used_at timestamps
+    try:
+        from app.core.api_key_auth import api_key_usage
+        await api_key_usage.flush()
+    except Exception as e:
+        logger.warning("API key usage flush failed", error=str(e))
+
+    # Write coalesced Firebase login tracking
+    try:
+        from app.services.firebase_auth_service import login_tracking
+        await login_tracking.flush()
+    except Exception as e:
+        logger.warning("Login tracking flush failed", error=str(e))
+
     await db_manager.close()
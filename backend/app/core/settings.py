@@ -102,6 +102,24 @@ class Settings(BaseSettings):
     keepa_results_per_page: int = Field(
         default=10, alias="KEEPA_RESULTS_PER_PAGE"
     )  # Product Finder returns 10 results per page
+    keepa_client_pool_size: int = Field(
+        default=4, alias="KEEPA_CLIENT_POOL_SIZE"
+    )  # keepa library clients kept alive per process
+    keepa_l2_cache_backend: str = Field(
+        default="none", alias="KEEPA_L2_CACHE_BACKEND"
+    )  # 'postgres' (shared), 'sqlite' (single node) or 'none'
+    keepa_l2_cache_path: str = Field(
+        default="keepa_cache.sqlite3", alias="KEEPA_L2_CACHE_PATH"
+    )  # SQLite file used when backend is 'sqlite'
+    niche_validation_parallelism: int = Field(
+        default=3, alias="NICHE_VALIDATION_PARALLELISM"
+    )  # curated niche templates validated concurrently
+    niche_validation_cache_ttl: int = Field(
+        default=1800, alias="NICHE_VALIDATION_CACHE_TTL"
+    )  # seconds a validated niche is reused (per template id + strategy)
+    background_job_workers: int = Field(
+        default=2, alias="BACKGROUND_JOB_WORKERS"
+    )  # asyncio workers running persisted background jobs (ingest batches)
 
     # Webhooks
     webhook_secret: str = Field(default="", alias="WEBHOOK_SECRET")
@@ -0,0 +1,102 @@
+"""Coalesced "last touched" timestamp writes.
+
+Hot authentication paths record a timestamp per row id in memory; one
+executemany UPDATE per flush window writes them, instead of a commit per
+request. Subclasses name the model and the values written per row.
+"""
+
+import asyncio
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import structlog
+from sqlalchemy import update
+
+from .db import db_manager
+
+logger = structlog.get_logger()
+
+
+class CoalescedTimestampRecorder(ABC):
+    """
+    Coalesces per-row timestamp updates and writes them in one batch.
+
+    The first record after a flush schedules the next flush on the running
+    loop; later records within the window only overwrite the pending
+    timestamp for their row.
+    """
+
+    label = "timestamp"
+
+    def __init__(self, flush_interval: float):
+        self.flush_interval = flush_interval
+        self._pending: Dict[str, datetime] = {}
+        self._lock = threading.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+
+    @abstractmethod
+    def _model(self):
+        """Mapped class whose rows are updated."""
+
+    @abstractmethod
+    def _now(self) -> datetime:
+        """Timestamp recorded when record() is called without one."""
+
+    @abstractmethod
+    def _row(self, row_id: str, touched_at: datetime) -> Dict[str, Any]:
+        """Primary key and column values written for one row."""
+
+    async def _write(self, session, rows: List[Dict[str, Any]]) -> None:
+        """Write one flush's rows (executemany UPDATE by primary key)."""
+        await session.execute(update(self._model()), rows)
+
+    def record(self, row_id: str, touched_at: Optional[datetime] = None) -> None:
+        with self._lock:
+            self._pending[str(row_id)] = touched_at or self._now()
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                return  # No loop: written by the next scheduled or shutdown flush
+            task = self._flush_task
+            # A task bound to another (possibly closed) loop will never run
+            if task is None or task.done() or task.get_loop() is not loop:
+                self._flush_task = loop.create_task(self._flush_later())
+
+    def pending(self) -> Dict[str, datetime]:
+        with self._lock:
+            return dict(self._pending)
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.flush_interval)
+        await self.flush()
+
+    async def flush(self, session_factory=None) -> int:
+        """Write pending timestamps in one executemany UPDATE."""
+        with self._lock:
+            batch, self._pending = self._pending, {}
+        if not batch:
+            return 0
+
+        rows: List[Dict[str, Any]] = [self._row(row_id, ts) for row_id, ts in batch.items()]
+        try:
+            async with (session_factory or db_manager.session)() as session:
+                await self._write(session, rows)
+                await session.commit()
+        except Exception as e:
+            logger.warning(f"{self.label} flush failed", error=str(e), rows=len(batch))
+            with self._lock:
+                # Keep the newest timestamp per row for the next attempt
+                for row_id, touched_at in batch.items():
+                    if row_id not in self._pending or self._pending[row_id] < touched_at:
+                        self._pending[row_id] = touched_at
+            return 0
+        return len(batch)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._pending.clear()
+            task, self._flush_task = self._flush_task, None
+            if task is not None and not task.done() and not task.get_loop().is_closed():
+                task.cancel()
@@ -10,7 +10,11 @@ import logging
 import statistics
 from datetime import datetime, timedelta
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Tuple, Union
+
+import numpy as np
+
+from app.utils.keepa_series import KeepaSeries
 
 logger = logging.getLogger(__name__)
 
@@ -19,10 +23,10 @@ logger = logging.getLogger(__name__)
 class VelocityData:
     """Input data for velocity calculations."""
     current_bsr: Optional[int]
-    bsr_history: List[Tuple[datetime, int]]  # (timestamp, bsr) pairs
-    price_history: List[Tuple[datetime, float]]  # (timestamp, price) pairs
-    buybox_history: List[Tuple[datetime, bool]]  # (timestamp, has_buybox) pairs
-    offers_history: List[Tuple[datetime, int]]   # (timestamp, offer_count) pairs
+    bsr_history: Union[KeepaSeries, List[Tuple[datetime, int]]]  # (timestamp, bsr) pairs
+    price_history: Union[KeepaSeries, List[Tuple[datetime, float]]]  # (timestamp, price) pairs
+    buybox_history: Union[KeepaSeries, List[Tuple[datetime, bool]]]  # (timestamp, has_buybox) pairs
+    offers_history: Union[KeepaSeries, List[Tuple[datetime, int]]]   # (timestamp, offer_count) pairs
     category: str = "books"
 
 
@@ -47,10 +51,10 @@ def calculate_velocity_score(
         cutoff_date = datetime.now() - timedelta(days=window_days)
 
         # Filter data to window
-        recent_bsr = [item for item in velocity_data.bsr_history if item[0] >= cutoff_date]
-        recent_prices = [item for item in velocity_data.price_history if item[0] >= cutoff_date]
-        recent_buybox = [item for item in velocity_data.buybox_history if item[0] >= cutoff_date]
-        recent_offers = [item for item in velocity_data.offers_history if item[0] >= cutoff_date]
+        recent_bsr = _in_window(velocity_data.bsr_history, cutoff_date)
+        recent_prices = _in_window(velocity_data.price_history, cutoff_date)
+        recent_buybox = _in_window(velocity_data.buybox_history, cutoff_date)
+        recent_offers = _in_window(velocity_data.offers_history, cutoff_date)
 
         # Component 1: BSR Percentile Trend (0-30 points)
         rank_percentile_30d = _calculate_rank_percentile(recent_bsr, velocity_data.category, config)
@@ -110,6 +114,13 @@ def calculate_velocity_score(
         }
 
 
+def _in_window(history, cutoff_date: datetime):
+    """Points at or after cutoff (searchsorted for KeepaSeries)."""
+    if isinstance(history, KeepaSeries):
+        return history.since(cutoff_date)
+    return [item for item in history if item[0] >= cutoff_date]
+
+
 def _calculate_rank_percentile(
     bsr_history: List[Tuple[datetime, int]],
     category: str,
@@ -119,12 +130,15 @@ def _calculate_rank_percentile(
     if not bsr_history:
         return 0.0
 
-    # Extract BSR values
-    bsr_values = [item[1] for item in bsr_history if item[1] is not None]
-    if not bsr_values:
-        return 0.0
+    if isinstance(bsr_history, KeepaSeries):
+        avg_bsr = bsr_history.mean()
+    else:
+        # Extract BSR values
+        bsr_values = [item[1] for item in bsr_history if item[1] is not None]
+        if not bsr_values:
+            return 0.0
 
-    avg_bsr = statistics.mean(bsr_values)
+        avg_bsr = statistics.mean(bsr_values)
 
     # Get benchmarks from config or use defaults
     if config and "velocity" in config and "benchmarks" in config["velocity"]:
@@ -155,6 +169,10 @@ def _calculate_rank_percentile(
 
 def _count_rank_improvements(bsr_history: List[Tuple[datetime, int]]) -> int:
     """Count number of BSR improvements (rank decreases)."""
+    # KeepaSeries is already time-ordered: vectorized diff
+    if isinstance(bsr_history, KeepaSeries):
+        return bsr_history.count_drops()
+
     # Safety: Ensure bsr_history is a list
     if not isinstance(bsr_history, list):
         return 0
@@ -178,6 +196,11 @@ def _count_rank_improvements(bsr_history: List[Tuple[datetime, int]]) -> int:
 
 def _calculate_buybox_uptime(buybox_history: List[Tuple[datetime, bool]]) -> float:
     """Calculate percentage of time buybox was available."""
+    if isinstance(buybox_history, KeepaSeries):
+        if not buybox_history:
+            return 0.0
+        return float(np.count_nonzero(buybox_history.values)) / len(buybox_history) * 100.0
+
     # Safety: Ensure buybox_history is a list
     if not isinstance(buybox_history, list) or not buybox_history:
         return 0.0
@@ -193,34 +216,37 @@ def _calculate_offers_volatility(
     price_history: List[Tuple[datetime, float]]
 ) -> float:
     """Calculate market volatility based on offer count and price changes."""
-    # Safety: Ensure inputs are lists
-    if not isinstance(offers_history, list):
-        offers_history = []
-    if not isinstance(price_history, list):
-        price_history = []
+    # Safety: Ensure inputs are lists (or KeepaSeries)
+    offer_counts = _series_values(offers_history)
+    prices = _series_values(price_history)
 
     volatility_score = 0.0
 
     # Offers volatility (frequent changes in number of sellers)
-    if len(offers_history) >= 2:
-        offer_counts = [item[1] for item in offers_history if item[1] is not None]
-        if offer_counts:
-            offer_volatility = statistics.stdev(offer_counts) if len(offer_counts) > 1 else 0
-            volatility_score += min(offer_volatility, 10)  # Cap at 10
+    if len(offer_counts) >= 2:
+        offer_volatility = float(np.std(offer_counts, ddof=1))
+        volatility_score += min(offer_volatility, 10)  # Cap at 10
 
     # Price volatility
-    if len(price_history) >= 2:
-        prices = [item[1] for item in price_history if item[1] is not None]
-        if len(prices) > 1:
-            mean_price = statistics.mean(prices)
-            # Guard against division by zero when mean price is 0
-            if mean_price > 0:
-                price_volatility = statistics.stdev(prices) / mean_price * 100
-                volatility_score += min(price_volatility, 10)  # Cap at 10
+    if len(prices) >= 2:
+        mean_price = float(np.mean(prices))
+        # Guard against division by zero when mean price is 0
+        if mean_price > 0:
+            price_volatility = float(np.std(prices, ddof=1)) / mean_price * 100
+            volatility_score += min(price_volatility, 10)  # Cap at 10
 
     return volatility_score
 
 
+def _series_values(history) -> np.ndarray:
+    """Non-null values of a history as a float64 array."""
+    if isinstance(history, KeepaSeries):
+        return history.as_float64()
+    if not isinstance(history, list):
+        return np.empty(0)
+    return np.asarray([item[1] for item in history if item[1] is not None], dtype=np.float64)
+
+
 def _get_velocity_tier(velocity_score: float, config: Optional[Dict[str, Any]] = None) -> str:
     """Categorize velocity score into tiers using config thresholds."""
 
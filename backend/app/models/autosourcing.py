@@ -67,6 +67,9 @@ class AutoSourcingJob(Base):
     # Error handling
     error_message = Column(Text, nullable=True)
     error_count = Column(Integer, nullable=False, default=0)
+
+    # Live progress while queued/running (stage, per-stage counters, tokens spent)
+    progress = Column(JSON, nullable=True)
     
     # Metadata
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
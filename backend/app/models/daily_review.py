@@ -0,0 +1,85 @@
+"""
+Materialized daily review models.
+
+When an AutoSourcing job completes, its picks are classified once and
+stored per ASIN per (UTC) day, next to a summary row with the count per
+classification. Review endpoints read these rows instead of
+reclassifying every pick on each request, and past classifications stay
+queryable.
+"""
+from datetime import datetime
+from uuid import uuid4
+
+from sqlalchemy import (
+    Column, String, Integer, Float, Date, DateTime, ForeignKey, JSON,
+    Index, UniqueConstraint
+)
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+
+from app.core.db import Base
+
+
+class DailyReviewItem(Base):
+    """Classification of one ASIN for one review day (latest pick wins)."""
+    __tablename__ = "daily_review_items"
+
+    id = Column(PG_UUID(as_uuid=True), primary_key=True, default=uuid4)
+    review_date = Column(Date, nullable=False)
+    asin = Column(String(20), nullable=False)
+    classification = Column(String(20), nullable=False)  # STABLE/JACKPOT/REVENANT/FLUKE/REJECT
+
+    # Pick the classification was computed from
+    pick_id = Column(
+        PG_UUID(as_uuid=True),
+        ForeignKey("autosourcing_picks.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    picked_at = Column(DateTime, nullable=False, index=True)
+
+    # History the classification saw (30-day sightings from earlier jobs)
+    sightings = Column(Integer, nullable=False, default=0)
+    last_seen_at = Column(DateTime, nullable=True)
+
+    roi_percentage = Column(Float, nullable=False, default=0.0)
+    product = Column(JSON, nullable=False)  # Pick fields as passed to classify_product
+
+    classified_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint("review_date", "asin", name="uq_daily_review_items_date_asin"),
+        Index("idx_daily_review_items_date_classification", "review_date", "classification"),
+        Index("idx_daily_review_items_pick_id", "pick_id"),
+    )
+
+    def __repr__(self):
+        return f"<DailyReviewItem(review_date={self.review_date}, asin='{self.asin}', classification='{self.classification}')>"
+
+
+class DailyReviewSummary(Base):
+    """Count per classification for one review day."""
+    __tablename__ = "daily_review_summaries"
+
+    review_date = Column(Date, primary_key=True)
+    total = Column(Integer, nullable=False, default=0)
+    stable = Column(Integer, nullable=False, default=0)
+    jackpot = Column(Integer, nullable=False, default=0)
+    revenant = Column(Integer, nullable=False, default=0)
+    fluke = Column(Integer, nullable=False, default=0)
+    reject = Column(Integer, nullable=False, default=0)
+
+    last_job_id = Column(PG_UUID(as_uuid=True), nullable=True)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    @property
+    def counts(self) -> dict:
+        """Counts keyed by classification value (STABLE, JACKPOT, ...)."""
+        return {
+            "STABLE": self.stable or 0,
+            "JACKPOT": self.jackpot or 0,
+            "REVENANT": self.revenant or 0,
+            "FLUKE": self.fluke or 0,
+            "REJECT": self.reject or 0,
+        }
+
+    def __repr__(self):
+        return f"<DailyReviewSummary(review_date={self.review_date}, total={self.total})>"
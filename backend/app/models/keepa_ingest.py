@@ -0,0 +1,96 @@
+"""
+Keepa ingest job models.
+
+Large /keepa/ingest batches run as background jobs. The job row holds the
+request snapshot and progress counters; one result row per identifier is
+written as each Keepa chunk completes, so a job resumes where it stopped
+after a restart.
+"""
+from datetime import datetime
+from enum import Enum
+from uuid import uuid4
+
+from sqlalchemy import (
+    Column, String, Integer, DateTime, Text, ForeignKey, JSON,
+    Enum as SQLEnum, Index, UniqueConstraint
+)
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.orm import relationship
+
+from app.core.db import Base
+
+
+class IngestJobStatus(Enum):
+    """Status of a Keepa ingest job."""
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCESS = "success"
+    ERROR = "error"
+
+
+class KeepaIngestJob(Base):
+    """An asynchronous /keepa/ingest batch."""
+    __tablename__ = "keepa_ingest_jobs"
+
+    id = Column(PG_UUID(as_uuid=True), primary_key=True, default=uuid4)
+    batch_id = Column(String(100), nullable=False, index=True)
+    trace_id = Column(String(64), nullable=True)
+
+    status = Column(SQLEnum(IngestJobStatus), nullable=False, default=IngestJobStatus.PENDING, index=True)
+
+    # Request snapshot (identifiers in submission order, effective config, options)
+    identifiers = Column(JSON, nullable=False)
+    config = Column(JSON, nullable=False)
+    options = Column(JSON, nullable=False, default=dict)
+
+    # Progress
+    total_items = Column(Integer, nullable=False)
+    processed = Column(Integer, nullable=False, default=0)
+    successful = Column(Integer, nullable=False, default=0)
+    failed = Column(Integer, nullable=False, default=0)
+
+    # Execution tracking; heartbeat_at lets another worker reclaim a job
+    # whose process died mid-run
+    attempts = Column(Integer, nullable=False, default=0)
+    worker_id = Column(String(64), nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)
+    error_message = Column(Text, nullable=True)
+
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
+    started_at = Column(DateTime, nullable=True)
+    completed_at = Column(DateTime, nullable=True)
+
+    results = relationship("KeepaIngestResult", back_populates="job", cascade="all, delete-orphan")
+
+    def __repr__(self):
+        try:
+            return f"<KeepaIngestJob(id={self.id})>"
+        except (AttributeError, TypeError):
+            return "<KeepaIngestJob(detached)>"
+
+
+class KeepaIngestResult(Base):
+    """Outcome for one identifier of an ingest job."""
+    __tablename__ = "keepa_ingest_results"
+
+    id = Column(PG_UUID(as_uuid=True), primary_key=True, default=uuid4)
+    job_id = Column(PG_UUID(as_uuid=True), ForeignKey("keepa_ingest_jobs.id", ondelete="CASCADE"), nullable=False)
+    position = Column(Integer, nullable=False)  # Index in the submitted identifiers
+
+    identifier = Column(String(50), nullable=False)
+    asin = Column(String(20), nullable=True)
+    status = Column(String(20), nullable=False)  # success / error / not_found
+    analysis = Column(JSON, nullable=True)       # AnalysisResult payload
+    error = Column(Text, nullable=True)
+
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    job = relationship("KeepaIngestJob", back_populates="results")
+
+    __table_args__ = (
+        UniqueConstraint("job_id", "position", name="uq_keepa_ingest_results_job_position"),
+        Index("idx_keepa_ingest_results_job_id", "job_id"),
+    )
+
+    def __repr__(self):
+        return f"<KeepaIngestResult(job_id={self.job_id}, position={self.position}, status='{self.status}')>"
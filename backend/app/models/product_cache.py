@@ -10,7 +10,7 @@ from typing import Optional, Dict, Any
 
 from sqlalchemy import (
     Column, String, Integer, Float, JSON,
-    DateTime, Index, Boolean, Text
+    DateTime, Index, Boolean, Text, LargeBinary
 )
 from sqlalchemy.dialects.postgresql import UUID
 
@@ -89,6 +89,33 @@ class ProductScoringCache(Base):
     )
 
 
+class KeepaResponseCache(Base):
+    """
+    Second-tier cache for raw Keepa responses (shared by workers, survives restarts).
+
+    Payload is zlib-compressed JSON. TTL depends on cache_type
+    ('meta', 'pricing', 'bsr'), same as the in-memory KeepaCache.
+    """
+
+    __tablename__ = "keepa_response_cache"
+
+    # Primary key - normalized KeepaCache key (e.g. /product?asin=X&domain=1)
+    cache_key = Column(String(512), primary_key=True)
+    cache_type = Column(String(20), nullable=False)
+
+    # Compressed payload
+    payload = Column(LargeBinary, nullable=False)
+    size_bytes = Column(Integer, nullable=False)
+
+    # Metadata
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index('idx_keepa_response_cache_expires_at', 'expires_at'),
+    )
+
+
 class SearchHistory(Base):
     """
     Historique des recherches pour analytics.
@@ -30,6 +30,7 @@ class CostEstimateResponse(BaseModel):
     """Response with cost estimation details."""
     estimated_tokens: int
     current_balance: int
+    balance_age_seconds: Optional[int] = None
     safe_to_proceed: bool
     warning_message: Optional[str] = None
     max_allowed: int = MAX_TOKENS_PER_JOB
@@ -13,6 +13,7 @@ import structlog
 from app.models.analytics import ASINHistory
 from app.models.keepa_models import KeepaProduct
 from app.services.keepa_service import KeepaService
+from app.services.keepa_throttle import KeepaPriority, with_keepa_priority
 
 
 logger = structlog.get_logger()
@@ -24,6 +25,7 @@ class ASINTrackingService:
     def __init__(self, keepa_service: KeepaService):
         self.keepa_service = keepa_service
 
+    @with_keepa_priority(KeepaPriority.TRACKING)
     async def track_asin_daily(
         self,
         session: AsyncSession,
@@ -42,13 +44,27 @@ class ASINTrackingService:
             ASINHistory record created, or None if fetch failed
         """
         try:
-            keepa_data = await self.keepa_service.get_product_data(
-                asin=asin,
-                domain=keepa_domain,
-                include_history=False,
-                include_offers=False
+            products = await self.keepa_service.get_products_batch(
+                [asin],
+                history=False,
+                offers=0,
+                domain=keepa_domain
             )
+            return await self._record_history(session, asin, products.get(asin), keepa_domain)
+
+        except Exception as e:
+            logger.error(f"Error tracking ASIN {asin}: {str(e)}")
+            return None
 
+    async def _record_history(
+        self,
+        session: AsyncSession,
+        asin: str,
+        keepa_data: Optional[Dict[str, Any]],
+        keepa_domain: int
+    ) -> Optional[ASINHistory]:
+        """Build and flush an ASINHistory row from fetched Keepa data."""
+        try:
             if not keepa_data:
                 logger.warning(f"No Keepa data for {asin}")
                 return None
@@ -104,6 +120,7 @@ class ASINTrackingService:
             logger.error(f"Error tracking ASIN {asin}: {str(e)}")
             return None
 
+    @with_keepa_priority(KeepaPriority.TRACKING)
     async def track_multiple_asins(
         self,
         session: AsyncSession,
@@ -113,6 +130,8 @@ class ASINTrackingService:
         """
         Track multiple ASINs in batch.
 
+        Keepa data is fetched with one request per 100 ASINs.
+
         Args:
             session: Database session
             asins: List of ASINs to track
@@ -121,9 +140,22 @@ class ASINTrackingService:
         Returns:
             Dict mapping ASIN to ASINHistory record (or None if failed)
         """
+        try:
+            products = await self.keepa_service.get_products_batch(
+                asins,
+                history=False,
+                offers=0,
+                domain=keepa_domain
+            )
+        except Exception as e:
+            logger.error(f"Error fetching Keepa batch for {len(asins)} ASINs: {str(e)}")
+            products = {}
+
         results = {}
         for asin in asins:
-            result = await self.track_asin_daily(session, asin, keepa_domain)
+            result = await self._record_history(
+                session, asin, products.get(asin), keepa_domain
+            )
             results[asin] = result
 
         await session.commit()
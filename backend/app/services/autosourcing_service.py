@@ -5,7 +5,7 @@ Integrates Keepa Product Finder with advanced scoring system v1.5.0.
 import asyncio
 import logging
 from datetime import datetime, timedelta, timezone
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Callable, Awaitable
 from uuid import UUID, uuid4
 from fastapi import HTTPException
 from app.services.autosourcing_scoring import (
@@ -22,16 +22,20 @@ from app.services.autosourcing_scoring import (
 )
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, desc, func
+from sqlalchemy import select, and_, desc, func, update
 from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.models.autosourcing import (
     AutoSourcingJob, AutoSourcingPick, SavedProfile,
     JobStatus, ActionStatus
 )
 from app.services.keepa_service import KeepaService
+from app.services.keepa_throttle import KeepaPriority, with_keepa_priority
 from app.services.webhook_service import dispatch_webhook
-from app.services.business_config_service import BusinessConfigService
+from app.services.daily_review_store import record_job_classifications, refresh_summaries_for_pick
+from app.services.business_config_service import get_business_config_service
+from app.services.scoring_profile import ScoringProfile
 from app.services.keepa_product_finder import KeepaProductFinderService
 from app.services.config_adapter import get_config_adapter
 from app.core.calculations import (
@@ -52,6 +56,12 @@ from app.config.keepa_categories import (
 
 logger = logging.getLogger(__name__)
 
+# Report scoring progress every N analyzed ASINs
+SCORING_PROGRESS_BATCH = 10
+
+# Slack past TIMEOUT_PER_JOB before a RUNNING job is considered interrupted
+INTERRUPTED_JOB_GRACE_SECONDS = 30
+
 
 class AutoSourcingService:
     """
@@ -62,7 +72,7 @@ class AutoSourcingService:
     def __init__(self, db_session: AsyncSession, keepa_service: KeepaService):
         self.db = db_session
         self.keepa_service = keepa_service
-        self.business_config = BusinessConfigService()
+        self.business_config = get_business_config_service()
         # Phase 7: Use KeepaProductFinderService (REST API) instead of keepa lib
         config_adapter = get_config_adapter()
         self.product_finder = KeepaProductFinderService(
@@ -71,6 +81,7 @@ class AutoSourcingService:
             db=db_session
         )
 
+    @with_keepa_priority(KeepaPriority.AUTOSOURCING)
     async def run_custom_search(
         self,
         discovery_config: Dict[str, Any],
@@ -81,6 +92,9 @@ class AutoSourcingService:
         """
         Run a custom AutoSourcing search with user-defined criteria.
 
+        Creates the job and executes it in the caller's task. The API
+        enqueues instead (create_job + background pool, see execute_job).
+
         Args:
             discovery_config: Keepa search parameters
             scoring_config: Advanced scoring thresholds
@@ -90,6 +104,23 @@ class AutoSourcingService:
         Returns:
             AutoSourcingJob with results populated
 
+        Raises:
+            InsufficientTokensError: If tokens insufficient for job
+        """
+        job = await self.create_job(discovery_config, scoring_config, profile_name, profile_id)
+        job.status = JobStatus.RUNNING
+        return await self.execute_job(job)
+
+    async def create_job(
+        self,
+        discovery_config: Dict[str, Any],
+        scoring_config: Dict[str, Any],
+        profile_name: str,
+        profile_id: Optional[UUID] = None
+    ) -> AutoSourcingJob:
+        """
+        Check the token budget and persist a PENDING job.
+
         Raises:
             InsufficientTokensError: If tokens insufficient for job
         """
@@ -120,8 +151,9 @@ class AutoSourcingService:
             profile_id=profile_id,
             discovery_config=discovery_config,
             scoring_config=scoring_config,
-            status=JobStatus.RUNNING,
-            launched_at=datetime.utcnow()
+            status=JobStatus.PENDING,
+            launched_at=datetime.utcnow(),
+            progress={"stage": "queued", "updated_at": datetime.utcnow().isoformat()}
         )
 
         logger.debug(f"Adding job to session: {profile_name}")
@@ -130,15 +162,128 @@ class AutoSourcingService:
         await self.db.commit()
         logger.debug(f"Refreshing job from DB...")
         await self.db.refresh(job)
+        # A new job has no picks: mark the relationship loaded so it can be
+        # serialized without a lazy load
+        set_committed_value(job, "picks", [])
         logger.debug(f"Job created with ID: {job.id}")
 
+        return job
+
+    async def claim_job(self, job_id: UUID) -> Optional[AutoSourcingJob]:
+        """
+        Atomically move a PENDING job to RUNNING for this worker.
+
+        Returns:
+            The job, or None if it was already claimed or no longer exists
+        """
+        result = await self.db.execute(
+            update(AutoSourcingJob)
+            .where(AutoSourcingJob.id == job_id, AutoSourcingJob.status == JobStatus.PENDING)
+            .values(status=JobStatus.RUNNING, launched_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        await self.db.commit()
+        if result.rowcount != 1:
+            return None
+        return await self.db.get(AutoSourcingJob, job_id, populate_existing=True)
+
+    @staticmethod
+    async def get_pending_job_ids(db: AsyncSession) -> List[UUID]:
+        """Queued jobs, oldest first (resubmitted to the worker pool at startup)."""
+        result = await db.execute(
+            select(AutoSourcingJob.id)
+            .where(AutoSourcingJob.status == JobStatus.PENDING)
+            .order_by(AutoSourcingJob.created_at)
+        )
+        return list(result.scalars().all())
+
+    @staticmethod
+    async def fail_interrupted_jobs(db: AsyncSession) -> int:
+        """
+        Mark RUNNING jobs that outlived TIMEOUT_PER_JOB as ERROR.
+
+        A live job always finishes or times out within TIMEOUT_PER_JOB, so
+        these were interrupted by a crash and would otherwise stay RUNNING.
+        """
+        cutoff = datetime.utcnow() - timedelta(seconds=TIMEOUT_PER_JOB + INTERRUPTED_JOB_GRACE_SECONDS)
+        result = await db.execute(
+            update(AutoSourcingJob)
+            .where(AutoSourcingJob.status == JobStatus.RUNNING, AutoSourcingJob.launched_at < cutoff)
+            .values(
+                status=JobStatus.ERROR,
+                error_message="Job interrupted before completion (server restart)",
+                completed_at=datetime.utcnow()
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        return result.rowcount or 0
+
+    @staticmethod
+    async def seconds_until_running_jobs_expire(db: AsyncSession) -> Optional[float]:
+        """
+        Time until the most recently launched RUNNING job would be failed
+        by fail_interrupted_jobs, or None if no job is running.
+
+        Recovery checks again after that delay, since a job launched just
+        before a crash is still too recent to tell from a live one.
+        """
+        result = await db.execute(
+            select(func.max(AutoSourcingJob.launched_at)).where(AutoSourcingJob.status == JobStatus.RUNNING)
+        )
+        launched_at = result.scalar()
+        if launched_at is None:
+            return None
+        expires_at = launched_at + timedelta(seconds=TIMEOUT_PER_JOB + INTERRUPTED_JOB_GRACE_SECONDS)
+        return max((expires_at - datetime.utcnow()).total_seconds(), 0.0) + 1
+
+    async def release_job(self, job_id: UUID) -> None:
+        """Put a job interrupted by shutdown back in the queue for the next start."""
+        await self.db.rollback()
+        await self.db.execute(
+            update(AutoSourcingJob)
+            .where(AutoSourcingJob.id == job_id, AutoSourcingJob.status == JobStatus.RUNNING)
+            .values(
+                status=JobStatus.PENDING,
+                progress={"stage": "queued", "updated_at": datetime.utcnow().isoformat()}
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await self.db.commit()
+
+    @with_keepa_priority(KeepaPriority.AUTOSOURCING)
+    async def execute_job(self, job: AutoSourcingJob) -> AutoSourcingJob:
+        """
+        Run the discovery pipeline for a created job.
+
+        Progress (stage, ASINs discovered/scored, picks selected, tokens
+        spent) is committed to job.progress as each stage and batch
+        completes, so pollers and the SSE stream can follow the job.
+
+        Returns:
+            AutoSourcingJob with results populated
+        """
+        discovery_config = job.discovery_config or {}
+        scoring_config = job.scoring_config or {}
         start_time = datetime.utcnow()
+        tokens_at_start = self._tokens_used()
+
+        async def report(stage: str, **counts):
+            job.progress = {
+                **(job.progress or {}),
+                **counts,
+                "stage": stage,
+                "tokens_spent": self._tokens_used() - tokens_at_start,
+                "updated_at": datetime.utcnow().isoformat(),
+            }
+            await self.db.commit()
 
         try:
             # Timeout protection INSIDE service to guarantee DB update
             async with asyncio.timeout(TIMEOUT_PER_JOB):
                 # Phase 1: Discover products via Keepa
                 logger.info("Phase 1: Product discovery via Keepa")
+                await report("discovering")
                 discovered_asins = await self._discover_products(discovery_config)
                 logger.info("pipeline discover: %d ASINs found", len(discovered_asins))
 
@@ -157,8 +302,14 @@ class AutoSourcingService:
 
                 # Phase 2: Score and filter products
                 logger.info("Phase 2: Advanced scoring and filtering")
+                await report(
+                    "scoring",
+                    asins_discovered=len(discovered_asins),
+                    asins_unique=len(unique_asins),
+                    asins_scored=0
+                )
                 scored_picks = await self._score_and_filter_products(
-                    unique_asins, scoring_config, job.id
+                    unique_asins, scoring_config, job.id, on_progress=report
                 )
                 logger.info("pipeline score: %d products scored", len(scored_picks))
 
@@ -167,6 +318,7 @@ class AutoSourcingService:
 
                 # Phase 3: Remove duplicates from recent jobs
                 logger.info("Phase 3: Duplicate detection")
+                await report("deduplicating", picks_selected=len(scored_picks))
                 unique_picks = await self._remove_recent_duplicates(scored_picks)
                 logger.info("pipeline final: %d picks selected (roi_min=%.1f)", len(unique_picks), scoring_config.get("roi_min", 0))
 
@@ -183,8 +335,11 @@ class AutoSourcingService:
                 job.status = JobStatus.SUCCESS
                 job.total_selected = final_count
 
+                # Classify once for the daily review; committed together with the job
+                await self._record_daily_review(job)
+
                 logger.debug(f"Final commit before return...")
-                await self.db.commit()
+                await report("completed", picks_selected=final_count)
 
                 # Reload job with picks relationship eagerly loaded to prevent MissingGreenlet
                 # when FastAPI serializes the response
@@ -211,7 +366,7 @@ class AutoSourcingService:
             job.error_message = f"Job exceeded timeout limit ({TIMEOUT_PER_JOB} seconds)"
             job.completed_at = datetime.utcnow()
             job.duration_ms = int((datetime.utcnow() - start_time).total_seconds() * 1000)
-            await self.db.commit()
+            await report("failed")
 
             logger.warning(f"Job {job.id} exceeded timeout ({TIMEOUT_PER_JOB}s)")
 
@@ -233,9 +388,14 @@ class AutoSourcingService:
             job.completed_at = datetime.utcnow()
             job.duration_ms = int((datetime.utcnow() - start_time).total_seconds() * 1000)
 
-            await self.db.commit()
+            await report("failed")
             raise AppException(f"AutoSourcing job failed: {str(e)}")
 
+    def _tokens_used(self) -> int:
+        """Tokens consumed so far by this service's KeepaService instance."""
+        tokens_used = getattr(getattr(self.keepa_service, "metrics", None), "tokens_used", 0)
+        return tokens_used if isinstance(tokens_used, int) else 0
+
     async def _discover_products(self, discovery_config: Dict[str, Any]) -> List[str]:
         """
         Discover products using KeepaProductFinderService (REST API).
@@ -384,7 +544,8 @@ class AutoSourcingService:
         self,
         asins: List[str],
         domain: int = 1,
-        batch_size: int = 50
+        batch_size: int = 50,
+        on_progress: Optional[Callable[..., Awaitable[None]]] = None
     ) -> Dict[str, Dict[str, Any]]:
         """
         Fetch product data for multiple ASINs using batch REST API.
@@ -396,6 +557,7 @@ class AutoSourcingService:
             asins: List of ASINs to fetch
             domain: Keepa domain ID (1=US)
             batch_size: Max ASINs per batch request (Keepa limit is 100)
+            on_progress: Optional job progress reporter, called after each batch
 
         Returns:
             Dict mapping ASIN to raw Keepa product data
@@ -441,13 +603,18 @@ class AutoSourcingService:
                 logger.error(f"Error fetching batch: {e}")
                 continue
 
+            finally:
+                if on_progress is not None:
+                    await on_progress("fetching", asins_fetched=min(i + batch_size, len(asins)))
+
         return results
 
     async def _score_and_filter_products(
         self,
         asins: List[str],
         scoring_config: Dict[str, Any],
-        job_id: UUID
+        job_id: UUID,
+        on_progress: Optional[Callable[..., Awaitable[None]]] = None
     ) -> List[AutoSourcingPick]:
         """
         Score products using advanced scoring system and filter by thresholds.
@@ -458,17 +625,19 @@ class AutoSourcingService:
             asins: List of ASINs to score
             scoring_config: Scoring thresholds
             job_id: Parent job ID
+            on_progress: Optional job progress reporter (per fetch/scoring batch)
 
         Returns:
             List of AutoSourcingPick objects meeting criteria
         """
         config = await self.business_config.get_effective_config(domain_id=1, category="books")
+        # Compiled once per config version and shared by every product of the job
+        profile = await self.business_config.get_scoring_profile(domain_id=1, category="books")
         picks = []
 
         # Enrich scoring_config with strategy thresholds so compute_rating()
         # and meets_criteria() use calibrated values instead of hardcoded defaults.
-        strategy_name = config.get("active_strategy", "balanced")
-        strategy = config.get("strategies", {}).get(strategy_name, {})
+        strategy = profile.strategy_limits
         enriched_scoring = {**scoring_config}
         enriched_scoring.setdefault("velocity_min", strategy.get("velocity_min", 40))
         enriched_scoring.setdefault("stability_min", strategy.get("stability_min", 50))
@@ -477,10 +646,10 @@ class AutoSourcingService:
 
         # BATCH FETCH: Get all product data in one API call instead of individual queries
         logger.info(f"Fetching {len(asins)} products via batch REST API...")
-        products_data = await self._fetch_products_batch(asins)
+        products_data = await self._fetch_products_batch(asins, on_progress=on_progress)
         logger.info(f"Batch fetch returned data for {len(products_data)} ASINs")
 
-        for asin in asins:
+        for scored, asin in enumerate(asins, start=1):
             try:
                 # Get product data from batch results
                 raw_keepa = products_data.get(asin)
@@ -491,7 +660,7 @@ class AutoSourcingService:
 
                 # Score product using batch data
                 pick = await self._analyze_product_from_batch(
-                    asin, raw_keepa, enriched_scoring, job_id, config
+                    asin, raw_keepa, enriched_scoring, job_id, config, profile=profile
                 )
 
                 if pick and meets_criteria(pick, enriched_scoring):
@@ -504,6 +673,10 @@ class AutoSourcingService:
                 logger.warning(f"Error scoring {asin}: {str(e)}")
                 continue
 
+            finally:
+                if on_progress is not None and (scored % SCORING_PROGRESS_BATCH == 0 or scored == len(asins)):
+                    await on_progress("scoring", asins_scored=scored, picks_selected=len(picks))
+
         # Sort by ROI descending and limit results
         picks.sort(key=lambda x: x.roi_percentage, reverse=True)
         max_picks = scoring_config.get("max_results", 20)
@@ -516,14 +689,18 @@ class AutoSourcingService:
         raw_keepa: Dict[str, Any],
         scoring_config: Dict[str, Any],
         job_id: UUID,
-        business_config: Dict[str, Any]
+        business_config: Dict[str, Any],
+        profile: Optional[ScoringProfile] = None
     ) -> Optional[AutoSourcingPick]:
         """
         Analyze a product using pre-fetched batch data.
 
         This is similar to _analyze_single_product but uses data already fetched
-        via batch REST API instead of making individual Keepa queries.
+        via batch REST API instead of making individual Keepa queries. Pass the
+        job's compiled profile; it is only compiled here for one-off calls.
         """
+        if profile is None:
+            profile = ScoringProfile.from_config(business_config)
         try:
             # Extract REAL data from Keepa response
             product_data = self._extract_product_data_from_keepa(raw_keepa)
@@ -547,16 +724,14 @@ class AutoSourcingService:
             # Unified source_price_factor: 0.40 = buy at 40% of sell price
             # (online arbitrage model 2026, calibrated from market data).
             # Override via business_config or DB seed.
-            source_price_factor = business_config.get("source_price_factor", 0.40)
-            fba_fee_percentage = business_config.get("fba_fee_percentage", 0.22)
+            source_price_factor = profile.flat_source_price_factor
+            fba_fee_percentage = profile.flat_fee_rate
             estimated_cost, profit_net, roi_percentage = calculate_product_roi(
                 current_price, source_price_factor, fba_fee_percentage
             )
 
             # --- Strategy filters (BSR, competition, profit floor) ---
-            strategy_config = business_config.get("strategies", {}).get(
-                business_config.get("active_strategy", "balanced"), {}
-            )
+            strategy_config = profile.strategy_limits
 
             max_bsr = strategy_config.get("max_bsr")
             if max_bsr and bsr > max_bsr:
@@ -942,6 +1117,15 @@ class AutoSourcingService:
             
         return unique_picks
 
+    async def _record_daily_review(self, job: AutoSourcingJob) -> None:
+        """Materialize the daily review for a job's picks; a failure never fails the job."""
+        try:
+            async with self.db.begin_nested():
+                classified = await record_job_classifications(self.db, job.id)
+            logger.info(f"Daily review: classified {classified} ASINs from job {job.id}")
+        except Exception as e:
+            logger.warning(f"Daily review materialization failed for job {job.id}: {str(e)}")
+
     # ========================================================================
     # PROFILE MANAGEMENT
     # ========================================================================
@@ -1015,9 +1199,14 @@ class AutoSourcingService:
         pick.action_notes = notes
         
         # Update flags (is_purchased only set when explicitly purchased, not just "to_buy")
+        was_ignored = pick.is_ignored
         pick.is_favorite = (action == ActionStatus.FAVORITE)
         pick.is_ignored = (action == ActionStatus.IGNORED)
         pick.analysis_requested = (action == ActionStatus.ANALYZING)
+
+        # Daily review counts leave out ignored picks
+        if pick.is_ignored != was_ignored:
+            await refresh_summaries_for_pick(self.db, pick.id)
         
         await self.db.commit()
         await self.db.refresh(pick)
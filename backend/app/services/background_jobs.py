@@ -0,0 +1,151 @@
+"""
+Background Job Pool
+===================
+Process-wide pool of asyncio workers for jobs persisted in the database.
+
+Endpoints persist a job row, then ``submit()`` its id here and return at
+once. Handlers are registered per job kind and receive only the job id:
+everything they need is reloaded from the database, so a job interrupted
+by a restart is simply submitted again by its ``recover`` callback at
+startup and continues from its stored progress.
+"""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from app.core.settings import get_settings
+
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[str], Awaitable[None]]
+JobRecovery = Callable[[], Awaitable[List[str]]]
+
+
+class BackgroundJobPool:
+    """
+    Fixed-size asyncio worker pool fed by a queue of (kind, job id).
+
+    Workers are started lazily on the running loop and restarted if the
+    pool is used from a new loop (tests, Celery tasks).
+    """
+
+    def __init__(self, workers: Optional[int] = None):
+        self._workers_setting = workers
+        self._handlers: Dict[str, JobHandler] = {}
+        self._recovery: Dict[str, JobRecovery] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._workers: List[asyncio.Task] = []
+        self._pending: Set[Tuple[str, str]] = set()
+        self._running: Set[Tuple[str, str]] = set()
+
+        # Statistics tracking
+        self._completed = 0
+        self._failed = 0
+
+    def register(self, kind: str, handler: JobHandler, recover: Optional[JobRecovery] = None):
+        """Register the handler (and optional startup recovery) for a job kind."""
+        self._handlers[kind] = handler
+        if recover is not None:
+            self._recovery[kind] = recover
+
+    def submit(self, kind: str, job_id: str) -> bool:
+        """
+        Queue a job for a worker. Must be called from a running event loop.
+
+        Returns:
+            False if the job is already queued or running in this process
+        """
+        if kind not in self._handlers:
+            raise ValueError(f"No background job handler registered for '{kind}'")
+        key = (kind, str(job_id))
+        self._ensure_workers()
+        if key in self._pending or key in self._running:
+            return False
+        self._pending.add(key)
+        self._queue.put_nowait(key)
+        return True
+
+    async def recover(self) -> Dict[str, int]:
+        """Resubmit unfinished jobs of every kind (called at startup)."""
+        recovered = {}
+        for kind, recover in self._recovery.items():
+            try:
+                job_ids = await recover()
+            except Exception as e:
+                logger.error(f"[JOBS] Recovery failed for {kind}: {e}")
+                continue
+            recovered[kind] = sum(1 for job_id in job_ids if self.submit(kind, job_id))
+            if recovered[kind]:
+                logger.info(f"[JOBS] Resuming {recovered[kind]} unfinished {kind} job(s)")
+        return recovered
+
+    async def join(self):
+        """Wait until every queued job has been processed (tests, shutdown)."""
+        if self._queue is not None and self._loop is asyncio.get_running_loop():
+            await self._queue.join()
+
+    async def shutdown(self):
+        """Stop workers. Interrupted jobs stay unfinished in the database."""
+        workers, self._workers = self._workers, []
+        for task in workers:
+            task.cancel()
+        if workers and self._loop is asyncio.get_running_loop():
+            await asyncio.gather(*workers, return_exceptions=True)
+        self._queue = None
+        self._loop = None
+        self._pending.clear()
+        self._running.clear()
+
+    def _ensure_workers(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._workers:
+            return
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        self._pending.clear()
+        self._running.clear()
+        size = self._workers_setting or get_settings().background_job_workers
+        self._workers = [
+            loop.create_task(self._worker(), name=f"background-job-worker-{n}")
+            for n in range(max(1, size))
+        ]
+
+    async def _worker(self):
+        queue = self._queue
+        while True:
+            key = await queue.get()
+            kind, job_id = key
+            self._pending.discard(key)
+            self._running.add(key)
+            try:
+                await self._handlers[kind](job_id)
+                self._completed += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._failed += 1
+                logger.error(f"[JOBS] {kind} job {job_id} failed: {e}", exc_info=True)
+            finally:
+                self._running.discard(key)
+                queue.task_done()
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "workers": len(self._workers),
+            "queued": len(self._pending),
+            "running": len(self._running),
+            "completed": self._completed,
+            "failed": self._failed,
+        }
+
+
+background_jobs = BackgroundJobPool()
+
+
+__all__ = [
+    "BackgroundJobPool",
+    "background_jobs",
+]
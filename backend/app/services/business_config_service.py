@@ -2,10 +2,12 @@
 Business Configuration Service - Hierarchical config management with caching.
 """
 
+import asyncio
 import json
 import threading
 from copy import deepcopy
 from datetime import datetime, timedelta
+from functools import partial
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
@@ -17,6 +19,7 @@ from sqlalchemy import select, and_
 
 from app.models.business_config import BusinessConfig, ConfigChange, DEFAULT_BUSINESS_CONFIG
 from app.core.db import db_manager
+from app.services.scoring_profile import ScoringProfile
 
 
 logger = logging.getLogger(__name__)
@@ -28,6 +31,7 @@ class ConfigCacheEntry:
     config: Dict[str, Any]
     timestamp: datetime
     scope: str
+    version: int = 0  # Service cache version the entry was loaded under
     ttl_minutes: int = 15  # Short TTL for business config
     
     def is_expired(self) -> bool:
@@ -40,14 +44,20 @@ class BusinessConfigService:
     
     Features:
     - Deep merge: global < domain < category
-    - Thread-safe caching with RLock
+    - Lock-free cache reads, single-flight loads per (domain, category)
+    - Version-counter invalidation on update
+    - Compiled ScoringProfile per effective config and strategy
     - JSONPatch diff generation
     - Config validation and rollback
     """
     
     def __init__(self):
+        # Only touched from the event loop: plain dicts, no lock held across awaits
         self._cache: Dict[str, ConfigCacheEntry] = {}
-        self._lock = threading.RLock()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        # Compiled per effective config dict: (config, profile)
+        self._profiles: Dict[Tuple[int, str, Optional[str]], Tuple[Dict[str, Any], ScoringProfile]] = {}
+        self._version = 0
         self._config_file_path = Path(__file__).parent.parent.parent / "config" / "business_rules.json"
         
     async def get_effective_config(
@@ -61,6 +71,9 @@ class BusinessConfigService:
         
         Priority: global < domain < category
         
+        A cache hit is a plain dict lookup. Concurrent misses for the same
+        (domain, category) on one event loop share a single load.
+        
         Args:
             domain_id: Keepa domain ID (1=US, 2=UK, etc.)
             category: Product category
@@ -71,70 +84,108 @@ class BusinessConfigService:
         """
         cache_key = f"effective:{domain_id}:{category}"
         
-        with self._lock:
-            # Check cache first (unless force refresh)
-            if not force_refresh:
-                cached_entry = self._cache.get(cache_key)
-                if cached_entry and not cached_entry.is_expired():
-                    logger.debug(f"Config cache HIT for {cache_key}")
-                    return cached_entry.config
-            
-            # Load and merge hierarchy
-            try:
-                async with db_manager.session() as session:
-                    # 1. Load global config
-                    global_config_obj = await self._load_config_by_scope(session, "global")
-                    if global_config_obj:
-                        global_config = global_config_obj.data
-                    else:
-                        global_config = await self._load_fallback_config()
-
-                    # 2. Load domain override
-                    domain_scope = f"domain:{domain_id}"
-                    domain_config_obj = await self._load_config_by_scope(session, domain_scope)
-                    domain_config = domain_config_obj.data if domain_config_obj else None
-
-                    # 3. Load category override
-                    category_scope = f"category:{category}"
-                    category_config_obj = await self._load_config_by_scope(session, category_scope)
-                    category_config = category_config_obj.data if category_config_obj else None
-                    
-                    # 4. Deep merge hierarchy
-                    effective_config = self._deep_merge_configs([
-                        global_config,
-                        domain_config, 
-                        category_config
-                    ])
-                    
-                    # Add metadata
-                    effective_config["_meta"] = {
-                        "domain_id": domain_id,
-                        "category": category,
-                        "generated_at": datetime.now().isoformat(),
-                        "sources": {
-                            "global": global_config is not None,
-                            "domain": domain_config is not None, 
-                            "category": category_config is not None
-                        }
-                    }
-                    
-                    # Cache result
-                    self._cache[cache_key] = ConfigCacheEntry(
-                        config=effective_config,
-                        timestamp=datetime.now(),
-                        scope=cache_key
-                    )
-                    
-                    logger.info(f"Generated effective config for domain={domain_id}, category={category}")
-                    return effective_config
-                    
-            except Exception as e:
-                logger.warning(f"Failed to load effective config from DB: {e}")
-                
-        # Return fallback config if DB access fails
-        logger.info("Using fallback configuration")
-        fallback = await self._load_fallback_config()
-        return fallback
+        # Check cache first (unless force refresh)
+        if not force_refresh:
+            cached_entry = self._cache.get(cache_key)
+            if cached_entry and cached_entry.version == self._version and not cached_entry.is_expired():
+                logger.debug(f"Config cache HIT for {cache_key}")
+                return cached_entry.config
+        
+        loop = asyncio.get_running_loop()
+        load = self._inflight.get(cache_key)
+        # A load started on another (possibly closed) loop cannot be awaited here
+        if force_refresh or load is None or load.done() or load.get_loop() is not loop:
+            load = loop.create_task(self._load_effective_config(cache_key, domain_id, category))
+            self._inflight[cache_key] = load
+            load.add_done_callback(partial(self._forget_load, cache_key))
+        
+        # Shielded: a cancelled caller must not cancel the load other callers share
+        return await asyncio.shield(load)
+    
+    async def get_scoring_profile(
+        self,
+        domain_id: int = 1,
+        category: str = "books",
+        strategy: Optional[str] = None
+    ) -> ScoringProfile:
+        """
+        Compiled scoring profile of the effective config for a strategy.
+        
+        Compiled once per effective config: a reload (update, TTL expiry)
+        yields a new config dict and therefore a new profile.
+        """
+        config = await self.get_effective_config(domain_id, category)
+        profile_key = (domain_id, category, strategy)
+        
+        cached = self._profiles.get(profile_key)
+        if cached is not None and cached[0] is config:
+            return cached[1]
+        
+        profile = ScoringProfile.from_config(config, strategy=strategy, category=category)
+        self._profiles[profile_key] = (config, profile)
+        return profile
+    
+    def _forget_load(self, cache_key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(cache_key) is task:
+            del self._inflight[cache_key]
+    
+    async def _load_effective_config(self, cache_key: str, domain_id: int, category: str) -> Dict[str, Any]:
+        """Load all scopes in one query, merge them and cache the result."""
+        version = self._version
+        domain_scope = f"domain:{domain_id}"
+        category_scope = f"category:{category}"
+        
+        try:
+            async with db_manager.session() as session:
+                configs = await self._load_configs_by_scopes(
+                    session, ["global", domain_scope, category_scope]
+                )
+        except Exception as e:
+            logger.warning(f"Failed to load effective config from DB: {e}")
+            # Return fallback config if DB access fails
+            logger.info("Using fallback configuration")
+            return await self._load_fallback_config()
+        
+        # 1. Global config (file/default fallback when absent)
+        if "global" in configs:
+            global_config = configs["global"].data
+        else:
+            global_config = await self._load_fallback_config()
+        
+        # 2. Domain and 3. category overrides
+        domain_config = configs[domain_scope].data if domain_scope in configs else None
+        category_config = configs[category_scope].data if category_scope in configs else None
+        
+        # 4. Deep merge hierarchy
+        effective_config = self._deep_merge_configs([
+            global_config,
+            domain_config, 
+            category_config
+        ])
+        
+        # Add metadata
+        effective_config["_meta"] = {
+            "domain_id": domain_id,
+            "category": category,
+            "generated_at": datetime.now().isoformat(),
+            "sources": {
+                "global": global_config is not None,
+                "domain": domain_config is not None, 
+                "category": category_config is not None
+            }
+        }
+        
+        # Cache result, unless an update landed while we were loading
+        if version == self._version:
+            self._cache[cache_key] = ConfigCacheEntry(
+                config=effective_config,
+                timestamp=datetime.now(),
+                scope=cache_key,
+                version=version
+            )
+        
+        logger.info(f"Generated effective config for domain={domain_id}, category={category}")
+        return effective_config
     
     async def update_config(
         self,
@@ -328,6 +379,18 @@ class BusinessConfigService:
         
         return config
     
+    async def _load_configs_by_scopes(self, session: AsyncSession, scopes: List[str]) -> Dict[str, BusinessConfig]:
+        """Load active configurations for several scopes in one query, keyed by scope."""
+        query = select(BusinessConfig).where(
+            and_(
+                BusinessConfig.scope.in_(scopes),
+                BusinessConfig.is_active == True
+            )
+        )
+        
+        result = await session.execute(query)
+        return {config.scope: config for config in result.scalars().all()}
+    
     async def _load_fallback_config(self) -> Dict[str, Any]:
         """Load fallback config from file or default."""
         try:
@@ -392,23 +455,35 @@ class BusinessConfigService:
         return errors
     
     def _invalidate_cache(self):
-        """Invalidate all cached configurations."""
-        with self._lock:
-            self._cache.clear()
-            logger.debug("Config cache invalidated")
+        """
+        Invalidate all cached configurations.
+
+        Loads already in flight are forgotten too: their result is not
+        cached, and later callers start a fresh load instead of joining one
+        that may predate the change.
+        """
+        self._version += 1
+        self._cache.clear()
+        self._inflight.clear()
+        self._profiles.clear()
+        logger.debug(f"Config cache invalidated (version {self._version})")
     
     def get_cache_stats(self) -> Dict[str, Any]:
         """Get cache statistics for monitoring."""
-        with self._lock:
-            total_entries = len(self._cache)
-            expired_entries = sum(1 for entry in self._cache.values() if entry.is_expired())
-            
-            return {
-                "total_entries": total_entries,
-                "active_entries": total_entries - expired_entries,
-                "expired_entries": expired_entries,
-                "cache_keys": list(self._cache.keys())
-            }
+        entries = list(self._cache.items())
+        stale_entries = sum(
+            1 for _, entry in entries if entry.is_expired() or entry.version != self._version
+        )
+        
+        return {
+            "total_entries": len(entries),
+            "active_entries": len(entries) - stale_entries,
+            "expired_entries": stale_entries,
+            "cache_keys": [key for key, _ in entries],
+            "version": self._version,
+            "inflight_loads": len(self._inflight),
+            "scoring_profiles": len(self._profiles)
+        }
 
 
 # Global service instance
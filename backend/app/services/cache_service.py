@@ -5,6 +5,8 @@ Gestion du cache PostgreSQL pour Product Finder.
 Supports both sync Session and async AsyncSession using SQLAlchemy 2.0.
 """
 
+import asyncio
+import functools
 import hashlib
 import json
 from datetime import datetime, timedelta
@@ -12,7 +14,8 @@ from typing import List, Dict, Any, Optional, Union
 
 from sqlalchemy.orm import Session
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import and_, select
+from sqlalchemy import and_, select, update
+from sqlalchemy.dialects.postgresql import insert
 
 from app.models.product_cache import (
     ProductDiscoveryCache,
@@ -21,6 +24,20 @@ from app.models.product_cache import (
 )
 
 
+def _serialized(method):
+    """
+    Run a CacheService DB operation under the instance lock.
+
+    One session cannot run concurrent operations, and concurrent discovery
+    tasks (curated niches) share the service of one product finder.
+    """
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        async with self._lock:
+            return await method(self, *args, **kwargs)
+    return wrapper
+
+
 class CacheService:
     """
     Service de cache pour optimiser performance.
@@ -38,9 +55,11 @@ class CacheService:
         """Initialize cache service."""
         self.db = db
         self.is_async = isinstance(db, AsyncSession)
+        self._lock = asyncio.Lock()
 
     # ===== DISCOVERY CACHE =====
 
+    @_serialized
     async def get_discovery_cache(
         self,
         domain: int,
@@ -92,6 +111,7 @@ class CacheService:
 
         return None
 
+    @_serialized
     async def set_discovery_cache(
         self,
         domain: int,
@@ -176,6 +196,7 @@ class CacheService:
 
     # ===== SCORING CACHE =====
 
+    @_serialized
     async def get_scoring_cache(self, asin: str) -> Optional[Dict[str, Any]]:
         """
         Get cached scoring results for ASIN.
@@ -201,19 +222,59 @@ class CacheService:
             ).order_by(ProductScoringCache.created_at.desc()).first()
 
         if cache_entry:
-            return {
-                "asin": cache_entry.asin,
-                "title": cache_entry.title,
-                "price": cache_entry.price,
-                "current_price": cache_entry.price,  # Alias for frontend compatibility
-                "bsr": cache_entry.bsr,
-                "roi_percent": cache_entry.roi_percent,
-                "velocity_score": cache_entry.velocity_score,
-                "recommendation": cache_entry.recommendation
-            }
+            return self._scoring_entry_to_dict(cache_entry)
 
         return None
 
+    @_serialized
+    async def get_scoring_cache_many(self, asins: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get cached scoring results for several ASINs in one query.
+
+        Hit counts of the returned entries are incremented with a single
+        UPDATE committed alongside.
+
+        Returns scoring data by ASIN (misses are absent).
+        """
+        if not asins:
+            return {}
+
+        now = datetime.utcnow()
+        stmt = select(ProductScoringCache).filter(
+            and_(
+                ProductScoringCache.asin.in_(set(asins)),
+                ProductScoringCache.expires_at > now
+            )
+        ).order_by(ProductScoringCache.created_at.asc())
+
+        if self.is_async:
+            entries = (await self.db.execute(stmt)).scalars().all()
+        else:
+            entries = self.db.execute(stmt).scalars().all()
+
+        # Newest entry wins if an ASIN has several
+        hits = {entry.asin: entry for entry in entries}
+        if not hits:
+            return {}
+
+        results = {asin: self._scoring_entry_to_dict(entry) for asin, entry in hits.items()}
+
+        hit_stmt = update(ProductScoringCache).where(
+            ProductScoringCache.cache_key.in_([entry.cache_key for entry in hits.values()])
+        ).values(
+            hit_count=ProductScoringCache.hit_count + 1
+        ).execution_options(synchronize_session=False)
+
+        if self.is_async:
+            await self.db.execute(hit_stmt)
+            await self.db.commit()
+        else:
+            self.db.execute(hit_stmt)
+            self.db.commit()
+
+        return results
+
+    @_serialized
     async def set_scoring_cache(
         self,
         asin: str,
@@ -232,7 +293,7 @@ class CacheService:
         Schema synchronized with production Neon (Phase 6 fix).
         """
         # Generate cache key from ASIN (unique per product)
-        cache_key = hashlib.md5(f"scoring:{asin}".encode()).hexdigest()
+        cache_key = self._scoring_cache_key(asin)
 
         if self.is_async:
             # Check if exists - update or insert
@@ -305,8 +366,70 @@ class CacheService:
 
         return cache_key
 
+    @_serialized
+    async def set_scoring_cache_many(
+        self,
+        rows: List[Dict[str, Any]],
+        ttl_hours: int = 6
+    ) -> List[str]:
+        """
+        Store scoring results for several ASINs with one upsert.
+
+        Each row carries the set_scoring_cache fields (asin, title, price,
+        bsr, roi_percent, velocity_score, recommendation). Existing entries
+        are refreshed and their hit count incremented, like set_scoring_cache.
+
+        Returns cache_keys (primary keys).
+        """
+        if not rows:
+            return []
+
+        now = datetime.utcnow()
+        values_by_key: Dict[str, Dict[str, Any]] = {}
+        for row in rows:
+            title = row.get("title")
+            cache_key = self._scoring_cache_key(row["asin"])
+            # One row per key: Postgres rejects an upsert touching a row twice
+            values_by_key[cache_key] = {
+                "cache_key": cache_key,
+                "asin": row["asin"],
+                "title": title[:500] if title else None,
+                "price": row.get("price"),
+                "bsr": row.get("bsr"),
+                "roi_percent": row["roi_percent"],
+                "velocity_score": row["velocity_score"],
+                "recommendation": row["recommendation"],
+                "created_at": now,
+                "expires_at": now + timedelta(hours=ttl_hours),
+                "hit_count": 0,
+            }
+
+        stmt = insert(ProductScoringCache).values(list(values_by_key.values()))
+        refreshed = {
+            column: stmt.excluded[column]
+            for column in (
+                "title", "price", "bsr", "roi_percent", "velocity_score",
+                "recommendation", "created_at", "expires_at"
+            )
+        }
+        refreshed["hit_count"] = ProductScoringCache.hit_count + 1
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ProductScoringCache.cache_key],
+            set_=refreshed
+        )
+
+        if self.is_async:
+            await self.db.execute(stmt)
+            await self.db.commit()
+        else:
+            self.db.execute(stmt)
+            self.db.commit()
+
+        return list(values_by_key)
+
     # ===== SEARCH HISTORY =====
 
+    @_serialized
     async def record_search(
         self,
         search_params: Dict[str, Any],
@@ -358,6 +481,7 @@ class CacheService:
 
     # ===== MAINTENANCE =====
 
+    @_serialized
     async def cleanup_expired(self) -> int:
         """
         Remove expired cache entries.
@@ -412,6 +536,7 @@ class CacheService:
 
         return count
 
+    @_serialized
     async def get_cache_stats(self) -> Dict[str, Any]:
         """
         Get cache statistics.
@@ -489,6 +614,25 @@ class CacheService:
 
     # ===== UTILITIES =====
 
+    @staticmethod
+    def _scoring_cache_key(asin: str) -> str:
+        """Scoring cache primary key for an ASIN."""
+        return hashlib.md5(f"scoring:{asin}".encode()).hexdigest()
+
+    @staticmethod
+    def _scoring_entry_to_dict(cache_entry: ProductScoringCache) -> Dict[str, Any]:
+        """Scoring result dict for a cache entry."""
+        return {
+            "asin": cache_entry.asin,
+            "title": cache_entry.title,
+            "price": cache_entry.price,
+            "current_price": cache_entry.price,  # Alias for frontend compatibility
+            "bsr": cache_entry.bsr,
+            "roi_percent": cache_entry.roi_percent,
+            "velocity_score": cache_entry.velocity_score,
+            "recommendation": cache_entry.recommendation
+        }
+
     def _generate_discovery_key(
         self,
         domain: int,
@@ -11,6 +11,7 @@ from typing import Optional, Dict, Any
 from dataclasses import dataclass
 
 from app.services.business_config_service import get_business_config_service
+from app.services.scoring_profile import ScoringProfile
 from app.schemas.config_types import (
     ROIConfigUnified,
     FeeConfigUnified,
@@ -101,6 +102,20 @@ class ConfigServiceAdapter:
             applied_overrides=applied_overrides
         )
 
+    async def get_scoring_profile(
+        self,
+        category_id: Optional[int] = None,
+        strategy: Optional[str] = None,
+        domain_id: int = 1
+    ) -> ScoringProfile:
+        """Compiled scoring profile for a Keepa category and strategy (cached by the service)."""
+        category_name = self._category_id_to_name(category_id) if category_id is not None else "books"
+        return await self._service.get_scoring_profile(
+            domain_id=domain_id,
+            category=category_name,
+            strategy=strategy
+        )
+
     def _category_id_to_name(self, category_id: int) -> str:
         """Map Keepa category ID to category name."""
         name = CATEGORY_ID_MAP.get(category_id)
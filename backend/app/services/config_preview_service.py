@@ -11,6 +11,7 @@ import logging
 from app.services.business_config_service import get_business_config_service
 from app.services.keepa_service import KeepaService
 from app.services.keepa_parser_v2 import parse_keepa_product, create_velocity_data_from_keepa
+from app.services.scoring_profile import ScoringProfile
 
 
 logger = logging.getLogger(__name__)
@@ -93,6 +94,10 @@ class ConfigPreviewService:
             # Simulate new config by merging patch
             new_config = self.config_service._deep_merge_configs([current_config, config_patch])
             
+            # Compile scoring once per config, not per ASIN (current one is cached)
+            current_profile = await self.config_service.get_scoring_profile(domain_id, category)
+            new_profile = ScoringProfile.from_config(new_config, category=category)
+            
             # Get demo ASINs from current config
             demo_asins = current_config.get("demo_asins", ["B00FLIJJSA", "B08N5WRWNW", "B07FNW9FGJ"])
             
@@ -100,7 +105,10 @@ class ConfigPreviewService:
             preview_results = []
             for asin in demo_asins:
                 try:
-                    result = await self._preview_single_asin(asin, current_config, new_config, domain_id, category)
+                    result = await self._preview_single_asin(
+                        asin, current_config, new_config, domain_id, category,
+                        current_profile=current_profile, new_profile=new_profile
+                    )
                     preview_results.append(result)
                 except Exception as e:
                     logger.warning(f"Preview failed for ASIN {asin}: {e}")
@@ -127,18 +135,22 @@ class ConfigPreviewService:
         current_config: Dict[str, Any],
         new_config: Dict[str, Any],
         domain_id: int,
-        category: str
+        category: str,
+        current_profile: Optional[ScoringProfile] = None,
+        new_profile: Optional[ScoringProfile] = None
     ) -> Dict[str, Any]:
         """Preview impact for a single ASIN."""
+        current_profile = current_profile or ScoringProfile.from_config(current_config, category=category)
+        new_profile = new_profile or ScoringProfile.from_config(new_config, category=category)
         
         # Get demo data (mock or real)
         demo_data = await self._get_demo_data(asin)
         
         # Calculate metrics with current config
-        current_metrics = await self._calculate_metrics_with_config(demo_data, current_config)
+        current_metrics = await self._calculate_metrics_with_config(demo_data, current_config, current_profile)
         
         # Calculate metrics with new config
-        new_metrics = await self._calculate_metrics_with_config(demo_data, new_config)
+        new_metrics = await self._calculate_metrics_with_config(demo_data, new_config, new_profile)
         
         # Generate change summary
         changes = self._generate_change_summary(current_metrics, new_metrics)
@@ -197,9 +209,10 @@ class ConfigPreviewService:
     async def _calculate_metrics_with_config(
         self, 
         demo_data: Dict[str, Any], 
-        config: Dict[str, Any]
+        config: Dict[str, Any],
+        profile: ScoringProfile
     ) -> Dict[str, Any]:
-        """Calculate metrics using specific configuration."""
+        """Calculate metrics using specific configuration and its compiled profile."""
         
         # Extract demo data
         current_price = demo_data["current_price"]
@@ -209,14 +222,17 @@ class ConfigPreviewService:
         
         # Calculate ROI with config parameters
         roi_metrics = self._calculate_roi_with_config(
-            current_price, buy_cost, weight_lbs, category, config
+            current_price, buy_cost, weight_lbs, category, config, profile
         )
         
         # Calculate velocity with config parameters
-        velocity_metrics = self._calculate_velocity_with_config(demo_data, config)
+        velocity_metrics = self._calculate_velocity_with_config(demo_data, profile)
         
         # Calculate combined score with config weights
-        combined_score = self._calculate_combined_score_with_config(roi_metrics, velocity_metrics, config)
+        combined_score = profile.combined_score(
+            float(roi_metrics.get("roi_percentage", 0)),
+            float(velocity_metrics.get("velocity_score", 0))
+        )
         
         # Generate recommendation with config rules
         recommendation = self._generate_recommendation_with_config(roi_metrics, velocity_metrics, config)
@@ -248,7 +264,8 @@ class ConfigPreviewService:
         buy_cost: Decimal,
         weight_lbs: Decimal,
         category: str,
-        config: Dict[str, Any]
+        config: Dict[str, Any],
+        profile: ScoringProfile
     ) -> Dict[str, Any]:
         """Calculate ROI metrics with specific config."""
         
@@ -275,7 +292,7 @@ class ConfigPreviewService:
         meets_target = roi_pct >= target_roi
         
         # Determine profit tier using config thresholds
-        profit_tier = self._get_profit_tier_with_config(roi_pct, roi_config)
+        profit_tier = profile.profit_tier(roi_pct)
         
         metrics.update({
             "meets_target_roi": meets_target,
@@ -285,17 +302,15 @@ class ConfigPreviewService:
         
         return metrics
     
-    def _calculate_velocity_with_config(self, demo_data: Dict[str, Any], config: Dict[str, Any]) -> Dict[str, Any]:
+    def _calculate_velocity_with_config(self, demo_data: Dict[str, Any], profile: ScoringProfile) -> Dict[str, Any]:
         """Calculate velocity metrics with specific config."""
         
-        velocity_config = config.get("velocity", {})
-        
         # Use mock velocity data for demo
         mock_velocity = demo_data.get("mock_velocity_data", {})
         velocity_score = mock_velocity.get("velocity_score", 60.0)
         
         # Apply config thresholds
-        velocity_tier = self._get_velocity_tier_with_config(velocity_score, velocity_config)
+        velocity_tier = profile.velocity_tier(velocity_score)
         
         return {
             "velocity_score": velocity_score,
@@ -304,24 +319,6 @@ class ConfigPreviewService:
             "current_bsr": mock_velocity.get("current_bsr", 50000)
         }
     
-    def _calculate_combined_score_with_config(
-        self, 
-        roi_metrics: Dict[str, Any], 
-        velocity_metrics: Dict[str, Any],
-        config: Dict[str, Any]
-    ) -> float:
-        """Calculate combined score with config weights."""
-        
-        combined_config = config.get("combined_score", {})
-        roi_weight = combined_config.get("roi_weight", 0.6)
-        velocity_weight = combined_config.get("velocity_weight", 0.4)
-        
-        roi_score = min(max(float(roi_metrics.get("roi_percentage", 0)), 0), 100)
-        velocity_score = float(velocity_metrics.get("velocity_score", 0))
-        
-        combined_score = (roi_score * roi_weight) + (velocity_score * velocity_weight)
-        return round(combined_score, 2)
-    
     def _generate_recommendation_with_config(
         self,
         roi_metrics: Dict[str, Any],
@@ -351,38 +348,6 @@ class ConfigPreviewService:
         
         return "PASS - Below thresholds"
     
-    def _get_profit_tier_with_config(self, roi_pct: float, roi_config: Dict[str, Any]) -> str:
-        """Determine profit tier using config thresholds."""
-        excellent = roi_config.get("excellent_threshold", 50.0)
-        good = roi_config.get("good_threshold", 30.0)
-        fair = roi_config.get("fair_threshold", 15.0)
-        
-        if roi_pct >= excellent:
-            return "excellent"
-        elif roi_pct >= good:
-            return "good"
-        elif roi_pct >= fair:
-            return "fair"
-        elif roi_pct > 0:
-            return "poor"
-        else:
-            return "loss"
-    
-    def _get_velocity_tier_with_config(self, velocity_score: float, velocity_config: Dict[str, Any]) -> str:
-        """Determine velocity tier using config thresholds."""
-        fast = velocity_config.get("fast_threshold", 80.0)
-        medium = velocity_config.get("medium_threshold", 60.0)
-        slow = velocity_config.get("slow_threshold", 40.0)
-        
-        if velocity_score >= fast:
-            return "fast"
-        elif velocity_score >= medium:
-            return "medium"
-        elif velocity_score >= slow:
-            return "slow"
-        else:
-            return "very_slow"
-    
     def _generate_change_summary(self, before: Dict[str, Any], after: Dict[str, Any]) -> Dict[str, Any]:
         """Generate summary of key changes between before/after metrics."""
         
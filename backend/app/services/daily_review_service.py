@@ -14,7 +14,7 @@ Categories (priority order - first match wins):
 import logging
 from datetime import datetime, timedelta, timezone
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
 
 logger = logging.getLogger(__name__)
 
@@ -63,9 +63,27 @@ REVENANT_GAP_HOURS = 24
 MIN_HISTORY_FOR_STABLE = 2
 
 
+class SightingSummary(NamedTuple):
+    """Compact sighting history: how often an ASIN was seen and when last."""
+    sightings: int
+    last_seen_at: Optional[datetime]
+
+
+History = Union[Sequence[Dict[str, Any]], SightingSummary]
+
+
+def _sighting_stats(history: Optional[History]) -> Tuple[int, Optional[datetime]]:
+    """Sighting count and most recent sighting of a history list or summary."""
+    if not history:
+        return 0, None
+    if isinstance(history, SightingSummary):
+        return history.sightings, history.last_seen_at
+    return len(history), max(h["tracked_at"] for h in history)
+
+
 def classify_product(
     product: Dict[str, Any],
-    history: List[Dict[str, Any]],
+    history: Optional[History],
     now: Optional[datetime] = None,
     config: Optional[Dict[str, Any]] = None,
 ) -> Classification:
@@ -77,7 +95,8 @@ def classify_product(
 
     Args:
         product: Dict with keys: roi_percentage, bsr, amazon_on_listing, etc.
-        history: List of past sightings with tracked_at, bsr, price.
+        history: List of past sightings with tracked_at, bsr, price,
+            or a SightingSummary aggregated by the database.
         config: Optional condition_signals config from business_rules.json.
 
     Returns:
@@ -116,8 +135,10 @@ def classify_product(
             )
             return Classification.REJECT
 
+    sightings, most_recent_at = _sighting_stats(history)
+
     # --- FLUKE: No history at all (never seen before) ---
-    if not history:
+    if not sightings:
         logger.debug("FLUKE: No history for %s", product.get("asin"))
         return Classification.FLUKE
 
@@ -130,8 +151,6 @@ def classify_product(
         return Classification.JACKPOT
 
     # --- REVENANT: Last seen 24h+ ago, reappears today ---
-    most_recent = max(history, key=lambda h: h["tracked_at"])
-    most_recent_at = most_recent["tracked_at"]
     # Handle naive/aware datetime mismatch
     if most_recent_at.tzinfo is None and now.tzinfo is not None:
         most_recent_at = most_recent_at.replace(tzinfo=timezone.utc)
@@ -146,10 +165,10 @@ def classify_product(
         return Classification.REVENANT
 
     # --- STABLE: 2+ sightings, decent ROI, no Amazon ---
-    if len(history) >= MIN_HISTORY_FOR_STABLE and roi >= STABLE_MIN_ROI:
+    if sightings >= MIN_HISTORY_FOR_STABLE and roi >= STABLE_MIN_ROI:
         logger.debug(
             "STABLE: %d sightings, ROI %.2f%% for %s",
-            len(history), roi, product.get("asin"),
+            sightings, roi, product.get("asin"),
         )
         return Classification.STABLE
 
@@ -158,9 +177,21 @@ def classify_product(
     return Classification.FLUKE
 
 
+def classified_product(pick: Dict[str, Any], classification: Classification) -> Dict[str, Any]:
+    """Pick dict enriched with its classification and display metadata."""
+    meta = CLASSIFICATION_META[classification]
+    return {
+        **pick,
+        "classification": classification.value,
+        "classification_label": meta["label"],
+        "classification_action": meta["action"],
+        "classification_color": meta["color"],
+    }
+
+
 def generate_daily_review(
     picks: List[Dict[str, Any]],
-    history_map: Dict[str, List[Dict[str, Any]]],
+    history_map: Dict[str, History],
     now: Optional[datetime] = None,
     condition_config: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
@@ -172,7 +203,7 @@ def generate_daily_review(
 
     Args:
         picks: List of product pick dicts (must contain 'asin' key).
-        history_map: Dict mapping ASIN -> list of history entries.
+        history_map: Dict mapping ASIN -> list of history entries or SightingSummary.
         now: Optional datetime for classification (passed to classify_product).
         condition_config: Optional condition_signals config from business_rules.
 
@@ -182,27 +213,38 @@ def generate_daily_review(
     """
     now = now or datetime.now(timezone.utc)
 
-    # Initialize counts for all categories
-    counts: Dict[str, int] = {c.value: 0 for c in Classification}
+    classified_products = [
+        classified_product(
+            pick,
+            classify_product(pick, history_map.get(pick.get("asin", ""), []), now=now, config=condition_config),
+        )
+        for pick in picks
+    ]
+    return summarize_daily_review(classified_products, now=now)
 
-    classified_products: List[Dict[str, Any]] = []
 
-    for pick in picks:
-        asin = pick.get("asin", "")
-        history = history_map.get(asin, [])
-        classification = classify_product(pick, history, now=now, config=condition_config)
+def summarize_daily_review(
+    classified_products: List[Dict[str, Any]],
+    now: Optional[datetime] = None,
+) -> Dict[str, Any]:
+    """
+    Build the daily review from already classified products.
 
-        counts[classification.value] += 1
+    Args:
+        classified_products: Pick dicts carrying a 'classification' value
+            (see classified_product()).
+        now: Optional datetime used for review_date.
 
-        meta = CLASSIFICATION_META[classification]
-        enriched = {
-            **pick,
-            "classification": classification.value,
-            "classification_label": meta["label"],
-            "classification_action": meta["action"],
-            "classification_color": meta["color"],
-        }
-        classified_products.append(enriched)
+    Returns:
+        Dict with: review_date, total, counts, classified_products,
+        top_opportunities, summary.
+    """
+    now = now or datetime.now(timezone.utc)
+
+    # Initialize counts for all categories
+    counts: Dict[str, int] = {c.value: 0 for c in Classification}
+    for product in classified_products:
+        counts[product["classification"]] += 1
 
     # Top opportunities: exclude REJECT and FLUKE, sort by ROI desc, max 3
     excluded = {Classification.REJECT.value, Classification.FLUKE.value}
@@ -214,12 +256,12 @@ def generate_daily_review(
     top_opportunities = top_opportunities[:3]
 
     # Build summary text
-    total = len(picks)
+    total = len(classified_products)
     stable_count = counts[Classification.STABLE.value]
     jackpot_count = counts[Classification.JACKPOT.value]
 
     if total > 0:
-        avg_roi = sum(p.get("roi_percentage", 0.0) or 0.0 for p in picks) / total
+        avg_roi = sum(p.get("roi_percentage", 0.0) or 0.0 for p in classified_products) / total
         summary = (
             f"{stable_count} achat(s) recommande(s). "
             f"{jackpot_count} jackpot(s) a verifier. "
@@ -240,7 +282,7 @@ def generate_daily_review(
 
 def generate_actionable_review(
     picks: List[Dict[str, Any]],
-    history_map: Dict[str, List[Dict[str, Any]]],
+    history_map: Dict[str, History],
     min_roi: float = STABLE_MIN_ROI,
     max_results: int = 10,
     now: Optional[datetime] = None,
@@ -255,7 +297,7 @@ def generate_actionable_review(
 
     Args:
         picks: List of product pick dicts (must contain 'asin' key).
-        history_map: Dict mapping ASIN -> list of history entries.
+        history_map: Dict mapping ASIN -> list of history entries or SightingSummary.
         min_roi: Minimum ROI percentage to include (default 15.0).
         max_results: Maximum number of items to return (default 10).
         now: Optional datetime for classification.
@@ -266,32 +308,56 @@ def generate_actionable_review(
     """
     now = now or datetime.now(timezone.utc)
 
-    stable_items: List[Dict[str, Any]] = []
+    classified_products = [
+        classified_product(
+            pick,
+            classify_product(pick, history_map.get(pick.get("asin", ""), []), now=now, config=condition_config),
+        )
+        for pick in picks
+    ]
+    return select_actionable(
+        classified_products,
+        min_roi=min_roi,
+        max_results=max_results,
+        now=now,
+        source_price_factor=source_price_factor,
+    )
+
+
+def select_actionable(
+    classified_products: List[Dict[str, Any]],
+    min_roi: float = STABLE_MIN_ROI,
+    max_results: int = 10,
+    now: Optional[datetime] = None,
+    source_price_factor: float = 0.40,
+) -> Dict[str, Any]:
+    """
+    Build the actionable buy list from already classified products.
+
+    Keeps STABLE products with ROI >= min_roi, sorted by stability_score
+    DESC then roi_percentage DESC, truncated to max_results.
+
+    Returns:
+        Dict with: items, total_found, filters_applied, generated_at.
+    """
+    now = now or datetime.now(timezone.utc)
 
-    for pick in picks:
-        asin = pick.get("asin", "")
-        history = history_map.get(asin, [])
-        classification = classify_product(pick, history, now=now, config=condition_config)
+    stable_items: List[Dict[str, Any]] = []
 
-        if classification != Classification.STABLE:
+    for product in classified_products:
+        if product["classification"] != Classification.STABLE.value:
             continue
 
-        roi = pick.get("roi_percentage", 0.0) or 0.0
+        roi = product.get("roi_percentage", 0.0) or 0.0
         if roi < min_roi:
             continue
 
-        meta = CLASSIFICATION_META[Classification.STABLE]
-        current_price = pick.get("current_price") or 0.0
-        item = {
-            **pick,
+        current_price = product.get("current_price") or 0.0
+        stable_items.append({
+            **product,
             "estimated_buy_price": round(current_price * source_price_factor, 2),
-            "classification": Classification.STABLE.value,
-            "classification_label": meta["label"],
-            "classification_action": meta["action"],
-            "classification_color": meta["color"],
             "action_recommendation": "BUY",
-        }
-        stable_items.append(item)
+        })
 
     # Sort by stability_score DESC, then roi_percentage DESC
     stable_items.sort(
@@ -0,0 +1,324 @@
+"""
+Daily Review Store - Materialized classifications.
+
+classify_product() runs once per ASIN when an AutoSourcing job completes;
+the result is stored per ASIN per UTC day (DailyReviewItem) and the day's
+count per classification in a DailyReviewSummary row. Review endpoints
+then read stored rows instead of reclassifying every pick per request.
+
+Jobs can complete concurrently (BACKGROUND_JOB_WORKERS): items are
+upserted and each day's summary is recounted under a row lock, so the
+last job to recount sees every committed item.
+"""
+import logging
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+from uuid import UUID, uuid4
+
+from sqlalchemy import Select, and_, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.autosourcing import AutoSourcingJob, AutoSourcingPick, JobStatus
+from app.models.daily_review import DailyReviewItem, DailyReviewSummary
+from app.services.daily_review_service import (
+    Classification,
+    SightingSummary,
+    classified_product,
+    classify_product,
+)
+
+logger = logging.getLogger(__name__)
+
+# Sightings older than this do not count towards an ASIN's history
+HISTORY_WINDOW_DAYS = 30
+
+# Days of completed jobs replayed at startup (the review endpoints' max days_back)
+BACKFILL_DAYS = 7
+
+
+def latest_per_asin(query: Select, asin_column, newest_first: Sequence, dialect_name: str) -> Select:
+    """
+    Keep the newest row per ASIN of a select.
+
+    DISTINCT ON (asin) on Postgres; elsewhere (SQLite in tests) rows are
+    ranked per ASIN with row_number() and the first one kept.
+    """
+    if dialect_name == "postgresql":
+        return query.order_by(asin_column, *newest_first).distinct(asin_column)
+
+    ranked = query.add_columns(
+        func.row_number().over(partition_by=asin_column, order_by=newest_first).label("recency")
+    ).subquery()
+    return select(*(column for column in ranked.c if column.key != "recency")).where(ranked.c.recency == 1)
+
+
+def upsert(db: AsyncSession, model):
+    """INSERT ... ON CONFLICT statement for the session's dialect (Postgres; SQLite in tests)."""
+    if db.bind.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(model)
+
+
+def review_product(pick: AutoSourcingPick) -> Dict[str, Any]:
+    """Pick fields read by classify_product() and returned by the review endpoints."""
+    return {
+        "asin": pick.asin,
+        "title": pick.title or "",
+        "category": pick.category or None,
+        "roi_percentage": float(pick.roi_percentage or 0),
+        "bsr": int(pick.bsr) if pick.bsr is not None else -1,
+        "amazon_on_listing": bool(pick.amazon_on_listing) if pick.amazon_on_listing is not None else False,
+        "current_price": float(pick.current_price) if pick.current_price else None,
+        "buy_price": float(pick.estimated_buy_cost) if pick.estimated_buy_cost else None,
+        "condition_signal": pick.condition_signal,
+        "overall_rating": pick.overall_rating,
+        "stability_score": float(pick.stability_score) if pick.stability_score else 0.0,
+        "velocity_score": float(pick.velocity_score) if pick.velocity_score else 0.0,
+        "confidence_score": float(pick.confidence_score) if pick.confidence_score else 0.0,
+    }
+
+
+async def sighting_summaries(
+    db: AsyncSession, job_id: UUID, asins: List[str], now: datetime
+) -> Dict[str, SightingSummary]:
+    """
+    Earlier sightings of ASINs picked by a job, over the history window.
+
+    The job's own picks and jobs created after ``now`` are not history.
+    Shared by the stored review and the Cowork buy list so both classify an
+    ASIN the same way.
+    """
+    history_cutoff = now - timedelta(days=HISTORY_WINDOW_DAYS)
+    result = await db.execute(
+        select(
+            AutoSourcingPick.asin,
+            func.count(AutoSourcingPick.id),
+            func.max(AutoSourcingPick.created_at),
+        )
+        .join(AutoSourcingJob)
+        .where(
+            and_(
+                AutoSourcingPick.asin.in_(asins),
+                AutoSourcingPick.job_id != job_id,
+                AutoSourcingJob.created_at >= history_cutoff,
+                AutoSourcingJob.created_at <= now,
+                AutoSourcingPick.is_ignored == False,
+            )
+        )
+        .group_by(AutoSourcingPick.asin)
+    )
+    return {
+        asin: SightingSummary(sightings=sightings, last_seen_at=last_seen_at)
+        for asin, sightings, last_seen_at in result.all()
+    }
+
+
+async def record_job_classifications(
+    db: AsyncSession,
+    job_id: UUID,
+    now: Optional[datetime] = None,
+) -> int:
+    """
+    Classify a completed job's picks and store them under today's review.
+
+    An ASIN already classified today is overwritten by a newer pick only
+    (upsert, so a concurrent job classifying it too cannot fail this one).
+    Does not commit, so the caller can commit it with the job.
+
+    Returns:
+        Number of ASINs classified.
+    """
+    now = now or datetime.utcnow()
+    review_date = now.date()
+
+    result = await db.execute(
+        select(AutoSourcingPick)
+        .where(
+            and_(
+                AutoSourcingPick.job_id == job_id,
+                AutoSourcingPick.is_ignored == False,
+            )
+        )
+        .order_by(AutoSourcingPick.created_at.asc())
+    )
+    latest: Dict[str, AutoSourcingPick] = {pick.asin: pick for pick in result.scalars().all()}
+    if not latest:
+        return 0
+
+    summaries = await sighting_summaries(db, job_id, list(latest), now)
+
+    rows = []
+    # Sorted so concurrent jobs lock shared (review_date, asin) rows in the same order
+    for asin, pick in sorted(latest.items()):
+        product = review_product(pick)
+        summary = summaries.get(asin, SightingSummary(sightings=0, last_seen_at=None))
+        classification = classify_product(product, summary, now=now)
+        rows.append({
+            "id": uuid4(),
+            "review_date": review_date,
+            "asin": asin,
+            "classification": classification.value,
+            "pick_id": pick.id,
+            "picked_at": pick.created_at or now,
+            "sightings": summary.sightings,
+            "last_seen_at": summary.last_seen_at,
+            "roi_percentage": product["roi_percentage"],
+            "product": product,
+            "classified_at": now,
+        })
+
+    stmt = upsert(db, DailyReviewItem).values(rows)
+    await db.execute(stmt.on_conflict_do_update(
+        index_elements=[DailyReviewItem.review_date, DailyReviewItem.asin],
+        set_={k: stmt.excluded[k] for k in rows[0] if k not in ("id", "review_date", "asin")},
+        where=DailyReviewItem.picked_at <= stmt.excluded.picked_at,
+    ))
+
+    await db.flush()
+    await refresh_daily_summaries(db, [review_date], last_job_id=job_id)
+    return len(latest)
+
+
+async def backfill_daily_reviews(
+    db: AsyncSession,
+    days: int = BACKFILL_DAYS,
+    now: Optional[datetime] = None,
+) -> int:
+    """
+    Classify recent jobs of days that have no stored review yet (commits).
+
+    Covers jobs completed before classifications were materialized, so the
+    review endpoints are not empty until the next job completes. Days with
+    a summary row were recorded at job completion and are skipped, which
+    makes this a no-op after the first run. Jobs are replayed in completion
+    order, each classified as of its completion time.
+
+    Returns:
+        Number of jobs replayed.
+    """
+    now = now or datetime.utcnow()
+    since = now - timedelta(days=days)
+
+    stored_result = await db.execute(
+        select(DailyReviewSummary.review_date).where(DailyReviewSummary.review_date >= since.date())
+    )
+    stored_dates = set(stored_result.scalars().all())
+
+    jobs_result = await db.execute(
+        select(AutoSourcingJob.id, AutoSourcingJob.completed_at)
+        .where(
+            and_(
+                AutoSourcingJob.status == JobStatus.SUCCESS,
+                AutoSourcingJob.completed_at >= since,
+            )
+        )
+        .order_by(AutoSourcingJob.completed_at.asc())
+    )
+    replayed = 0
+    for job_id, completed_at in jobs_result.all():
+        if completed_at.date() in stored_dates:
+            continue
+        await record_job_classifications(db, job_id, now=completed_at)
+        await db.commit()
+        replayed += 1
+    return replayed
+
+
+async def refresh_daily_summaries(
+    db: AsyncSession,
+    review_dates: Iterable[date],
+    last_job_id: Optional[UUID] = None,
+) -> None:
+    """
+    Recount the stored classifications of each day into its summary row (no commit).
+
+    The summary row is created if missing and locked (FOR UPDATE) before
+    counting: a concurrent job waits for this one to commit, then counts
+    both jobs' items.
+    """
+    for review_date in sorted(set(review_dates)):
+        await db.execute(
+            upsert(db, DailyReviewSummary)
+            .values(review_date=review_date)
+            .on_conflict_do_nothing(index_elements=[DailyReviewSummary.review_date])
+        )
+        summary = (await db.execute(
+            select(DailyReviewSummary)
+            .where(DailyReviewSummary.review_date == review_date)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )).scalar_one()
+
+        result = await db.execute(
+            select(DailyReviewItem.classification, func.count(DailyReviewItem.id))
+            .join(AutoSourcingPick, AutoSourcingPick.id == DailyReviewItem.pick_id)
+            .where(
+                and_(
+                    DailyReviewItem.review_date == review_date,
+                    AutoSourcingPick.is_ignored == False,
+                )
+            )
+            .group_by(DailyReviewItem.classification)
+        )
+        counts = {c.value: 0 for c in Classification}
+        counts.update(dict(result.all()))
+
+        summary.total = sum(counts.values())
+        summary.stable = counts[Classification.STABLE.value]
+        summary.jackpot = counts[Classification.JACKPOT.value]
+        summary.revenant = counts[Classification.REVENANT.value]
+        summary.fluke = counts[Classification.FLUKE.value]
+        summary.reject = counts[Classification.REJECT.value]
+        if last_job_id is not None:
+            summary.last_job_id = last_job_id
+        summary.updated_at = datetime.utcnow()
+
+    await db.flush()
+
+
+async def refresh_summaries_for_pick(db: AsyncSession, pick_id: UUID) -> None:
+    """Recount the days a pick was classified in (after it was ignored or restored)."""
+    result = await db.execute(
+        select(DailyReviewItem.review_date).where(DailyReviewItem.pick_id == pick_id)
+    )
+    review_dates = result.scalars().all()
+    if review_dates:
+        await refresh_daily_summaries(db, review_dates)
+
+
+async def load_review_products(db: AsyncSession, since: datetime) -> List[Dict[str, Any]]:
+    """
+    Stored classifications of ASINs picked since a cutoff.
+
+    One product per ASIN (most recent pick), as classified_product() dicts.
+    Picks ignored after classification are left out.
+    """
+    query = (
+        select(DailyReviewItem.asin, DailyReviewItem.classification, DailyReviewItem.product)
+        .join(AutoSourcingPick, AutoSourcingPick.id == DailyReviewItem.pick_id)
+        .where(
+            and_(
+                DailyReviewItem.picked_at >= since,
+                AutoSourcingPick.is_ignored == False,
+            )
+        )
+    )
+    result = await db.execute(
+        latest_per_asin(
+            query, DailyReviewItem.asin, (DailyReviewItem.picked_at.desc(),), db.bind.dialect.name
+        )
+    )
+    return [
+        classified_product(product, Classification(classification))
+        for _asin, classification, product in result.all()
+    ]
+
+
+async def get_daily_summary(db: AsyncSession, review_date: date) -> Optional[DailyReviewSummary]:
+    """Summary row of one review day, or None when no job completed that day."""
+    result = await db.execute(
+        select(DailyReviewSummary).where(DailyReviewSummary.review_date == review_date)
+    )
+    return result.scalars().first()
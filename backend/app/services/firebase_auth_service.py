@@ -1,10 +1,26 @@
-"""Firebase Authentication Service."""
+"""Firebase Authentication Service.
 
-from typing import Optional, Tuple
+Token verification runs in a worker thread (it is CPU-bound and may fetch
+Google's signing certificates), and verified tokens are cached by hash
+until their ``exp`` claim. Users are cached by firebase_uid for
+FIREBASE_USER_CACHE_TTL_SECONDS and login tracking is written in
+coalesced batches, so a repeat request with the same bearer token does no
+crypto and no auth-related DB work.
+"""
+
+import asyncio
+import hashlib
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
 
 import structlog
 from firebase_admin.auth import ExpiredIdTokenError, InvalidIdTokenError, RevokedIdTokenError
+from sqlalchemy import inspect as sa_inspect, or_, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
 
 from app.core.exceptions import (
     AccountInactiveError,
@@ -12,10 +28,119 @@ from app.core.exceptions import (
 )
 from app.core.firebase import verify_firebase_token
 from app.models.user import User
+from app.core.usage_recorder import CoalescedTimestampRecorder
 from app.repositories.user_repository import UserRepository
 
 logger = structlog.get_logger()
 
+# Verified-token and user caches, login tracking write coalescing
+FIREBASE_TOKEN_CACHE_MAX_ENTRIES = 4096
+FIREBASE_USER_CACHE_TTL_SECONDS = 60
+FIREBASE_USER_CACHE_MAX_ENTRIES = 1024
+LOGIN_TRACKING_FLUSH_SECONDS = 60
+
+
+@dataclass(frozen=True)
+class _CachedToken:
+    """Claims of a token that passed verification."""
+
+    claims: Dict[str, Any]
+    expires_at: float  # exp claim, epoch seconds
+
+    @property
+    def evict_order(self) -> float:
+        return self.expires_at
+
+    def is_fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+
+@dataclass(frozen=True)
+class _CachedUser:
+    """Column values of a user row, rebuilt into a session-bound User on hit."""
+
+    values: Dict[str, Any]
+    cached_at: float
+
+    @property
+    def evict_order(self) -> float:
+        return self.cached_at
+
+    def is_fresh(self) -> bool:
+        return time.monotonic() - self.cached_at <= FIREBASE_USER_CACHE_TTL_SECONDS
+
+
+_token_cache: Dict[str, _CachedToken] = {}
+_user_cache: Dict[str, _CachedUser] = {}
+_cache_lock = threading.Lock()
+
+
+def _token_hash(id_token: str) -> str:
+    return hashlib.sha256(id_token.encode()).hexdigest()
+
+
+def invalidate_firebase_auth_cache(firebase_uid: Optional[str] = None) -> None:
+    """Drop cached tokens and user rows for one firebase_uid, or everything."""
+    with _cache_lock:
+        if firebase_uid is None:
+            _token_cache.clear()
+            _user_cache.clear()
+            return
+        _user_cache.pop(firebase_uid, None)
+        for key in [k for k, entry in _token_cache.items() if entry.claims.get("uid") == firebase_uid]:
+            del _token_cache[key]
+
+
+def _cache_get(cache: Dict[str, Any], key: str):
+    with _cache_lock:
+        entry = cache.get(key)
+        if entry is not None and not entry.is_fresh():
+            del cache[key]
+            return None
+        return entry
+
+
+def _cache_put(cache: Dict[str, Any], key: str, entry, max_entries: int) -> None:
+    with _cache_lock:
+        if len(cache) >= max_entries and key not in cache:
+            # Evict the entry that expires (or was cached) first
+            del cache[min(cache, key=lambda k: cache[k].evict_order)]
+        cache[key] = entry
+
+
+class LoginTrackingRecorder(CoalescedTimestampRecorder):
+    """Coalesces successful-login bookkeeping (last_login_at, lockout reset)."""
+
+    label = "Login tracking"
+
+    def __init__(self, flush_interval: float = LOGIN_TRACKING_FLUSH_SECONDS):
+        super().__init__(flush_interval)
+
+    def _model(self):
+        return User
+
+    def _now(self) -> datetime:
+        # Same clock as User.set_last_login
+        return datetime.utcnow()
+
+    def _row(self, row_id: str, touched_at: datetime) -> dict:
+        return {"id": row_id, "last_login_at": touched_at}
+
+    async def _write(self, session, rows: List[dict]) -> None:
+        await super()._write(session, rows)
+        # Reset failed attempts, but never clear a lockout set after the login
+        await session.execute(
+            update(User)
+            .where(
+                User.id.in_([row["id"] for row in rows]),
+                or_(User.locked_until.is_(None), User.locked_until < self._now()),
+            )
+            .values(failed_login_attempts=0, locked_until=None)
+        )
+
+
+login_tracking = LoginTrackingRecorder()
+
 
 class FirebaseAuthService:
     """Service for Firebase-based authentication."""
@@ -44,18 +169,7 @@ class FirebaseAuthService:
             InvalidTokenError: Token is invalid, expired, or revoked
             AccountInactiveError: User account is deactivated
         """
-        # Verify token with Firebase
-        try:
-            decoded_token = verify_firebase_token(id_token)
-        except ExpiredIdTokenError:
-            raise InvalidTokenError("Token has expired")
-        except RevokedIdTokenError:
-            raise InvalidTokenError("Token has been revoked")
-        except InvalidIdTokenError as e:
-            raise InvalidTokenError(f"Invalid token: {str(e)}")
-        except Exception as e:
-            logger.error("Unexpected error verifying token", error=str(e))
-            raise InvalidTokenError("Token verification failed")
+        decoded_token = await self._verify_token(id_token)
 
         firebase_uid = decoded_token.get("uid")
         email = decoded_token.get("email")
@@ -64,17 +178,71 @@ class FirebaseAuthService:
             raise InvalidTokenError("Token missing required claims")
 
         # Get or create user
-        user = await self._get_or_create_user(firebase_uid, email, decoded_token)
+        user = await self._get_cached_user(firebase_uid)
+        if user is None:
+            user = await self._get_or_create_user(firebase_uid, email, decoded_token)
+            self._cache_user(firebase_uid, user)
 
         # Check account status
         if not user.is_active:
             raise AccountInactiveError()
 
-        # Update last login
-        await self.user_repo.update_login_tracking(user.id, success=True)
+        # Update last login (coalesced, written by the next flush)
+        login_tracking.record(user.id)
 
         return user, decoded_token
 
+    async def _verify_token(self, id_token: str) -> dict:
+        """Verify a token off the event loop, or return its cached claims."""
+        token_hash = _token_hash(id_token)
+        entry = _cache_get(_token_cache, token_hash)
+        if entry is not None:
+            return dict(entry.claims)
+
+        try:
+            decoded_token = await asyncio.to_thread(verify_firebase_token, id_token)
+        except ExpiredIdTokenError:
+            raise InvalidTokenError("Token has expired")
+        except RevokedIdTokenError:
+            raise InvalidTokenError("Token has been revoked")
+        except InvalidIdTokenError as e:
+            raise InvalidTokenError(f"Invalid token: {str(e)}")
+        except Exception as e:
+            logger.error("Unexpected error verifying token", error=str(e))
+            raise InvalidTokenError("Token verification failed")
+
+        expires_at = decoded_token.get("exp")
+        if isinstance(expires_at, (int, float)):
+            _cache_put(
+                _token_cache,
+                token_hash,
+                _CachedToken(claims=dict(decoded_token), expires_at=float(expires_at)),
+                FIREBASE_TOKEN_CACHE_MAX_ENTRIES,
+            )
+        return decoded_token
+
+    async def _get_cached_user(self, firebase_uid: str) -> Optional[User]:
+        """Rebuild a cached user and attach it to this session without a query."""
+        entry = _cache_get(_user_cache, firebase_uid)
+        if entry is None:
+            return None
+        user = User(**entry.values)
+        make_transient_to_detached(user)
+        return await self.db.merge(user, load=False)
+
+    def _cache_user(self, firebase_uid: str, user: User) -> None:
+        state = sa_inspect(user)
+        # Only fully loaded rows: reading expired attributes would hit the DB
+        if state.unloaded:
+            return
+        values = {attr.key: state.dict[attr.key] for attr in state.mapper.column_attrs}
+        _cache_put(
+            _user_cache,
+            firebase_uid,
+            _CachedUser(values=values, cached_at=time.monotonic()),
+            FIREBASE_USER_CACHE_MAX_ENTRIES,
+        )
+
     async def _get_or_create_user(
         self,
         firebase_uid: str,
@@ -10,9 +10,12 @@ Date: January 2026
 """
 
 import logging
-import statistics
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from app.utils.keepa_series import KeepaSeries
 
 logger = logging.getLogger(__name__)
 
@@ -43,7 +46,7 @@ KEEPA_EPOCH = datetime(2000, 10, 21, 0, 0, 0)
 # =============================================================================
 
 def calculate_intrinsic_value_corridor(
-    price_history: Optional[List[Tuple[datetime, float]]],
+    price_history: Optional[Union[KeepaSeries, List[Tuple[datetime, float]]]],
     window_days: int = 90,
     min_data_points: int = 10
 ) -> Dict[str, Any]:
@@ -55,7 +58,8 @@ def calculate_intrinsic_value_corridor(
 
     Args:
         price_history: List of (datetime, float) tuples representing price history.
-                      Can also accept (timestamp_minutes, float) from Keepa format.
+                      Can also accept (timestamp_minutes, float) from Keepa format,
+                      or a KeepaSeries (window and filters are vectorized).
         window_days: Number of days to consider for calculation (default 90).
         min_data_points: Minimum data points required for valid calculation (default 10).
 
@@ -88,27 +92,10 @@ def calculate_intrinsic_value_corridor(
     now = datetime.now()
     window_start = now - timedelta(days=window_days)
 
-    valid_prices = []
-    for entry in price_history:
-        try:
-            timestamp, price = entry
-
-            # Convert timestamp to datetime if needed
-            if isinstance(timestamp, (int, float)):
-                # Assume Keepa timestamp (minutes since epoch)
-                dt = KEEPA_EPOCH + timedelta(minutes=timestamp)
-            elif isinstance(timestamp, datetime):
-                dt = timestamp
-            else:
-                continue
-
-            # Filter by window and validate price
-            if dt >= window_start and price is not None and price > 0:
-                valid_prices.append(price)
-
-        except (ValueError, TypeError) as e:
-            logger.debug(f"[INTRINSIC] Skipping invalid entry: {entry}, error: {e}")
-            continue
+    if isinstance(price_history, KeepaSeries):
+        valid_prices = price_history.since(window_start).positive().as_float64()
+    else:
+        valid_prices = np.asarray(_valid_prices_in_window(price_history, window_start), dtype=np.float64)
 
     logger.debug(
         f"[INTRINSIC] Extracted {len(valid_prices)} valid prices "
@@ -154,11 +141,8 @@ def calculate_intrinsic_value_corridor(
             reason=f"Insufficient data after outlier filtering: {len(filtered_prices)} < {min_data_points}"
         )
 
-    # Calculate percentiles
-    sorted_prices = sorted(filtered_prices)
-    p25 = _percentile(sorted_prices, 25)
-    median = _percentile(sorted_prices, 50)
-    p75 = _percentile(sorted_prices, 75)
+    # Calculate percentiles (linear interpolation)
+    p25, median, p75 = (float(v) for v in np.percentile(filtered_prices, [25, 50, 75]))
 
     # Calculate volatility (coefficient of variation)
     volatility = _calculate_volatility(filtered_prices)
@@ -270,69 +254,76 @@ def get_sell_price_for_strategy(
 # HELPER FUNCTIONS
 # =============================================================================
 
-def _filter_outliers(prices: List[float]) -> List[float]:
+def _valid_prices_in_window(
+    price_history: List[Tuple[Any, float]],
+    window_start: datetime
+) -> List[float]:
     """
-    Filter outliers using P5-P95 range.
-
-    Only applies filtering when there are enough data points to
-    reliably detect outliers without accidentally removing valid data.
+    Extract valid prices within the window from a list of (timestamp, price) pairs.
 
     Args:
-        prices: List of price values.
+        price_history: (datetime or Keepa minutes, price) pairs.
+        window_start: Oldest timestamp to keep.
 
     Returns:
-        List of prices with outliers removed.
+        List of prices > 0 within the window.
     """
-    # Need at least 20 data points to reliably filter outliers
-    # With fewer points, P5/P95 interpolation can remove valid data
-    if len(prices) < 20:
-        return prices
+    valid_prices = []
+    for entry in price_history:
+        try:
+            timestamp, price = entry
+
+            # Convert timestamp to datetime if needed
+            if isinstance(timestamp, (int, float)):
+                # Assume Keepa timestamp (minutes since epoch)
+                dt = KEEPA_EPOCH + timedelta(minutes=timestamp)
+            elif isinstance(timestamp, datetime):
+                dt = timestamp
+            else:
+                continue
 
-    sorted_prices = sorted(prices)
-    p5 = _percentile(sorted_prices, 5)
-    p95 = _percentile(sorted_prices, 95)
+            # Filter by window and validate price
+            if dt >= window_start and price is not None and price > 0:
+                valid_prices.append(price)
 
-    filtered = [p for p in prices if p5 <= p <= p95]
+        except (ValueError, TypeError) as e:
+            logger.debug(f"[INTRINSIC] Skipping invalid entry: {entry}, error: {e}")
+            continue
 
-    return filtered if filtered else prices  # Return original if all filtered
+    return valid_prices
 
 
-def _percentile(sorted_data: List[float], p: int) -> float:
+def _filter_outliers(prices: np.ndarray) -> np.ndarray:
     """
-    Calculate percentile from sorted data.
+    Filter outliers using P5-P95 range.
+
+    Only applies filtering when there are enough data points to
+    reliably detect outliers without accidentally removing valid data.
 
     Args:
-        sorted_data: Pre-sorted list of values.
-        p: Percentile to calculate (0-100).
+        prices: Array of price values.
 
     Returns:
-        Percentile value.
+        Array of prices with outliers removed.
     """
-    if not sorted_data:
-        return 0.0
-
-    n = len(sorted_data)
-    if n == 1:
-        return sorted_data[0]
+    # Need at least 20 data points to reliably filter outliers
+    # With fewer points, P5/P95 interpolation can remove valid data
+    if len(prices) < 20:
+        return prices
 
-    # Linear interpolation method
-    k = (n - 1) * p / 100
-    f = int(k)
-    c = f + 1 if f + 1 < n else f
+    p5, p95 = np.percentile(prices, [5, 95])
 
-    if f == c:
-        return sorted_data[f]
+    filtered = prices[(prices >= p5) & (prices <= p95)]
 
-    # Interpolate between f and c
-    return sorted_data[f] + (k - f) * (sorted_data[c] - sorted_data[f])
+    return filtered if len(filtered) else prices  # Return original if all filtered
 
 
-def _calculate_volatility(prices: List[float]) -> float:
+def _calculate_volatility(prices: np.ndarray) -> float:
     """
     Calculate volatility as coefficient of variation (stdev / mean).
 
     Args:
-        prices: List of price values.
+        prices: Array of price values.
 
     Returns:
         Coefficient of variation (0.0 if all values identical or mean is 0).
@@ -340,17 +331,12 @@ def _calculate_volatility(prices: List[float]) -> float:
     if len(prices) < 2:
         return 0.0
 
-    try:
-        mean = statistics.mean(prices)
-        if mean == 0:
-            return 0.0
-
-        stdev = statistics.stdev(prices)
-        return stdev / mean
-
-    except statistics.StatisticsError:
+    mean = float(np.mean(prices))
+    if mean == 0:
         return 0.0
 
+    return float(np.std(prices, ddof=1)) / mean
+
 
 def _determine_confidence(data_points: int, volatility: float) -> str:
     """
@@ -6,15 +6,27 @@ Multi-tier caching system for Keepa API responses.
 Separated from keepa_service.py for SRP compliance.
 """
 
+import json
 import logging
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple
 
 from .keepa_models import CacheEntry
+from .keepa_cache_l2 import KeepaL2Backend
 
 
 logger = logging.getLogger(__name__)
 
+# Memory ceiling defaults (a full product with history + offers is ~100-500 KB)
+DEFAULT_MAX_ENTRIES = 2000
+DEFAULT_MAX_BYTES = 128 * 1024 * 1024
+DEFAULT_SWEEP_INTERVAL_SECONDS = 300
+
+# Estimated bytes per number / datetime / None in _estimate_size
+SCALAR_SIZE_ESTIMATE = 8
+
 
 class KeepaCache:
     """
@@ -23,15 +35,24 @@ class KeepaCache:
     Features:
     - Different TTLs by data type (meta, pricing, bsr)
     - Quick cache for repeated test calls
-    - Automatic expiry cleanup
+    - Automatic expiry cleanup (on read and periodic sweep)
+    - LRU eviction bounded by entry count and estimated bytes
+    - Optional persistent L2 tier (aget/aset), consulted on L1 misses
     - Cache statistics tracking
     """
 
-    def __init__(self):
-        # Main cache with different TTL by data type
-        self._cache: Dict[str, CacheEntry] = {}
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        sweep_interval_seconds: float = DEFAULT_SWEEP_INTERVAL_SECONDS,
+        l2: Optional[KeepaL2Backend] = None
+    ):
+        # Main cache with different TTL by data type (ordered oldest -> most recent use)
+        self._cache: "OrderedDict[str, CacheEntry]" = OrderedDict()
         self._cache_ttl = {
             'meta': timedelta(hours=24),      # Product metadata (stable)
+            'history': timedelta(hours=12),   # Price/BSR series (append-only)
             'pricing': timedelta(minutes=30), # Prices (volatile)
             'bsr': timedelta(minutes=60)      # BSR data (semi-volatile)
         }
@@ -40,9 +61,21 @@ class KeepaCache:
         self._quick_cache: Dict[str, Tuple[Any, datetime]] = {}
         self._quick_cache_ttl = timedelta(minutes=10)
 
+        # Persistent second tier (shared between workers / restarts)
+        self.l2 = l2
+
+        # Capacity limits
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._total_bytes = 0
+        self._sweep_interval = sweep_interval_seconds
+        self._last_sweep = time.monotonic()
+
         # Statistics tracking
         self._cache_hits = 0
         self._cache_misses = 0
+        self._evictions = 0
+        self._expired_removals = 0
 
     @property
     def cache(self) -> Dict[str, CacheEntry]:
@@ -50,40 +83,199 @@ class KeepaCache:
         return self._cache
 
     def get_cache_key(self, endpoint: str, params: Dict) -> str:
-        """Generate cache key from endpoint and params."""
+        """
+        Generate cache key from endpoint and params.
+
+        Keys are normalized so equivalent requests collide: params are
+        sorted, the API key is dropped and JSON-encoded values (Product
+        Finder ``selection``) are re-serialized with sorted keys.
+        """
         # Sort params for consistent keys
-        sorted_params = sorted(params.items())
+        sorted_params = sorted(
+            (k, self._normalize_param(v)) for k, v in params.items() if k != 'key'
+        )
         param_str = "&".join(f"{k}={v}" for k, v in sorted_params)
         return f"{endpoint}?{param_str}"
 
+    @staticmethod
+    def _normalize_param(value: Any) -> Any:
+        """Canonicalize a param value for cache keys."""
+        if isinstance(value, str):
+            value = value.strip()
+            if value.startswith('{'):
+                try:
+                    return json.dumps(json.loads(value), sort_keys=True, separators=(',', ':'))
+                except ValueError:
+                    return value
+        return value
+
     def get(self, cache_key: str) -> Optional[Any]:
         """Get data from cache if not expired."""
         entry = self._cache.get(cache_key)
         if entry and not entry.is_expired():
             logger.debug(f"Cache HIT for {cache_key}")
             self._cache_hits += 1
+            self._cache.move_to_end(cache_key)
             return entry.data
 
         # Remove expired entry
         if entry and entry.is_expired():
-            del self._cache[cache_key]
+            self._remove(cache_key)
+            self._expired_removals += 1
 
         logger.debug(f"Cache MISS for {cache_key}")
         self._cache_misses += 1
         return None
 
-    def set(self, cache_key: str, data: Any, cache_type: str = 'pricing'):
-        """Store data in cache with appropriate TTL."""
+    def set(
+        self,
+        cache_key: str,
+        data: Any,
+        cache_type: str = 'pricing',
+        expires_at: Optional[datetime] = None
+    ):
+        """Store data in cache with appropriate TTL (or an explicit expiry)."""
         ttl = self._cache_ttl.get(cache_type, self._cache_ttl['pricing'])
-        expires_at = datetime.now() + ttl
+        expires_at = expires_at or datetime.now() + ttl
+        size_bytes = self._estimate_size(data)
+
+        self._maybe_sweep()
 
+        if size_bytes > self.max_bytes:
+            logger.warning(
+                f"Cache SKIP for {cache_key}: {size_bytes} bytes exceeds cache limit"
+            )
+            self._remove(cache_key)
+            return
+
+        self._remove(cache_key)
         self._cache[cache_key] = CacheEntry(
             data=data,
             expires_at=expires_at,
-            cache_type=cache_type
+            cache_type=cache_type,
+            size_bytes=size_bytes
         )
-
-        logger.debug(f"Cache SET for {cache_key} (TTL: {ttl})")
+        self._total_bytes += size_bytes
+
+        self._evict_to_capacity()
+
+        logger.debug(f"Cache SET for {cache_key} (TTL: {ttl}, {size_bytes} bytes)")
+
+    async def aget(self, cache_key: str) -> Optional[Any]:
+        """Get data from L1, falling back to the L2 tier on a miss."""
+        return (await self.aget_many([cache_key])).get(cache_key)
+
+    async def aget_many(self, cache_keys: List[str]) -> Dict[str, Any]:
+        """
+        Get several keys from L1, then fetch L1 misses from L2 in one call.
+
+        L2 hits are promoted into L1 with their remaining TTL.
+
+        Returns:
+            Dict of cache_key -> data for hits only
+        """
+        found: Dict[str, Any] = {}
+        missing: List[str] = []
+        for cache_key in cache_keys:
+            data = self.get(cache_key)
+            if data is not None:
+                found[cache_key] = data
+            else:
+                missing.append(cache_key)
+
+        if not missing or self.l2 is None:
+            return found
+
+        for cache_key, (data, cache_type, expires_at_utc) in (await self.l2.get_many(missing)).items():
+            remaining = expires_at_utc - datetime.utcnow()
+            self.set(cache_key, data, cache_type, expires_at=datetime.now() + remaining)
+            found[cache_key] = data
+            logger.debug(f"Cache L2 HIT for {cache_key}")
+
+        return found
+
+    async def aset(self, cache_key: str, data: Any, cache_type: str = 'pricing'):
+        """Store data in L1 and write it through to the L2 tier."""
+        await self.aset_many({cache_key: (data, cache_type)})
+
+    async def aset_many(self, entries: Dict[str, Tuple[Any, str]]):
+        """Store several entries (cache_key -> (data, cache_type)), one L2 write for all."""
+        for cache_key, (data, cache_type) in entries.items():
+            self.set(cache_key, data, cache_type)
+        if self.l2 is not None:
+            await self.l2.set_many({
+                cache_key: (data, cache_type, self.get_ttl(cache_type))
+                for cache_key, (data, cache_type) in entries.items()
+            })
+
+    def _remove(self, cache_key: str):
+        """Remove an entry and release its byte budget."""
+        entry = self._cache.pop(cache_key, None)
+        if entry:
+            self._total_bytes -= entry.size_bytes
+
+    def _evict_to_capacity(self):
+        """Evict least recently used entries until within limits."""
+        while self._cache and (
+            len(self._cache) > self.max_entries or self._total_bytes > self.max_bytes
+        ):
+            cache_key, entry = self._cache.popitem(last=False)
+            self._total_bytes -= entry.size_bytes
+            self._evictions += 1
+            logger.debug(f"Cache EVICT (LRU) for {cache_key}")
+
+    def _maybe_sweep(self):
+        """Run the expiry sweep if the sweep interval has elapsed."""
+        if time.monotonic() - self._last_sweep >= self._sweep_interval:
+            self.sweep_expired()
+
+    def sweep_expired(self) -> int:
+        """
+        Drop every expired entry.
+
+        Returns:
+            Number of entries removed
+        """
+        expired_keys = [key for key, entry in self._cache.items() if entry.is_expired()]
+        for key in expired_keys:
+            self._remove(key)
+
+        self._expired_removals += len(expired_keys)
+        self._last_sweep = time.monotonic()
+
+        if expired_keys:
+            logger.debug(f"Cache SWEEP removed {len(expired_keys)} expired entries")
+        return len(expired_keys)
+
+    @staticmethod
+    def _estimate_size(data: Any) -> int:
+        """
+        Estimate the memory footprint of a cached payload (about its JSON size).
+
+        Only containers are walked: a list of scalars (a Keepa csv series) is
+        sized from its length, so large histories stay cheap on the event loop.
+        A list's type is taken from its first non-None element, since a csv
+        often starts with missing series (``csv[0] = None``).
+        """
+        size = 0
+        pending = [data]
+        while pending:
+            value = pending.pop()
+            if isinstance(value, (str, bytes)):
+                size += len(value) + 2
+            elif isinstance(value, dict):
+                size += 2 + sum(len(str(key)) + 3 for key in value)
+                pending.extend(value.values())
+            elif isinstance(value, (list, tuple)):
+                size += 2
+                first = next((item for item in value if item is not None), None)
+                if first is not None and not isinstance(first, (str, bytes, dict, list, tuple)):
+                    size += len(value) * SCALAR_SIZE_ESTIMATE
+                else:
+                    pending.extend(value)
+            else:
+                size += SCALAR_SIZE_ESTIMATE
+        return size
 
     def get_ttl(self, cache_type: str) -> timedelta:
         """Get TTL for a specific cache type."""
@@ -135,15 +327,24 @@ class KeepaCache:
             "entries_by_type": by_type,
             "hits": self._cache_hits,
             "misses": self._cache_misses,
-            "hit_rate": hit_rate
+            "hit_rate": hit_rate,
+            "estimated_bytes": self._total_bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "evictions": self._evictions,
+            "expired_removals": self._expired_removals,
+            "l2": self.l2.get_stats() if self.l2 is not None else None
         }
 
     def clear(self):
         """Clear all caches."""
         self._cache.clear()
         self._quick_cache.clear()
+        self._total_bytes = 0
         self._cache_hits = 0
         self._cache_misses = 0
+        self._evictions = 0
+        self._expired_removals = 0
 
 
 # Backward compatibility exports
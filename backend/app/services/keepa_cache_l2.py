@@ -0,0 +1,369 @@
+"""
+Keepa Service - Second-Tier (L2) Cache
+======================================
+Persistent cache tier under the in-memory KeepaCache.
+
+The in-memory tier is lost on every restart and is not shared between
+workers, so each deploy re-spends Keepa tokens. L2 backends store
+compressed product payloads with the same per-type TTLs:
+
+- PostgresKeepaL2: ``keepa_response_cache`` table (shared by all workers)
+- SQLiteKeepaL2: local file, for single-node deployments
+
+Separated from keepa_cache.py for SRP compliance.
+"""
+
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+# (data, cache_type, expires_at)
+L2Entry = Tuple[Any, str, datetime]
+
+# (cache_key, payload, cache_type, expires_at) as written by _set_many
+L2Row = Tuple[str, bytes, str, datetime]
+
+PURGE_INTERVAL_SECONDS = 3600
+
+
+def _encode_default(value: Any) -> Any:
+    # keepa lib 'data' timestamps are datetime objects; parsers rely on the type
+    if isinstance(value, datetime):
+        return {"__dt__": value.isoformat()}
+    return str(value)
+
+
+def _decode_object(obj: Dict[str, Any]) -> Any:
+    if len(obj) == 1 and "__dt__" in obj:
+        return datetime.fromisoformat(obj["__dt__"])
+    return obj
+
+
+def encode_payload(data: Any) -> bytes:
+    """Serialize and compress a payload (datetimes are preserved)."""
+    raw = json.dumps(data, default=_encode_default, separators=(',', ':')).encode('utf-8')
+    return zlib.compress(raw, 6)
+
+
+def decode_payload(payload: bytes) -> Any:
+    """Decompress and deserialize a payload."""
+    return json.loads(zlib.decompress(payload).decode('utf-8'), object_hook=_decode_object)
+
+
+def _encode_entries(entries: Dict[str, Tuple[Any, str, timedelta]], now: datetime) -> List[L2Row]:
+    return [
+        (cache_key, encode_payload(data), cache_type, now + ttl)
+        for cache_key, (data, cache_type, ttl) in entries.items()
+    ]
+
+
+def _decode_rows(rows: List[L2Row]) -> Dict[str, L2Entry]:
+    return {
+        cache_key: (decode_payload(payload), cache_type, expires_at)
+        for cache_key, payload, cache_type, expires_at in rows
+    }
+
+
+async def _off_loop(fn, *args):
+    """
+    Run payload (de)serialization in the default executor.
+
+    A chunk can carry hundreds of 100-500 KB history payloads; json +
+    zlib on them would stall the event loop.
+    """
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(None, fn, *args)
+
+
+class KeepaL2Backend(ABC):
+    """
+    Base class for L2 backends.
+
+    Backends never raise: failures are logged, counted and reported as
+    misses so a broken L2 only costs tokens, never requests.
+    """
+
+    name = "base"
+
+    def __init__(self, purge_interval_seconds: float = PURGE_INTERVAL_SECONDS):
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.errors = 0
+        self._purge_interval = purge_interval_seconds
+        self._last_purge = time.monotonic()
+
+    async def get_many(self, cache_keys: List[str]) -> Dict[str, L2Entry]:
+        """Fetch unexpired entries for the given keys."""
+        if not cache_keys:
+            return {}
+        try:
+            entries = await self._get_many(cache_keys)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"[L2 CACHE] {self.name} read failed: {e}")
+            return {}
+
+        self.hits += len(entries)
+        self.misses += len(cache_keys) - len(entries)
+        return entries
+
+    async def get(self, cache_key: str) -> Optional[L2Entry]:
+        """Fetch one unexpired entry."""
+        return (await self.get_many([cache_key])).get(cache_key)
+
+    async def set(self, cache_key: str, data: Any, cache_type: str, ttl: timedelta):
+        """Store an entry (upsert)."""
+        await self.set_many({cache_key: (data, cache_type, ttl)})
+
+    async def set_many(self, entries: Dict[str, Tuple[Any, str, timedelta]]):
+        """Store several entries (cache_key -> (data, cache_type, ttl)) in one upsert."""
+        if not entries:
+            return
+        now = datetime.utcnow()
+        try:
+            await self._set_many(await _off_loop(_encode_entries, entries, now))
+            self.writes += len(entries)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"[L2 CACHE] {self.name} write failed for {len(entries)} key(s): {e}")
+            return
+
+        if time.monotonic() - self._last_purge >= self._purge_interval:
+            self._last_purge = time.monotonic()
+            try:
+                purged = await self._purge_expired()
+                logger.info(f"[L2 CACHE] {self.name} purged {purged} expired entries")
+            except Exception as e:
+                self.errors += 1
+                logger.warning(f"[L2 CACHE] {self.name} purge failed: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get L2 statistics."""
+        total = self.hits + self.misses
+        return {
+            "backend": self.name,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / max(total, 1),
+            "writes": self.writes,
+            "errors": self.errors,
+        }
+
+    @abstractmethod
+    async def _get_many(self, cache_keys: List[str]) -> Dict[str, L2Entry]:
+        """Unexpired entries for the given keys (may raise)."""
+
+    @abstractmethod
+    async def _set_many(self, rows: List[L2Row]):
+        """Upsert encoded rows in one write (may raise)."""
+
+    @abstractmethod
+    async def _purge_expired(self) -> int:
+        """Delete expired entries; returns the number removed."""
+
+
+class PostgresKeepaL2(KeepaL2Backend):
+    """L2 backend on the ``keepa_response_cache`` table (via db_manager)."""
+
+    name = "postgres"
+
+    def __init__(self, session_factory=None, **kwargs):
+        super().__init__(**kwargs)
+        if session_factory is None:
+            from app.core.db import db_manager
+            session_factory = db_manager.session
+        self._session_factory = session_factory
+
+    async def _get_many(self, cache_keys: List[str]) -> Dict[str, L2Entry]:
+        from sqlalchemy import select
+        from app.models.product_cache import KeepaResponseCache
+
+        stmt = select(
+            KeepaResponseCache.cache_key,
+            KeepaResponseCache.payload,
+            KeepaResponseCache.cache_type,
+            KeepaResponseCache.expires_at,
+        ).where(
+            KeepaResponseCache.cache_key.in_(cache_keys),
+            KeepaResponseCache.expires_at > datetime.utcnow(),
+        )
+
+        async with self._session_factory() as session:
+            rows = (await session.execute(stmt)).all()
+
+        return await _off_loop(_decode_rows, [tuple(row) for row in rows])
+
+    async def _set_many(self, rows: List[L2Row]):
+        from sqlalchemy.dialects.postgresql import insert
+        from app.models.product_cache import KeepaResponseCache
+
+        created_at = datetime.utcnow()
+        values = [
+            {
+                "cache_key": cache_key,
+                "cache_type": cache_type,
+                "payload": payload,
+                "size_bytes": len(payload),
+                "created_at": created_at,
+                "expires_at": expires_at,
+            }
+            for cache_key, payload, cache_type, expires_at in rows
+        ]
+        stmt = insert(KeepaResponseCache).values(values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[KeepaResponseCache.cache_key],
+            set_={k: stmt.excluded[k] for k in values[0] if k != "cache_key"},
+        )
+
+        async with self._session_factory() as session:
+            await session.execute(stmt)
+            await session.commit()
+
+    async def _purge_expired(self) -> int:
+        from sqlalchemy import delete
+        from app.models.product_cache import KeepaResponseCache
+
+        async with self._session_factory() as session:
+            result = await session.execute(
+                delete(KeepaResponseCache).where(
+                    KeepaResponseCache.expires_at <= datetime.utcnow()
+                )
+            )
+            await session.commit()
+            return result.rowcount or 0
+
+
+class SQLiteKeepaL2(KeepaL2Backend):
+    """L2 backend on a local SQLite file (single-node deployments)."""
+
+    name = "sqlite"
+
+    def __init__(self, path: str, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS keepa_response_cache ("
+            " cache_key TEXT PRIMARY KEY,"
+            " cache_type TEXT NOT NULL,"
+            " payload BLOB NOT NULL,"
+            " expires_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_keepa_response_cache_expires_at"
+            " ON keepa_response_cache (expires_at)"
+        )
+        self._conn.commit()
+
+    async def _run(self, fn, *args):
+        loop = asyncio.get_event_loop()
+
+        def _locked():
+            with self._lock:
+                return fn(*args)
+
+        return await loop.run_in_executor(None, _locked)
+
+    async def _get_many(self, cache_keys: List[str]) -> Dict[str, L2Entry]:
+        def _query():
+            placeholders = ",".join("?" for _ in cache_keys)
+            return self._conn.execute(
+                "SELECT cache_key, payload, cache_type, expires_at FROM keepa_response_cache"
+                f" WHERE cache_key IN ({placeholders}) AND expires_at > ?",
+                (*cache_keys, time.time()),
+            ).fetchall()
+
+        rows = await self._run(_query)
+        # Decoded outside the connection lock
+        return await _off_loop(_decode_rows, [
+            (key, payload, cache_type, datetime.utcfromtimestamp(expires_at))
+            for key, payload, cache_type, expires_at in rows
+        ])
+
+    async def _set_many(self, rows: List[L2Row]):
+        epoch = datetime(1970, 1, 1)
+
+        def _upsert():
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO keepa_response_cache"
+                " (cache_key, cache_type, payload, expires_at) VALUES (?, ?, ?, ?)",
+                [
+                    (cache_key, cache_type, payload, (expires_at - epoch).total_seconds())
+                    for cache_key, payload, cache_type, expires_at in rows
+                ],
+            )
+            self._conn.commit()
+
+        await self._run(_upsert)
+
+    async def _purge_expired(self) -> int:
+        def _purge():
+            cursor = self._conn.execute(
+                "DELETE FROM keepa_response_cache WHERE expires_at <= ?", (time.time(),)
+            )
+            self._conn.commit()
+            return cursor.rowcount
+
+        return await self._run(_purge)
+
+
+# =========================================================================
+# PROCESS-WIDE BACKEND
+# =========================================================================
+
+_l2_backend: Optional[KeepaL2Backend] = None
+
+
+def configure_l2_backend(backend: str, sqlite_path: str = "keepa_cache.sqlite3") -> Optional[KeepaL2Backend]:
+    """
+    Select the process-wide L2 backend ('postgres', 'sqlite' or 'none').
+
+    Called from the application lifespan.
+    """
+    global _l2_backend
+
+    backend = (backend or "none").lower()
+    if backend == "postgres":
+        _l2_backend = PostgresKeepaL2()
+    elif backend == "sqlite":
+        _l2_backend = SQLiteKeepaL2(sqlite_path)
+    else:
+        _l2_backend = None
+
+    logger.info(f"[L2 CACHE] Backend configured: {backend}")
+    return _l2_backend
+
+
+def get_l2_backend() -> Optional[KeepaL2Backend]:
+    """Get the configured L2 backend (None when disabled)."""
+    return _l2_backend
+
+
+def set_l2_backend(backend: Optional[KeepaL2Backend]):
+    """Install an L2 backend instance directly (tests, scripts)."""
+    global _l2_backend
+    _l2_backend = backend
+
+
+__all__ = [
+    'KeepaL2Backend',
+    'PostgresKeepaL2',
+    'SQLiteKeepaL2',
+    'encode_payload',
+    'decode_payload',
+    'configure_l2_backend',
+    'get_l2_backend',
+    'set_l2_backend',
+]
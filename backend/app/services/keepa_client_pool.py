@@ -0,0 +1,207 @@
+"""
+Keepa Service - Library Client Pool
+===================================
+Long-lived, bounded pool of ``keepa.Keepa`` clients shared by the process.
+
+Constructing a ``keepa.Keepa`` client performs a status round-trip to Keepa,
+so building one per call adds a fixed latency to every cache miss. The pool
+keeps clients alive across requests (KeepaService itself is created per
+request) and hands them out to executor threads one at a time.
+
+Separated from keepa_service.py for SRP compliance.
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from app.core.settings import get_settings
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = 4
+
+# keepa library RuntimeError messages for rejected keys / unpaid access
+AUTH_ERROR_MARKERS = ('PAYMENT_REQUIRED', 'Status code: 401', 'Status code: 403')
+
+
+class KeepaClientPool:
+    """
+    Thread-safe bounded pool of keepa library clients.
+
+    Clients are only ever used from executor threads (the keepa library is
+    synchronous), so the pool relies on threading primitives and is safe to
+    share across event loops.
+
+    Features:
+    - Lazy creation up to ``max_size`` clients, reused afterwards
+    - Optional warm-up to pay client construction at startup
+    - Wait-time metrics for pool acquisition
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        max_size: int = DEFAULT_POOL_SIZE,
+        client_factory: Optional[Callable[[str], Any]] = None,
+    ):
+        if max_size < 1:
+            raise ValueError("max_size must be >= 1")
+
+        self.api_key = api_key
+        self.max_size = max_size
+        self._client_factory = client_factory or _default_client_factory
+
+        self._idle: List[Any] = []
+        self._created = 0
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._lock = threading.Lock()
+
+        # Metrics
+        self._acquisitions = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._discarded = 0
+
+    def _create_client(self) -> Any:
+        """Build a new library client (blocking, may hit the network)."""
+        client = self._client_factory(self.api_key)
+        with self._lock:
+            self._created += 1
+        logger.info(
+            f"[KEEPA POOL] Created client {self._created}/{self.max_size}"
+        )
+        return client
+
+    def warm_up(self, size: Optional[int] = None) -> int:
+        """
+        Pre-create idle clients so the first requests skip construction.
+
+        Blocking - call from an executor thread or at startup.
+
+        Args:
+            size: Number of clients to have ready (default: max_size)
+
+        Returns:
+            Number of idle clients after warm-up
+        """
+        target = min(size or self.max_size, self.max_size)
+
+        while True:
+            with self._lock:
+                if self._created >= target:
+                    return len(self._idle)
+            client = self._create_client()
+            with self._lock:
+                self._idle.append(client)
+
+    @contextmanager
+    def client(self) -> Iterator[Any]:
+        """
+        Borrow a client for the duration of the block (blocking).
+
+        Waits for a free slot when ``max_size`` clients are in use. A client
+        whose block raised a transport or auth error is discarded rather than
+        returned, in case the library left it in a bad state; other errors
+        (invalid ASIN, NOT_ENOUGH_TOKEN...) keep it in the pool.
+        """
+        start = time.monotonic()
+        self._slots.acquire()
+        wait = time.monotonic() - start
+
+        with self._lock:
+            self._acquisitions += 1
+            self._total_wait += wait
+            self._max_wait = max(self._max_wait, wait)
+            api = self._idle.pop() if self._idle else None
+
+        discard = False
+        try:
+            if api is None:
+                api = self._create_client()
+            yield api
+        except Exception as e:
+            discard = _is_client_failure(e)
+            raise
+        except BaseException:
+            discard = True
+            raise
+        finally:
+            with self._lock:
+                if api is None:
+                    pass
+                elif discard:
+                    self._created -= 1
+                    self._discarded += 1
+                else:
+                    self._idle.append(api)
+            self._slots.release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool statistics."""
+        with self._lock:
+            acquisitions = self._acquisitions
+            return {
+                "max_size": self.max_size,
+                "created": self._created,
+                "idle": len(self._idle),
+                "in_use": self._created - len(self._idle),
+                "acquisitions": acquisitions,
+                "discarded": self._discarded,
+                "avg_wait_ms": round(self._total_wait * 1000 / max(acquisitions, 1), 2),
+                "max_wait_ms": round(self._max_wait * 1000, 2),
+            }
+
+
+def _is_client_failure(error: Exception) -> bool:
+    """Transport (requests errors are OSErrors) or auth failure of a client."""
+    if isinstance(error, OSError):
+        return True
+    message = str(error)
+    return any(marker in message for marker in AUTH_ERROR_MARKERS)
+
+
+def _default_client_factory(api_key: str) -> Any:
+    import keepa
+
+    return keepa.Keepa(api_key)
+
+
+# =========================================================================
+# PROCESS-WIDE REGISTRY
+# =========================================================================
+
+_pools: Dict[str, KeepaClientPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_client_pool(api_key: str, max_size: Optional[int] = None) -> KeepaClientPool:
+    """
+    Get the process-wide client pool for an API key (created on first use).
+
+    ``max_size`` (default: the keepa_client_pool_size setting) only applies
+    when the pool is created.
+    """
+    with _pools_lock:
+        pool = _pools.get(api_key)
+        if pool is None:
+            pool = KeepaClientPool(api_key, max_size=max_size or get_settings().keepa_client_pool_size)
+            _pools[api_key] = pool
+        return pool
+
+
+def reset_client_pools():
+    """Drop all pools (used by tests and on shutdown)."""
+    with _pools_lock:
+        _pools.clear()
+
+
+__all__ = [
+    'DEFAULT_POOL_SIZE',
+    'KeepaClientPool',
+    'get_client_pool',
+    'reset_client_pools',
+]
@@ -0,0 +1,257 @@
+"""
+Keepa Service - Adaptive Concurrency Control
+============================================
+Process-wide AIMD limiter for concurrent Keepa HTTP calls.
+
+The limit grows by one after a window of healthy responses (as many as the
+current limit) and is cut multiplicatively on 429s, 5xx, transport errors
+or when latency climbs well above the observed baseline. Throughput then
+follows what Keepa actually allows instead of a fixed semaphore.
+
+Separated from keepa_service.py for SRP compliance.
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Deque, Dict, Optional, Tuple
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_INITIAL_LIMIT = 3
+DEFAULT_MIN_LIMIT = 1
+DEFAULT_MAX_LIMIT = 10  # Matches the KeepaService httpx connection pool
+
+BACKOFF_FACTOR = 0.5          # Multiplicative decrease on 429/5xx/errors
+LATENCY_BACKOFF_FACTOR = 0.8  # Gentler decrease when only latency degrades
+LATENCY_TOLERANCE = 2.0       # Recent latency above baseline x this = congested
+BASELINE_ALPHA = 0.05         # EWMA weight of the long-run latency baseline
+RECENT_ALPHA = 0.3            # EWMA weight of the recent latency
+DECISION_HISTORY = 20
+
+
+class _Slot:
+    """One concurrent call; the caller records the HTTP status it got."""
+
+    __slots__ = ("status_code",)
+
+    def __init__(self):
+        self.status_code: Optional[int] = None
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD concurrency limit shared by every KeepaService instance.
+
+    Waiting callers park on a future of their own loop and are woken
+    thread-safely, so the limiter works across event loops (API, Celery
+    tasks running ``asyncio.run``). State changes happen under a short
+    threading lock that is never held across an await.
+    """
+
+    def __init__(self,
+                 initial_limit: int = DEFAULT_INITIAL_LIMIT,
+                 min_limit: int = DEFAULT_MIN_LIMIT,
+                 max_limit: int = DEFAULT_MAX_LIMIT):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.initial_limit = initial_limit
+        self._lock = threading.Lock()
+        self._reset_state()
+
+    def _reset_state(self):
+        self._limit = float(self.initial_limit)
+        self._in_flight = 0
+        self._waiters: Deque[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = deque()
+        self._healthy_streak = 0
+        self._baseline_latency: Optional[float] = None
+        self._recent_latency: Optional[float] = None
+        self._last_decrease = float("-inf")
+        self._decisions: Deque[Dict[str, Any]] = deque(maxlen=DECISION_HISTORY)
+        self._completed = 0
+        self._throttled = 0
+        self._errors = 0
+
+    @property
+    def limit(self) -> int:
+        return max(self.min_limit, int(self._limit))
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[_Slot]:
+        """
+        Hold one concurrency slot for a Keepa HTTP call.
+
+        Set ``slot.status_code`` after the response arrives; exceptions
+        raised inside the block count as transport errors. A call cancelled
+        before its response (early stop, client disconnect) only frees the
+        slot and says nothing about Keepa's health.
+        """
+        await self._acquire()
+        slot = _Slot()
+        start = time.monotonic()
+        error = cancelled = False
+        try:
+            yield slot
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+        except Exception:
+            error = True
+            raise
+        finally:
+            if cancelled and slot.status_code is None:
+                self._free()
+            else:
+                self._release(slot.status_code, time.monotonic() - start, error)
+
+    async def _acquire(self):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._in_flight < self.limit and not self._waiters:
+                self._in_flight += 1
+                return
+            waiter = (loop, loop.create_future())
+            self._waiters.append(waiter)
+        try:
+            # _wake() reserves our slot before resolving the future
+            await waiter[1]
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                else:
+                    # Slot was handed over while cancelling: pass it on
+                    self._in_flight -= 1
+                    self._wake()
+            raise
+
+    def _free(self):
+        """Give a slot back without recording an AIMD decision."""
+        with self._lock:
+            self._in_flight -= 1
+            self._wake()
+
+    def _release(self, status_code: Optional[int], latency: float, error: bool):
+        with self._lock:
+            self._in_flight -= 1
+            self._completed += 1
+            if status_code == 429:
+                self._throttled += 1
+                self._decrease(BACKOFF_FACTOR, "429")
+            elif status_code is not None and status_code >= 500:
+                self._errors += 1
+                self._decrease(BACKOFF_FACTOR, f"{status_code}")
+            elif error or status_code is None:
+                self._errors += 1
+                self._decrease(BACKOFF_FACTOR, "error")
+            else:
+                self._record_healthy(latency)
+            self._wake()
+
+    def _record_healthy(self, latency: float):
+        baseline = self._baseline_latency
+        if baseline is None:
+            self._baseline_latency = self._recent_latency = latency
+        else:
+            # The baseline drifts slowly so a persistently slower Keepa is accepted
+            self._baseline_latency = baseline + BASELINE_ALPHA * (latency - baseline)
+            self._recent_latency += RECENT_ALPHA * (latency - self._recent_latency)
+            if self._recent_latency > baseline * LATENCY_TOLERANCE:
+                self._decrease(
+                    LATENCY_BACKOFF_FACTOR,
+                    f"latency {self._recent_latency:.2f}s > {LATENCY_TOLERANCE:g}x baseline",
+                )
+                return
+
+        self._healthy_streak += 1
+        # Additive increase: +1 per window of `limit` healthy responses,
+        # and only while the current limit is actually in use
+        if self._healthy_streak >= self.limit and self._in_flight + 1 >= self.limit:
+            self._healthy_streak = 0
+            if self.limit < self.max_limit:
+                self._limit = float(self.limit + 1)
+                self._log_decision("increase", "healthy")
+
+    def _decrease(self, factor: float, reason: str):
+        self._healthy_streak = 0
+        now = time.monotonic()
+        # Responses already in flight reflect the old limit: back off once
+        # per baseline round-trip, not once per failed response
+        cooldown = max(self._baseline_latency or 0.0, 0.5)
+        if now - self._last_decrease < cooldown:
+            return
+        new_limit = max(float(self.min_limit), self._limit * factor)
+        if int(new_limit) == self.limit and self.limit > self.min_limit:
+            new_limit = float(self.limit - 1)
+        if int(new_limit) == self.limit:
+            return
+        self._limit = new_limit
+        self._last_decrease = now
+        self._log_decision("decrease", reason)
+        logger.warning(f"[CONCURRENCY] Keepa concurrency reduced to {self.limit} ({reason})")
+
+    def _log_decision(self, action: str, reason: str):
+        self._decisions.append({
+            "action": action,
+            "limit": self.limit,
+            "reason": reason,
+            "at": datetime.now(timezone.utc).isoformat(),
+        })
+
+    def _wake(self):
+        while self._waiters and self._in_flight < self.limit:
+            loop, future = self._waiters.popleft()
+            self._in_flight += 1
+            try:
+                loop.call_soon_threadsafe(_resolve_future, future)
+            except RuntimeError:
+                self._in_flight -= 1  # Loop closed; the waiter is gone
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Current limit, in-flight/queued calls and recent AIMD decisions."""
+        with self._lock:
+            return {
+                "limit": self.limit,
+                "min_limit": self.min_limit,
+                "max_limit": self.max_limit,
+                "in_flight": self._in_flight,
+                "queued": len(self._waiters),
+                "baseline_latency_ms": (
+                    round(self._baseline_latency * 1000, 1)
+                    if self._baseline_latency is not None else None
+                ),
+                "completed": self._completed,
+                "rate_limited": self._throttled,
+                "errors": self._errors,
+                "recent_decisions": list(self._decisions),
+            }
+
+    def reset(self):
+        """Restore the initial limit and clear statistics."""
+        with self._lock:
+            self._reset_state()
+
+
+def _resolve_future(future: asyncio.Future):
+    if not future.done():
+        future.set_result(None)
+
+
+# Process-wide limiter: KeepaService instances are per request
+keepa_concurrency = AdaptiveConcurrencyLimiter()
+
+
+__all__ = [
+    "AdaptiveConcurrencyLimiter",
+    "keepa_concurrency",
+]
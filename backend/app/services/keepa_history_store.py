@@ -0,0 +1,358 @@
+"""
+Keepa Service - Incremental History Store
+=========================================
+Process-wide per-ASIN store of the keepa lib ``data`` series (price, BSR,
+offer count...).
+
+Instead of re-downloading and re-walking the full history on every
+refresh, KeepaService asks Keepa only for the days since the last sync
+(``days=N``) and appends the points newer than the last stored timestamp.
+Series are columnar KeepaSeries, so analysis code (intrinsic value
+corridor, velocity score) reads them directly with vectorized windows.
+
+The raw history keys of the last full fetch (csv, salesRanks, ...) are
+kept too (as compact int32 arrays) and extended with each incremental
+fetch, so a refreshed product carries the same history as a full
+download. ASINs without them are fetched in full.
+
+Separated from keepa_service.py for SRP compliance.
+"""
+
+import logging
+import math
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.utils.keepa_series import KeepaSeries
+
+
+logger = logging.getLogger(__name__)
+
+# Series attribute -> keepa lib 'data' key
+HISTORY_SERIES = {
+    'price': 'NEW',
+    'bsr': 'SALES',
+    'offers': 'COUNT_NEW',
+    'amazon': 'AMAZON',
+    'buybox': 'BUY_BOX_SHIPPING',
+}
+
+# Series holding prices (dollars) rather than ranks/counts
+PRICE_SERIES = frozenset({'price', 'amazon', 'buybox'})
+
+# csv series holding (time, price, shipping) triplets instead of pairs
+SHIPPING_CSV_INDICES = frozenset({7, *range(18, 30)})
+
+# Raw history keys (besides csv and salesRanks) -> values per record
+RAW_HISTORY_STRIDES = {
+    'buyBoxSellerIdHistory': 2,
+    'couponHistory': 3,
+    'monthlySoldHistory': 2,
+}
+
+DEFAULT_MAX_ASINS = 2000
+DEFAULT_RETENTION_DAYS = 730
+
+
+@dataclass
+class ProductHistory:
+    """Stored series for one ASIN in one Keepa domain."""
+    asin: str
+    domain: int = 1
+    series: Dict[str, KeepaSeries] = field(
+        default_factory=lambda: {
+            name: KeepaSeries.empty(is_price=name in PRICE_SERIES) for name in HISTORY_SERIES
+        }
+    )
+    # Raw history keys of the last full fetch, extended incrementally
+    raw: Optional[Dict[str, Any]] = None
+    synced_at: Optional[datetime] = None
+
+    @property
+    def price(self) -> KeepaSeries:
+        return self.series['price']
+
+    @property
+    def bsr(self) -> KeepaSeries:
+        return self.series['bsr']
+
+    @property
+    def offers(self) -> KeepaSeries:
+        return self.series['offers']
+
+    def covers(self, data_section: Dict[str, Any]) -> bool:
+        """True if the store is at least as recent as a keepa 'data' section."""
+        for name, key in HISTORY_SERIES.items():
+            times = data_section.get(f'{key}_time')
+            if times is None or len(times) == 0:
+                continue
+            last = times[-1]
+            if not isinstance(last, datetime) or last > datetime.now():
+                continue
+            stored = self.series[name].last_time
+            # Stored timestamps have Keepa's minute precision
+            if stored is None or stored < last.replace(second=0, microsecond=0):
+                return False
+        return True
+
+    def to_data_section(self) -> Dict[str, List[Any]]:
+        """Series in keepa lib 'data' layout (KEY / KEY_time lists)."""
+        data: Dict[str, List[Any]] = {}
+        for name, key in HISTORY_SERIES.items():
+            series = self.series[name]
+            data[key] = series.value_list()
+            data[f'{key}_time'] = series.times()
+        return data
+
+
+def _compact(values: Any) -> Any:
+    """Flat Keepa records as an int32 array (kept as-is if not all ints)."""
+    if isinstance(values, np.ndarray) or not isinstance(values, list):
+        return values
+    if not all(isinstance(v, int) for v in values):
+        return values
+    try:
+        return np.asarray(values, dtype=np.int32)
+    except OverflowError:
+        return values
+
+
+def _expand(values: Any) -> Any:
+    """Inverse of _compact (plain lists, as in a Keepa response)."""
+    return values.tolist() if isinstance(values, np.ndarray) else values
+
+
+def _append_records(stored: Any, recent: Any, stride: int) -> Any:
+    """Append the records of a recent flat series newer than the stored ones."""
+    if not recent:
+        return stored
+    if stored is None or len(stored) < stride:
+        return _compact(recent)
+
+    last = int(stored[-stride])
+    for start in range(0, len(recent) - stride + 1, stride):
+        if int(recent[start]) > last:
+            return _compact(list(_expand(stored)) + list(recent[start:]))
+    return stored
+
+
+def _merge_raw_history(stored: Dict[str, Any], recent: Dict[str, Any]) -> Dict[str, Any]:
+    """Extend stored raw history keys with the records of a recent fetch."""
+    merged = dict(stored)
+
+    csv = recent.get('csv')
+    if csv:
+        old = stored.get('csv') or []
+        merged['csv'] = [
+            _append_records(
+                old[i] if i < len(old) else None,
+                csv[i] if i < len(csv) else None,
+                3 if i in SHIPPING_CSV_INDICES else 2
+            )
+            for i in range(max(len(old), len(csv)))
+        ]
+
+    ranks = recent.get('salesRanks')
+    if ranks:
+        old = stored.get('salesRanks') or {}
+        merged['salesRanks'] = {
+            category: _append_records(old.get(category), ranks.get(category), 2)
+            for category in {**old, **ranks}
+        }
+
+    for key, stride in RAW_HISTORY_STRIDES.items():
+        if recent.get(key):
+            merged[key] = _append_records(stored.get(key), recent[key], stride)
+
+    return merged
+
+
+def _compact_raw_history(raw: Dict[str, Any]) -> Dict[str, Any]:
+    compact = {key: _compact(value) for key, value in raw.items()}
+    if isinstance(raw.get('csv'), list):
+        compact['csv'] = [_compact(series) for series in raw['csv']]
+    if isinstance(raw.get('salesRanks'), dict):
+        compact['salesRanks'] = {c: _compact(r) for c, r in raw['salesRanks'].items()}
+    return compact
+
+
+def _expand_raw_history(raw: Dict[str, Any]) -> Dict[str, Any]:
+    expanded = {key: _expand(value) for key, value in raw.items()}
+    if isinstance(raw.get('csv'), list):
+        expanded['csv'] = [_expand(series) for series in raw['csv']]
+    if isinstance(raw.get('salesRanks'), dict):
+        expanded['salesRanks'] = {c: _expand(r) for c, r in raw['salesRanks'].items()}
+    return expanded
+
+
+class KeepaHistoryStore:
+    """
+    Bounded (LRU) process-wide store of ProductHistory by (ASIN, domain).
+
+    Thread-safe: Celery tasks and the API share the instance.
+    """
+
+    def __init__(
+        self,
+        max_asins: int = DEFAULT_MAX_ASINS,
+        retention_days: int = DEFAULT_RETENTION_DAYS
+    ):
+        self.max_asins = max_asins
+        self.retention = timedelta(days=retention_days)
+        self._histories: "OrderedDict[Tuple[str, int], ProductHistory]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Statistics tracking
+        self._merges = 0
+        self._points_added = 0
+        self._evictions = 0
+
+    @staticmethod
+    def _key(asin: str, domain: int) -> Tuple[str, int]:
+        return (asin.upper(), domain)
+
+    def get(self, asin: str, domain: int = 1) -> Optional[ProductHistory]:
+        """Stored history for an ASIN (None if never synced)."""
+        with self._lock:
+            history = self._histories.get(self._key(asin, domain))
+            if history is not None:
+                self._histories.move_to_end(self._key(asin, domain))
+            return history
+
+    def days_since_sync(self, asin: str, domain: int = 1) -> Optional[int]:
+        """
+        Days of history to request to catch up (Keepa ``days`` parameter).
+
+        Returns:
+            Whole days since the last sync (at least 1), or None if the
+            ASIN has no stored full history (raw keys) to extend
+        """
+        history = self.get(asin, domain)
+        if history is None or history.synced_at is None or history.raw is None:
+            return None
+        elapsed = datetime.now() - history.synced_at
+        return max(1, math.ceil(elapsed.total_seconds() / 86400))
+
+    def merge(self, asin: str, domain: int, data_section: Optional[Dict[str, Any]]) -> Optional[ProductHistory]:
+        """
+        Extend the stored series with the new points of a keepa 'data' section.
+
+        Returns:
+            The updated history, or None if the section has no series
+        """
+        if not data_section:
+            return None
+
+        now = datetime.now()
+        key = self._key(asin, domain)
+
+        with self._lock:
+            history = self._entry(key)
+
+            added = 0
+            for name, data_key in HISTORY_SERIES.items():
+                times = data_section.get(f'{data_key}_time')
+                values = data_section.get(data_key)
+                if times is None or values is None:
+                    continue
+                series = history.series[name]
+                new_points = KeepaSeries.from_datetimes(
+                    times, values, is_price=name in PRICE_SERIES, now=now
+                )
+                if series.last_minute is not None:
+                    new_points = new_points.after_minute(series.last_minute)
+                added += len(new_points)
+                history.series[name] = series.concat(new_points).since(now - self.retention)
+
+            history.synced_at = now
+            self._merges += 1
+            self._points_added += added
+            self._evict()
+
+        logger.debug(f"[HISTORY] Merged {added} new point(s) for {key[0]}")
+        return history
+
+    def merge_raw(
+        self,
+        asin: str,
+        domain: int,
+        raw: Dict[str, Any],
+        incremental: bool
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Keep the raw history keys (csv, salesRanks...) of a fetched product.
+
+        A full fetch replaces the stored keys; an incremental fetch (last
+        few days only) appends its newer records to them.
+
+        Returns:
+            The complete raw history keys, or None if an incremental fetch
+            has no stored full history to extend
+        """
+        key = self._key(asin, domain)
+
+        with self._lock:
+            if incremental:
+                history = self._histories.get(key)
+                if history is None or history.raw is None:
+                    return None
+                history.raw = _merge_raw_history(history.raw, raw)
+            else:
+                history = self._entry(key)
+                history.raw = _compact_raw_history(raw)
+                self._evict()
+            return _expand_raw_history(history.raw)
+
+    def _entry(self, key: Tuple[str, int]) -> ProductHistory:
+        """Get or create the history of a key (caller holds the lock)."""
+        history = self._histories.get(key)
+        if history is None:
+            history = ProductHistory(asin=key[0], domain=key[1])
+            self._histories[key] = history
+        self._histories.move_to_end(key)
+        return history
+
+    def _evict(self):
+        """Drop least recently used histories over the bound (caller holds the lock)."""
+        while len(self._histories) > self.max_asins:
+            self._histories.popitem(last=False)
+            self._evictions += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get history store statistics."""
+        with self._lock:
+            return {
+                "asins": len(self._histories),
+                "max_asins": self.max_asins,
+                "merges": self._merges,
+                "points_added": self._points_added,
+                "evictions": self._evictions,
+            }
+
+    def reset(self):
+        """Clear stored histories and statistics."""
+        with self._lock:
+            self._histories.clear()
+            self._merges = 0
+            self._points_added = 0
+            self._evictions = 0
+
+
+# Global history store shared by every KeepaService instance
+keepa_history_store = KeepaHistoryStore()
+
+
+__all__ = [
+    'HISTORY_SERIES',
+    'PRICE_SERIES',
+    'SHIPPING_CSV_INDICES',
+    'RAW_HISTORY_STRIDES',
+    'ProductHistory',
+    'KeepaHistoryStore',
+    'keepa_history_store',
+]
@@ -0,0 +1,387 @@
+"""
+Keepa Ingest Jobs - persistence and execution of async /keepa/ingest batches.
+
+A job is claimed by one worker at a time (status + heartbeat), processed
+in MAX_ASINS_PER_REQUEST chunks through KeepaService.get_products_batch,
+and each chunk's results are committed together with the progress
+counters. Positions that already have a result are skipped, so a job
+resumes after a restart without re-spending Keepa tokens.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from sqlalchemy import func, or_, select, update
+
+from app.models.keepa_ingest import IngestJobStatus, KeepaIngestJob, KeepaIngestResult
+from app.services.keepa_models import MAX_ASINS_PER_REQUEST
+
+
+logger = logging.getLogger(__name__)
+
+INGEST_JOB_KIND = "keepa_ingest"
+
+# A running job whose heartbeat is older than this is considered orphaned
+HEARTBEAT_INTERVAL_SECONDS = 30
+STALE_HEARTBEAT_SECONDS = 120
+
+# One id per process: identifies which worker holds a job
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+# analyze(asin, keepa_data, config, keepa_service, options) -> analysis payload
+AnalyzeFn = Callable[[str, Dict[str, Any], Dict[str, Any], Any, Dict[str, Any]], Awaitable[Any]]
+
+
+class ClaimLostError(Exception):
+    """Another worker took over a job this worker was running (stale heartbeat)."""
+
+
+def _json_safe(value: Any) -> Any:
+    """Round-trip through JSON so snapshots store cleanly in JSON columns."""
+    return json.loads(json.dumps(value, default=str))
+
+
+def _to_uuid(job_id: Any) -> uuid.UUID:
+    return job_id if isinstance(job_id, uuid.UUID) else uuid.UUID(str(job_id))
+
+
+class KeepaIngestJobService:
+    """Stores ingest jobs and runs them chunk by chunk."""
+
+    def __init__(self, session_factory=None):
+        if session_factory is None:
+            from app.core.db import db_manager
+            session_factory = db_manager.session
+        self._session_factory = session_factory
+
+    # ------------------------------------------------------------------
+    # Job records
+    # ------------------------------------------------------------------
+
+    async def create_job(
+        self,
+        identifiers: List[str],
+        config: Dict[str, Any],
+        batch_id: str,
+        trace_id: Optional[str] = None,
+        options: Optional[Dict[str, Any]] = None,
+    ) -> KeepaIngestJob:
+        """Persist a new pending job."""
+        job = KeepaIngestJob(
+            batch_id=batch_id,
+            trace_id=trace_id,
+            status=IngestJobStatus.PENDING,
+            identifiers=list(identifiers),
+            config=_json_safe(config),
+            options=_json_safe(options or {}),
+            total_items=len(identifiers),
+            processed=0,
+            successful=0,
+            failed=0,
+            attempts=0,
+        )
+        async with self._session_factory() as session:
+            session.add(job)
+            await session.commit()
+        return job
+
+    async def get_job(self, job_id: str) -> Optional[KeepaIngestJob]:
+        async with self._session_factory() as session:
+            return await session.get(KeepaIngestJob, _to_uuid(job_id))
+
+    async def get_results(self, job_id: str, offset: int = 0, limit: int = 100) -> List[KeepaIngestResult]:
+        """Results in submission order."""
+        async with self._session_factory() as session:
+            rows = await session.execute(
+                select(KeepaIngestResult)
+                .where(KeepaIngestResult.job_id == _to_uuid(job_id))
+                .order_by(KeepaIngestResult.position)
+                .offset(offset)
+                .limit(limit)
+            )
+            return list(rows.scalars().all())
+
+    async def resumable_job_ids(self) -> List[str]:
+        """Pending jobs and running ones that may have lost their worker."""
+        async with self._session_factory() as session:
+            rows = await session.execute(
+                select(KeepaIngestJob.id)
+                .where(KeepaIngestJob.status.in_([IngestJobStatus.PENDING, IngestJobStatus.RUNNING]))
+                .order_by(KeepaIngestJob.created_at)
+            )
+            return [str(job_id) for job_id in rows.scalars().all()]
+
+    async def seconds_until_orphans_claimable(self, worker_id: str = WORKER_ID) -> Optional[float]:
+        """
+        Time until the freshest heartbeat of a job running on another worker
+        goes stale, or None if no other worker holds a job.
+
+        A job a crash left RUNNING just before a restart cannot be claimed
+        until then, so recovery checks again after that delay.
+        """
+        async with self._session_factory() as session:
+            heartbeat_at = (await session.execute(
+                select(func.max(KeepaIngestJob.heartbeat_at)).where(
+                    KeepaIngestJob.status == IngestJobStatus.RUNNING,
+                    or_(KeepaIngestJob.worker_id.is_(None), KeepaIngestJob.worker_id != worker_id),
+                )
+            )).scalar()
+        if heartbeat_at is None:
+            return None
+        stale_at = heartbeat_at + timedelta(seconds=STALE_HEARTBEAT_SECONDS)
+        return max((stale_at - datetime.utcnow()).total_seconds(), 0.0) + 1
+
+    async def claim(self, job_id: str, worker_id: str = WORKER_ID) -> Optional[KeepaIngestJob]:
+        """
+        Atomically take ownership of a pending or orphaned job.
+
+        Returns:
+            The claimed job, or None if it is finished or held by a live worker
+        """
+        now = datetime.utcnow()
+        stale_before = now - timedelta(seconds=STALE_HEARTBEAT_SECONDS)
+        async with self._session_factory() as session:
+            result = await session.execute(
+                update(KeepaIngestJob)
+                .where(
+                    KeepaIngestJob.id == _to_uuid(job_id),
+                    or_(
+                        KeepaIngestJob.status == IngestJobStatus.PENDING,
+                        (KeepaIngestJob.status == IngestJobStatus.RUNNING)
+                        & or_(KeepaIngestJob.heartbeat_at.is_(None), KeepaIngestJob.heartbeat_at < stale_before),
+                    ),
+                )
+                .values(
+                    status=IngestJobStatus.RUNNING,
+                    worker_id=worker_id,
+                    heartbeat_at=now,
+                    started_at=func.coalesce(KeepaIngestJob.started_at, now),
+                    attempts=KeepaIngestJob.attempts + 1,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+            if result.rowcount != 1:
+                return None
+            return await session.get(KeepaIngestJob, _to_uuid(job_id), populate_existing=True)
+
+    async def release(self, job_id: str, worker_id: str = WORKER_ID) -> bool:
+        """
+        Hand a job this worker holds back to the queue (shutdown).
+
+        The next start claims it at once instead of waiting for the
+        heartbeat to go stale.
+        """
+        async with self._session_factory() as session:
+            result = await session.execute(
+                update(KeepaIngestJob)
+                .where(
+                    KeepaIngestJob.id == _to_uuid(job_id),
+                    KeepaIngestJob.status == IngestJobStatus.RUNNING,
+                    KeepaIngestJob.worker_id == worker_id,
+                )
+                .values(status=IngestJobStatus.PENDING, worker_id=None, heartbeat_at=None)
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+            return result.rowcount == 1
+
+    async def completed_positions(self, job_id: str) -> Set[int]:
+        async with self._session_factory() as session:
+            rows = await session.execute(
+                select(KeepaIngestResult.position).where(KeepaIngestResult.job_id == _to_uuid(job_id))
+            )
+            return set(rows.scalars().all())
+
+    async def record_chunk(self, job_id: str, results: List[Dict[str, Any]], worker_id: str = WORKER_ID):
+        """
+        Insert a chunk's results and advance the counters in one transaction.
+
+        Raises:
+            ClaimLostError: The job is no longer held by this worker (nothing stored)
+        """
+        successful = sum(1 for r in results if r["status"] == "success")
+        async with self._session_factory() as session:
+            # Counters first: the job row lock orders this against a concurrent claim
+            held = await session.execute(
+                update(KeepaIngestJob)
+                .where(
+                    KeepaIngestJob.id == _to_uuid(job_id),
+                    KeepaIngestJob.status == IngestJobStatus.RUNNING,
+                    KeepaIngestJob.worker_id == worker_id,
+                )
+                .values(
+                    processed=KeepaIngestJob.processed + len(results),
+                    successful=KeepaIngestJob.successful + successful,
+                    failed=KeepaIngestJob.failed + len(results) - successful,
+                    heartbeat_at=datetime.utcnow(),
+                )
+                .execution_options(synchronize_session=False)
+            )
+            if held.rowcount != 1:
+                await session.rollback()
+                raise ClaimLostError(f"Job {job_id} is no longer held by {worker_id}")
+            session.add_all(
+                KeepaIngestResult(job_id=_to_uuid(job_id), **result) for result in results
+            )
+            await session.commit()
+
+    async def heartbeat(self, job_id: str, worker_id: str = WORKER_ID) -> bool:
+        """Refresh the heartbeat of a job this worker holds (False if the claim was lost)."""
+        async with self._session_factory() as session:
+            result = await session.execute(
+                update(KeepaIngestJob)
+                .where(
+                    KeepaIngestJob.id == _to_uuid(job_id),
+                    KeepaIngestJob.status == IngestJobStatus.RUNNING,
+                    KeepaIngestJob.worker_id == worker_id,
+                )
+                .values(heartbeat_at=datetime.utcnow())
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+            return result.rowcount == 1
+
+    async def finish(self, job_id: str, error: Optional[str] = None, worker_id: str = WORKER_ID) -> bool:
+        """Mark a job this worker holds as done (False if the claim was lost)."""
+        async with self._session_factory() as session:
+            result = await session.execute(
+                update(KeepaIngestJob)
+                .where(
+                    KeepaIngestJob.id == _to_uuid(job_id),
+                    KeepaIngestJob.status == IngestJobStatus.RUNNING,
+                    KeepaIngestJob.worker_id == worker_id,
+                )
+                .values(
+                    status=IngestJobStatus.ERROR if error else IngestJobStatus.SUCCESS,
+                    error_message=error,
+                    completed_at=datetime.utcnow(),
+                    heartbeat_at=None,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+            return result.rowcount == 1
+
+    # ------------------------------------------------------------------
+    # Execution
+    # ------------------------------------------------------------------
+
+    async def run_job(
+        self,
+        job_id: str,
+        keepa_service_factory: Callable[[], Awaitable[Any]],
+        analyze: AnalyzeFn,
+        normalize: Callable[[str], str],
+        chunk_size: int = MAX_ASINS_PER_REQUEST,
+    ) -> Optional[IngestJobStatus]:
+        """
+        Process the identifiers of a job that have no result yet.
+
+        Returns:
+            Final status, or None if the job could not be claimed or another
+            worker took it over meanwhile (that worker finishes it)
+        """
+        job = await self.claim(job_id)
+        if job is None:
+            return None
+
+        done = await self.completed_positions(job_id)
+        remaining = [
+            (position, identifier)
+            for position, identifier in enumerate(job.identifiers)
+            if position not in done
+        ]
+        options = job.options or {}
+        trace_id = job.trace_id or "-"
+        logger.info(
+            f"[{trace_id}] [INGEST] Job {job_id}: {len(remaining)}/{job.total_items} identifiers "
+            f"to process (attempt {job.attempts})"
+        )
+
+        heartbeat = asyncio.create_task(self._heartbeat_loop(job_id))
+        try:
+            keepa_service = await keepa_service_factory()
+            async with keepa_service:
+                for start in range(0, len(remaining), chunk_size):
+                    chunk = remaining[start:start + chunk_size]
+                    results = await self._process_chunk(
+                        chunk, job.config, options, keepa_service, analyze, normalize, trace_id
+                    )
+                    await self.record_chunk(job_id, results)
+        except asyncio.CancelledError:
+            # Shutdown: release the claim so the next start resumes the job
+            # right away (a crash instead leaves a heartbeat that goes stale)
+            heartbeat.cancel()
+            try:
+                await self.release(job_id)
+            except Exception as e:
+                logger.warning(f"[{trace_id}] [INGEST] Could not release job {job_id}: {e}")
+            raise
+        except ClaimLostError:
+            logger.warning(f"[{trace_id}] [INGEST] Job {job_id} taken over by another worker - stopping")
+            return None
+        except Exception as e:
+            logger.error(f"[{trace_id}] [INGEST] Job {job_id} failed: {e}")
+            if not await self.finish(job_id, error=str(e)):
+                logger.warning(f"[{trace_id}] [INGEST] Job {job_id} taken over by another worker - not marked failed")
+                return None
+            return IngestJobStatus.ERROR
+        finally:
+            heartbeat.cancel()
+
+        if not await self.finish(job_id):
+            logger.warning(f"[{trace_id}] [INGEST] Job {job_id} taken over by another worker - not marked done")
+            return None
+        logger.info(f"[{trace_id}] [INGEST] Job {job_id} completed")
+        return IngestJobStatus.SUCCESS
+
+    async def _process_chunk(self, chunk, config, options, keepa_service, analyze, normalize, trace_id):
+        normalized_ids = [normalize(identifier) for _, identifier in chunk]
+        products = await keepa_service.get_products_batch(
+            normalized_ids,
+            force_refresh=options.get("force_refresh", False)
+        )
+
+        results = []
+        for (position, identifier), normalized_id in zip(chunk, normalized_ids):
+            row = {"position": position, "identifier": identifier[:50], "asin": None, "analysis": None, "error": None}
+            keepa_data = products.get(normalized_id)
+            if keepa_data is None:
+                row.update(status="not_found", error="Product not found in Keepa")
+                results.append(row)
+                continue
+            asin = keepa_data.get("asin", normalized_id)
+            try:
+                analysis = await analyze(asin, keepa_data, config, keepa_service, options)
+                payload = analysis.model_dump(mode="json") if hasattr(analysis, "model_dump") else analysis
+                row.update(status="success", asin=asin, analysis=_json_safe(payload))
+            except Exception as e:
+                logger.error(f"[{trace_id}] Failed processing {identifier}: {e}")
+                row.update(status="error", error=str(e))
+            results.append(row)
+        return results
+
+    async def _heartbeat_loop(self, job_id: str):
+        while True:
+            await asyncio.sleep(HEARTBEAT_INTERVAL_SECONDS)
+            try:
+                if not await self.heartbeat(job_id):
+                    # The next record_chunk stops the run
+                    logger.warning(f"[INGEST] Job {job_id} taken over by another worker")
+                    return
+            except Exception as e:
+                logger.warning(f"[INGEST] Heartbeat failed for job {job_id}: {e}")
+
+
+__all__ = [
+    "INGEST_JOB_KIND",
+    "ClaimLostError",
+    "KeepaIngestJobService",
+]
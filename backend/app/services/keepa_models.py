@@ -22,10 +22,24 @@ ENDPOINT_COSTS = {
     "seller": 1,         # 1 token per seller
 }
 
+# Keepa /product accepts up to 100 comma-separated ASINs per request
+MAX_ASINS_PER_REQUEST = 100
+
+# Keepa domain id -> keepa library domain code
+DOMAIN_CODES = {
+    1: 'US', 2: 'GB', 3: 'DE', 4: 'FR', 5: 'JP',
+    6: 'CA', 7: 'CN', 8: 'IT', 9: 'ES', 10: 'IN',
+    11: 'MX', 12: 'BR'
+}
+
 # Safety thresholds
 MIN_BALANCE_THRESHOLD = 10  # Refuse requests if balance < 10 tokens
 SAFETY_BUFFER = 20          # Warn if balance < 20 tokens
 
+# Re-read the balance from Keepa's free /token endpoint when no response
+# has reported it for this long (other processes spend the same key)
+BALANCE_MAX_AGE_SECONDS = 60
+
 
 class CircuitState(Enum):
     """Circuit breaker states."""
@@ -39,7 +53,8 @@ class CacheEntry:
     """Cache entry with TTL."""
     data: Any
     expires_at: datetime
-    cache_type: str  # 'meta', 'pricing', 'bsr'
+    cache_type: str  # 'meta', 'history', 'pricing', 'bsr'
+    size_bytes: int = 0  # Estimated serialized size (for memory cap)
 
     def is_expired(self) -> bool:
         return datetime.now() > self.expires_at
@@ -105,6 +120,8 @@ class CircuitBreaker:
 __all__ = [
     # Constants
     'ENDPOINT_COSTS',
+    'MAX_ASINS_PER_REQUEST',
+    'DOMAIN_CODES',
     'MIN_BALANCE_THRESHOLD',
     'SAFETY_BUFFER',
 
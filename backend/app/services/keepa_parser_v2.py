@@ -11,7 +11,7 @@ Last Modified: 2025-11-27 - SRP refactor: split into modules
 from datetime import datetime
 from decimal import Decimal
 import decimal
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any
 import logging
 
 from app.models.keepa_models import ProductStatus
@@ -23,6 +23,8 @@ from app.utils.keepa_utils import (
 
 # Import from new split modules
 from app.services.keepa_constants import KeepaCSVType, KEEPA_CONDITION_CODES
+from app.services.keepa_history_store import keepa_history_store
+from app.utils.keepa_series import KeepaSeries
 from app.services.keepa_extractors import (
     KeepaRawParser,
     KeepaTimestampExtractor,
@@ -380,8 +382,19 @@ def parse_keepa_product_unified(
     data_section = raw_keepa.get('data', {})
     csv = raw_keepa.get('csv', [])
 
+    # Series already merged into the history store (by KeepaService) are reused
+    # as-is instead of re-walking the whole data section
+    stored_history = (
+        keepa_history_store.get(asin, raw_keepa.get('domainId', 1)) if data_section else None
+    )
+
+    if stored_history is not None and stored_history.covers(data_section):
+        parsed['price_history'] = stored_history.price
+        parsed['bsr_history'] = stored_history.bsr
+        logger.info(f"ASIN {asin}: Using stored history - price_history={len(parsed['price_history'])}, bsr_history={len(parsed['bsr_history'])}")
+
     # Try data section first (preferred - has correct datetime objects)
-    if data_section:
+    elif data_section:
         # Extract price history from data['NEW'] with data['NEW_time']
         price_history = _extract_history_from_data_section(
             data_section, 'NEW', 'NEW_time', is_price=True
@@ -450,7 +463,7 @@ def _extract_history_from_data_section(
     value_key: str,
     time_key: str,
     is_price: bool = True
-) -> List[Tuple[datetime, float]]:
+) -> KeepaSeries:
     """
     Extract history from keepa lib 'data' section which has proper datetime objects.
 
@@ -464,66 +477,23 @@ def _extract_history_from_data_section(
         is_price: If True, values are already in dollars. If False, keep as-is (BSR).
 
     Returns:
-        List of (datetime, value) tuples for use by intrinsic_value_service
+        KeepaSeries of (datetime, value) points for use by intrinsic_value_service
     """
     values = data_section.get(value_key)
     times = data_section.get(time_key)
 
     # Check if data exists (handle numpy arrays properly)
     if values is None or times is None:
-        return []
-
-    # Convert to lists if numpy arrays
-    try:
-        values_list = values.tolist() if hasattr(values, 'tolist') else list(values)
-        times_list = times.tolist() if hasattr(times, 'tolist') else list(times)
-    except (TypeError, AttributeError):
-        return []
-
-    if len(values_list) == 0 or len(times_list) == 0 or len(values_list) != len(times_list):
-        return []
-
-    # Get current time for future timestamp filtering (Gap #4)
-    now = datetime.now()
-
-    result = []
-    for i in range(len(values_list)):
-        value = values_list[i]
-        time = times_list[i]
-
-        # Skip null/invalid values (-1 is Keepa's null marker)
-        if value is None or value == -1:
-            continue
-
-        # Ensure time is datetime
-        if not isinstance(time, datetime):
-            continue
+        return KeepaSeries.empty(is_price)
 
-        # Gap #4: Skip future timestamps (data corruption indicator)
-        if time > now:
-            logger.debug(f"[HISTORY] Skipping future timestamp: {time}")
-            continue
-
-        # Convert value
-        try:
-            # Prices from keepa lib are already in dollars, BSR is integer
-            converted_value = float(value)
-
-            # Gap #3: Skip negative prices (invalid data)
-            if is_price and converted_value < 0:
-                logger.debug(f"[HISTORY] Skipping negative price: {converted_value}")
-                continue
-
-            result.append((time, converted_value))
-        except (ValueError, TypeError):
-            continue
+    # Vectorized filters: -1/None nulls, non-datetime timestamps,
+    # future timestamps (Gap #4) and negative prices (Gap #3)
+    return KeepaSeries.from_datetimes(times, values, is_price=is_price)
 
-    return result
 
-
-def _parse_csv_to_timeseries(csv_array: List[int], is_price: bool = True) -> List[Tuple[int, float]]:
+def _parse_csv_to_timeseries(csv_array: List[int], is_price: bool = True) -> KeepaSeries:
     """
-    Parse Keepa CSV array to timeseries [(timestamp_minutes, value), ...].
+    Parse Keepa CSV array to a KeepaSeries.
 
     NOTE: This is a FALLBACK function. Prefer _extract_history_from_data_section()
     which uses the keepa lib's processed data with correct datetime objects.
@@ -533,36 +503,16 @@ def _parse_csv_to_timeseries(csv_array: List[int], is_price: bool = True) -> Lis
         is_price: If True, divide value by 100 (prices in cents). If False, keep as-is (BSR).
 
     Returns:
-        List of (timestamp_minutes, value) tuples
+        KeepaSeries (Keepa minutes are kept as-is, iteration yields UTC datetimes)
     """
     if not csv_array or not isinstance(csv_array, list):
-        return []
+        return KeepaSeries.empty(is_price)
 
-    timeseries = []
     try:
-        # Keepa CSV format: [timestamp1, value1, timestamp2, value2, ...]
-        # Timestamps are in minutes since Keepa epoch (21 Oct 2000 00:00 UTC)
-        for i in range(0, len(csv_array) - 1, 2):
-            timestamp = csv_array[i]
-            value = csv_array[i + 1]
-
-            # Skip invalid values
-            if value is None or value == KEEPA_NULL_VALUE or value == -1:
-                continue
-
-            # Convert price from cents to dollars if needed
-            if is_price:
-                value_converted = float(value) / KEEPA_PRICE_DIVISOR
-            else:
-                value_converted = float(value)
-
-            timeseries.append((timestamp, value_converted))
-
-        return timeseries
-
+        return KeepaSeries.from_keepa_csv(csv_array, is_price=is_price)
     except (IndexError, ValueError, TypeError) as e:
         logger.warning(f"Error parsing CSV to timeseries: {e}")
-        return []
+        return KeepaSeries.empty(is_price)
 
 
 def _extract_price(array: List, index: int) -> Optional[float]:
@@ -9,10 +9,11 @@ Extracted from keepa_extractors.py for Single Responsibility Principle complianc
 
 from datetime import datetime, timedelta
 from decimal import Decimal
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional
 import logging
 
 from app.services.keepa_constants import KeepaCSVType
+from app.utils.keepa_series import KeepaSeries
 from app.utils.keepa_utils import (
     extract_latest_value,
     keepa_to_datetime,
@@ -130,7 +131,7 @@ class KeepaRawParser:
         return current_values
 
     @staticmethod
-    def extract_history_arrays(raw_data: Dict[str, Any], days_back: int = 90) -> Dict[str, List[Tuple]]:
+    def extract_history_arrays(raw_data: Dict[str, Any], days_back: int = 90) -> Dict[str, KeepaSeries]:
         """
         Extract historical data from product['data'] arrays using keepa library format.
 
@@ -145,7 +146,7 @@ class KeepaRawParser:
             days_back: Number of days of history to extract
 
         Returns:
-            Dictionary with history arrays (bsr_history, price_history, etc.)
+            Dictionary of KeepaSeries (bsr_history, price_history, etc.)
         """
         history_data = {}
         asin = raw_data.get('asin', 'unknown')
@@ -162,53 +163,16 @@ class KeepaRawParser:
         cutoff_date = datetime.now() - timedelta(days=days_back)
 
         # Helper to extract time series from keepa lib format
-        def extract_series(value_key: str, time_key: str, is_price: bool = False) -> List[Tuple]:
+        def extract_series(value_key: str, time_key: str, is_price: bool = False) -> KeepaSeries:
             values = data.get(value_key)
             times = data.get(time_key)
 
             # [OK] Handle numpy arrays - check existence with 'is None', not 'not'
             if values is None or times is None:
-                return []
+                return KeepaSeries.empty(is_price)
 
-            # Convert to list if numpy array
-            try:
-                values_list = values.tolist() if hasattr(values, 'tolist') else list(values)
-                times_list = times.tolist() if hasattr(times, 'tolist') else list(times)
-            except (TypeError, AttributeError):
-                return []
-
-            if len(values_list) == 0 or len(times_list) == 0 or len(values_list) != len(times_list):
-                return []
-
-            series = []
-            for i in range(len(values_list)):
-                value = values_list[i]
-                time = times_list[i]
-
-                # Skip null/invalid values
-                if value is None or value == -1:
-                    continue
-
-                # Apply time filter
-                if isinstance(time, datetime) and time < cutoff_date:
-                    continue
-
-                # Convert price if needed
-                if is_price:
-                    value = float(KeepaRawParser._convert_price(value))
-                else:
-                    value = int(value)
-
-                # Ensure time is datetime
-                if not isinstance(time, datetime):
-                    try:
-                        time = datetime.fromisoformat(str(time))
-                    except (ValueError, TypeError):
-                        continue
-
-                series.append((time, value))
-
-            return series
+            # keepa lib values are already in dollars: no cents conversion here
+            return KeepaSeries.from_datetimes(times, values, is_price=is_price).since(cutoff_date)
 
         # Extract BSR history (SALES)
         bsr_history = extract_series('SALES', 'SALES_time', is_price=False)
@@ -242,33 +206,18 @@ class KeepaRawParser:
         return history_data
 
     @staticmethod
-    def _parse_time_series(data: List, cutoff: int, convert_price: bool = False) -> List[Tuple]:
+    def _parse_time_series(data: List, cutoff: int, convert_price: bool = False) -> KeepaSeries:
         """
         Parse Keepa time series data format: [timestamp, value, timestamp, value, ...]
         """
-        result = []
-
-        for i in range(0, len(data), 2):
-            if i + 1 < len(data):
-                timestamp_keepa = data[i]
-                value = data[i + 1]
-
-                if timestamp_keepa and timestamp_keepa >= cutoff and value != -1:
-                    try:
-                        dt = KeepaRawParser._keepa_to_datetime(timestamp_keepa)
-                        if convert_price:
-                            value = float(KeepaRawParser._convert_price(value))
-                        else:
-                            value = int(value)
-                        result.append((dt, value))
-                    except (ValueError, TypeError) as e:
-                        logger.warning(f"Invalid data point: {e}")
-                        continue
-
-        return result
+        try:
+            return KeepaSeries.from_keepa_csv(data, is_price=convert_price).since_minute(cutoff)
+        except (ValueError, TypeError) as e:
+            logger.warning(f"Invalid time series data: {e}")
+            return KeepaSeries.empty(convert_price)
 
     @staticmethod
-    def _extract_history_from_csv(raw_data: Dict[str, Any], days_back: int = 90) -> Dict[str, List[Tuple]]:
+    def _extract_history_from_csv(raw_data: Dict[str, Any], days_back: int = 90) -> Dict[str, KeepaSeries]:
         """
         Extract history from raw csv arrays (fallback when keepa SDK 'data' section not available).
 
@@ -0,0 +1,106 @@
+"""
+Keepa Service - Product Facets by Volatility
+============================================
+Splits a Keepa product into separately cached facets:
+
+- meta: title, identifiers, category tree, dimensions... (stable, 24h)
+- history: csv / keepa lib 'data' series, sales ranks (append-only)
+- live: stats, offers and last-update stamps (volatile, 30 min)
+
+With facets cached separately, a refresh only needs the live part
+(``history=False``) and reuses the cached history, which keeps the
+payload small.
+
+Separated from keepa_service.py for SRP compliance.
+"""
+
+from typing import Any, Dict
+
+
+# Facet name -> KeepaCache cache_type (TTL)
+FACET_CACHE_TYPES = {
+    'meta': 'meta',
+    'history': 'history',
+    'live': 'pricing',
+}
+
+# Product keys holding time series (only present with history=True)
+HISTORY_KEYS = frozenset({
+    'csv',
+    'data',
+    'salesRanks',
+    'buyBoxSellerIdHistory',
+    'couponHistory',
+    'monthlySoldHistory',
+})
+
+# Product keys describing the current market state
+LIVE_KEYS = frozenset({
+    'stats',
+    'stats_parsed',
+    'offers',
+    'liveOffersOrder',
+    'lastUpdate',
+    'lastPriceChange',
+    'lastRatingUpdate',
+    'lastSoldUpdate',
+    'lastStockUpdate',
+    'availabilityAmazon',
+    'availabilityAmazonDelay',
+    'buyBoxEligibleOfferCounts',
+    'offersSuccessful',
+    'monthlySold',
+    'fbaFees',
+})
+
+
+def split_product(product: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """
+    Split a product dict into its meta, history and live facets.
+
+    Every key lands in exactly one facet, so
+    ``assemble_product(**split_product(p)) == p``.
+    """
+    facets: Dict[str, Dict[str, Any]] = {'meta': {}, 'history': {}, 'live': {}}
+    for key, value in product.items():
+        if key in HISTORY_KEYS:
+            facets['history'][key] = value
+        elif key in LIVE_KEYS:
+            facets['live'][key] = value
+        else:
+            facets['meta'][key] = value
+    return facets
+
+
+def assemble_product(
+    meta: Dict[str, Any],
+    history: Dict[str, Any],
+    live: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Rebuild a product dict from its cached facets."""
+    return {**meta, **history, **live}
+
+
+def merge_live_refresh(
+    refreshed: Dict[str, Any],
+    history: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+    Combine a ``history=False`` refresh with cached history.
+
+    The refresh carries fresh meta and live fields; history keys it may
+    return empty (e.g. ``csv: None``) are replaced by the cached series.
+    """
+    product = {k: v for k, v in refreshed.items() if k not in HISTORY_KEYS}
+    product.update(history)
+    return product
+
+
+__all__ = [
+    'FACET_CACHE_TYPES',
+    'HISTORY_KEYS',
+    'LIVE_KEYS',
+    'split_product',
+    'assemble_product',
+    'merge_live_refresh',
+]
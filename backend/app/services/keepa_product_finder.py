@@ -27,6 +27,12 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.services.config_adapter import ConfigServiceAdapter
 from app.services.keepa_service import KeepaService, ENDPOINT_COSTS
 from app.services.cache_service import CacheService
+from app.services.product_finder_scoring import (
+    recommendation_thresholds,
+    score_product_batch,
+    select_top_products,
+)
+from app.services.scoring_profile import STRATEGY_VELOCITY_TIERS, fallback_scoring_profile
 from app.schemas.config import CategoryConfig
 
 logger = logging.getLogger(__name__)
@@ -37,6 +43,9 @@ BESTSELLERS_COST = 50  # tokens per bestsellers call
 PRODUCT_FINDER_COST = 10  # tokens per Product Finder /query call
 FILTERING_COST_PER_ASIN = 1  # tokens per ASIN in filtering
 
+# Phase 9: BSR sub-segments queried concurrently (bounded by token budget)
+MAX_SUBSEGMENT_CONCURRENCY = 3
+
 # Phase 6.2: Root category mapping (Product Finder only supports root categories)
 # Map subcategories to their root category for Product Finder queries
 ROOT_CATEGORY_MAPPING = {
@@ -350,10 +359,16 @@ class KeepaProductFinderService:
             max_fba_sellers: Maximum FBA sellers (competition filter)
             exclude_amazon_seller: Exclude products where Amazon sells
 
+        Segments run concurrently, as many at once as the local token budget
+        covers (see _subsegment_concurrency). Every segment is queried and
+        results are merged in segment order, so the output does not depend
+        on which segment answers first.
+
         Returns:
-            Merged list of ASINs from all sub-segments, deduplicated
+            Merged list of ASINs from all sub-segments (in segment order),
+            deduplicated
 
-        Token cost: ~30 tokens (3 queries x 10 tokens each)
+        Token cost: ~30 tokens (3 queries x 10 tokens each) + post-filtering
         """
         # Calculate sub-segment boundaries
         bsr_range = bsr_max - bsr_min
@@ -372,54 +387,71 @@ class KeepaProductFinderService:
             f"[{segments[2][0]:,}-{segments[2][1]:,}]"
         )
 
-        # Query each segment (sequentially to avoid rate limits)
-        all_asins = []
         results_per_segment = max(20, max_results // 3)  # Distribute results across segments
+        post_filter = exclude_amazon_seller or max_fba_sellers is not None
+        concurrency = self._subsegment_concurrency(results_per_segment, post_filter)
+        limiter = asyncio.Semaphore(concurrency)
 
-        for i, (seg_min, seg_max) in enumerate(segments):
-            try:
-                segment_asins = await self._single_product_finder_query(
-                    domain=domain,
-                    root_category=root_category,
-                    bsr_min=seg_min,
-                    bsr_max=seg_max,
-                    price_min=price_min,
-                    price_max=price_max,
-                    max_results=results_per_segment,
-                    max_fba_sellers=max_fba_sellers,
-                    exclude_amazon_seller=exclude_amazon_seller
-                )
+        segment_results: Dict[int, List[str]] = {}
+
+        async def query_segment(i: int, seg_min: int, seg_max: int):
+            async with limiter:
+                try:
+                    segment_asins = await self._single_product_finder_query(
+                        domain=domain,
+                        root_category=root_category,
+                        bsr_min=seg_min,
+                        bsr_max=seg_max,
+                        price_min=price_min,
+                        price_max=price_max,
+                        max_results=results_per_segment,
+                        max_fba_sellers=max_fba_sellers,
+                        exclude_amazon_seller=exclude_amazon_seller
+                    )
+                except Exception as e:
+                    logger.warning(f"[PRODUCT_FINDER] Segment {i+1} failed: {e}")
+                    return
 
                 logger.info(
                     f"[PRODUCT_FINDER] Segment {i+1}/3 (BSR {seg_min:,}-{seg_max:,}): "
                     f"{len(segment_asins)} ASINs"
                 )
 
-                all_asins.extend(segment_asins)
+                segment_results[i] = segment_asins
 
-                # Small delay between segments to avoid rate limiting
-                if i < len(segments) - 1:
-                    await asyncio.sleep(0.5)
+        # No early stop: a segment answering first must not crowd out the others
+        await asyncio.gather(*(
+            query_segment(i, seg_min, seg_max)
+            for i, (seg_min, seg_max) in enumerate(segments)
+        ))
 
-            except Exception as e:
-                logger.warning(f"[PRODUCT_FINDER] Segment {i+1} failed: {e}")
-                continue
-
-        # Deduplicate while preserving order
-        seen = set()
-        unique_asins = []
-        for asin in all_asins:
-            if asin not in seen:
-                seen.add(asin)
-                unique_asins.append(asin)
+        # Deduplicate in segment order (lower BSR segment first)
+        all_asins = [asin for i in sorted(segment_results) for asin in segment_results[i]]
+        unique_asins = list(dict.fromkeys(all_asins))
 
         logger.info(
             f"[PRODUCT_FINDER] Sub-segments total: {len(unique_asins)} unique ASINs "
-            f"(from {len(all_asins)} total)"
+            f"(from {len(all_asins)} total, concurrency {concurrency})"
         )
 
         return unique_asins[:max_results]
 
+    def _subsegment_concurrency(self, results_per_segment: int, post_filter: bool) -> int:
+        """
+        Number of sub-segments to query at once within the local token budget.
+
+        A segment costs one /query plus, with post-filtering, one token per
+        ASIN of the /product call. Only segments the throttle can cover
+        without waiting run concurrently (always at least one).
+        """
+        segment_cost = PRODUCT_FINDER_COST
+        if post_filter:
+            per_page = max(50, min(100, results_per_segment))
+            segment_cost += per_page * FILTERING_COST_PER_ASIN
+
+        affordable = self.keepa_service.throttle.available_tokens // segment_cost
+        return max(1, min(MAX_SUBSEGMENT_CONCURRENCY, affordable))
+
     async def _single_product_finder_query(
         self,
         domain: int,
@@ -984,209 +1016,96 @@ class KeepaProductFinderService:
         products = response.get("products", []) if response else []
 
         # Step 3: Apply scoring and filters (with cache per product)
-        scored_products = []
         scoring_cache_hits = 0
         scoring_cache_misses = 0
 
-        # Get effective config - use default if config service fails
+        # Compiled scoring profile (cached per config version and strategy) -
+        # use the default profile if config service fails
         try:
-            effective_config = await self.config_service.get_effective_config(category_id=category)
+            profile = await self.config_service.get_scoring_profile(
+                category_id=category, strategy=strategy
+            )
         except Exception as e:
             logger.warning(f"Config service failed, using defaults: {e}")
-            # Configuration par defaut avec structure attendue par le code
-            # Doit matcher l'interface EffectiveConfig avec effective_roi, effective_fees, effective_velocity
-            from types import SimpleNamespace
-            effective_config = SimpleNamespace(
-                effective_roi=SimpleNamespace(
-                    source_price_factor=Decimal("0.4"),
-                    excellent_threshold=Decimal("50"),
-                    target=Decimal("30"),
-                    min_acceptable=Decimal("15")
-                ),
-                effective_fees=SimpleNamespace(
-                    referral_fee_percent=Decimal("15"),
-                    fba_base_fee=Decimal("2.50"),
-                    fba_per_pound=Decimal("0.40"),
-                    closing_fee=Decimal("1.80"),
-                    prep_fee=Decimal("0.20"),
-                    shipping_cost=Decimal("0.40")
-                ),
-                effective_velocity=SimpleNamespace(
-                    tiers=[
-                        SimpleNamespace(bsr_threshold=10000, min_score=80, max_score=100),
-                        SimpleNamespace(bsr_threshold=50000, min_score=60, max_score=80),
-                        SimpleNamespace(bsr_threshold=100000, min_score=40, max_score=60),
-                        SimpleNamespace(bsr_threshold=500000, min_score=20, max_score=40),
-                    ]
-                )
-            )
-
-        # Phase 8: Strategy-specific velocity tiers
-        # Override velocity tiers based on strategy for appropriate BSR ranges
-        from types import SimpleNamespace
-        strategy_velocity_tiers = {
-            # Textbook Standard: BSR 100K-250K should map to good velocity scores
-            # BSR 100K = top of range = higher velocity
-            # BSR 250K = bottom of range = lower velocity
-            "textbooks_standard": [
-                SimpleNamespace(bsr_threshold=100000, min_score=70, max_score=85),   # BSR <= 100K: excellent
-                SimpleNamespace(bsr_threshold=150000, min_score=55, max_score=70),   # BSR 100K-150K: good
-                SimpleNamespace(bsr_threshold=200000, min_score=40, max_score=55),   # BSR 150K-200K: moderate
-                SimpleNamespace(bsr_threshold=250000, min_score=30, max_score=40),   # BSR 200K-250K: acceptable
-                SimpleNamespace(bsr_threshold=500000, min_score=15, max_score=30),   # BSR > 250K: low
-            ],
-            # Textbook Patience: BSR 250K-400K should map to reasonable velocity scores
-            # These books rotate slower, so velocity expectations are lower
-            "textbooks_patience": [
-                SimpleNamespace(bsr_threshold=200000, min_score=60, max_score=75),   # BSR <= 200K: excellent
-                SimpleNamespace(bsr_threshold=250000, min_score=50, max_score=60),   # BSR 200K-250K: very good
-                SimpleNamespace(bsr_threshold=300000, min_score=40, max_score=50),   # BSR 250K-300K: good
-                SimpleNamespace(bsr_threshold=350000, min_score=30, max_score=40),   # BSR 300K-350K: moderate
-                SimpleNamespace(bsr_threshold=400000, min_score=25, max_score=30),   # BSR 350K-400K: acceptable
-                SimpleNamespace(bsr_threshold=500000, min_score=15, max_score=25),   # BSR > 400K: low
-            ],
-            # Legacy textbooks (backward compat)
-            "textbooks": [
-                SimpleNamespace(bsr_threshold=100000, min_score=65, max_score=80),
-                SimpleNamespace(bsr_threshold=200000, min_score=45, max_score=65),
-                SimpleNamespace(bsr_threshold=300000, min_score=30, max_score=45),
-                SimpleNamespace(bsr_threshold=500000, min_score=15, max_score=30),
-            ]
-        }
+            profile = fallback_scoring_profile(strategy)
 
-        # Apply strategy-specific velocity tiers if applicable
-        if strategy and strategy in strategy_velocity_tiers:
+        if strategy in STRATEGY_VELOCITY_TIERS:
             logger.info(f"[SCORING] Applying {strategy} velocity tiers")
-            effective_config = SimpleNamespace(
-                effective_roi=effective_config.effective_roi,
-                effective_fees=effective_config.effective_fees,
-                effective_velocity=SimpleNamespace(
-                    tiers=strategy_velocity_tiers[strategy]
-                )
-            )
-
-        for product in products:
-            try:
-                asin = product.get("asin")
-                if not asin:
-                    continue
-
-                # Try scoring cache first (skip if force_refresh or strategy-specific)
-                # Phase 8: Bypass cache when strategy is specified because velocity/recommendation
-                # scoring depends on strategy type. Cache stores default scoring only.
-                cached_scoring = None
-                use_cache = self.cache_service and not force_refresh and not strategy
-                if use_cache:
-                    cached_scoring = await self.cache_service.get_scoring_cache(asin)
-
-                if cached_scoring and use_cache:
-                    # Cache HIT - use cached scoring (only for default strategy)
-                    logger.debug(f"[SCORING] Cache HIT for ASIN {asin}")
-                    scoring_cache_hits += 1
-
-                    # Apply filters on cached data
-                    if min_roi and cached_scoring.get("roi_percent", 0) < min_roi:
-                        continue
-                    if min_velocity and cached_scoring.get("velocity_score", 0) < min_velocity:
-                        continue
-
-                    scored_products.append(cached_scoring)
-                else:
-                    # Cache MISS - calculate scoring
-                    logger.debug(f"[SCORING] Cache MISS for ASIN {asin} - calculating")
-                    scoring_cache_misses += 1
-
-                    # Extract metrics
-                    title = product.get("title", "Unknown")
-                    stats = product.get("stats", {})
-                    current = stats.get("current", [None, None, None, None])
-
-                    # Use NEW price (index 1), fallback to AMAZON price (index 0)
-                    # Keepa current[] array indices:
-                    #   [0] = AMAZON price (often -1 if unavailable)
-                    #   [1] = NEW price (3rd party sellers - preferred!)
-                    #   [3] = Sales Rank (BSR)
-                    price_cents = None
-                    if len(current) > 1 and current[1] is not None and current[1] > 0:
-                        price_cents = current[1]  # NEW price (preferred)
-                    elif len(current) > 0 and current[0] is not None and current[0] > 0:
-                        price_cents = current[0]  # AMAZON price (fallback)
-
-                    bsr = current[3] if len(current) > 3 else None
-
-                    if not price_cents or not bsr:
-                        continue
-
-                    # Apply "Exclude Amazon as seller" filter (Phase 6.1)
-                    # stats.current[0] = AMAZON price - if > 0, Amazon is selling
-                    if exclude_amazon_seller:
-                        amazon_price = current[0] if len(current) > 0 else None
-                        if amazon_price is not None and amazon_price > 0:
-                            logger.debug(
-                                f"[SCORING] Skipping ASIN {asin}: "
-                                f"Amazon is a seller (price: ${amazon_price/100:.2f})"
-                            )
-                            continue
 
-                    price = Decimal(str(price_cents / 100))
+        # Scoring cache first (skip if force_refresh or strategy-specific)
+        # Phase 8: Bypass cache when strategy is specified because velocity/recommendation
+        # scoring depends on strategy type. Cache stores default scoring only.
+        use_cache = self.cache_service and not force_refresh and not strategy
+        cached_by_position: Dict[int, Dict[str, Any]] = {}
+        to_score: List[Tuple[int, Dict[str, Any]]] = []
 
-                    # Calculate ROI
-                    source_price = price * effective_config.effective_roi.source_price_factor
-                    fees = self._calculate_fees(price, effective_config.effective_fees)
-                    profit = price - source_price - fees
-                    roi_percent = float((profit / source_price) * Decimal("100"))
-
-                    # Apply ROI filter
-                    if min_roi and roi_percent < min_roi:
-                        continue
+        # One IN query for the whole batch
+        cached_by_asin: Dict[str, Dict[str, Any]] = {}
+        if use_cache:
+            try:
+                cached_by_asin = await self.cache_service.get_scoring_cache_many(
+                    [product["asin"] for product in products if product.get("asin")]
+                )
+            except Exception as e:
+                logger.error(f"Error reading scoring cache: {e}")
 
-                    # Calculate velocity score
-                    velocity_score = self._calculate_velocity_score(
-                        bsr,
-                        effective_config.effective_velocity.tiers
-                    )
+        for position, product in enumerate(products):
+            asin = product.get("asin")
+            if not asin:
+                continue
 
-                    # Apply velocity filter
-                    if min_velocity and velocity_score < min_velocity:
-                        continue
+            cached_scoring = cached_by_asin.get(asin)
+            if cached_scoring:
+                # Cache HIT - use cached scoring (only for default strategy)
+                logger.debug(f"[SCORING] Cache HIT for ASIN {asin}")
+                scoring_cache_hits += 1
 
-                    # Get recommendation (Phase 8: strategy-aware thresholds)
-                    recommendation = self._get_recommendation(
-                        roi_percent,
-                        velocity_score,
-                        effective_config,
-                        strategy=strategy
-                    )
+                # Apply filters on cached data
+                if min_roi and cached_scoring.get("roi_percent", 0) < min_roi:
+                    continue
+                if min_velocity and cached_scoring.get("velocity_score", 0) < min_velocity:
+                    continue
 
-                    scoring_result = {
-                        "asin": asin,
-                        "title": title[:100],  # Truncate long titles
-                        "price": float(price),
-                        "current_price": float(price),  # Alias for frontend compatibility
-                        "bsr": bsr,
-                        "roi_percent": roi_percent,
-                        "velocity_score": velocity_score,
-                        "recommendation": recommendation
+                cached_by_position[position] = cached_scoring
+            else:
+                scoring_cache_misses += 1
+                to_score.append((position, product))
+
+        # Cache MISS - score all remaining products in one vectorized pass
+        batch_results = score_product_batch(
+            [product for _, product in to_score],
+            profile,
+            min_roi=min_roi,
+            min_velocity=min_velocity,
+            exclude_amazon_seller=exclude_amazon_seller
+        )
+        logger.debug(f"[SCORING] Batch scored {len(to_score)} products, {len(batch_results)} passed filters")
+
+        # Results are the products that passed, in input order: match them
+        # by position so a duplicate ASIN keeps both of its products
+        scored_by_position = dict(cached_by_position)
+        batch_positions = []
+        remaining = iter(to_score)
+        for scoring_result in batch_results:
+            position = next(p for p, product in remaining if product["asin"] == scoring_result["asin"])
+            batch_positions.append(position)
+            scored_by_position[position] = scoring_result
+
+        # Store in cache with one upsert (Phase 6: removed keepa_data param per production schema)
+        if self.cache_service and batch_results:
+            try:
+                await self.cache_service.set_scoring_cache_many([
+                    {
+                        **scoring_result,
+                        "title": products[position].get("title", "Unknown"),
                     }
-
-                    # Store in cache (Phase 6: removed keepa_data param per production schema)
-                    if self.cache_service:
-                        await self.cache_service.set_scoring_cache(
-                            asin=asin,
-                            title=title,
-                            price=float(price),
-                            bsr=bsr,
-                            roi_percent=roi_percent,
-                            velocity_score=velocity_score,
-                            recommendation=recommendation
-                        )
-                        logger.debug(f"[SCORING] Cached ASIN {asin} (ROI: {roi_percent:.1f}%)")
-
-                    scored_products.append(scoring_result)
-
+                    for position, scoring_result in zip(batch_positions, batch_results)
+                ])
+                logger.debug(f"[SCORING] Cached {len(batch_results)} ASINs")
             except Exception as e:
-                logger.error(f"Error scoring product {asin}: {e}")
-                continue
+                logger.error(f"Error caching scoring results: {e}")
+
+        scored_products = [scored_by_position[position] for position in sorted(scored_by_position)]
 
         # Log cache metrics
         total_products = scoring_cache_hits + scoring_cache_misses
@@ -1197,85 +1116,10 @@ class KeepaProductFinderService:
                 f"({scoring_cache_hits}/{total_products})"
             )
 
-
         # Phase 9: Balanced selection across BSR range
         # Instead of pure score sorting (which clusters at low BSR),
         # we ensure representation from all BSR segments
-        if bsr_min is not None and bsr_max is not None and len(scored_products) > max_results:
-            # Calculate BSR segments (same logic as sub-segments discovery)
-            bsr_range = bsr_max - bsr_min
-            segment_size = bsr_range // 3
-            segments_bounds = [
-                (bsr_min, bsr_min + segment_size),                    # Lower third
-                (bsr_min + segment_size, bsr_min + 2 * segment_size), # Middle third
-                (bsr_min + 2 * segment_size, bsr_max + 1)             # Upper third (+1 for inclusive)
-            ]
-
-            # Group products by BSR segment
-            segment_products = [[], [], []]
-            for p in scored_products:
-                product_bsr = p.get("bsr", 0)
-                for i, (seg_min, seg_max) in enumerate(segments_bounds):
-                    if seg_min <= product_bsr < seg_max:
-                        segment_products[i].append(p)
-                        break
-                else:
-                    # Product outside expected range - add to closest segment
-                    if product_bsr < bsr_min:
-                        segment_products[0].append(p)
-                    else:
-                        segment_products[2].append(p)
-
-            # Sort each segment by score internally
-            for segment in segment_products:
-                segment.sort(
-                    key=lambda p: p["roi_percent"] * 0.6 + p["velocity_score"] * 0.4,
-                    reverse=True
-                )
-
-            # Take balanced representation from each segment
-            results_per_segment = max(1, max_results // 3)
-            balanced_results = []
-
-            for i, segment in enumerate(segment_products):
-                # Take up to results_per_segment from each segment
-                segment_take = segment[:results_per_segment]
-                balanced_results.extend(segment_take)
-                logger.debug(
-                    f"[SCORING] Segment {i+1}: {len(segment)} total, taking {len(segment_take)}"
-                )
-
-            # If we need more products, take remaining from any segment
-            remaining_needed = max_results - len(balanced_results)
-            if remaining_needed > 0:
-                all_remaining = []
-                for i, segment in enumerate(segment_products):
-                    all_remaining.extend(segment[results_per_segment:])
-                all_remaining.sort(
-                    key=lambda p: p["roi_percent"] * 0.6 + p["velocity_score"] * 0.4,
-                    reverse=True
-                )
-                balanced_results.extend(all_remaining[:remaining_needed])
-
-            # Final sort by score for display order
-            balanced_results.sort(
-                key=lambda p: p["roi_percent"] * 0.6 + p["velocity_score"] * 0.4,
-                reverse=True
-            )
-
-            logger.info(
-                f"[SCORING] Balanced selection: {len(balanced_results)} products "
-                f"from segments [{len(segment_products[0])}, {len(segment_products[1])}, {len(segment_products[2])}]"
-            )
-
-            return balanced_results[:max_results]
-        else:
-            # Fallback to simple score sorting if no BSR range specified
-            scored_products.sort(
-                key=lambda p: p["roi_percent"] * 0.6 + p["velocity_score"] * 0.4,
-                reverse=True
-            )
-            return scored_products[:max_results]
+        return select_top_products(scored_products, max_results, bsr_min=bsr_min, bsr_max=bsr_max)
 
     def _calculate_fees(self, price: Decimal, fees_config, weight_lbs: Decimal = Decimal("1.0")) -> Decimal:
         """
@@ -1293,16 +1137,35 @@ class KeepaProductFinderService:
             Total fees as Decimal
         """
         from app.core.fees_config import calculate_fees_from_unified_config
+
+        result = calculate_fees_from_unified_config(
+            sell_price=price,
+            weight_lbs=weight_lbs,
+            fee_config=self._unified_fee_config(fees_config)
+        )
+
+        return result["total_fees"]
+
+    def _unified_fee_config(self, fees_config):
+        """
+        Convert a fee configuration to FeeConfigUnified.
+
+        Args:
+            fees_config: Fee configuration (dict, FeeConfigUnified, or legacy object)
+
+        Returns:
+            FeeConfigUnified
+        """
         from app.schemas.config_types import fee_schema_to_unified, FeeConfigUnified
 
         # Convert legacy config to unified type if needed
         if isinstance(fees_config, dict):
-            unified_config = fee_schema_to_unified(fees_config)
+            return fee_schema_to_unified(fees_config)
         elif isinstance(fees_config, FeeConfigUnified):
-            unified_config = fees_config
+            return fees_config
         else:
             # Legacy config object - convert field names
-            unified_config = FeeConfigUnified(
+            return FeeConfigUnified(
                 referral_fee_pct=getattr(fees_config, 'referral_fee_percent', getattr(fees_config, 'referral_fee_pct', Decimal("15.0"))),
                 closing_fee=getattr(fees_config, 'closing_fee', Decimal("1.80")),
                 fba_fee_base=getattr(fees_config, 'fba_base_fee', getattr(fees_config, 'fba_fee_base', Decimal("2.50"))),
@@ -1311,14 +1174,6 @@ class KeepaProductFinderService:
                 prep_fee=getattr(fees_config, 'prep_fee', Decimal("0.20")),
             )
 
-        result = calculate_fees_from_unified_config(
-            sell_price=price,
-            weight_lbs=weight_lbs,
-            fee_config=unified_config
-        )
-
-        return result["total_fees"]
-
     def _calculate_velocity_score(self, bsr: int, tiers: list) -> float:
         """
         Calculer velocity score base sur BSR et tiers.
@@ -1373,36 +1228,7 @@ class KeepaProductFinderService:
         roi_config = config.effective_roi
 
         # Phase 8: Strategy-specific velocity thresholds
-        # Default thresholds (Smart Velocity - BSR 10K-80K, fast rotation)
-        velocity_thresholds = {
-            "strong_buy": 80,
-            "buy": 60,
-            "consider": 40
-        }
-
-        # Textbook Standard: Balanced thresholds (BSR 100K-250K)
-        # Rotation 7-14 days, moderate velocity expectations
-        if strategy == "textbooks_standard":
-            velocity_thresholds = {
-                "strong_buy": 50,
-                "buy": 40,
-                "consider": 30
-            }
-        # Textbook Patience: Lower thresholds (BSR 250K-400K)
-        # Rotation 4-6 weeks, slower velocity is acceptable
-        elif strategy == "textbooks_patience":
-            velocity_thresholds = {
-                "strong_buy": 40,
-                "buy": 30,
-                "consider": 20
-            }
-        # Legacy textbooks
-        elif strategy == "textbooks":
-            velocity_thresholds = {
-                "strong_buy": 50,
-                "buy": 40,
-                "consider": 30
-            }
+        velocity_thresholds = recommendation_thresholds(strategy)
 
         if roi_percent >= float(roi_config.excellent_threshold) and velocity_score >= velocity_thresholds["strong_buy"]:
             return "STRONG_BUY"
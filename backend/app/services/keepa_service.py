@@ -8,12 +8,17 @@ Sub-modules:
 - keepa_models: Data classes, enums, and constants
 - keepa_cache: Multi-tier caching system
 - keepa_throttle: Rate limiting and token management
+- keepa_concurrency: Adaptive (AIMD) limit on concurrent HTTP calls
+- keepa_client_pool: Process-wide pool of keepa library clients
+- keepa_single_flight: Deduplication of concurrent identical requests
+- keepa_product_facets: Product split into meta/history/live cache facets
+- keepa_history_store: Per-ASIN history series extended incrementally
 """
 
 import asyncio
 import time
 import logging
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Iterable, Optional, List, Tuple
 
 import httpx
 from tenacity import retry, wait_exponential, stop_after_attempt, retry_if_exception_type
@@ -21,15 +26,34 @@ from tenacity import retry, wait_exponential, stop_after_attempt, retry_if_excep
 # Import from specialized modules
 from .keepa_models import (
     ENDPOINT_COSTS,
+    MAX_ASINS_PER_REQUEST,
+    DOMAIN_CODES,
     MIN_BALANCE_THRESHOLD,
     SAFETY_BUFFER,
+    BALANCE_MAX_AGE_SECONDS,
     CircuitState,
     CacheEntry,
     TokenMetrics,
     CircuitBreaker,
 )
 from .keepa_cache import KeepaCache
-from .keepa_throttle import KeepaThrottle
+from .keepa_cache_l2 import get_l2_backend
+from .keepa_product_facets import (
+    FACET_CACHE_TYPES,
+    HISTORY_KEYS,
+    assemble_product,
+    merge_live_refresh,
+    split_product,
+)
+from .keepa_throttle import KeepaThrottle, keepa_throttle
+from .keepa_concurrency import (
+    DEFAULT_MAX_LIMIT as MAX_CONCURRENCY,
+    AdaptiveConcurrencyLimiter,
+    keepa_concurrency,
+)
+from .keepa_client_pool import KeepaClientPool, get_client_pool
+from .keepa_single_flight import KeepaSingleFlight, keepa_single_flight
+from .keepa_history_store import KeepaHistoryStore, keepa_history_store
 from ..core.exceptions import InsufficientTokensError, KeepaRateLimitError
 
 
@@ -41,44 +65,44 @@ class KeepaService:
     - Async HTTP client with timeouts
     - Token-aware throttling and budgeting
     - Circuit breaker for fault tolerance
-    - Multi-tier caching (meta, pricing, BSR)
+    - Multi-tier caching (meta, history, pricing, BSR)
     - Comprehensive metrics and logging
     """
 
     BASE_URL = "https://api.keepa.com"
 
-    def __init__(self, api_key: str, concurrency: int = 3):
+    def __init__(self, api_key: str):
         self.api_key = api_key
-        self.concurrency = concurrency
 
-        # HTTP client with reasonable timeouts
+        # HTTP client with reasonable timeouts; the pool covers the adaptive
+        # concurrency ceiling
         self.client = httpx.AsyncClient(
             timeout=httpx.Timeout(connect=10, read=30, write=10, pool=5),
-            limits=httpx.Limits(max_keepalive_connections=5, max_connections=10)
+            limits=httpx.Limits(max_keepalive_connections=5, max_connections=MAX_CONCURRENCY)
         )
 
-        # Use KeepaCache for caching
-        self._cache_manager = KeepaCache()
+        # Use KeepaCache for caching (L2 tier shared process-wide when configured)
+        self._cache_manager = KeepaCache(l2=get_l2_backend())
 
         # For backward compatibility - expose internal cache dict
         self._cache = self._cache_manager.cache
         self._cache_ttl = self._cache_manager._cache_ttl
 
-        # Rate limiting and circuit breaker
-        self._semaphore = asyncio.Semaphore(concurrency)
-        self._circuit_breaker = CircuitBreaker()
+        # In-flight requests shared process-wide (deduplicates concurrent callers)
+        self.single_flight: KeepaSingleFlight = keepa_single_flight
 
-        # Initialize throttle with production-optimized settings
-        self.throttle = KeepaThrottle(
-            tokens_per_minute=20,
-            burst_capacity=200,  # Increased for smooth AutoSourcing (5 niches x 40 products)
-            warning_threshold=80,  # 40% of burst capacity
-            critical_threshold=40   # 20% of burst capacity
-        )
+        # Per-ASIN history series shared process-wide (incremental refreshes)
+        self.history_store: KeepaHistoryStore = keepa_history_store
+
+        # Shared keepa library clients (process-wide, survives this instance)
+        self.client_pool: KeepaClientPool = get_client_pool(api_key)
 
-        # API balance tracking
-        self.last_api_balance_check = 0
-        self.api_balance_cache: Optional[int] = None
+        # Adaptive (AIMD) concurrency shared process-wide, and circuit breaker
+        self.concurrency_limiter: AdaptiveConcurrencyLimiter = keepa_concurrency
+        self._circuit_breaker = CircuitBreaker()
+
+        # Priority-scheduled token bucket shared process-wide (one Keepa balance)
+        self.throttle: KeepaThrottle = keepa_throttle
 
         # Metrics tracking
         self.metrics = TokenMetrics()
@@ -101,10 +125,14 @@ class KeepaService:
     # BALANCE & THROTTLING
     # =========================================================================
 
-    async def check_api_balance(self) -> int:
+    async def check_api_balance(self, max_age: float = BALANCE_MAX_AGE_SECONDS) -> int:
         """
-        Check current Keepa API token balance.
-        Uses cached value if checked within last 60 seconds.
+        Check current Keepa API token balance. Costs no tokens.
+
+        Every Keepa response carries tokensLeft/refillIn/refillRate, which
+        the process-wide throttle records (the balance ledger). The free
+        /token endpoint is queried only when no response reported the
+        balance within ``max_age`` seconds.
 
         Returns:
             Current token balance from Keepa API
@@ -112,33 +140,32 @@ class KeepaService:
         Note:
             Keepa API returns tokensLeft in the JSON response body, NOT in HTTP headers.
         """
-        now = time.time()
-
-        # Use cached balance if recent (< 60 seconds old)
-        if self.api_balance_cache is not None and (now - self.last_api_balance_check) < 60:
-            return self.api_balance_cache
-
-        # Make lightweight request to get current balance
+        age = self.throttle.balance_age
+        if age is None or age > max_age:
+            await self._fetch_token_status()
+        return self.throttle.keepa_balance
+
+    @property
+    def balance_age_seconds(self) -> Optional[int]:
+        """Seconds since Keepa last reported the balance (None if never)."""
+        age = self.throttle.balance_age
+        return None if age is None else int(age)
+
+    async def _fetch_token_status(self):
+        """Sync the throttle from Keepa's /token endpoint (consumes no tokens)."""
         try:
             response = await self.client.get(
-                f"{self.BASE_URL}/product",
-                params={
-                    "key": self.api_key,
-                    "domain": 1,
-                    "asin": "B00FLIJJSA"  # Known valid ASIN
-                }
+                f"{self.BASE_URL}/token",
+                params={"key": self.api_key}
             )
 
             # Keepa returns tokensLeft in JSON body (NOT in HTTP headers)
             if response.status_code == 200:
                 data = response.json()
-                tokens_left = data.get('tokensLeft')
-
-                if tokens_left is not None:
-                    self.api_balance_cache = int(tokens_left)
-                    self.last_api_balance_check = now
-                    self.logger.info(f"[OK] Keepa API balance: {self.api_balance_cache} tokens")
-                    return self.api_balance_cache
+                if data.get('tokensLeft') is not None:
+                    self.throttle.observe(data)
+                    self.logger.info(f"[OK] Keepa API balance: {data['tokensLeft']} tokens")
+                    return
 
             self.logger.error("[ERROR] Cannot verify Keepa balance (tokensLeft not in response)")
             raise InsufficientTokensError(
@@ -208,9 +235,6 @@ class KeepaService:
         """
         current_balance = await self.check_api_balance()
 
-        # Synchronize local throttle with actual Keepa balance
-        self.throttle.set_tokens(current_balance)
-
         # Warn if balance is low but still above minimum
         if current_balance < SAFETY_BUFFER:
             self.logger.warning(
@@ -262,6 +286,18 @@ class KeepaService:
         """Store data in cache with appropriate TTL."""
         self._cache_manager.set(cache_key, data, cache_type)
 
+    async def _aget_from_cache(self, cache_key: str) -> Optional[Any]:
+        """Get data from cache, falling back to the L2 tier."""
+        return await self._cache_manager.aget(cache_key)
+
+    async def _aset_cache(self, cache_key: str, data: Any, cache_type: str = 'pricing'):
+        """Store data in cache and the L2 tier."""
+        await self._cache_manager.aset(cache_key, data, cache_type)
+
+    async def _aset_cache_many(self, entries: Dict[str, Tuple[Any, str]]):
+        """Store several entries (cache_key -> (data, cache_type)), one L2 write."""
+        await self._cache_manager.aset_many(entries)
+
     def get_cache_stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
         return self._cache_manager.get_stats()
@@ -270,12 +306,28 @@ class KeepaService:
     # HTTP REQUEST
     # =========================================================================
 
+    async def _make_request(self, endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Make HTTP request, sharing identical concurrent requests.
+
+        Callers asking for the same normalized cache key while a request is
+        in flight await that request instead of spending tokens again.
+        """
+        endpoint_name = endpoint.strip('/').split('?')[0]
+        estimated_cost = ENDPOINT_COSTS.get(endpoint_name, 1)
+
+        return await self.single_flight.run(
+            self._get_cache_key(endpoint, params),
+            lambda: self._send_request(endpoint, params),
+            cost=estimated_cost
+        )
+
     @retry(
         wait=wait_exponential(multiplier=2, min=2, max=30),
         stop=stop_after_attempt(4),
         retry=retry_if_exception_type((httpx.TimeoutException, httpx.ConnectError, KeepaRateLimitError))
     )
-    async def _make_request(self, endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    async def _send_request(self, endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
         """Make HTTP request with retry logic and throttling."""
 
         endpoint_name = endpoint.strip('/').split('?')[0]
@@ -294,64 +346,78 @@ class KeepaService:
         params_with_key = {**params, 'key': self.api_key}
         url = f"{self.BASE_URL}{endpoint}"
 
-        try:
-            start_time = time.time()
-
-            async with self._semaphore:  # Concurrency limiting
-                response = await self.client.get(url, params=params_with_key)
-
-            latency_ms = int((time.time() - start_time) * 1000)
+        with self.throttle.in_flight(estimated_cost) as request:
+            try:
+                start_time = time.time()
+
+                async with self.concurrency_limiter.slot() as slot:  # Adaptive concurrency
+                    response = await self.client.get(url, params=params_with_key)
+                    slot.status_code = response.status_code
+
+                latency_ms = int((time.time() - start_time) * 1000)
+
+                safe_params = {k: v for k, v in params.items() if k != 'key'}
+                self.logger.info(
+                    f"Keepa API request",
+                    extra={
+                        "endpoint": endpoint,
+                        "params": safe_params,
+                        "status_code": response.status_code,
+                        "latency_ms": latency_ms
+                    }
+                )
 
-            safe_params = {k: v for k, v in params.items() if k != 'key'}
-            self.logger.info(
-                f"Keepa API request",
-                extra={
-                    "endpoint": endpoint,
-                    "params": safe_params,
-                    "status_code": response.status_code,
-                    "latency_ms": latency_ms
-                }
-            )
+                # Handle rate limiting (HTTP 429)
+                if response.status_code == 429:
+                    self._circuit_breaker.record_failure()
+                    body = self._json_body(response)
+                    # 429 bodies report the balance and refill time too
+                    request.observe(body)
+                    tokens_left = body.get('tokensLeft', response.headers.get('tokens-left', 'unknown'))
+                    retry_after = response.headers.get('retry-after')
+                    retry_seconds = int(retry_after) if retry_after and retry_after.isdigit() else None
+                    self.logger.warning(
+                        f"Rate limited by Keepa API (tokens left: {tokens_left}, retry-after: {retry_after})"
+                    )
+                    raise KeepaRateLimitError(
+                        tokens_left=tokens_left,
+                        endpoint=endpoint,
+                        retry_after=retry_seconds
+                    )
 
-            # Handle rate limiting (HTTP 429)
-            if response.status_code == 429:
-                self._circuit_breaker.record_failure()
-                tokens_left = response.headers.get('tokens-left', 'unknown')
-                retry_after = response.headers.get('retry-after')
-                retry_seconds = int(retry_after) if retry_after and retry_after.isdigit() else None
-                self.logger.warning(
-                    f"Rate limited by Keepa API (tokens left: {tokens_left}, retry-after: {retry_after})"
-                )
-                raise KeepaRateLimitError(
-                    tokens_left=tokens_left,
-                    endpoint=endpoint,
-                    retry_after=retry_seconds
-                )
+                # Handle server errors (HTTP 500)
+                if response.status_code == 500:
+                    self._circuit_breaker.record_failure()
+                    self.logger.error(f"Keepa API server error (HTTP 500)")
+                    raise Exception("HTTP 500: Keepa API internal server error")
 
-            # Handle server errors (HTTP 500)
-            if response.status_code == 500:
-                self._circuit_breaker.record_failure()
-                self.logger.error(f"Keepa API server error (HTTP 500)")
-                raise Exception("HTTP 500: Keepa API internal server error")
+                response.raise_for_status()
+                data = response.json()
 
-            response.raise_for_status()
-            data = response.json()
+                # Token feedback lives in the JSON body (NOT in HTTP headers)
+                if isinstance(data, dict):
+                    request.observe(data)
+                    if data.get('tokensLeft') is not None:
+                        self.metrics.add_usage(
+                            int(data.get('tokensConsumed', estimated_cost)),
+                            int(data['tokensLeft'])
+                        )
 
-            # Extract token info from response if available
-            tokens_left = response.headers.get('tokens-left')
-            if tokens_left:
-                try:
-                    self.metrics.add_usage(1, int(tokens_left))
-                except ValueError:
-                    pass
+                self._circuit_breaker.record_success()
+                return data
 
-            self._circuit_breaker.record_success()
-            return data
+            except (httpx.HTTPStatusError, httpx.RequestError) as e:
+                self._circuit_breaker.record_failure()
+                self.logger.error(f"Keepa API error: {e}")
+                raise
 
-        except (httpx.HTTPStatusError, httpx.RequestError) as e:
-            self._circuit_breaker.record_failure()
-            self.logger.error(f"Keepa API error: {e}")
-            raise
+    @staticmethod
+    def _json_body(response: httpx.Response) -> Dict[str, Any]:
+        try:
+            body = response.json()
+        except ValueError:
+            return {}
+        return body if isinstance(body, dict) else {}
 
     # =========================================================================
     # PRODUCT DATA METHODS
@@ -376,6 +442,275 @@ class KeepaService:
 
         return result
 
+    def _product_cache_key(
+        self,
+        identifier: str,
+        domain: int = 1,
+        stats: int = 180,
+        history: bool = True,
+        offers: int = 20
+    ) -> str:
+        """
+        Key identifying a product fetch (single-flight and non-default caching).
+
+        The full default fetch (stats=180, history, offers=20) keeps the
+        historical key so batch and single lookups share in-flight calls.
+        """
+        params = {'asin': identifier, 'domain': domain}
+        if not self._is_faceted_fetch(stats, history, offers):
+            params.update({'stats': stats, 'history': history, 'offers': offers})
+        return self._get_cache_key('/product', params)
+
+    @staticmethod
+    def _is_faceted_fetch(stats: int, history: bool, offers: int) -> bool:
+        """Full default fetches are cached as meta/history/live facets."""
+        return (stats, history, offers) == (180, True, 20)
+
+    def _facet_cache_key(self, identifier: str, domain: int, facet: str) -> str:
+        """Cache key for one facet (meta, history, live) of a product."""
+        return self._get_cache_key(f'/product/{facet}', {'asin': identifier, 'domain': domain})
+
+    async def _lookup_cached_products(
+        self,
+        identifiers: List[str],
+        domain: int = 1,
+        stats: int = 180,
+        history: bool = True,
+        offers: int = 20
+    ) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+        """
+        Look up products in cache (one L1 pass + one L2 round-trip).
+
+        Returns:
+            (complete products, cached history facets of products whose
+            meta or live facet expired and only need a live refresh)
+        """
+        if not self._is_faceted_fetch(stats, history, offers):
+            keys = {
+                identifier: self._product_cache_key(identifier, domain, stats, history, offers)
+                for identifier in identifiers
+            }
+            cached = await self._cache_manager.aget_many(list(dict.fromkeys(keys.values())))
+            return {i: cached[k] for i, k in keys.items() if cached.get(k)}, {}
+
+        keys = {
+            (identifier, facet): self._facet_cache_key(identifier, domain, facet)
+            for identifier in identifiers
+            for facet in FACET_CACHE_TYPES
+        }
+        cached = await self._cache_manager.aget_many(list(dict.fromkeys(keys.values())))
+
+        complete: Dict[str, Dict[str, Any]] = {}
+        partial: Dict[str, Dict[str, Any]] = {}
+        for identifier in identifiers:
+            facets = {facet: cached.get(keys[(identifier, facet)]) for facet in FACET_CACHE_TYPES}
+            if facets['history'] is None:
+                continue
+            if facets['meta'] is not None and facets['live'] is not None:
+                complete[identifier] = assemble_product(**facets)
+            else:
+                partial[identifier] = facets['history']
+
+        return complete, partial
+
+    def _product_cache_entries(
+        self,
+        identifier: str,
+        product: Dict[str, Any],
+        domain: int = 1,
+        stats: int = 180,
+        history: bool = True,
+        offers: int = 20,
+        facets: Iterable[str] = tuple(FACET_CACHE_TYPES)
+    ) -> Dict[str, Tuple[Any, str]]:
+        """
+        Cache entries for a fetched product (split by volatility for full fetches).
+
+        ``facets`` limits which facets are written, so a live-only refresh
+        does not rewrite the cached history (and extend its TTL).
+        """
+        if not self._is_faceted_fetch(stats, history, offers):
+            key = self._product_cache_key(identifier, domain, stats, history, offers)
+            return {key: (product, 'pricing')}
+
+        return {
+            self._facet_cache_key(identifier, domain, facet): (data, FACET_CACHE_TYPES[facet])
+            for facet, data in split_product(product).items()
+            if facet in facets
+        }
+
+    async def _query_products(
+        self,
+        identifiers: List[str],
+        domain: int = 1,
+        stats: int = 180,
+        history: bool = True,
+        offers: int = 20,
+        force_refresh: bool = False,
+        days: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Run one keepa library query (up to MAX_ASINS_PER_REQUEST identifiers).
+
+        ``days`` limits the returned history to the last N days.
+
+        Returns:
+            Sanitized product dicts, in Keepa response order
+        """
+        from app.utils.keepa_utils import sanitize_keepa_response
+
+        loop = asyncio.get_event_loop()
+
+        # Scheduled under the caller's priority class, one token per identifier
+        cost = len(identifiers)
+        await self.throttle.acquire(cost=cost)
+
+        def _sync_query(request):
+            domain_str = DOMAIN_CODES.get(domain, 'US')
+            update_param = 0 if force_refresh else None
+
+            self.logger.info(
+                f"[KEEPA API] Calling with update={update_param}, history={history}, days={days} for "
+                f"{len(identifiers)} identifier(s): {', '.join(identifiers[:5])}"
+            )
+
+            with self.client_pool.client() as api:
+                products = api.query(
+                    identifiers if len(identifiers) > 1 else identifiers[0],
+                    domain=domain_str,
+                    stats=stats,
+                    history=history,
+                    offers=offers or None,
+                    update=update_param,
+                    days=days
+                )
+                # keepa keeps the last response's tokensLeft/refillIn/refillRate
+                request.observe(getattr(api, 'status', None))
+                return products
+
+        with self.throttle.in_flight(cost) as request:
+            products = await loop.run_in_executor(None, _sync_query, request)
+
+        # Sanitize numpy arrays before caching/returning
+        return [sanitize_keepa_response(product) for product in (products or [])]
+
+    async def _fetch_products(
+        self,
+        identifiers: List[str],
+        domain: int = 1,
+        stats: int = 180,
+        history: bool = True,
+        offers: int = 20,
+        force_refresh: bool = False,
+        cached_history: Optional[Dict[str, Dict[str, Any]]] = None
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Query Keepa for identifiers and cache the results.
+
+        Identifiers with a cached history facet are refreshed with
+        ``history=False`` (stats/offers only) and merged with that history.
+        Identifiers with a stored full history only download the days
+        since their last sync; the new records are appended to the stored
+        csv / salesRanks and the product's 'data' section is rebuilt from
+        them.
+
+        Returns:
+            Dict keyed by identifier with product data or None (not found or
+            failed query)
+        """
+        cached_history = cached_history or {}
+        results: Dict[str, Optional[Dict[str, Any]]] = {}
+
+        live_only = [i for i in identifiers if i in cached_history]
+        full = [i for i in identifiers if i not in cached_history]
+
+        # (identifiers, history flag, days since last sync per identifier)
+        groups = [(live_only, False, {})]
+        if history:
+            sync_days = {i: self.history_store.days_since_sync(i, domain) for i in full}
+            groups.append(([i for i in full if sync_days[i]], True, sync_days))
+            groups.append(([i for i in full if not sync_days[i]], True, {}))
+        else:
+            groups.append((full, False, {}))
+
+        for group, with_history, sync_days in groups:
+            for start in range(0, len(group), MAX_ASINS_PER_REQUEST):
+                chunk = group[start:start + MAX_ASINS_PER_REQUEST]
+                days = max(sync_days[i] for i in chunk) if sync_days else None
+
+                try:
+                    products = await self._query_products(
+                        chunk, domain, stats, with_history, offers, force_refresh, days=days
+                    )
+                except Exception as e:
+                    self.logger.error(f"[KEEPA API] Query failed for {len(chunk)} identifier(s): {e}")
+                    products = []
+
+                matched = self._match_products(chunk, products)
+
+                # Cached once per chunk: one L2 write instead of one per product
+                entries: Dict[str, Tuple[Any, str]] = {}
+                for identifier in chunk:
+                    product = matched.get(identifier)
+                    facets = tuple(FACET_CACHE_TYPES)
+                    if product and identifier in cached_history:
+                        product = merge_live_refresh(product, cached_history[identifier])
+                        facets = ('meta', 'live')
+                    elif product and with_history:
+                        product, complete = self._merge_history(
+                            identifier, domain, product, incremental=bool(days)
+                        )
+                        if not complete:
+                            facets = ('meta', 'live')
+                    if product:
+                        entries.update(self._product_cache_entries(
+                            identifier, product, domain, stats, history, offers, facets
+                        ))
+                    results[identifier] = product
+
+                await self._aset_cache_many(entries)
+
+        return results
+
+    def _merge_history(
+        self,
+        identifier: str,
+        domain: int,
+        product: Dict[str, Any],
+        incremental: bool
+    ) -> Tuple[Dict[str, Any], bool]:
+        """
+        Append a fetched product's new history points to the history store.
+
+        Incremental fetches only carry the last few days: their history
+        keys (csv, salesRanks...) are appended to the ones kept from the
+        last full fetch and 'data' is rebuilt from the merged csv, so the
+        product carries the same history as a full download.
+
+        Returns:
+            (product, True if it carries its complete history and can be
+            cached as the history facet)
+        """
+        from keepa import parse_csv
+        from app.utils.keepa_utils import sanitize_keepa_response
+
+        stored = self.history_store.merge(identifier, domain, product.get('data'))
+        raw = {k: v for k, v in product.items() if k in HISTORY_KEYS and k != 'data'}
+        merged = self.history_store.merge_raw(identifier, domain, raw, incremental)
+        if not incremental:
+            return product, True
+        if merged is None:
+            # Full history evicted meanwhile: serve the recent days, don't cache them
+            return product, False
+
+        product = {k: v for k, v in product.items() if k not in HISTORY_KEYS}
+        product.update(merged)
+        if merged.get('csv'):
+            product['data'] = sanitize_keepa_response(parse_csv(merged['csv']))
+        elif stored is not None:
+            product['data'] = stored.to_data_section()
+        return product, True
+
     async def get_product_data(self, identifier: str, domain: int = 1, force_refresh: bool = False) -> Optional[Dict[str, Any]]:
         """
         Get product data from Keepa using official Python library.
@@ -388,64 +723,48 @@ class KeepaService:
         Returns:
             Product data dict or None if not found
         """
-        from datetime import datetime
-
-        # Check cache first (unless force_refresh)
-        cache_key = self._get_cache_key('/product', {
-            'asin': identifier,
-            'domain': domain
-        })
+        if force_refresh:
+            self.logger.info(f"[FORCE REFRESH] Bypassing cache for {identifier}, requesting LIVE data with update=0")
+            return await self._fetch_product(identifier, domain, force_refresh)
 
-        cached_data = None if force_refresh else self._get_from_cache(cache_key)
-        if cached_data:
+        # Check cache first
+        complete, partial = await self._lookup_cached_products([identifier], domain)
+        if identifier in complete:
             self.logger.info(f"[CACHE HIT] Serving cached data for {identifier}")
-            return cached_data
+            return complete[identifier]
 
-        if force_refresh:
-            self.logger.info(f"[FORCE REFRESH] Bypassing cache for {identifier}, requesting LIVE data with update=0")
+        if identifier in partial:
+            self.logger.info(f"[CACHE PARTIAL] Reusing cached history for {identifier}, refreshing stats/offers")
         else:
             self.logger.info(f"[CACHE MISS] No valid cache for {identifier}, requesting data from Keepa")
 
-        try:
-            import keepa
-
-            api = keepa.Keepa(self.api_key)
-
-            loop = asyncio.get_event_loop()
-
-            def _sync_query():
-                domain_map = {
-                    1: 'US', 2: 'GB', 3: 'DE', 4: 'FR', 5: 'JP',
-                    6: 'CA', 7: 'CN', 8: 'IT', 9: 'ES', 10: 'IN',
-                    11: 'MX', 12: 'BR'
-                }
-                domain_str = domain_map.get(domain, 'US')
-                update_param = 0 if force_refresh else None
-
-                self.logger.info(f"[KEEPA API] Calling with update={update_param} for {identifier}")
+        # Share an identical fetch already in flight (another request or batch)
+        return await self.single_flight.run(
+            self._product_cache_key(identifier, domain),
+            lambda: self._fetch_product(identifier, domain, force_refresh, partial)
+        )
 
-                return api.query(
-                    identifier,
-                    domain=domain_str,
-                    stats=180,
-                    history=True,
-                    offers=20,
-                    update=update_param
-                )
+    async def _fetch_product(
+        self,
+        identifier: str,
+        domain: int,
+        force_refresh: bool,
+        cached_history: Optional[Dict[str, Dict[str, Any]]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Fetch one product from Keepa and cache it (None on failure)."""
+        from datetime import datetime
 
-            products = await loop.run_in_executor(None, _sync_query)
+        try:
+            fetched = await self._fetch_products(
+                [identifier], domain, force_refresh=force_refresh, cached_history=cached_history
+            )
+            product = fetched.get(identifier)
 
-            if not products or len(products) == 0:
+            if not product:
                 self.logger.info(f"Product not found: {identifier}")
                 return None
 
-            product = products[0]
-
-            # Sanitize numpy arrays before caching/returning
-            from app.utils.keepa_utils import keepa_to_datetime, sanitize_keepa_response
-
-            product = sanitize_keepa_response(product)
-            self.logger.info(f"[NUMPY FIX] Sanitized numpy arrays for {identifier}")
+            from app.utils.keepa_utils import keepa_to_datetime
 
             # Log data freshness
             last_price_change = product.get("lastPriceChange", -1)
@@ -462,10 +781,7 @@ class KeepaService:
             else:
                 self.logger.info(f"[KEEPA DATA] Received data for {identifier}, no lastPriceChange available")
 
-            # Cache the result
-            self._set_cache(cache_key, product, cache_type='pricing')
-            self.logger.info(f"[CACHE SET] Cached data for {identifier} with TTL={self._cache_ttl['pricing']}")
-
+            self.logger.info(f"[CACHE SET] Cached data for {identifier}")
             return product
 
         except Exception as e:
@@ -474,6 +790,128 @@ class KeepaService:
             self.logger.error(f"Traceback: {traceback.format_exc()}")
             return None
 
+    async def get_products_batch(
+        self,
+        asins: List[str],
+        stats: int = 180,
+        history: bool = True,
+        offers: int = 20,
+        domain: int = 1,
+        force_refresh: bool = False
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Get product data for many ASINs with as few Keepa calls as possible.
+
+        Cache hits are served locally, duplicate ASINs and ASINs already being
+        fetched by a concurrent batch are requested once, ASINs with cached
+        history only refresh stats/offers, and the remaining ASINs are queried
+        in chunks of MAX_ASINS_PER_REQUEST.
+
+        Args:
+            asins: ASINs or ISBN-10s to fetch
+            stats: Days of statistics to request (0 to skip)
+            history: Include price/BSR history
+            offers: Number of offers to request (0 to skip)
+            domain: Keepa domain (1=US, 2=UK, etc.)
+            force_refresh: Skip cache and force fresh API call
+
+        Returns:
+            Dict keyed by ASIN (input order) with product data or None if not found
+        """
+        results: Dict[str, Optional[Dict[str, Any]]] = {}
+        waiting: Dict[str, asyncio.Future] = {}
+        to_fetch: List[str] = []
+
+        unique_asins = list(dict.fromkeys(asins))
+        if force_refresh:
+            complete, partial = {}, {}
+        else:
+            complete, partial = await self._lookup_cached_products(
+                unique_asins, domain, stats, history, offers
+            )
+
+        for asin in unique_asins:
+            if asin in complete:
+                results[asin] = complete[asin]
+                continue
+
+            inflight = None if force_refresh else self.single_flight.join(
+                self._product_cache_key(asin, domain, stats, history, offers), cost=1
+            )
+            if inflight is not None:
+                waiting[asin] = inflight
+                continue
+
+            to_fetch.append(asin)
+
+        live_only = [asin for asin in to_fetch if asin in partial]
+        self.logger.info(
+            f"[BATCH] {len(asins)} requested: {len(results)} cached, "
+            f"{len(waiting)} in flight, {len(to_fetch)} to fetch "
+            f"({len(live_only)} stats/offers only)"
+        )
+
+        # Become leader for fetched keys (force refresh stays private)
+        shared = not force_refresh
+        if shared:
+            for asin in to_fetch:
+                self.single_flight.begin(
+                    self._product_cache_key(asin, domain, stats, history, offers)
+                )
+
+        try:
+            full = [asin for asin in to_fetch if asin not in partial]
+            for group in (live_only, full):
+                for start in range(0, len(group), MAX_ASINS_PER_REQUEST):
+                    chunk = group[start:start + MAX_ASINS_PER_REQUEST]
+                    fetched = await self._fetch_products(
+                        chunk, domain, stats, history, offers, force_refresh, partial
+                    )
+
+                    for asin in chunk:
+                        results[asin] = fetched.get(asin)
+                        if shared:
+                            self.single_flight.finish(
+                                self._product_cache_key(asin, domain, stats, history, offers),
+                                result=results[asin]
+                            )
+        finally:
+            # Release any key left unresolved (e.g. cancellation)
+            for asin in to_fetch if shared else []:
+                self.single_flight.finish(
+                    self._product_cache_key(asin, domain, stats, history, offers),
+                    result=results.get(asin)
+                )
+
+        for asin, future in waiting.items():
+            results[asin] = await asyncio.shield(future)
+
+        return {asin: results.get(asin) for asin in asins}
+
+    @staticmethod
+    def _match_products(
+        requested: List[str],
+        products: List[Dict[str, Any]]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Map Keepa products back to the requested identifiers.
+
+        Matched on the returned codes, never by position: the keepa library
+        sorts (np.unique) the identifiers before sending them.
+        """
+        by_code: Dict[str, Dict[str, Any]] = {}
+        for product in products:
+            codes = [product.get('asin'), *(product.get('eanList') or []), *(product.get('upcList') or [])]
+            for code in codes:
+                if code:
+                    by_code.setdefault(str(code).upper(), product)
+
+        return {
+            identifier: by_code[identifier.upper()]
+            for identifier in requested
+            if identifier.upper() in by_code
+        }
+
     async def find_products(self, search_criteria: Dict[str, Any], domain: int = 1, max_results: int = 50) -> List[str]:
         """
         Find products using Keepa Product Finder.
@@ -487,10 +925,6 @@ class KeepaService:
             List of ASINs matching the criteria
         """
         try:
-            import keepa
-
-            api = keepa.Keepa(self.api_key)
-
             product_params = {
                 'categories_include': search_criteria.get('categories', [1000]),
                 'current_NEW_gte': search_criteria.get('price_min_cents', 500),
@@ -504,11 +938,12 @@ class KeepaService:
             loop = asyncio.get_event_loop()
 
             def _sync_product_finder():
-                return api.product_finder(
-                    product_params,
-                    domain='US' if domain == 1 else 'DE',
-                    wait=True
-                )
+                with self.client_pool.client() as api:
+                    return api.product_finder(
+                        product_params,
+                        domain='US' if domain == 1 else 'DE',
+                        wait=True
+                    )
 
             asins = await loop.run_in_executor(None, _sync_product_finder)
 
@@ -543,10 +978,16 @@ class KeepaService:
                 "status": "healthy" if balance and balance > 0 else "degraded",
                 "api_tokens_left": balance,
                 "local_tokens_available": local_tokens,
+                "balance_age_seconds": self.balance_age_seconds,
                 "throttle_healthy": self.throttle.is_healthy,
+                "throttle": self.throttle.get_stats(),
+                "concurrency": self.concurrency_limiter.get_stats(),
                 "circuit_breaker_state": self._circuit_breaker.state.value,
                 "requests_made": self.metrics.requests_count,
-                "cache_entries": len(self._cache)
+                "cache_entries": len(self._cache),
+                "client_pool": self.client_pool.get_stats(),
+                "single_flight": self.single_flight.get_stats(),
+                "history_store": self.history_store.get_stats()
             }
 
         except Exception as e:
@@ -619,36 +1060,54 @@ class KeepaService:
 # DEPENDENCY INJECTION
 # =========================================================================
 
-async def get_keepa_service() -> KeepaService:
-    """FastAPI dependency to get Keepa service instance."""
+def _resolve_api_key() -> str:
+    """Resolve the Keepa API key from Memex keyring, then environment."""
+    # First try Memex keyring (primary method)
+    api_key = None
     try:
-        # First try Memex keyring (primary method)
-        api_key = None
-        try:
-            import keyring
-            api_key = keyring.get_password("memex", "KEEPA_API_KEY")
-            if api_key:
-                logging.getLogger(__name__).info("Successfully retrieved Keepa API key from Memex secrets")
-        except Exception as keyring_error:
-            logging.getLogger(__name__).debug(f"Keyring access failed: {keyring_error}")
+        import keyring
+        api_key = keyring.get_password("memex", "KEEPA_API_KEY")
+        if api_key:
+            logging.getLogger(__name__).info("Successfully retrieved Keepa API key from Memex secrets")
+    except Exception as keyring_error:
+        logging.getLogger(__name__).debug(f"Keyring access failed: {keyring_error}")
 
-        # Fallback to environment variable
-        if not api_key:
-            import os
-            api_key = os.getenv("KEEPA_API_KEY")
-            if api_key:
-                logging.getLogger(__name__).info("Using Keepa API key from environment variable")
+    # Fallback to environment variable
+    if not api_key:
+        import os
+        api_key = os.getenv("KEEPA_API_KEY")
+        if api_key:
+            logging.getLogger(__name__).info("Using Keepa API key from environment variable")
 
-        if not api_key:
-            raise ValueError("KEEPA_API_KEY not found in Memex secrets or environment variables")
+    if not api_key:
+        raise ValueError("KEEPA_API_KEY not found in Memex secrets or environment variables")
 
-        return KeepaService(api_key=api_key)
+    return api_key
+
+
+async def get_keepa_service() -> KeepaService:
+    """FastAPI dependency to get Keepa service instance."""
+    try:
+        return KeepaService(api_key=_resolve_api_key())
 
     except Exception as e:
         logging.getLogger(__name__).error(f"Failed to initialize Keepa service: {e}")
         raise
 
 
+async def warm_up_keepa_client_pool(pool_size: int) -> Dict[str, Any]:
+    """
+    Create the shared keepa client pool and pre-build its clients.
+
+    Called from the application lifespan so the first lookups after a
+    deploy do not pay client construction.
+    """
+    pool = get_client_pool(_resolve_api_key(), max_size=pool_size)
+    loop = asyncio.get_event_loop()
+    await loop.run_in_executor(None, pool.warm_up)
+    return pool.get_stats()
+
+
 # Backward compatibility exports
 __all__ = [
     # Main class
@@ -656,6 +1115,7 @@ __all__ = [
 
     # Dependency injection
     'get_keepa_service',
+    'warm_up_keepa_client_pool',
 
     # Re-exported from keepa_models for backward compatibility
     'ENDPOINT_COSTS',
@@ -0,0 +1,147 @@
+"""
+Keepa Service - Single-Flight Request Deduplication
+===================================================
+Process-wide registry of in-flight Keepa calls keyed by the normalized
+KeepaCache cache key.
+
+When the dashboard, CoWork and AutoSourcing ask for the same ASIN or the
+same Product Finder query at the same moment, only the first caller (the
+leader) hits Keepa; the others await the leader's result and spend no
+tokens.
+
+Separated from keepa_service.py for SRP compliance.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+
+class KeepaSingleFlight:
+    """
+    Shares one in-flight Keepa call between concurrent identical requests.
+
+    Futures are bound to the event loop that created them, so entries are
+    keyed by (loop, cache key) and the registry is safe to share across
+    loops (tests, Celery tasks running ``asyncio.run``).
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Tuple[int, str], asyncio.Future] = {}
+
+        # Statistics tracking
+        self._leaders = 0
+        self._deduplicated = 0
+        self._tokens_saved = 0
+
+    @staticmethod
+    def _slot(cache_key: str) -> Tuple[int, str]:
+        return (id(asyncio.get_running_loop()), cache_key)
+
+    def join(self, cache_key: str, cost: int = 1) -> Optional[asyncio.Future]:
+        """
+        Return the in-flight future for a key, counting the saved tokens.
+
+        Returns:
+            The leader's future, or None if nothing is in flight
+        """
+        future = self._inflight.get(self._slot(cache_key))
+        if future is None or future.done():
+            return None
+
+        self._deduplicated += 1
+        self._tokens_saved += cost
+        logger.debug(f"[SINGLE-FLIGHT] Joined in-flight request {cache_key}")
+        return future
+
+    def begin(self, cache_key: str) -> asyncio.Future:
+        """Register the caller as leader for a key and return its future."""
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[self._slot(cache_key)] = future
+        self._leaders += 1
+        return future
+
+    def finish(
+        self,
+        cache_key: str,
+        result: Any = None,
+        error: Optional[BaseException] = None
+    ):
+        """Resolve the leader's future and release the key."""
+        future = self._inflight.pop(self._slot(cache_key), None)
+        if future is None or future.done():
+            return
+
+        if error is None:
+            future.set_result(result)
+        elif isinstance(error, asyncio.CancelledError):
+            future.cancel()
+        else:
+            future.set_exception(error)
+            # Mark as retrieved: followers are optional
+            future.exception()
+
+    async def run(
+        self,
+        cache_key: str,
+        fn: Callable[[], Awaitable[Any]],
+        cost: int = 1
+    ) -> Any:
+        """
+        Await ``fn()`` once per key across concurrent callers.
+
+        Args:
+            cache_key: Normalized cache key (KeepaCache.get_cache_key)
+            fn: Coroutine factory performing the Keepa call
+            cost: Estimated token cost, counted as saved for followers
+
+        Returns:
+            The leader's result (followers get the same object)
+        """
+        future = self.join(cache_key, cost)
+        if future is not None:
+            return await asyncio.shield(future)
+
+        self.begin(cache_key)
+        try:
+            result = await fn()
+        except BaseException as e:
+            self.finish(cache_key, error=e)
+            raise
+
+        self.finish(cache_key, result=result)
+        return result
+
+    @property
+    def in_flight(self) -> int:
+        """Number of keys currently being fetched."""
+        return sum(1 for future in self._inflight.values() if not future.done())
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get single-flight statistics."""
+        return {
+            "in_flight": self.in_flight,
+            "leader_requests": self._leaders,
+            "deduplicated_requests": self._deduplicated,
+            "tokens_saved": self._tokens_saved,
+        }
+
+    def reset(self):
+        """Clear in-flight entries and statistics."""
+        self._inflight.clear()
+        self._leaders = 0
+        self._deduplicated = 0
+        self._tokens_saved = 0
+
+
+# Global single-flight registry shared by every KeepaService instance
+keepa_single_flight = KeepaSingleFlight()
+
+
+__all__ = [
+    'KeepaSingleFlight',
+    'keepa_single_flight',
+]
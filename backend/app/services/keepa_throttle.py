@@ -2,23 +2,141 @@
 Keepa API Throttling System
 Prevents token exhaustion by implementing token bucket algorithm
 Phase 3 Day 10 - Protection contre épuisement tokens
+
+The bucket is shared process-wide and scheduled by priority class:
+interactive calls (dashboard, /keepa/{asin}/metrics) are served first,
+verification next, and AutoSourcing / tracking scans only spend tokens
+above the warning reserve. Waiters are ordered with weighted fair queuing
+so background classes still progress, and no lock is held while a waiter
+sleeps.
+
+Until Keepa has answered once the bucket refills continuously at the
+configured rate. Every response body carries tokensLeft, refillIn,
+refillRate and tokensConsumed; observe() feeds them back so the bucket
+follows the real balance and plan, refills in Keepa's one-minute steps
+and sizes waits to the next refill.
 """
 import asyncio
+import contextvars
+import functools
+import math
+import threading
 import time
-from typing import Optional
+from collections import deque
+from contextlib import contextmanager
+from enum import Enum
+from typing import Any, Deque, Dict, Iterator, Mapping, Optional, Union
 import logging
 
 logger = logging.getLogger(__name__)
 
+
+class KeepaPriority(str, Enum):
+    """Scheduling class of a Keepa token request."""
+    INTERACTIVE = "interactive"
+    VERIFICATION = "verification"
+    AUTOSOURCING = "autosourcing"
+    TRACKING = "tracking"
+
+
+# Weighted fair queuing shares when several classes are waiting
+PRIORITY_WEIGHTS: Dict[KeepaPriority, int] = {
+    KeepaPriority.INTERACTIVE: 8,
+    KeepaPriority.VERIFICATION: 4,
+    KeepaPriority.AUTOSOURCING: 2,
+    KeepaPriority.TRACKING: 1,
+}
+
+# Classes that must leave warning_threshold tokens for user-facing calls
+BACKGROUND_PRIORITIES = frozenset({KeepaPriority.AUTOSOURCING, KeepaPriority.TRACKING})
+
+CRITICAL_COOLDOWN_SECONDS = 30
+
+# Keepa adds refillRate tokens once per minute and caps the balance at one
+# hour of refill
+KEEPA_REFILL_PERIOD_SECONDS = 60
+KEEPA_MAX_REFILL_PERIODS = 60
+
+_current_priority: contextvars.ContextVar[KeepaPriority] = contextvars.ContextVar(
+    "keepa_priority", default=KeepaPriority.INTERACTIVE
+)
+
+
+@contextmanager
+def keepa_priority(priority: Union[KeepaPriority, str]) -> Iterator[KeepaPriority]:
+    """Run Keepa calls made inside the block under the given priority class."""
+    token = _current_priority.set(KeepaPriority(priority))
+    try:
+        yield _current_priority.get()
+    finally:
+        _current_priority.reset(token)
+
+
+def with_keepa_priority(priority: Union[KeepaPriority, str]):
+    """Decorator: run an async function under the given Keepa priority class."""
+    priority = KeepaPriority(priority)
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with keepa_priority(priority):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def current_keepa_priority() -> KeepaPriority:
+    """Priority class of the current task (interactive unless tagged)."""
+    return _current_priority.get()
+
+
+class _Waiter:
+    """A queued acquire() call."""
+
+    __slots__ = ("cost", "priority", "start_tag", "finish_tag", "enqueued_at",
+                 "granted", "loop", "future")
+
+    def __init__(self, cost: int, priority: KeepaPriority, start_tag: float,
+                 finish_tag: float, loop: asyncio.AbstractEventLoop):
+        self.cost = cost
+        self.priority = priority
+        self.start_tag = start_tag
+        self.finish_tag = finish_tag
+        self.enqueued_at = time.monotonic()
+        self.granted = False
+        self.loop = loop
+        self.future: Optional[asyncio.Future] = None
+
+
+class _InFlightRequest:
+    """A request holding in-flight tokens until Keepa's answer is observed."""
+
+    __slots__ = ("throttle", "cost", "settled")
+
+    def __init__(self, throttle: "KeepaThrottle", cost: int):
+        self.throttle = throttle
+        self.cost = cost
+        self.settled = False
+
+    def observe(self, status: Any):
+        reserved = 0 if self.settled else self.cost
+        self.settled = True
+        self.throttle.observe(status, reserved=reserved)
+
+
 class KeepaThrottle:
     """
     Token bucket implementation for Keepa API rate limiting.
 
     Prevents API token exhaustion by:
-    - Limiting requests to 20/minute (Keepa plan limit)
+    - Limiting requests to 20/minute (Keepa plan limit) until Keepa
+      reports the plan's actual refill rate
     - Managing burst capacity conservatively
-    - Auto-pausing when tokens are low
-    - Thread-safe for concurrent requests
+    - Auto-pausing when tokens are low (a blind cooldown only while the
+      real balance is unknown)
+    - Scheduling waiters by priority class (weighted fair queuing)
+    - Safe for concurrent requests: state changes under a short lock,
+      sleeping never holds it
     """
 
     def __init__(self,
@@ -32,93 +150,300 @@ class KeepaThrottle:
         Args:
             tokens_per_minute: Rate limit (20 for current Keepa plan)
             burst_capacity: Max tokens to accumulate (100 = 5 min buffer)
-            warning_threshold: Warn when below this level
-            critical_threshold: Force wait when below this level
+            warning_threshold: Warn when below this level; background classes
+                never spend below it
+            critical_threshold: Force a cooldown when below this level
         """
         self.rate = tokens_per_minute / 60.0  # tokens per second
         self.capacity = burst_capacity
+        self._configured_rate = self.rate
+        self._configured_capacity = burst_capacity
         self.warning_threshold = warning_threshold
         self.critical_threshold = critical_threshold
         self.tokens = float(burst_capacity)
         self.last_refill = time.monotonic()  # Use monotonic to avoid clock issues
-        self._lock = asyncio.Lock()  # Thread-safe for concurrent requests
+        # Guards bucket and queue state only; never held across an await.
+        # A threading lock because the throttle is shared by every event
+        # loop in the process (API, Celery tasks running asyncio.run).
+        self._lock = threading.Lock()
+        self._queues: Dict[KeepaPriority, Deque[_Waiter]] = {p: deque() for p in KeepaPriority}
+        self._last_finish: Dict[KeepaPriority, float] = {p: 0.0 for p in KeepaPriority}
+        self._virtual_time = 0.0
+        self._cooldown_until = 0.0
+        self._last_cooldown_end = float("-inf")
+        self._init_keepa_state()
         self.total_requests = 0
         self.total_wait_time = 0.0
+        self._class_stats = self._empty_class_stats()
 
-    async def acquire(self, cost: int = 1) -> bool:
+    def _init_keepa_state(self):
+        # Learned from Keepa responses; None until the first observe()
+        self.refill_per_minute: Optional[int] = None
+        self._next_refill_at: Optional[float] = None
+        self._synced_at: Optional[float] = None
+        # Tokens acquired by requests Keepa has not answered yet
+        self._in_flight = 0
+        self.tokens_consumed = 0
+
+    @staticmethod
+    def _empty_class_stats() -> Dict[KeepaPriority, Dict[str, float]]:
+        return {
+            p: {"acquired": 0, "tokens": 0, "total_wait": 0.0, "max_wait": 0.0}
+            for p in KeepaPriority
+        }
+
+    async def acquire(self,
+                      cost: int = 1,
+                      priority: Optional[Union[KeepaPriority, str]] = None,
+                      preempt: bool = False) -> bool:
         """
         Acquire tokens for API request, wait if necessary.
 
         Args:
             cost: Number of tokens needed (usually 1 per request)
+            priority: Scheduling class; defaults to the class set with
+                keepa_priority() for the current task (interactive)
+            preempt: Take tokens ahead of every queued waiter if the bucket
+                can cover them now, otherwise queue at the front. Other
+                waiters keep their place and are not blocked.
 
         Returns:
             True when tokens acquired successfully
         """
-        async with self._lock:
-            now = time.monotonic()
-            elapsed = now - self.last_refill
+        priority = KeepaPriority(priority) if priority is not None else current_keepa_priority()
+        loop = asyncio.get_running_loop()
 
-            # Progressive refill based on elapsed time
-            self.tokens = min(
-                self.capacity,
-                self.tokens + (elapsed * self.rate)
-            )
-            self.last_refill = now
+        with self._lock:
+            self._refill()
+            if cost <= 0 or (
+                (preempt or not self._has_waiters())
+                and not self._in_cooldown()
+                and not self._cooldown_required()
+                and self._can_dispatch(priority, cost)
+            ):
+                self.tokens -= cost
+                self._record(priority, cost, 0.0)
+                return True
+            waiter = self._enqueue(cost, priority, loop, preempt)
 
-            # Log warning if tokens are low (only log once per 10 tokens drop)
-            if self.tokens < self.warning_threshold and int(self.tokens) % 10 == 0:
-                logger.warning(
-                    f"[WARNING] Keepa tokens low: {self.tokens:.0f} remaining "
-                    f"(threshold: {self.warning_threshold})"
-                )
+        try:
+            await self._wait_turn(waiter, loop)
+        except BaseException:
+            with self._lock:
+                if waiter.granted:
+                    # Granted while being cancelled: give the tokens back
+                    self.tokens += waiter.cost
+                elif waiter in self._queues[waiter.priority]:
+                    self._queues[waiter.priority].remove(waiter)
+                self._dispatch()
+            self._wake_all()
+            raise
 
-            # Critical level - force longer wait
-            if self.tokens < self.critical_threshold:
-                logger.error(
-                    f"[CRITICAL] Keepa tokens CRITICAL: {self.tokens:.0f} remaining. "
-                    f"Forcing 30s cooldown."
-                )
-                await asyncio.sleep(30)  # Force cooldown
-                # Recalculate after cooldown
-                elapsed = 30
-                self.tokens = min(
-                    self.capacity,
-                    self.tokens + (elapsed * self.rate)
-                )
+        wait = time.monotonic() - waiter.enqueued_at
+        with self._lock:
+            self._record(priority, cost, wait)
+        return True
 
-            # Calculate wait time if insufficient tokens
-            if self.tokens < cost:
-                wait_time = (cost - self.tokens) / self.rate
+    async def _wait_turn(self, waiter: _Waiter, loop: asyncio.AbstractEventLoop):
+        """Sleep (lock released) until the scheduler grants this waiter."""
+        while True:
+            with self._lock:
+                if not waiter.granted:
+                    self._refill()
+                    delay = self._dispatch()
+                if waiter.granted:
+                    return
+                cooldown = self._cooldown_required()
+                if cooldown:
+                    # One waiter performs the cooldown, the others wait for it
+                    self._cooldown_until = time.monotonic() + CRITICAL_COOLDOWN_SECONDS
+                    tokens_before = self.tokens
+                else:
+                    waiter.future = loop.create_future()
+
+            if cooldown:
+                await self._critical_cooldown(tokens_before)
+                continue
+
+            if delay > 1:
                 logger.info(
-                    f"[THROTTLE] Throttling: waiting {wait_time:.1f}s for {cost} tokens "
-                    f"(current: {self.tokens:.1f})"
-                )
-                self.total_wait_time += wait_time
-                await asyncio.sleep(wait_time)
-
-                # Recalculate tokens after wait
-                now = time.monotonic()
-                elapsed = wait_time
-                self.tokens = min(
-                    self.capacity,
-                    self.tokens + (elapsed * self.rate)
-                )
-                self.last_refill = now
-
-            # Consume tokens
-            self.tokens -= cost
-            self.total_requests += 1
-
-            # Log every 10 requests
-            if self.total_requests % 10 == 0:
-                logger.debug(
-                    f"[STATS] Throttle stats: {self.total_requests} requests, "
-                    f"{self.total_wait_time:.1f}s total wait, "
-                    f"{self.tokens:.0f} tokens available"
+                    f"[THROTTLE] Throttling {waiter.priority.value}: waiting up to {delay:.1f}s "
+                    f"for {waiter.cost} tokens (current: {self.tokens:.1f})"
                 )
+            try:
+                await asyncio.wait_for(waiter.future, timeout=max(delay, 0.001))
+            except asyncio.TimeoutError:
+                pass
+
+    async def _critical_cooldown(self, tokens_before: float):
+        logger.error(
+            f"[CRITICAL] Keepa tokens CRITICAL: {tokens_before:.0f} remaining. "
+            f"Forcing {CRITICAL_COOLDOWN_SECONDS}s cooldown."
+        )
+        try:
+            await asyncio.sleep(CRITICAL_COOLDOWN_SECONDS)
+        finally:
+            with self._lock:
+                self._refill()
+                if self._next_refill_at is None:
+                    # Credit at least the cooldown's worth of refill
+                    self.tokens = min(
+                        self.capacity,
+                        max(self.tokens, tokens_before + CRITICAL_COOLDOWN_SECONDS * self.rate)
+                    )
+                self._cooldown_until = 0.0
+                self._last_cooldown_end = time.monotonic()
+            self._wake_all()
+
+    # ------------------------------------------------------------------
+    # Scheduler internals (call with self._lock held)
+    # ------------------------------------------------------------------
+
+    def _refill(self):
+        now = time.monotonic()
+        if self._next_refill_at is not None:
+            if now >= self._next_refill_at:
+                periods = int((now - self._next_refill_at) // KEEPA_REFILL_PERIOD_SECONDS) + 1
+                self.tokens = min(self.capacity, self.tokens + periods * self.refill_per_minute)
+                self._next_refill_at += periods * KEEPA_REFILL_PERIOD_SECONDS
+        else:
+            elapsed = now - self.last_refill
+            if elapsed > 0:
+                self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.last_refill = now
+
+    def _seconds_until(self, shortfall: float) -> float:
+        """Time until refills cover ``shortfall`` tokens."""
+        if shortfall <= 0:
+            return 0.0
+        if self._next_refill_at is not None:
+            if self.refill_per_minute <= 0:
+                return float(KEEPA_REFILL_PERIOD_SECONDS)
+            periods = math.ceil(shortfall / self.refill_per_minute)
+            return (max(self._next_refill_at - time.monotonic(), 0.0)
+                    + (periods - 1) * KEEPA_REFILL_PERIOD_SECONDS)
+        return shortfall / self.rate if self.rate > 0 else 1.0
+
+    def _has_waiters(self) -> bool:
+        return any(self._queues.values())
+
+    def _reserve(self, priority: KeepaPriority) -> float:
+        return self.warning_threshold if priority in BACKGROUND_PRIORITIES else 0.0
 
-            return True
+    def _can_dispatch(self, priority: KeepaPriority, cost: int) -> bool:
+        return self.tokens - cost >= self._reserve(priority)
+
+    def _in_cooldown(self) -> bool:
+        return self._cooldown_until > time.monotonic()
+
+    def _cooldown_required(self) -> bool:
+        """Below critical: pause once, then fall back to plain refill waits."""
+        if self._next_refill_at is not None:
+            return False  # Real balance and refill time known: wait exactly
+        if self.tokens >= self.critical_threshold or self._cooldown_until:
+            return False
+        return time.monotonic() - self._last_cooldown_end >= CRITICAL_COOLDOWN_SECONDS
+
+    def _enqueue(self, cost: int, priority: KeepaPriority,
+                 loop: asyncio.AbstractEventLoop, preempt: bool) -> _Waiter:
+        if preempt:
+            start = finish = min(
+                [self._virtual_time] + [q[0].start_tag for q in self._queues.values() if q]
+            )
+        else:
+            start = max(self._virtual_time, self._last_finish[priority])
+            finish = start + cost / PRIORITY_WEIGHTS[priority]
+            self._last_finish[priority] = finish
+        waiter = _Waiter(cost, priority, start, finish, loop)
+        queue = self._queues[priority]
+        if preempt:
+            queue.appendleft(waiter)
+        else:
+            queue.append(waiter)
+        return waiter
+
+    def _dispatch(self) -> float:
+        """
+        Grant waiters in finish-tag order while tokens allow.
+
+        Background heads that would dip into the reserve are skipped rather
+        than blocking other classes; a foreground head short of tokens holds
+        back everything tagged after it. Returns the seconds until the next
+        waiter could be served.
+        """
+        if self._in_cooldown():
+            return self._cooldown_until - time.monotonic()
+        if self._cooldown_required():
+            return 0.0
+
+        granted = True
+        while granted:
+            granted = False
+            heads = sorted((q[0] for q in self._queues.values() if q), key=lambda w: w.finish_tag)
+            for waiter in heads:
+                if self._can_dispatch(waiter.priority, waiter.cost):
+                    self._queues[waiter.priority].popleft()
+                    self._virtual_time = max(self._virtual_time, waiter.start_tag)
+                    self.tokens -= waiter.cost
+                    waiter.granted = granted = True
+                    self._notify(waiter)
+                    break
+                if waiter.priority not in BACKGROUND_PRIORITIES:
+                    break
+
+        # Only heads up to the first blocking foreground head can be served
+        # next; a later head that would fit is held back, not ready
+        shortfalls = []
+        for waiter in sorted((q[0] for q in self._queues.values() if q), key=lambda w: w.finish_tag):
+            shortfalls.append(waiter.cost + self._reserve(waiter.priority) - self.tokens)
+            if waiter.priority not in BACKGROUND_PRIORITIES:
+                break
+        if not shortfalls:
+            return 0.0
+        return self._seconds_until(min(shortfalls))
+
+    @staticmethod
+    def _notify(waiter: _Waiter):
+        future = waiter.future
+        if future is None:
+            return
+        try:
+            waiter.loop.call_soon_threadsafe(_resolve_future, future)
+        except RuntimeError:
+            pass  # Loop already closed; the waiter is gone
+
+    def _wake_all(self):
+        with self._lock:
+            waiters = [w for q in self._queues.values() for w in q]
+        for waiter in waiters:
+            self._notify(waiter)
+
+    def _record(self, priority: KeepaPriority, cost: int, wait: float):
+        self.total_requests += 1
+        self.total_wait_time += wait
+        stats = self._class_stats[priority]
+        stats["acquired"] += 1
+        stats["tokens"] += max(cost, 0)
+        stats["total_wait"] += wait
+        stats["max_wait"] = max(stats["max_wait"], wait)
+
+        if self.tokens < self.warning_threshold and int(self.tokens) % 10 == 0:
+            logger.warning(
+                f"[WARNING] Keepa tokens low: {self.tokens:.0f} remaining "
+                f"(threshold: {self.warning_threshold})"
+            )
+
+        # Log every 10 requests
+        if self.total_requests % 10 == 0:
+            logger.debug(
+                f"[STATS] Throttle stats: {self.total_requests} requests, "
+                f"{self.total_wait_time:.1f}s total wait, "
+                f"{self.tokens:.0f} tokens available"
+            )
+
+    # ------------------------------------------------------------------
+    # Public state
+    # ------------------------------------------------------------------
 
     @property
     def available_tokens(self) -> int:
@@ -130,12 +455,64 @@ class KeepaThrottle:
         """Check if we have sufficient tokens."""
         return self.tokens > self.warning_threshold
 
+    def queue_depth(self, priority: Optional[Union[KeepaPriority, str]] = None) -> int:
+        """Number of waiters queued, for one class or overall."""
+        if priority is not None:
+            return len(self._queues[KeepaPriority(priority)])
+        return sum(len(q) for q in self._queues.values())
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Bucket level plus per-class queue depth and wait times."""
+        with self._lock:
+            classes = {}
+            for priority in KeepaPriority:
+                stats = self._class_stats[priority]
+                acquired = stats["acquired"]
+                classes[priority.value] = {
+                    "queue_depth": len(self._queues[priority]),
+                    "acquired": acquired,
+                    "tokens_spent": stats["tokens"],
+                    "avg_wait_seconds": round(stats["total_wait"] / acquired, 3) if acquired else 0.0,
+                    "max_wait_seconds": round(stats["max_wait"], 3),
+                }
+            return {
+                "tokens_available": self.available_tokens,
+                "capacity": self.capacity,
+                "refill_per_minute": self.refill_per_minute,
+                "synced_with_keepa": self._synced_at is not None,
+                "tokens_in_flight": self._in_flight,
+                "tokens_consumed": self.tokens_consumed,
+                "in_cooldown": self._in_cooldown(),
+                "total_requests": self.total_requests,
+                "total_wait_seconds": round(self.total_wait_time, 3),
+                "classes": classes,
+            }
+
     def reset_stats(self):
         """Reset statistics counters."""
-        self.total_requests = 0
-        self.total_wait_time = 0.0
+        with self._lock:
+            self.total_requests = 0
+            self.total_wait_time = 0.0
+            self._class_stats = self._empty_class_stats()
         logger.info("[STATS] Throttle statistics reset")
 
+    def reset(self):
+        """Refill the bucket and drop scheduler state (tests, process reuse)."""
+        with self._lock:
+            self.rate = self._configured_rate
+            self.capacity = self._configured_capacity
+            self.tokens = float(self.capacity)
+            self.last_refill = time.monotonic()
+            self._queues = {p: deque() for p in KeepaPriority}
+            self._last_finish = {p: 0.0 for p in KeepaPriority}
+            self._virtual_time = 0.0
+            self._cooldown_until = 0.0
+            self._last_cooldown_end = float("-inf")
+            self._init_keepa_state()
+            self.total_requests = 0
+            self.total_wait_time = 0.0
+            self._class_stats = self._empty_class_stats()
+
     def set_tokens(self, value: int):
         """
         Synchronize local token count with external balance.
@@ -144,29 +521,129 @@ class KeepaThrottle:
         Args:
             value: Token count from external source (Keepa API balance)
         """
-        self.tokens = float(max(0, value))  # Ensure non-negative
-        self.last_refill = time.monotonic()
+        with self._lock:
+            self.tokens = float(max(0, value))  # Ensure non-negative
+            self.last_refill = time.monotonic()
         logger.info(
             f"Throttle synchronized with external balance: {self.tokens:.0f} tokens"
         )
+        self._wake_all()
+
+    @contextmanager
+    def in_flight(self, cost: int) -> Iterator["_InFlightRequest"]:
+        """
+        Mark ``cost`` acquired tokens as spent on a request still in flight.
+
+        Keepa's tokensLeft only reflects requests it has answered, so
+        observe() subtracts what is still in flight. Call the yielded
+        request's observe() with the response body once it is parsed.
+        """
+        with self._lock:
+            self._in_flight += cost
+        request = _InFlightRequest(self, cost)
+        try:
+            yield request
+        finally:
+            if not request.settled:
+                with self._lock:
+                    self._in_flight -= cost
+
+    def observe(self, status: Any, reserved: int = 0):
+        """
+        Update the bucket from a Keepa response body (or keepa ``Status``).
+
+        Args:
+            status: Mapping with tokensLeft, refillIn (ms), refillRate
+                (tokens/minute) and tokensConsumed; missing keys are ignored
+            reserved: Tokens this request holds in in_flight()
+        """
+        tokens_left = _field(status, "tokensLeft")
+        with self._lock:
+            self._in_flight -= reserved
+            consumed = _field(status, "tokensConsumed")
+            if consumed is not None:
+                self.tokens_consumed += int(consumed)
+            if tokens_left is None:
+                return
+            now = time.monotonic()
+            refill_rate = _field(status, "refillRate")
+            if refill_rate is not None:
+                self.refill_per_minute = int(refill_rate)
+                self.rate = self.refill_per_minute / 60.0
+                self.capacity = max(self.refill_per_minute * KEEPA_MAX_REFILL_PERIODS, 1)
+            refill_in = _field(status, "refillIn")
+            if refill_in is not None and self.refill_per_minute is not None:
+                self._next_refill_at = now + max(float(refill_in), 0.0) / 1000.0
+            self.tokens = float(tokens_left) - self._in_flight
+            self.last_refill = now
+            self._synced_at = now
+            self._dispatch()
+        self._wake_all()
+
+    @property
+    def keepa_balance(self) -> Optional[int]:
+        """Spendable tokens per Keepa's last report (None until Keepa answered)."""
+        with self._lock:
+            if self._synced_at is None:
+                return None
+            self._refill()
+            return int(self.tokens)
+
+    @property
+    def balance_age(self) -> Optional[float]:
+        """Seconds since Keepa last reported the balance."""
+        synced_at = self._synced_at
+        return None if synced_at is None else time.monotonic() - synced_at
 
     async def wait_for_tokens(self, required: int = 50):
         """
         Wait until we have a specific number of tokens available.
         Useful before starting batch operations.
         """
-        while self.available_tokens < required:
-            wait_time = (required - self.tokens) / self.rate
+        while True:
+            with self._lock:
+                self._refill()
+                if self.available_tokens >= required:
+                    return
+                wait_time = self._seconds_until(required - self.tokens)
             logger.info(
                 f"⏳ Waiting {wait_time:.1f}s to accumulate {required} tokens"
             )
             await asyncio.sleep(wait_time)
 
-            # Refill tokens
-            now = time.monotonic()
-            elapsed = wait_time
-            self.tokens = min(
-                self.capacity,
-                self.tokens + (elapsed * self.rate)
-            )
-            self.last_refill = now
\ No newline at end of file
+
+def _field(status: Any, key: str) -> Optional[float]:
+    """Numeric field from a response body or keepa ``Status`` (None if absent)."""
+    if status is None:
+        return None
+    value = status.get(key) if isinstance(status, Mapping) else getattr(status, key, None)
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return value
+
+
+def _resolve_future(future: asyncio.Future):
+    if not future.done():
+        future.set_result(None)
+
+
+# Process-wide throttle: KeepaService instances are per request, the Keepa
+# token balance is per API key, so every caller must queue in the same bucket.
+keepa_throttle = KeepaThrottle(
+    tokens_per_minute=20,
+    burst_capacity=200,  # Increased for smooth AutoSourcing (5 niches x 40 products)
+    warning_threshold=80,  # 40% of burst capacity
+    critical_threshold=40   # 20% of burst capacity
+)
+
+
+__all__ = [
+    "BACKGROUND_PRIORITIES",
+    "KeepaPriority",
+    "KeepaThrottle",
+    "PRIORITY_WEIGHTS",
+    "current_keepa_priority",
+    "keepa_priority",
+    "keepa_throttle",
+    "with_keepa_priority",
+]
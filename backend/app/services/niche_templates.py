@@ -10,17 +10,23 @@ Phase 6 Update: Added strategy types (smart_velocity, textbooks) with competitio
 """
 
 import sys
+import time
 import random
-from typing import List, Dict, Optional, Union
+import asyncio
+from typing import AsyncIterator, List, Dict, Optional, Tuple, Union
 from datetime import datetime
 from sqlalchemy.orm import Session
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.services.keepa_product_finder import KeepaProductFinderService
+from app.services.keepa_product_finder import KeepaProductFinderService, estimate_discovery_cost
+from app.core.settings import get_settings
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Validated niches by (template id, strategy) -> (monotonic expiry, niche)
+_validated_niche_cache: Dict[Tuple[str, Optional[str]], Tuple[float, Dict]] = {}
+
 
 # Strategy type definitions for filtering
 STRATEGY_CONFIGS = {
@@ -329,11 +335,16 @@ async def discover_curated_niches(
     product_finder: KeepaProductFinderService,
     count: int = 3,
     shuffle: bool = True,
-    strategy: Optional[str] = None
+    strategy: Optional[str] = None,
+    parallelism: Optional[int] = None
 ) -> List[Dict]:
     """
     Validate curated niche templates with real-time Keepa data.
 
+    Templates are validated concurrently (up to ``parallelism``, within the
+    token budget) and validated niches are cached per template id and
+    strategy for NICHE_VALIDATION_CACHE_TTL seconds.
+
     WINDOWS FIX: Runs async code in isolated SelectorEventLoop for psycopg3 compatibility.
 
     Args:
@@ -342,6 +353,7 @@ async def discover_curated_niches(
         count: Number of niches to return (default 3)
         shuffle: Randomize template selection for variety (default True)
         strategy: Filter by strategy type (textbooks_standard, textbooks_patience, smart_velocity, textbooks, or None for all)
+        parallelism: Max concurrent validations (default NICHE_VALIDATION_PARALLELISM)
 
     Returns:
         List of validated niches with aggregate stats and top products
@@ -370,14 +382,14 @@ async def discover_curated_niches(
                 # Run the actual async function in a separate SelectorEventLoop
                 return await _run_in_selector_loop(
                     _discover_curated_niches_impl,
-                    db, product_finder, count, shuffle, strategy
+                    db, product_finder, count, shuffle, strategy, parallelism
                 )
         except RuntimeError:
             # No running loop, continue normally
             pass
 
     # Normal async execution for Linux/Mac or when SelectorEventLoop already in use
-    return await _discover_curated_niches_impl(db, product_finder, count, shuffle, strategy)
+    return await _discover_curated_niches_impl(db, product_finder, count, shuffle, strategy, parallelism)
 
 
 async def _run_in_selector_loop(func, *args):
@@ -407,11 +419,57 @@ async def _discover_curated_niches_impl(
     product_finder: KeepaProductFinderService,
     count: int,
     shuffle: bool,
-    strategy: Optional[str] = None
+    strategy: Optional[str] = None,
+    parallelism: Optional[int] = None
 ) -> List[Dict]:
     """Implementation of discover_curated_niches (separated for Windows compatibility)."""
     logger.info(f"[NICHE_TEMPLATES] Starting validation of {count} templates (shuffle={shuffle}, strategy={strategy})")
 
+    templates = _select_templates(count, shuffle, strategy)
+    if not templates:
+        return []
+
+    validated = [
+        niche async for niche in _stream_validated_niches(product_finder, templates, parallelism)
+    ]
+
+    # Niches finish in any order - keep template selection order
+    order = {tmpl["id"]: i for i, tmpl in enumerate(templates)}
+    validated.sort(key=lambda niche: order[niche["id"]])
+
+    logger.info(f"[NICHE_TEMPLATES] Completed: {len(validated)}/{len(templates)} niches validated")
+
+    return validated
+
+
+async def stream_curated_niches(
+    product_finder: KeepaProductFinderService,
+    count: int = 3,
+    shuffle: bool = True,
+    strategy: Optional[str] = None,
+    parallelism: Optional[int] = None
+) -> AsyncIterator[Dict]:
+    """
+    Validate curated niche templates concurrently, yielding each validated
+    niche as soon as its discovery finishes.
+
+    Args:
+        product_finder: KeepaProductFinderService instance (with cache enabled)
+        count: Number of templates to validate (default 3)
+        shuffle: Randomize template selection for variety (default True)
+        strategy: Filter by strategy type (None for all)
+        parallelism: Max concurrent validations (default NICHE_VALIDATION_PARALLELISM)
+
+    Yields:
+        Validated niches (same shape as discover_curated_niches items)
+    """
+    templates = _select_templates(count, shuffle, strategy)
+    async for niche in _stream_validated_niches(product_finder, templates, parallelism):
+        yield niche
+
+
+def _select_templates(count: int, shuffle: bool, strategy: Optional[str]) -> List[Dict]:
+    """Pick the templates to validate, optionally filtered by strategy."""
     # Filter templates by strategy if specified
     available_templates = CURATED_NICHES
     if strategy:
@@ -423,73 +481,156 @@ async def _discover_curated_niches_impl(
             return []
 
     # Select templates
-    templates = random.sample(available_templates, min(count, len(available_templates))) if shuffle else available_templates[:count]
+    return random.sample(available_templates, min(count, len(available_templates))) if shuffle else available_templates[:count]
+
+
+def _validation_parallelism(
+    product_finder: KeepaProductFinderService,
+    requested: Optional[int],
+    template_count: int
+) -> int:
+    """
+    Concurrent validations allowed by settings and the local token budget.
+
+    Each validation is budgeted at the conservative discovery estimate for
+    one niche; at least one validation always runs.
+    """
+    if requested is None:
+        requested = get_settings().niche_validation_parallelism
+
+    affordable = product_finder.keepa_service.throttle.available_tokens // estimate_discovery_cost(1)
+    return max(1, min(requested, template_count, affordable))
+
+
+async def _stream_validated_niches(
+    product_finder: KeepaProductFinderService,
+    templates: List[Dict],
+    parallelism: Optional[int] = None
+) -> AsyncIterator[Dict]:
+    """Yield validated niches for templates: cached ones first, then as discoveries finish."""
+    ttl = get_settings().niche_validation_cache_ttl
+    to_validate = []
 
-    validated = []
     for tmpl in templates:
-        logger.debug(f"[NICHE_TEMPLATES] Validating template: {tmpl['id']}")
+        cached = _get_cached_niche(tmpl)
+        if cached is not None:
+            logger.debug(f"[NICHE_TEMPLATES] Cache HIT for template: {tmpl['id']}")
+            yield cached
+        else:
+            to_validate.append(tmpl)
+
+    if not to_validate:
+        return
+
+    limit = _validation_parallelism(product_finder, parallelism, len(to_validate))
+    limiter = asyncio.Semaphore(limit)
+    logger.info(f"[NICHE_TEMPLATES] Validating {len(to_validate)} templates (parallelism={limit})")
+
+    async def validate(tmpl: Dict) -> Tuple[Dict, Optional[Dict]]:
+        async with limiter:
+            try:
+                return tmpl, await _validate_template(product_finder, tmpl)
+            except Exception as e:
+                logger.error(f"[NICHE_TEMPLATES] Error validating {tmpl['id']}: {e}")
+                return tmpl, None
+
+    tasks = [asyncio.create_task(validate(tmpl)) for tmpl in to_validate]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            tmpl, niche = await next_done
+            if niche is None:
+                continue
+            _validated_niche_cache[_niche_cache_key(tmpl)] = (time.monotonic() + ttl, niche)
+            yield dict(niche)
+    finally:
+        # Consumer stopped early: do not leave discoveries running
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def _validate_template(
+    product_finder: KeepaProductFinderService,
+    tmpl: Dict
+) -> Optional[Dict]:
+    """Run discovery for one template; the validated niche, or None if too few quality products."""
+    logger.debug(f"[NICHE_TEMPLATES] Validating template: {tmpl['id']}")
+
+    # Call Discovery with template config
+    # Phase 6: Now passing max_fba_sellers for competition filtering
+    # Phase 8: Now passing strategy for velocity/recommendation adjustments
+    template_strategy = tmpl.get("type")
+    products = await product_finder.discover_with_scoring(
+        domain=1,
+        category=tmpl["categories"][0],  # Primary category
+        bsr_min=tmpl["bsr_range"][0],
+        bsr_max=tmpl["bsr_range"][1],
+        price_min=tmpl["price_range"][0],
+        price_max=tmpl["price_range"][1],
+        max_results=10,
+        max_fba_sellers=tmpl.get("max_fba_sellers"),  # Competition filter
+        strategy=template_strategy  # Phase 8: Strategy-aware scoring
+    )
+
+    # Filter by quality thresholds - RELAXED FOR TESTING
+    # Critères élargis temporairement : ROI 10+, Velocity 20+
+    quality_products = [
+        p for p in products
+        if p.get("roi_percent", 0) >= 10  # Réduit de 27-40%
+        and p.get("velocity_score", 0) >= 20  # Réduit de 50-70
+    ]
+
+    # Only include niche if ≥1 quality products found (réduit de 3 pour tests)
+    if len(quality_products) < 1:
+        logger.warning(
+            f"[NICHE_TEMPLATES] [SKIP] Skipped {tmpl['id']}: "
+            f"Only {len(quality_products)} quality products found (threshold: 3)"
+        )
+        return None
+
+    avg_roi = sum(p["roi_percent"] for p in quality_products) / len(quality_products)
+    avg_velocity = sum(p["velocity_score"] for p in quality_products) / len(quality_products)
+
+    logger.info(
+        f"[NICHE_TEMPLATES] [OK] Validated {tmpl['id']}: "
+        f"{len(quality_products)} products, ROI {avg_roi:.1f}%, velocity {avg_velocity:.1f}"
+    )
+
+    return {
+        "id": tmpl["id"],
+        "name": tmpl["name"],
+        "description": tmpl["description"],
+        "icon": tmpl["icon"],
+        "categories": tmpl["categories"],
+        "bsr_range": tmpl["bsr_range"],
+        "price_range": tmpl["price_range"],
+        "products_found": len(quality_products),
+        "avg_roi": round(avg_roi, 1),
+        "avg_velocity": round(avg_velocity, 1),
+        "top_products": quality_products[:3]  # Top 3 for preview
+    }
 
-        try:
-            # Call Discovery with template config
-            # Phase 6: Now passing max_fba_sellers for competition filtering
-            # Phase 8: Now passing strategy for velocity/recommendation adjustments
-            template_strategy = tmpl.get("type")
-            products = await product_finder.discover_with_scoring(
-                domain=1,
-                category=tmpl["categories"][0],  # Primary category
-                bsr_min=tmpl["bsr_range"][0],
-                bsr_max=tmpl["bsr_range"][1],
-                price_min=tmpl["price_range"][0],
-                price_max=tmpl["price_range"][1],
-                max_results=10,
-                max_fba_sellers=tmpl.get("max_fba_sellers"),  # Competition filter
-                strategy=template_strategy  # Phase 8: Strategy-aware scoring
-            )
-
-            # Filter by quality thresholds - RELAXED FOR TESTING
-            # Critères élargis temporairement : ROI 10+, Velocity 20+
-            quality_products = [
-                p for p in products
-                if p.get("roi_percent", 0) >= 10  # Réduit de 27-40%
-                and p.get("velocity_score", 0) >= 20  # Réduit de 50-70
-            ]
-
-            # Only include niche if ≥1 quality products found (réduit de 3 pour tests)
-            if len(quality_products) >= 1:
-                avg_roi = sum(p["roi_percent"] for p in quality_products) / len(quality_products)
-                avg_velocity = sum(p["velocity_score"] for p in quality_products) / len(quality_products)
-
-                validated.append({
-                    "id": tmpl["id"],
-                    "name": tmpl["name"],
-                    "description": tmpl["description"],
-                    "icon": tmpl["icon"],
-                    "categories": tmpl["categories"],
-                    "bsr_range": tmpl["bsr_range"],
-                    "price_range": tmpl["price_range"],
-                    "products_found": len(quality_products),
-                    "avg_roi": round(avg_roi, 1),
-                    "avg_velocity": round(avg_velocity, 1),
-                    "top_products": quality_products[:3]  # Top 3 for preview
-                })
-
-                logger.info(
-                    f"[NICHE_TEMPLATES] [OK] Validated {tmpl['id']}: "
-                    f"{len(quality_products)} products, ROI {avg_roi:.1f}%, velocity {avg_velocity:.1f}"
-                )
-            else:
-                logger.warning(
-                    f"[NICHE_TEMPLATES] [SKIP] Skipped {tmpl['id']}: "
-                    f"Only {len(quality_products)} quality products found (threshold: 3)"
-                )
 
-        except Exception as e:
-            logger.error(f"[NICHE_TEMPLATES] Error validating {tmpl['id']}: {e}")
-            continue
+def _niche_cache_key(tmpl: Dict) -> Tuple[str, Optional[str]]:
+    return (tmpl["id"], tmpl.get("type"))
 
-    logger.info(f"[NICHE_TEMPLATES] Completed: {len(validated)}/{len(templates)} niches validated")
 
-    return validated
+def _get_cached_niche(tmpl: Dict) -> Optional[Dict]:
+    """Validated niche for a template if cached and not expired."""
+    entry = _validated_niche_cache.get(_niche_cache_key(tmpl))
+    if entry is None:
+        return None
+    expires_at, niche = entry
+    if time.monotonic() >= expires_at:
+        del _validated_niche_cache[_niche_cache_key(tmpl)]
+        return None
+    return dict(niche)
+
+
+def clear_validated_niche_cache():
+    """Drop all cached niche validations."""
+    _validated_niche_cache.clear()
 
 
 def get_niche_template_by_id(niche_id: str) -> Optional[Dict]:
@@ -0,0 +1,294 @@
+"""
+Product Finder Batch Scoring - Extracted from keepa_product_finder.py for SRP.
+
+Scores every fetched product of a discover_with_scoring run at once:
+- Columnar extraction of price / Amazon price / BSR from stats.current
+- ROI, velocity and recommendations from a compiled ScoringProfile
+  (fees linear in price, tier lookup via searchsorted, vectorized masks)
+- Balanced BSR-segment selection with a single score computation
+
+Result dicts are identical to the per-product scoring they replace.
+"""
+import logging
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from app.services.scoring_profile import ScoringProfile
+
+logger = logging.getLogger(__name__)
+
+
+# Composite score used to rank discovered products
+ROI_WEIGHT = 0.6
+VELOCITY_WEIGHT = 0.4
+
+# Weight assumed for fees when the product weight is unknown
+DEFAULT_WEIGHT_LBS = Decimal("1.0")
+
+# Velocity requirements per recommendation level (Phase 8: strategy-aware)
+# Default thresholds (Smart Velocity - BSR 10K-80K, fast rotation)
+DEFAULT_RECOMMENDATION_THRESHOLDS = {"strong_buy": 80, "buy": 60, "consider": 40}
+STRATEGY_RECOMMENDATION_THRESHOLDS = {
+    # Textbook Standard: Balanced thresholds (BSR 100K-250K)
+    # Rotation 7-14 days, moderate velocity expectations
+    "textbooks_standard": {"strong_buy": 50, "buy": 40, "consider": 30},
+    # Textbook Patience: Lower thresholds (BSR 250K-400K)
+    # Rotation 4-6 weeks, slower velocity is acceptable
+    "textbooks_patience": {"strong_buy": 40, "buy": 30, "consider": 20},
+    # Legacy textbooks
+    "textbooks": {"strong_buy": 50, "buy": 40, "consider": 30},
+}
+
+
+def recommendation_thresholds(strategy: Optional[str]) -> Dict[str, int]:
+    """Velocity thresholds for STRONG_BUY / BUY / CONSIDER under a strategy."""
+    return STRATEGY_RECOMMENDATION_THRESHOLDS.get(strategy, DEFAULT_RECOMMENDATION_THRESHOLDS)
+
+
+@dataclass
+class ProductArrays:
+    """Columnar view of the scoring inputs of a product batch."""
+    asins: List[str]
+    titles: List[str]
+    bsr_values: List[Any]
+    price_cents: np.ndarray
+    amazon_cents: np.ndarray
+    bsr: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.asins)
+
+
+def _current_value(current: Sequence[Any], index: int) -> float:
+    """stats.current[index] as float (NaN when missing)."""
+    if len(current) > index and current[index] is not None:
+        try:
+            return float(current[index])
+        except (TypeError, ValueError):
+            return np.nan
+    return np.nan
+
+
+def extract_product_arrays(products: Sequence[Dict[str, Any]]) -> ProductArrays:
+    """
+    Build scoring columns from Keepa /product results.
+
+    Keepa current[] array indices:
+      [0] = AMAZON price (often -1 if unavailable)
+      [1] = NEW price (3rd party sellers - preferred!)
+      [3] = Sales Rank (BSR)
+    """
+    asins, titles, bsr_values = [], [], []
+    new_prices, amazon_prices, ranks = [], [], []
+
+    for product in products:
+        asin = product.get("asin")
+        if not asin:
+            continue
+        current = (product.get("stats") or {}).get("current") or [None, None, None, None]
+
+        asins.append(asin)
+        titles.append(product.get("title", "Unknown"))
+        bsr_values.append(current[3] if len(current) > 3 else None)
+        new_prices.append(_current_value(current, 1))
+        amazon_prices.append(_current_value(current, 0))
+        ranks.append(_current_value(current, 3))
+
+    return ProductArrays(
+        asins=asins,
+        titles=titles,
+        bsr_values=bsr_values,
+        price_cents=np.asarray(new_prices, dtype=np.float64),
+        amazon_cents=np.asarray(amazon_prices, dtype=np.float64),
+        bsr=np.asarray(ranks, dtype=np.float64),
+    )
+
+
+def compile_velocity_tiers(tiers: Sequence[Any]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Sorted tier thresholds and their midpoint scores.
+
+    Scanning tiers in order and taking the first with ``bsr <= threshold``
+    means a tier whose threshold does not exceed an earlier one can never
+    match, so only tiers with a new maximum threshold are kept. Tiers are
+    (bsr_threshold, min_score, max_score) tuples or objects with those
+    attributes.
+    """
+    thresholds, midpoints = [], []
+    for tier in tiers:
+        if isinstance(tier, tuple):
+            bsr_threshold, min_score, max_score = tier
+        else:
+            bsr_threshold, min_score, max_score = tier.bsr_threshold, tier.min_score, tier.max_score
+        if not thresholds or bsr_threshold > thresholds[-1]:
+            thresholds.append(bsr_threshold)
+            midpoints.append((min_score + max_score) / 2)
+    return np.asarray(thresholds, dtype=np.float64), np.asarray(midpoints, dtype=np.float64)
+
+
+def tier_scores(bsr: np.ndarray, thresholds: np.ndarray, midpoints: np.ndarray) -> np.ndarray:
+    """
+    Velocity score (tier midpoint) for each BSR via searchsorted.
+
+    BSR <= 0 (no sales data) and BSR above every tier score 0.
+    """
+    bsr = np.asarray(bsr, dtype=np.float64)
+    scores = np.zeros(len(bsr), dtype=np.float64)
+    if not len(thresholds):
+        return scores
+
+    index = np.searchsorted(thresholds, bsr, side="left")
+    matched = (bsr > 0) & (index < len(thresholds))
+    scores[matched] = midpoints[index[matched]]
+    return scores
+
+
+def velocity_scores(bsr: np.ndarray, tiers: Sequence[Any]) -> np.ndarray:
+    """Velocity score for each BSR, equivalent to a linear first-match tier scan."""
+    return tier_scores(bsr, *compile_velocity_tiers(tiers))
+
+
+def score_product_batch(
+    products: Sequence[Dict[str, Any]],
+    profile: "ScoringProfile",
+    min_roi: Optional[float] = None,
+    min_velocity: Optional[float] = None,
+    exclude_amazon_seller: bool = True
+) -> List[Dict[str, Any]]:
+    """
+    Score a batch of Keepa products and apply the discovery filters.
+
+    Args:
+        products: Keepa /product results (with stats.current)
+        profile: Compiled scoring profile (ROI model, velocity tiers, thresholds)
+        min_roi: Minimum ROI filter
+        min_velocity: Minimum velocity score filter
+        exclude_amazon_seller: Drop products where Amazon is a seller
+
+    Returns:
+        Scoring dicts (asin, title, price, current_price, bsr, roi_percent,
+        velocity_score, recommendation) in input order
+    """
+    arrays = extract_product_arrays(products)
+    if not len(arrays):
+        return []
+
+    # Use NEW price, fallback to AMAZON price
+    price_cents = np.where(arrays.price_cents > 0, arrays.price_cents, arrays.amazon_cents)
+    keep = (price_cents > 0) & ~np.isnan(arrays.bsr) & (arrays.bsr != 0)
+
+    # stats.current[0] = AMAZON price - if > 0, Amazon is selling
+    if exclude_amazon_seller:
+        amazon_selling = keep & (arrays.amazon_cents > 0)
+        if amazon_selling.any():
+            logger.debug(f"[SCORING] Skipping {int(amazon_selling.sum())} ASIN(s): Amazon is a seller")
+        keep &= ~amazon_selling
+
+    prices = np.where(keep, price_cents, 0) / 100
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        roi = profile.roi_percents(prices)
+    if min_roi:
+        keep &= roi >= min_roi
+
+    velocity = profile.velocity_scores(arrays.bsr)
+    if min_velocity:
+        keep &= velocity >= min_velocity
+
+    selected = np.flatnonzero(keep)
+    labels = profile.recommendations(roi[selected], velocity[selected])
+
+    results = []
+    for i, recommendation in zip(selected.tolist(), labels):
+        price = float(prices[i])
+        results.append({
+            "asin": arrays.asins[i],
+            "title": arrays.titles[i][:100],  # Truncate long titles
+            "price": price,
+            "current_price": price,  # Alias for frontend compatibility
+            "bsr": arrays.bsr_values[i],
+            "roi_percent": float(roi[i]),
+            "velocity_score": float(velocity[i]),
+            "recommendation": recommendation,
+        })
+    return results
+
+
+def composite_scores(scored_products: Sequence[Dict[str, Any]]) -> np.ndarray:
+    """Ranking score (ROI 60% / velocity 40%) of scored product dicts."""
+    return np.fromiter(
+        (p["roi_percent"] * ROI_WEIGHT + p["velocity_score"] * VELOCITY_WEIGHT for p in scored_products),
+        dtype=np.float64,
+        count=len(scored_products),
+    )
+
+
+def select_top_products(
+    scored_products: Sequence[Dict[str, Any]],
+    max_results: int,
+    bsr_min: Optional[int] = None,
+    bsr_max: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Pick the products to return, best composite score first.
+
+    Phase 9: with a BSR range and more candidates than max_results, the
+    range is split in thirds and each third contributes up to
+    max_results // 3 products before the remaining slots go to the best
+    leftovers, so results do not cluster at low BSR. Ties keep the order
+    of the original (stable) sorts.
+    """
+    count = len(scored_products)
+    if count == 0:
+        return []
+
+    scores = composite_scores(scored_products)
+    positions = np.arange(count)
+
+    if bsr_min is None or bsr_max is None or count <= max_results:
+        order = np.argsort(-scores, kind="stable")
+        return [scored_products[i] for i in order[:max_results].tolist()]
+
+    # Segment per product: [min, min+s), [min+s, min+2s), [min+2s, max] -
+    # outside the range goes to the closest end segment
+    segment_size = (bsr_max - bsr_min) // 3
+    edges = [bsr_min, bsr_min + segment_size, bsr_min + 2 * segment_size, bsr_max + 1]
+    bsr = np.fromiter((p.get("bsr", 0) or 0 for p in scored_products), dtype=np.float64, count=count)
+    segments = np.select(
+        [(bsr >= edges[i]) & (bsr < edges[i + 1]) for i in range(3)],
+        [0, 1, 2],
+        default=np.where(bsr < bsr_min, 0, 2),
+    )
+
+    # Rank of each product inside its segment (score desc, then input order)
+    by_segment = np.lexsort((positions, -scores, segments))
+    segment_starts = np.searchsorted(segments[by_segment], np.arange(3), side="left")
+    ranks = np.empty(count, dtype=np.int64)
+    ranks[by_segment] = positions - segment_starts[segments[by_segment]]
+
+    results_per_segment = max(1, max_results // 3)
+    primary = ranks < results_per_segment
+
+    # Fill the remaining slots from any segment
+    remaining_needed = max_results - int(primary.sum())
+    filler = np.zeros(count, dtype=bool)
+    if remaining_needed > 0:
+        leftovers = np.lexsort((positions, segments, -scores))
+        leftovers = leftovers[~primary[leftovers]]
+        filler[leftovers[:remaining_needed]] = True
+
+    chosen = np.flatnonzero(primary | filler)
+    group = (~primary[chosen]).astype(np.int64)
+    order = chosen[np.lexsort((chosen, segments[chosen], group, -scores[chosen]))]
+
+    segment_sizes = np.bincount(segments, minlength=3)
+    logger.info(
+        f"[SCORING] Balanced selection: {len(order)} products "
+        f"from segments [{segment_sizes[0]}, {segment_sizes[1]}, {segment_sizes[2]}]"
+    )
+
+    return [scored_products[i] for i in order[:max_results].tolist()]
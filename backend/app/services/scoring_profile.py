@@ -0,0 +1,271 @@
+"""
+Compiled Scoring Profiles.
+
+A ScoringProfile is everything per-product scoring reads from a business
+config, resolved once per (effective config, strategy): thresholds as
+floats, velocity tiers as sorted arrays and the price-independent part of
+the fees summed up. BusinessConfigService caches one per effective config
+version, so the product finder, AutoSourcing and config preview score
+with arithmetic instead of re-reading config dicts for every product.
+"""
+import bisect
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from app.schemas.config_types import (
+    fee_schema_to_unified,
+    roi_schema_to_unified,
+    velocity_schema_to_unified,
+)
+from app.services.product_finder_scoring import (
+    DEFAULT_WEIGHT_LBS,
+    compile_velocity_tiers,
+    recommendation_thresholds,
+    tier_scores,
+)
+
+
+# Velocity tiers as (bsr_threshold, min_score, max_score): first tier with
+# bsr <= threshold wins, score is the tier midpoint
+DEFAULT_VELOCITY_TIERS = (
+    (10000, 80, 100),
+    (50000, 60, 80),
+    (100000, 40, 60),
+    (500000, 20, 40),
+)
+
+# Phase 8: Strategy-specific velocity tiers for appropriate BSR ranges
+STRATEGY_VELOCITY_TIERS = {
+    # Textbook Standard: BSR 100K-250K should map to good velocity scores
+    "textbooks_standard": (
+        (100000, 70, 85),   # BSR <= 100K: excellent
+        (150000, 55, 70),   # BSR 100K-150K: good
+        (200000, 40, 55),   # BSR 150K-200K: moderate
+        (250000, 30, 40),   # BSR 200K-250K: acceptable
+        (500000, 15, 30),   # BSR > 250K: low
+    ),
+    # Textbook Patience: BSR 250K-400K, slower rotation is expected
+    "textbooks_patience": (
+        (200000, 60, 75),   # BSR <= 200K: excellent
+        (250000, 50, 60),   # BSR 200K-250K: very good
+        (300000, 40, 50),   # BSR 250K-300K: good
+        (350000, 30, 40),   # BSR 300K-350K: moderate
+        (400000, 25, 30),   # BSR 350K-400K: acceptable
+        (500000, 15, 25),   # BSR > 400K: low
+    ),
+    # Legacy textbooks (backward compat)
+    "textbooks": (
+        (100000, 65, 80),
+        (200000, 45, 65),
+        (300000, 30, 45),
+        (500000, 15, 30),
+    ),
+}
+
+# Used by the product finder when the config service is unavailable
+FALLBACK_SCORING_CONFIG = {
+    "roi": {
+        "source_price_factor": 0.4,
+        "excellent_threshold": 50.0,
+        "target_pct": 30.0,
+        "min_acceptable": 15.0,
+    },
+}
+
+
+@dataclass(frozen=True, eq=False)
+class ScoringProfile:
+    """Scoring parameters of one effective config and strategy, ready for arithmetic."""
+    strategy: Optional[str]
+
+    # Product finder ROI model: fees = referral_rate * price + fixed_fees
+    source_price_factor: float
+    referral_rate: float
+    fixed_fees: float
+
+    # ROI thresholds
+    roi_excellent: float
+    roi_target: float
+    roi_min_acceptable: float
+    roi_good: float
+    roi_fair: float
+
+    # Velocity tiers (strictly increasing thresholds) and tier labels
+    tier_thresholds: np.ndarray
+    tier_midpoints: np.ndarray
+    velocity_fast: float
+    velocity_medium: float
+    velocity_slow: float
+
+    # Velocity required for STRONG_BUY / BUY / CONSIDER
+    velocity_strong_buy: float
+    velocity_buy: float
+    velocity_consider: float
+
+    # Combined score weights
+    roi_weight: float
+    velocity_weight: float
+
+    # AutoSourcing flat-rate ROI model and active strategy limits
+    flat_source_price_factor: float
+    flat_fee_rate: float
+    strategy_limits: Mapping[str, Any]
+
+    @classmethod
+    def from_config(
+        cls,
+        config: Dict[str, Any],
+        strategy: Optional[str] = None,
+        category: Optional[str] = None
+    ) -> "ScoringProfile":
+        """
+        Compile a profile from an effective business config dict.
+
+        Args:
+            config: Effective config (as returned by BusinessConfigService)
+            strategy: Product finder strategy (velocity tiers and thresholds)
+            category: Category whose fee schedule to use when fees are per category
+        """
+        roi = roi_schema_to_unified(config.get("roi", {}))
+        velocity = velocity_schema_to_unified(config.get("velocity", {}))
+
+        fees_section = config.get("fees", {})
+        if category and isinstance(fees_section.get(category), dict):
+            fees_section = fees_section[category]
+        fees = fee_schema_to_unified(fees_section)
+
+        if strategy in STRATEGY_VELOCITY_TIERS:
+            tiers = STRATEGY_VELOCITY_TIERS[strategy]
+        else:
+            tiers = config.get("velocity", {}).get("tiers") or DEFAULT_VELOCITY_TIERS
+        thresholds, midpoints = compile_velocity_tiers(_tier_tuples(tiers))
+
+        recommendation = recommendation_thresholds(strategy)
+        combined = config.get("combined_score", {})
+        active_strategy = config.get("strategies", {}).get(config.get("active_strategy", "balanced"), {})
+
+        return cls(
+            strategy=strategy,
+            source_price_factor=float(roi.source_price_factor),
+            referral_rate=float(fees.referral_fee_pct) / 100,
+            fixed_fees=float(
+                fees.closing_fee
+                + fees.fba_fee_base
+                + DEFAULT_WEIGHT_LBS * fees.fba_fee_per_lb
+                + fees.inbound_shipping
+                + fees.prep_fee
+            ),
+            roi_excellent=float(roi.excellent_threshold),
+            roi_target=float(roi.target_pct),
+            roi_min_acceptable=float(roi.min_acceptable),
+            roi_good=float(roi.good_threshold),
+            roi_fair=float(roi.fair_threshold),
+            tier_thresholds=thresholds,
+            tier_midpoints=midpoints,
+            velocity_fast=float(velocity.fast_threshold),
+            velocity_medium=float(velocity.medium_threshold),
+            velocity_slow=float(velocity.slow_threshold),
+            velocity_strong_buy=float(recommendation["strong_buy"]),
+            velocity_buy=float(recommendation["buy"]),
+            velocity_consider=float(recommendation["consider"]),
+            roi_weight=float(combined.get("roi_weight", 0.6)),
+            velocity_weight=float(combined.get("velocity_weight", 0.4)),
+            flat_source_price_factor=float(config.get("source_price_factor", 0.40)),
+            flat_fee_rate=float(config.get("fba_fee_percentage", 0.22)),
+            strategy_limits=MappingProxyType(dict(active_strategy)),
+        )
+
+    # --- Vectorized (product finder batch scoring) ---
+
+    def velocity_scores(self, bsr: np.ndarray) -> np.ndarray:
+        """Tier midpoint for each BSR; BSR <= 0 or above every tier scores 0."""
+        return tier_scores(bsr, self.tier_thresholds, self.tier_midpoints)
+
+    def roi_percents(self, prices: np.ndarray) -> np.ndarray:
+        """ROI % for each sell price."""
+        source_prices = prices * self.source_price_factor
+        profits = prices - source_prices - (prices * self.referral_rate + self.fixed_fees)
+        return profits / source_prices * 100
+
+    def recommendations(self, roi: np.ndarray, velocity: np.ndarray) -> List[str]:
+        """STRONG_BUY / BUY / CONSIDER / SKIP for each (ROI, velocity) pair."""
+        labels = np.select(
+            [
+                (roi >= self.roi_excellent) & (velocity >= self.velocity_strong_buy),
+                (roi >= self.roi_target) & (velocity >= self.velocity_buy),
+                (roi >= self.roi_min_acceptable) & (velocity >= self.velocity_consider),
+            ],
+            ["STRONG_BUY", "BUY", "CONSIDER"],
+            default="SKIP",
+        )
+        return labels.tolist()
+
+    # --- Scalar ---
+
+    def velocity_score(self, bsr: Optional[float]) -> float:
+        if bsr is None or bsr <= 0:
+            return 0.0
+        index = bisect.bisect_left(self.tier_thresholds, bsr)
+        return float(self.tier_midpoints[index]) if index < len(self.tier_thresholds) else 0.0
+
+    def recommendation(self, roi_percent: float, velocity_score: float) -> str:
+        if roi_percent >= self.roi_excellent and velocity_score >= self.velocity_strong_buy:
+            return "STRONG_BUY"
+        if roi_percent >= self.roi_target and velocity_score >= self.velocity_buy:
+            return "BUY"
+        if roi_percent >= self.roi_min_acceptable and velocity_score >= self.velocity_consider:
+            return "CONSIDER"
+        return "SKIP"
+
+    def profit_tier(self, roi_percent: float) -> str:
+        if roi_percent >= self.roi_excellent:
+            return "excellent"
+        if roi_percent >= self.roi_good:
+            return "good"
+        if roi_percent >= self.roi_fair:
+            return "fair"
+        return "poor" if roi_percent > 0 else "loss"
+
+    def velocity_tier(self, velocity_score: float) -> str:
+        if velocity_score >= self.velocity_fast:
+            return "fast"
+        if velocity_score >= self.velocity_medium:
+            return "medium"
+        if velocity_score >= self.velocity_slow:
+            return "slow"
+        return "very_slow"
+
+    def combined_score(self, roi_percent: float, velocity_score: float) -> float:
+        """ROI (clamped to 0-100) and velocity weighted by the config."""
+        roi_score = min(max(roi_percent, 0), 100)
+        return round(roi_score * self.roi_weight + velocity_score * self.velocity_weight, 2)
+
+
+def _tier_tuples(tiers: Sequence[Any]) -> List[Any]:
+    """Config tiers may be dicts or lists (JSON); compile_velocity_tiers takes tuples or objects."""
+    result = []
+    for tier in tiers:
+        if isinstance(tier, dict):
+            tier = (tier["bsr_threshold"], tier["min_score"], tier["max_score"])
+        elif isinstance(tier, list):
+            tier = tuple(tier)
+        result.append(tier)
+    return result
+
+
+@lru_cache(maxsize=None)
+def fallback_scoring_profile(strategy: Optional[str] = None) -> ScoringProfile:
+    """Profile used when no effective config can be loaded (compiled once per strategy)."""
+    return ScoringProfile.from_config(FALLBACK_SCORING_CONFIG, strategy)
+
+
+__all__ = [
+    "DEFAULT_VELOCITY_TIERS",
+    "STRATEGY_VELOCITY_TIERS",
+    "ScoringProfile",
+    "fallback_scoring_profile",
+]
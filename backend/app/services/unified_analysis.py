@@ -29,6 +29,7 @@ from app.core.calculations import (
     generate_readable_summary
 )
 from app.utils.amazon_urls import get_amazon_product_url, get_seller_central_restriction_url
+from app.utils.keepa_series import KeepaSeries
 
 logger = logging.getLogger(__name__)
 
@@ -442,10 +443,12 @@ async def process_product_batch(
 
     products = []
 
+    # Fetch Keepa data for the whole batch (100 ASINs per Keepa call)
+    raw_products = await keepa_service.get_products_batch(identifiers, force_refresh=False)
+
     for identifier in identifiers:
         try:
-            # Fetch Keepa data
-            raw_keepa = await keepa_service.get_product_data(identifier, force_refresh=False)
+            raw_keepa = raw_products.get(identifier)
 
             if not raw_keepa:
                 logger.warning(f"No Keepa data for {identifier}")
@@ -643,8 +646,8 @@ async def build_unified_product_v2(
         price_history_raw = parsed.get('price_history', [])
 
         # Safety: Convert to empty list if not already a list
-        bsr_history = bsr_history_raw if isinstance(bsr_history_raw, list) else []
-        price_history = price_history_raw if isinstance(price_history_raw, list) else []
+        bsr_history = bsr_history_raw if isinstance(bsr_history_raw, (list, KeepaSeries)) else []
+        price_history = price_history_raw if isinstance(price_history_raw, (list, KeepaSeries)) else []
         data_age_days = 1  # Assume recent data (could be enhanced with actual age calculation)
 
         # Compute advanced scores
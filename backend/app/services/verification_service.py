@@ -18,6 +18,7 @@ from app.schemas.verification import (
     BuyOpportunity,
 )
 from app.services.keepa_service import KeepaService
+from app.services.keepa_throttle import KeepaPriority, with_keepa_priority
 from app.core.logging import get_logger
 from app.core.fees_config import calculate_total_fees
 
@@ -123,6 +124,7 @@ class VerificationService:
         self.keepa = keepa_service
         self.thresholds = thresholds or VerificationThresholds()
 
+    @with_keepa_priority(KeepaPriority.VERIFICATION)
     async def verify_product(self, request: VerificationRequest) -> VerificationResponse:
         """Verify a product's current status against saved analysis.
 
@@ -0,0 +1,281 @@
+"""
+Columnar Keepa Time Series
+==========================
+Compact representation of Keepa histories used through the parsing
+pipeline: int32 Keepa minutes (since 2011-01-01 UTC, the Keepa epoch) and
+float32 values.
+
+Filtering, windows, percentiles and rank-drop counting are vectorized.
+Iterating yields ``(datetime, float)`` tuples for code that still expects
+lists of pairs; conversion to JSON-safe lists happens at the response
+boundary (``tolist`` / ``sanitize_keepa_response``).
+"""
+
+import logging
+from datetime import datetime, timezone
+from typing import Any, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+
+logger = logging.getLogger(__name__)
+
+# Keepa minute 0 (naive UTC, same convention as the keepa lib 'data' section)
+KEEPA_EPOCH_MINUTE = np.datetime64('2011-01-01T00:00', 'm')
+
+# Decimals kept when converting price values back to Python floats
+PRICE_DECIMALS = 2
+
+
+def _to_float_array(values: Sequence[Any]) -> np.ndarray:
+    """Values as float64, with None/non-numeric entries as NaN."""
+    try:
+        return np.asarray(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        converted = []
+        for value in values:
+            try:
+                converted.append(np.nan if value is None else float(value))
+            except (TypeError, ValueError):
+                converted.append(np.nan)
+        return np.asarray(converted, dtype=np.float64)
+
+
+def _to_minutes(times: Sequence[Any]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Datetimes as Keepa minutes.
+
+    Returns:
+        (minutes as int64, mask of valid timestamps)
+    """
+    try:
+        stamps = np.asarray(times, dtype='datetime64[m]')
+        valid = ~np.isnat(stamps)
+    except (TypeError, ValueError):
+        # Mixed content (strings, None, tz-aware): convert one by one
+        stamps = np.empty(len(times), dtype='datetime64[m]')
+        valid = np.zeros(len(times), dtype=bool)
+        for i, time in enumerate(times):
+            if isinstance(time, datetime):
+                if time.tzinfo is not None:
+                    time = time.astimezone(timezone.utc).replace(tzinfo=None)
+                stamps[i] = np.datetime64(time, 'm')
+                valid[i] = True
+    minutes = (stamps - KEEPA_EPOCH_MINUTE).astype(np.int64)
+    return minutes, valid
+
+
+class KeepaSeries:
+    """
+    Immutable time-ordered series of Keepa points.
+
+    Attributes:
+        minutes: int32 Keepa minutes, ascending
+        values: float32 values (prices in dollars, ranks, counts)
+        decimals: Rounding applied when values leave the series (2 for prices)
+    """
+
+    __slots__ = ('minutes', 'values', 'decimals')
+
+    def __init__(
+        self,
+        minutes: Optional[Sequence[int]] = None,
+        values: Optional[Sequence[float]] = None,
+        decimals: Optional[int] = None
+    ):
+        self.minutes = np.asarray(minutes if minutes is not None else [], dtype=np.int32)
+        self.values = np.asarray(values if values is not None else [], dtype=np.float32)
+        if self.minutes.shape != self.values.shape:
+            raise ValueError("minutes and values must have the same length")
+        self.decimals = decimals
+
+    # =========================================================================
+    # CONSTRUCTORS
+    # =========================================================================
+
+    @classmethod
+    def _build(
+        cls,
+        minutes: np.ndarray,
+        values: np.ndarray,
+        keep: np.ndarray,
+        decimals: Optional[int]
+    ) -> "KeepaSeries":
+        minutes = minutes[keep]
+        values = values[keep]
+        if len(minutes) > 1 and np.any(np.diff(minutes) < 0):
+            order = np.argsort(minutes, kind='stable')
+            minutes, values = minutes[order], values[order]
+        return cls(minutes, values, decimals)
+
+    @classmethod
+    def from_datetimes(
+        cls,
+        times: Sequence[Any],
+        values: Sequence[Any],
+        is_price: bool = True,
+        scale: float = 1.0,
+        now: Optional[datetime] = None
+    ) -> "KeepaSeries":
+        """
+        Build from keepa lib 'data' arrays (datetimes + values).
+
+        Drops Keepa nulls (-1, None, NaN), non-datetime and future
+        timestamps, and negative prices.
+        """
+        if times is None or values is None or len(times) != len(values) or len(times) == 0:
+            return cls.empty(is_price)
+
+        minutes, keep = _to_minutes(times)
+        raw = _to_float_array(values)
+
+        keep &= ~np.isnan(raw) & (raw != -1)
+        if is_price:
+            keep &= raw >= 0
+        keep &= minutes <= _minute_of(now or datetime.now())
+
+        return cls._build(minutes, raw * scale, keep, PRICE_DECIMALS if is_price else None)
+
+    @classmethod
+    def from_keepa_csv(cls, csv_array: Sequence[Any], is_price: bool = True) -> "KeepaSeries":
+        """Build from a raw Keepa csv array [minute1, value1, minute2, value2, ...]."""
+        if csv_array is None or len(csv_array) < 2:
+            return cls.empty(is_price)
+
+        pairs = _to_float_array(csv_array[:len(csv_array) // 2 * 2]).reshape(-1, 2)
+        minutes, raw = pairs[:, 0], pairs[:, 1]
+
+        keep = ~np.isnan(minutes) & ~np.isnan(raw) & (raw != -1) & (minutes > 0)
+        if is_price:
+            raw = raw / 100
+
+        return cls._build(
+            np.nan_to_num(minutes).astype(np.int64), raw, keep,
+            PRICE_DECIMALS if is_price else None
+        )
+
+    @classmethod
+    def empty(cls, is_price: bool = True) -> "KeepaSeries":
+        return cls(decimals=PRICE_DECIMALS if is_price else None)
+
+    # =========================================================================
+    # VECTORIZED OPERATIONS
+    # =========================================================================
+
+    def _with(self, selector) -> "KeepaSeries":
+        return KeepaSeries(self.minutes[selector], self.values[selector], self.decimals)
+
+    def since(self, start: datetime) -> "KeepaSeries":
+        """Points at or after ``start``."""
+        return self.since_minute(_minute_of(start))
+
+    def since_minute(self, minute: int) -> "KeepaSeries":
+        """Points at or after a Keepa minute."""
+        return self._with(slice(int(np.searchsorted(self.minutes, minute, side='left')), None))
+
+    def after_minute(self, minute: int) -> "KeepaSeries":
+        """Points strictly after a Keepa minute."""
+        return self._with(slice(int(np.searchsorted(self.minutes, minute, side='right')), None))
+
+    def positive(self) -> "KeepaSeries":
+        """Points with a value > 0."""
+        return self._with(self.values > 0)
+
+    def concat(self, other: "KeepaSeries") -> "KeepaSeries":
+        """Append a later series (its points must be newer)."""
+        return KeepaSeries(
+            np.concatenate([self.minutes, other.minutes]),
+            np.concatenate([self.values, other.values]),
+            self.decimals
+        )
+
+    def as_float64(self) -> np.ndarray:
+        """Values as float64, rounded like the original Keepa values."""
+        values = self.values.astype(np.float64)
+        if self.decimals is not None:
+            values = np.round(values, self.decimals)
+        return values
+
+    def percentiles(self, percents: Sequence[float]) -> List[float]:
+        """Linear-interpolated percentiles of the values."""
+        if len(self) == 0:
+            return [0.0 for _ in percents]
+        return [float(v) for v in np.percentile(self.as_float64(), percents)]
+
+    def mean(self) -> float:
+        return float(np.mean(self.as_float64())) if len(self) else 0.0
+
+    def count_drops(self) -> int:
+        """Number of consecutive decreases (BSR improvements)."""
+        if len(self) < 2:
+            return 0
+        return int(np.count_nonzero(np.diff(self.values) < 0))
+
+    # =========================================================================
+    # PYTHON / JSON BOUNDARY
+    # =========================================================================
+
+    @property
+    def last_minute(self) -> Optional[int]:
+        return int(self.minutes[-1]) if len(self) else None
+
+    @property
+    def last_time(self) -> Optional[datetime]:
+        return _datetime_of(self.minutes[-1]) if len(self) else None
+
+    def times(self) -> List[datetime]:
+        """Timestamps as naive UTC datetimes."""
+        return (self.minutes.astype(np.int64) + KEEPA_EPOCH_MINUTE).astype('datetime64[us]').tolist()
+
+    def value_list(self) -> List[float]:
+        """Values as Python floats."""
+        return self.as_float64().tolist()
+
+    def tolist(self) -> List[Tuple[datetime, float]]:
+        """``[(datetime, value), ...]`` (JSON-encodable by FastAPI)."""
+        return list(zip(self.times(), self.value_list()))
+
+    def __len__(self) -> int:
+        return len(self.minutes)
+
+    def __iter__(self) -> Iterator[Tuple[datetime, float]]:
+        return iter(self.tolist())
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return self._with(index)
+        value = float(self.values[index])
+        if self.decimals is not None:
+            value = round(value, self.decimals)
+        return (_datetime_of(self.minutes[index]), value)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, KeepaSeries):
+            return (
+                np.array_equal(self.minutes, other.minutes)
+                and np.array_equal(self.values, other.values)
+            )
+        if isinstance(other, (list, tuple)):
+            return self.tolist() == [tuple(item) for item in other]
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"KeepaSeries(points={len(self)}, last={self.last_time})"
+
+
+def _minute_of(time: datetime) -> int:
+    if time.tzinfo is not None:
+        time = time.astimezone(timezone.utc).replace(tzinfo=None)
+    return int((np.datetime64(time, 'm') - KEEPA_EPOCH_MINUTE).astype(np.int64))
+
+
+def _datetime_of(minute: int) -> datetime:
+    return (KEEPA_EPOCH_MINUTE + np.timedelta64(int(minute), 'm')).astype('datetime64[us]').item()
+
+
+__all__ = [
+    'KEEPA_EPOCH_MINUTE',
+    'KeepaSeries',
+]
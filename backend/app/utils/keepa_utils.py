@@ -65,6 +65,7 @@ def safe_array_to_list(arr: Any) -> List:
 
     Handles:
     - numpy.ndarray -> list (via .tolist())
+    - KeepaSeries -> [(datetime, value), ...] (via .tolist())
     - list -> list (pass-through)
     - None -> empty list
     - Scalar values (including strings) -> single-element list
@@ -363,6 +364,7 @@ def sanitize_keepa_response(data: Any) -> Any:
 
     Handles:
     - numpy.ndarray -> list (via .tolist())
+    - KeepaSeries -> [(datetime, value), ...] (via .tolist())
     - numpy scalar types -> Python native (int, float)
     - dict -> recursively sanitize values
     - list -> recursively sanitize elements
@@ -0,0 +1,43 @@
+"""Add keepa_response_cache table
+
+Revision ID: 20261016_keepa_l2
+Revises: bd5d376117d0
+Create Date: 2026-10-16 12:00:00
+
+Second-tier (shared, persistent) cache for compressed Keepa product payloads.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261016_keepa_l2"
+down_revision: Union[str, None] = "bd5d376117d0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "keepa_response_cache",
+        sa.Column("cache_key", sa.String(512), primary_key=True),
+        sa.Column("cache_type", sa.String(20), nullable=False),
+        sa.Column("payload", sa.LargeBinary(), nullable=False),
+        sa.Column("size_bytes", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.func.now(), nullable=False),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+    )
+
+    # Index on expires_at for expiry filtering and purge
+    op.create_index(
+        "idx_keepa_response_cache_expires_at",
+        "keepa_response_cache",
+        ["expires_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_keepa_response_cache_expires_at", table_name="keepa_response_cache")
+    op.drop_table("keepa_response_cache")
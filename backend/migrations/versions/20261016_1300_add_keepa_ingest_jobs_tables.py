@@ -0,0 +1,82 @@
+"""Add keepa_ingest_jobs and keepa_ingest_results tables
+
+Revision ID: 20261016_ingest_jobs
+Revises: 20261016_keepa_l2
+Create Date: 2026-10-16 13:00:00
+
+Durable storage for async /keepa/ingest batches: one job row with progress
+counters and one result row per identifier, so jobs resume after restarts.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261016_ingest_jobs"
+down_revision: Union[str, None] = "20261016_keepa_l2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "keepa_ingest_jobs",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("batch_id", sa.String(100), nullable=False),
+        sa.Column("trace_id", sa.String(64), nullable=True),
+        sa.Column(
+            "status",
+            sa.Enum("PENDING", "RUNNING", "SUCCESS", "ERROR", name="ingestjobstatus"),
+            nullable=False,
+        ),
+        sa.Column("identifiers", sa.JSON(), nullable=False),
+        sa.Column("config", sa.JSON(), nullable=False),
+        sa.Column("options", sa.JSON(), nullable=False),
+        sa.Column("total_items", sa.Integer(), nullable=False),
+        sa.Column("processed", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("successful", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("failed", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("worker_id", sa.String(64), nullable=True),
+        sa.Column("heartbeat_at", sa.DateTime(), nullable=True),
+        sa.Column("error_message", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.func.now(), nullable=False),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("completed_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_keepa_ingest_jobs_batch_id", "keepa_ingest_jobs", ["batch_id"])
+    op.create_index("ix_keepa_ingest_jobs_status", "keepa_ingest_jobs", ["status"])
+    op.create_index("ix_keepa_ingest_jobs_created_at", "keepa_ingest_jobs", ["created_at"])
+
+    op.create_table(
+        "keepa_ingest_results",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column(
+            "job_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("keepa_ingest_jobs.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("position", sa.Integer(), nullable=False),
+        sa.Column("identifier", sa.String(50), nullable=False),
+        sa.Column("asin", sa.String(20), nullable=True),
+        sa.Column("status", sa.String(20), nullable=False),
+        sa.Column("analysis", sa.JSON(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.func.now(), nullable=False),
+        sa.UniqueConstraint("job_id", "position", name="uq_keepa_ingest_results_job_position"),
+    )
+    op.create_index("idx_keepa_ingest_results_job_id", "keepa_ingest_results", ["job_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_keepa_ingest_results_job_id", table_name="keepa_ingest_results")
+    op.drop_table("keepa_ingest_results")
+    op.drop_index("ix_keepa_ingest_jobs_created_at", table_name="keepa_ingest_jobs")
+    op.drop_index("ix_keepa_ingest_jobs_status", table_name="keepa_ingest_jobs")
+    op.drop_index("ix_keepa_ingest_jobs_batch_id", table_name="keepa_ingest_jobs")
+    op.drop_table("keepa_ingest_jobs")
+    sa.Enum(name="ingestjobstatus").drop(op.get_bind(), checkfirst=True)
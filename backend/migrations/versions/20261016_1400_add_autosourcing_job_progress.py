@@ -0,0 +1,27 @@
+"""Add progress column to autosourcing_jobs
+
+Revision ID: 20261016_as_progress
+Revises: 20261016_ingest_jobs
+Create Date: 2026-10-16 14:00:00
+
+Live stage/counter snapshot for queued and running AutoSourcing jobs.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261016_as_progress"
+down_revision: Union[str, None] = "20261016_ingest_jobs"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("autosourcing_jobs", sa.Column("progress", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("autosourcing_jobs", "progress")
@@ -0,0 +1,72 @@
+"""Add daily_review_items and daily_review_summaries tables
+
+Revision ID: 20261016_daily_review
+Revises: 20261016_as_progress
+Create Date: 2026-10-16 15:00:00
+
+Daily review classifications materialized when an AutoSourcing job
+completes: one row per ASIN per day and one count summary per day.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261016_daily_review"
+down_revision: Union[str, None] = "20261016_as_progress"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "daily_review_items",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("review_date", sa.Date(), nullable=False),
+        sa.Column("asin", sa.String(20), nullable=False),
+        sa.Column("classification", sa.String(20), nullable=False),
+        sa.Column(
+            "pick_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("autosourcing_picks.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("picked_at", sa.DateTime(), nullable=False),
+        sa.Column("sightings", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("last_seen_at", sa.DateTime(), nullable=True),
+        sa.Column("roi_percentage", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("product", sa.JSON(), nullable=False),
+        sa.Column("classified_at", sa.DateTime(), server_default=sa.func.now(), nullable=False),
+        sa.UniqueConstraint("review_date", "asin", name="uq_daily_review_items_date_asin"),
+    )
+    op.create_index(
+        "idx_daily_review_items_date_classification",
+        "daily_review_items",
+        ["review_date", "classification"],
+    )
+    op.create_index("idx_daily_review_items_pick_id", "daily_review_items", ["pick_id"])
+    op.create_index("ix_daily_review_items_picked_at", "daily_review_items", ["picked_at"])
+
+    op.create_table(
+        "daily_review_summaries",
+        sa.Column("review_date", sa.Date(), primary_key=True),
+        sa.Column("total", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("stable", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("jackpot", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("revenant", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("fluke", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("reject", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("last_job_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), server_default=sa.func.now(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("daily_review_summaries")
+    op.drop_index("ix_daily_review_items_picked_at", table_name="daily_review_items")
+    op.drop_index("idx_daily_review_items_pick_id", table_name="daily_review_items")
+    op.drop_index("idx_daily_review_items_date_classification", table_name="daily_review_items")
+    op.drop_table("daily_review_items")
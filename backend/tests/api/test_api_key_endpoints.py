@@ -291,6 +291,23 @@ class TestDeleteAPIKey:
         assert len(keys) == 1
         assert keys[0]["is_active"] is False
 
+    @pytest.mark.asyncio
+    async def test_delete_api_key_invalidates_auth_cache(self, admin_client: AsyncClient):
+        """Test deleting a key drops its cached verification immediately."""
+        from unittest.mock import patch
+
+        create_resp = await admin_client.post(
+            "/api/v1/api-keys",
+            json={"name": "Cached Key"},
+        )
+        key_id = create_resp.json()["id"]
+
+        with patch("app.api.v1.routers.api_keys.invalidate_api_key_cache") as mock_invalidate:
+            await admin_client.patch(f"/api/v1/api-keys/{key_id}", json={"scopes": ["daily_review:read"]})
+            await admin_client.delete(f"/api/v1/api-keys/{key_id}")
+
+        assert [c.args[0] for c in mock_invalidate.call_args_list] == [key_id, key_id]
+
     @pytest.mark.asyncio
     async def test_delete_api_key_not_found(self, admin_client: AsyncClient):
         """Test deleting a non-existent API key returns 404."""
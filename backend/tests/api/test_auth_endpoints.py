@@ -315,3 +315,112 @@ class TestFirebaseAuthService:
 
             assert user.id == existing.id
             assert user.firebase_uid == "test_firebase_uid_123"
+
+
+class TestFirebaseAuthCache:
+    """Tests for the verified-token/user caches and coalesced login tracking."""
+
+    @staticmethod
+    def _claims(exp_offset=3600):
+        import time
+        return {**MOCK_FIREBASE_CLAIMS, "exp": int(time.time()) + exp_offset}
+
+    @pytest.mark.asyncio
+    async def test_verified_token_cached_until_exp(self, async_db_session):
+        """A token with a future exp is verified once; claims without exp are not cached."""
+        from app.services.firebase_auth_service import FirebaseAuthService
+
+        service = FirebaseAuthService(async_db_session)
+
+        with patch("app.services.firebase_auth_service.verify_firebase_token") as mock_verify:
+            mock_verify.return_value = self._claims()
+            await service.verify_token_and_get_user("cached_token")
+            await service.verify_token_and_get_user("cached_token")
+            assert mock_verify.call_count == 1
+
+            mock_verify.return_value = self._claims(exp_offset=-1)
+            await service.verify_token_and_get_user("expired_token")
+            await service.verify_token_and_get_user("expired_token")
+            assert mock_verify.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_cached_user_skips_lookup_and_is_session_bound(self, async_db_session):
+        """A repeat login rebuilds the user from the cache without querying it."""
+        from app.services.firebase_auth_service import FirebaseAuthService
+
+        service = FirebaseAuthService(async_db_session)
+
+        with patch("app.services.firebase_auth_service.verify_firebase_token") as mock_verify:
+            mock_verify.return_value = self._claims()
+            first, _ = await service.verify_token_and_get_user("token_a")
+
+            with patch.object(
+                service.user_repo, "get_by_firebase_uid", new_callable=AsyncMock
+            ) as mock_lookup:
+                second, claims = await service.verify_token_and_get_user("token_b")
+
+            mock_lookup.assert_not_called()
+            assert second.id == first.id
+            assert second.email == "test@example.com"
+            assert second in async_db_session
+            assert claims["uid"] == "test_firebase_uid_123"
+
+    @pytest.mark.asyncio
+    async def test_login_tracking_is_coalesced(self, async_db_session, async_test_engine):
+        """Logins only record a timestamp; one flush writes last_login_at per user."""
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+        from app.services.firebase_auth_service import FirebaseAuthService, login_tracking
+
+        service = FirebaseAuthService(async_db_session)
+
+        with patch("app.services.firebase_auth_service.verify_firebase_token") as mock_verify:
+            mock_verify.return_value = self._claims()
+            for _ in range(3):
+                user, _ = await service.verify_token_and_get_user("tracked_token")
+
+        assert list(login_tracking.pending()) == [user.id]
+        assert user.last_login_at is None
+
+        factory = async_sessionmaker(async_test_engine, expire_on_commit=False)
+        assert await login_tracking.flush(factory) == 1
+        assert login_tracking.pending() == {}
+
+        await async_db_session.refresh(user)
+        assert user.last_login_at is not None
+
+    @pytest.mark.asyncio
+    async def test_login_tracking_flush_keeps_newer_lockout(self, async_db_session, async_test_engine):
+        """A flush resets failed attempts only when no lockout is active."""
+        from datetime import datetime, timedelta
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+        from app.services.firebase_auth_service import FirebaseAuthService, login_tracking
+
+        service = FirebaseAuthService(async_db_session)
+
+        with patch("app.services.firebase_auth_service.verify_firebase_token") as mock_verify:
+            mock_verify.return_value = self._claims()
+            user, _ = await service.verify_token_and_get_user("tracked_token")
+
+        # Locked out between the login and the flush
+        locked_until = datetime.utcnow() + timedelta(minutes=15)
+        user.failed_login_attempts = 5
+        user.lock_account(locked_until)
+        await async_db_session.commit()
+
+        factory = async_sessionmaker(async_test_engine, expire_on_commit=False)
+        assert await login_tracking.flush(factory) == 1
+
+        await async_db_session.refresh(user)
+        assert user.last_login_at is not None
+        assert user.failed_login_attempts == 5
+        assert user.locked_until is not None
+
+        # Once the lockout has expired, the next flush resets it
+        user.locked_until = datetime.utcnow() - timedelta(minutes=1)
+        await async_db_session.commit()
+        login_tracking.record(user.id)
+        assert await login_tracking.flush(factory) == 1
+
+        await async_db_session.refresh(user)
+        assert user.failed_login_attempts == 0
+        assert user.locked_until is None
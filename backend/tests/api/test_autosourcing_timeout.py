@@ -1,8 +1,8 @@
 """
 Tests for AutoSourcing timeout protection.
 
-The timeout is now enforced inside AutoSourcingService.run_custom_search(),
-not in the router endpoint. These tests verify the infrastructure is in place.
+The timeout is enforced inside AutoSourcingService.execute_job(), which the
+background job pool runs after the router endpoint has queued the job. These tests verify the infrastructure is in place.
 """
 import pytest
 import asyncio
@@ -14,13 +14,15 @@ from uuid import uuid4
 
 
 @pytest.mark.asyncio
-async def test_run_custom_delegates_to_service():
+async def test_run_custom_enqueues_job_without_running_pipeline():
     """
-    Test run_custom endpoint delegates to service.run_custom_search().
+    Test run_custom endpoint creates the job and hands it to the background pool.
 
-    Timeout protection is handled inside the service, not the router.
+    The pipeline (and its timeout protection) runs in the worker, not the request.
     """
-    from app.api.v1.routers.autosourcing import run_custom_search, RunCustomSearchRequest
+    from app.api.v1.routers.autosourcing import (
+        run_custom_search, RunCustomSearchRequest, AUTOSOURCING_JOB_KIND
+    )
 
     request = RunCustomSearchRequest(
         profile_name="Test Job",
@@ -34,69 +36,58 @@ async def test_run_custom_delegates_to_service():
     mock_job = AutoSourcingJob(
         id=uuid4(),
         profile_name="Test Job",
-        status=JobStatus.SUCCESS,
-        total_tested=5,
-        total_selected=2,
+        status=JobStatus.PENDING,
+        total_tested=0,
+        total_selected=0,
         launched_at=datetime.now(timezone.utc),
+        progress={"stage": "queued"},
         picks=[]
     )
 
     mock_autosourcing_service = AsyncMock()
-    mock_autosourcing_service.run_custom_search = AsyncMock(return_value=mock_job)
+    mock_autosourcing_service.create_job = AsyncMock(return_value=mock_job)
 
     mock_user = MagicMock()
 
-    result = await run_custom_search(
-        request=request,
-        service=mock_autosourcing_service,
-        keepa_service=mock_keepa_service,
-        current_user=mock_user,
-    )
+    with patch("app.api.v1.routers.autosourcing.background_jobs") as mock_pool:
+        result = await run_custom_search(
+            request=request,
+            service=mock_autosourcing_service,
+            keepa_service=mock_keepa_service,
+            current_user=mock_user,
+        )
 
-    assert result.status == JobStatus.SUCCESS
+    assert result.status == JobStatus.PENDING
     assert result.profile_name == "Test Job"
-    mock_autosourcing_service.run_custom_search.assert_called_once()
+    mock_autosourcing_service.create_job.assert_called_once()
+    mock_autosourcing_service.run_custom_search.assert_not_called()
+    mock_pool.submit.assert_called_once_with(AUTOSOURCING_JOB_KIND, str(mock_job.id))
 
 
 @pytest.mark.asyncio
-async def test_run_custom_completes_within_timeout():
+async def test_background_handler_skips_already_claimed_job():
     """
-    Test run_custom endpoint completes successfully when within timeout.
+    Test the worker handler only executes jobs it could claim.
     """
-    from app.api.v1.routers.autosourcing import run_custom_search, RunCustomSearchRequest
+    from app.api.v1.routers.autosourcing import process_autosourcing_job
 
-    request = RunCustomSearchRequest(
-        profile_name="Test Fast Job",
-        discovery_config={"categories": ["books"], "max_results": 5},
-        scoring_config={"roi_min": 30, "velocity_min": 70}
-    )
+    mock_service = MagicMock()
+    mock_service.claim_job = AsyncMock(return_value=None)
+    mock_service.execute_job = AsyncMock()
 
-    mock_keepa_service = AsyncMock()
-    mock_keepa_service.check_api_balance = AsyncMock(return_value=1000)
+    mock_session = MagicMock()
+    mock_session.__aenter__ = AsyncMock(return_value=AsyncMock())
+    mock_session.__aexit__ = AsyncMock(return_value=None)
+    mock_keepa = AsyncMock()
 
-    mock_job = AutoSourcingJob(
-        id=uuid4(),
-        profile_name="Test Fast Job",
-        status=JobStatus.SUCCESS,
-        total_tested=5,
-        total_selected=2,
-        launched_at=datetime.now(timezone.utc),
-        picks=[]
-    )
-    mock_autosourcing_service = AsyncMock()
-    mock_autosourcing_service.run_custom_search = AsyncMock(return_value=mock_job)
-
-    mock_user = MagicMock()
-
-    result = await run_custom_search(
-        request=request,
-        service=mock_autosourcing_service,
-        keepa_service=mock_keepa_service,
-        current_user=mock_user,
-    )
+    with patch("app.api.v1.routers.autosourcing.db_manager") as mock_db_manager, \
+         patch("app.api.v1.routers.autosourcing.get_keepa_service", AsyncMock(return_value=mock_keepa)), \
+         patch("app.api.v1.routers.autosourcing.AutoSourcingService", return_value=mock_service):
+        mock_db_manager.session.return_value = mock_session
+        await process_autosourcing_job(str(uuid4()))
 
-    assert result.status == JobStatus.SUCCESS
-    assert result.profile_name == "Test Fast Job"
+    mock_service.claim_job.assert_called_once()
+    mock_service.execute_job.assert_not_called()
 
 
 def test_timeout_constant_is_defined():
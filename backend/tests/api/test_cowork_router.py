@@ -5,7 +5,7 @@ import os
 os.environ.setdefault("DATABASE_URL", "sqlite:///test.db")
 
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta
 
 import pytest
 from unittest.mock import AsyncMock, patch, MagicMock
@@ -13,7 +13,12 @@ from fastapi.testclient import TestClient
 
 from app.main import app
 from app.core.db import get_db_session
-from app.models.autosourcing import JobStatus
+from app.api.v1.routers.cowork import (
+    _latest_picks_query,
+    _load_latest_picks,
+    _load_sighting_summaries,
+)
+from app.models.autosourcing import AutoSourcingJob, AutoSourcingPick, JobStatus
 
 VALID_TOKEN = "test-cowork-token-123"
 
@@ -226,7 +231,7 @@ def test_daily_buy_list_smoke(_override_db_session):
 
     # First execute call returns picks, subsequent calls return empty (history + config)
     mock_result_with_pick = MagicMock()
-    mock_result_with_pick.scalars.return_value.all.return_value = [mock_pick]
+    mock_result_with_pick.all.return_value = [mock_pick]
     mock_result_empty = _mock_db_execute_result()
 
     _override_db_session.execute = AsyncMock(
@@ -264,6 +269,60 @@ def test_daily_buy_list_smoke(_override_db_session):
         p.stop()
 
 
+# --- latest picks / sighting summaries (SQLite) ---
+
+def _pick(job, asin, created_at, roi=40.0, is_ignored=False):
+    return AutoSourcingPick(
+        job_id=job.id, asin=asin, title=f"Book {asin}", roi_percentage=roi,
+        velocity_score=70, stability_score=80, confidence_score=85, overall_rating="GOOD",
+        bsr=50000, amazon_on_listing=False, current_price=20.0,
+        is_ignored=is_ignored, created_at=created_at,
+    )
+
+
+@pytest.mark.asyncio
+async def test_latest_picks_and_sighting_summaries(async_db_session):
+    """One row per ASIN (newest pick wins) and sightings from earlier jobs over 30 days."""
+    now = datetime.utcnow()
+    old_job = AutoSourcingJob(
+        profile_name="old", discovery_config={}, scoring_config={}, created_at=now - timedelta(days=5)
+    )
+    job = AutoSourcingJob(
+        profile_name="today", discovery_config={}, scoring_config={}, created_at=now - timedelta(hours=2)
+    )
+    async_db_session.add_all([old_job, job])
+    await async_db_session.flush()
+    async_db_session.add_all([
+        _pick(old_job, "B00AAA", now - timedelta(days=5)),
+        _pick(old_job, "B00OLD", now - timedelta(days=5)),
+        _pick(job, "B00AAA", now - timedelta(hours=2), roi=30.0),
+        _pick(job, "B00AAA", now - timedelta(hours=1), roi=55.0),
+        _pick(job, "B00BBB", now - timedelta(hours=1)),
+        _pick(job, "B00IGN", now - timedelta(hours=1), is_ignored=True),
+    ])
+    await async_db_session.commit()
+
+    cutoff = now - timedelta(hours=24)
+    picks = {p["asin"]: p for p in await _load_latest_picks(async_db_session, cutoff)}
+    assert set(picks) == {"B00AAA", "B00BBB"}
+    assert picks["B00AAA"]["roi_percentage"] == 55.0
+    assert picks["B00AAA"]["stability_score"] == 80.0
+
+    # The picks' own job is not history (same as the stored daily review)
+    summaries = await _load_sighting_summaries(async_db_session, list(picks.values()))
+    assert set(summaries) == {"B00AAA"}
+    assert summaries["B00AAA"].sightings == 1
+    assert summaries["B00AAA"].last_seen_at == now - timedelta(days=5)
+
+
+def test_latest_picks_query_uses_distinct_on_for_postgres():
+    from sqlalchemy.dialects import postgresql
+
+    sql = str(_latest_picks_query(datetime.utcnow(), "postgresql").compile(dialect=postgresql.dialect()))
+    assert "DISTINCT ON (autosourcing_picks.asin)" in sql
+    assert "row_number" not in sql
+
+
 # --- last-job-stats tests ---
 
 def _make_mock_job(**overrides):
@@ -490,11 +549,8 @@ def test_keepa_balance_no_keepa():
 
 def test_keepa_balance_cached():
     """GET keepa-balance returns cached balance with correct schema."""
-    import time
-
     mock_keepa = AsyncMock()
-    mock_keepa.api_balance_cache = 4500
-    mock_keepa.last_api_balance_check = time.time() - 10
+    mock_keepa.balance_age_seconds = 10
     mock_keepa.check_api_balance = AsyncMock(return_value=4500)
 
     client, p = _client_with_settings()
@@ -512,6 +568,7 @@ def test_keepa_balance_cached():
         data = response.json()
         assert data["tokens_left"] == 4500
         assert data["is_cached"] is True
+        assert data["cache_age_seconds"] == 10
         assert "thresholds" in data
         assert data["can_run_autosourcing"] is True
         assert data["can_run_manual_search"] is True
@@ -521,11 +578,8 @@ def test_keepa_balance_cached():
 
 def test_keepa_balance_low_tokens():
     """GET keepa-balance with low tokens shows correct flags."""
-    import time
-
     mock_keepa = AsyncMock()
-    mock_keepa.api_balance_cache = 5
-    mock_keepa.last_api_balance_check = time.time() - 10
+    mock_keepa.balance_age_seconds = 10
     mock_keepa.check_api_balance = AsyncMock(return_value=5)
 
     client, p = _client_with_settings()
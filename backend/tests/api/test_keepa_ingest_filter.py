@@ -7,13 +7,17 @@ from unittest.mock import AsyncMock, patch, MagicMock
 def _make_mock_keepa_service():
     """Create a mock Keepa service returning test data."""
     mock_service = AsyncMock()
-    mock_service.get_product_data = AsyncMock(return_value={
+    product = {
         'asin': 'B00TEST123',
         'title': 'Test Book',
         'domainId': 1,
         'stats': {'current': [None] * 20},
         'offers': [],
-    })
+    }
+    mock_service.get_product_data = AsyncMock(return_value=product)
+    mock_service.get_products_batch = AsyncMock(
+        side_effect=lambda asins, **kwargs: {asin: product for asin in asins}
+    )
     mock_service.__aenter__ = AsyncMock(return_value=mock_service)
     mock_service.__aexit__ = AsyncMock(return_value=None)
     return mock_service
@@ -0,0 +1,115 @@
+"""Tests for the streaming (NDJSON/SSE) mode of the keepa ingest endpoint."""
+
+import os
+os.environ.setdefault("DATABASE_URL", "sqlite:///test.db")
+
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.v1.routers.keepa_schemas import AnalysisResult
+from app.main import app
+from app.services.business_config_service import get_business_config_service
+from app.services.keepa_service import get_keepa_service
+
+
+FOUND = ["B00TEST001", "B00TEST002"]
+MISSING = "B00MISSING"
+
+
+def _make_mock_keepa_service(fail=False):
+    mock_service = AsyncMock()
+
+    async def get_products_batch(asins, **kwargs):
+        if fail:
+            raise RuntimeError("Keepa unavailable")
+        return {asin: {"asin": asin} for asin in asins if asin != MISSING}
+
+    mock_service.get_products_batch = AsyncMock(side_effect=get_products_batch)
+    mock_service.__aenter__ = AsyncMock(return_value=mock_service)
+    mock_service.__aexit__ = AsyncMock(return_value=None)
+    return mock_service
+
+
+def _analysis(asin, *args, **kwargs):
+    return AnalysisResult(
+        asin=asin,
+        title="Test Book",
+        roi={"roi_percentage": 35.0},
+        velocity={},
+        velocity_score=60,
+        price_stability_score=70,
+        confidence_score=80,
+        overall_rating="GOOD",
+        score_breakdown={},
+        readable_summary="ok",
+        recommendation="BUY",
+        risk_factors=[],
+    )
+
+
+@pytest.fixture
+def client_for():
+    mock_config = AsyncMock()
+    mock_config.get_effective_config = AsyncMock(return_value={"roi": {}})
+
+    def make(keepa_service):
+        app.dependency_overrides[get_keepa_service] = lambda: keepa_service
+        app.dependency_overrides[get_business_config_service] = lambda: mock_config
+        return TestClient(app)
+
+    with patch("app.api.v1.routers.keepa.analyze_product", AsyncMock(side_effect=_analysis)):
+        yield make
+
+    app.dependency_overrides.pop(get_keepa_service, None)
+    app.dependency_overrides.pop(get_business_config_service, None)
+
+
+def test_ndjson_stream_emits_each_result_then_summary(client_for):
+    client = client_for(_make_mock_keepa_service())
+
+    # Streaming takes precedence over the async job threshold
+    response = client.post(
+        "/api/v1/keepa/ingest",
+        json={"identifiers": FOUND + [MISSING], "stream": "ndjson", "async_threshold": 1},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    records = [json.loads(line) for line in response.text.splitlines()]
+
+    results = sorted((r for r in records if r["type"] == "result"), key=lambda r: r["index"])
+    assert [r["identifier"] for r in results] == FOUND + [MISSING]
+    assert [r["status"] for r in results] == ["success", "success", "not_found"]
+    assert results[0]["analysis"]["overall_rating"] == "GOOD"
+
+    summary = records[-1]
+    assert summary["type"] == "summary"
+    assert (summary["total_items"], summary["successful"], summary["failed"]) == (3, 2, 1)
+
+
+def test_sse_stream_selected_by_accept_header(client_for):
+    client = client_for(_make_mock_keepa_service())
+
+    response = client.post(
+        "/api/v1/keepa/ingest",
+        json={"identifiers": FOUND},
+        headers={"Accept": "text/event-stream"},
+    )
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = [frame.split("\n")[0] for frame in response.text.strip().split("\n\n")]
+    assert events == ["event: result", "event: result", "event: summary"]
+
+
+def test_stream_reports_fetch_failure_per_item(client_for):
+    client = client_for(_make_mock_keepa_service(fail=True))
+
+    response = client.post("/api/v1/keepa/ingest", json={"identifiers": FOUND, "stream": "ndjson"})
+
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert [r["status"] for r in records[:-1]] == ["error", "error"]
+    assert records[0]["error"] == "Keepa unavailable"
+    assert records[-1]["failed"] == 2
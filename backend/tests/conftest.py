@@ -180,6 +180,57 @@ def _reset_app_dependency_overrides():
     app.dependency_overrides.clear()
 
 
+@pytest.fixture(autouse=True)
+def _reset_keepa_history_store():
+    """Clear the process-wide Keepa history store between tests.
+
+    The unified parser reuses stored series, so one test's fetch must not
+    leak history into another.
+    """
+    from app.services.keepa_history_store import keepa_history_store
+    keepa_history_store.reset()
+    yield
+    keepa_history_store.reset()
+
+
+@pytest.fixture(autouse=True)
+def _reset_keepa_throttle():
+    """Refill the process-wide Keepa throttle between tests.
+
+    Every KeepaService shares one bucket (and one concurrency limit), so a
+    test that drains it must not make the next one wait for refill.
+    """
+    from app.services.keepa_concurrency import keepa_concurrency
+    from app.services.keepa_throttle import keepa_throttle
+    keepa_throttle.reset()
+    keepa_concurrency.reset()
+    yield
+    keepa_throttle.reset()
+    keepa_concurrency.reset()
+
+
+@pytest.fixture(autouse=True)
+def _reset_api_key_cache():
+    """Forget verified API keys and pending last_used_at writes between tests."""
+    from app.core.api_key_auth import api_key_usage, invalidate_api_key_cache
+    invalidate_api_key_cache()
+    api_key_usage.reset()
+    yield
+    invalidate_api_key_cache()
+    api_key_usage.reset()
+
+
+@pytest.fixture(autouse=True)
+def _reset_firebase_auth_cache():
+    """Forget verified Firebase tokens, cached users and pending login writes between tests."""
+    from app.services.firebase_auth_service import invalidate_firebase_auth_cache, login_tracking
+    invalidate_firebase_auth_cache()
+    login_tracking.reset()
+    yield
+    invalidate_firebase_auth_cache()
+    login_tracking.reset()
+
+
 @pytest.fixture
 def mock_keepa_balance():
     """Mock Keepa service check_api_balance to return test value."""
@@ -8,7 +8,12 @@ STABLE, JACKPOT, REVENANT, FLUKE, REJECT.
 import pytest
 from datetime import datetime, timezone, timedelta
 
-from app.services.daily_review_service import classify_product, generate_daily_review, Classification
+from app.services.daily_review_service import (
+    classify_product,
+    generate_daily_review,
+    Classification,
+    SightingSummary,
+)
 
 
 # =============================================================================
@@ -242,6 +247,33 @@ class TestClassifyProduct:
         assert result == Classification.REJECT
 
 
+class TestSightingSummary:
+    """classify_product gives the same answer for a history list and its summary."""
+
+    @pytest.mark.parametrize("roi,hours_ago", [
+        (40.0, []),
+        (90.0, [12]),
+        (35.0, [72]),
+        (40.0, [12, 36]),
+        (40.0, [12]),
+        (5.0, [12, 36]),
+    ])
+    def test_summary_matches_history_list(self, roi, hours_ago):
+        product = make_pick(roi=roi, bsr=300, amazon_on_listing=False)
+        history = [make_history(hours_ago=h) for h in hours_ago]
+        summary = SightingSummary(
+            sightings=len(history),
+            last_seen_at=max((h["tracked_at"] for h in history), default=None),
+        )
+        assert classify_product(product, history=summary) == classify_product(product, history=history)
+
+    def test_naive_last_seen_at(self):
+        """DB aggregates come back naive (UTC)."""
+        product = make_pick(roi=40.0, bsr=300, amazon_on_listing=False)
+        summary = SightingSummary(sightings=3, last_seen_at=datetime.utcnow() - timedelta(hours=2))
+        assert classify_product(product, history=summary) == Classification.STABLE
+
+
 # =============================================================================
 # DAILY REVIEW GENERATOR TESTS
 # =============================================================================
@@ -0,0 +1,182 @@
+"""
+Tests for the materialized daily review (classifications stored at job completion).
+"""
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from sqlalchemy import select
+
+from app.models.autosourcing import ActionStatus, AutoSourcingJob, AutoSourcingPick, JobStatus
+from app.services.autosourcing_service import AutoSourcingService
+from app.services.daily_review_store import (
+    backfill_daily_reviews,
+    get_daily_summary,
+    load_review_products,
+    record_job_classifications,
+)
+
+
+def _pick(job, asin, created_at, roi=40.0, amazon=False):
+    return AutoSourcingPick(
+        job_id=job.id, asin=asin, title=f"Book {asin}", roi_percentage=roi,
+        velocity_score=70, stability_score=80, confidence_score=85, overall_rating="GOOD",
+        bsr=50000, amazon_on_listing=amazon, current_price=20.0, created_at=created_at,
+    )
+
+
+async def _job(db, created_at, picks):
+    job = AutoSourcingJob(
+        profile_name="test", discovery_config={}, scoring_config={},
+        status=JobStatus.SUCCESS, created_at=created_at,
+    )
+    db.add(job)
+    await db.flush()
+    db.add_all([_pick(job, asin, created_at, **kwargs) for asin, kwargs in picks])
+    await db.flush()
+    return job
+
+
+@pytest.mark.asyncio
+async def test_job_classifications_stored_per_asin_with_summary(async_db_session):
+    now = datetime.utcnow()
+    await _job(async_db_session, now - timedelta(days=3), [("B00SEEN", {}), ("B00BACK", {})])
+    await _job(async_db_session, now - timedelta(hours=6), [("B00SEEN", {})])
+    job = await _job(async_db_session, now - timedelta(minutes=5), [
+        ("B00SEEN", {}),
+        ("B00BACK", {}),
+        ("B00NEW", {}),
+        ("B00AMZN", {"amazon": True}),
+    ])
+
+    assert await record_job_classifications(async_db_session, job.id, now=now) == 4
+    await async_db_session.commit()
+
+    products = {p["asin"]: p for p in await load_review_products(async_db_session, now - timedelta(days=1))}
+    assert products["B00SEEN"]["classification"] == "STABLE"
+    assert products["B00BACK"]["classification"] == "REVENANT"
+    assert products["B00AMZN"]["classification"] == "REJECT"
+    assert products["B00NEW"]["classification"] == "FLUKE"
+    assert products["B00SEEN"]["classification_color"] == "green"
+
+    summary = await get_daily_summary(async_db_session, now.date())
+    assert summary.total == 4
+    assert summary.counts == {"STABLE": 1, "JACKPOT": 0, "REVENANT": 1, "FLUKE": 1, "REJECT": 1}
+    assert summary.last_job_id == job.id
+
+
+@pytest.mark.asyncio
+async def test_later_job_overwrites_same_day_asin(async_db_session):
+    now = datetime.utcnow()
+    first = await _job(async_db_session, now - timedelta(hours=2), [("B00AAA", {"roi": 20.0})])
+    await record_job_classifications(async_db_session, first.id, now=now - timedelta(hours=2))
+    second = await _job(async_db_session, now - timedelta(minutes=5), [("B00AAA", {"roi": 95.0})])
+    await record_job_classifications(async_db_session, second.id, now=now)
+    await async_db_session.commit()
+
+    products = await load_review_products(async_db_session, now - timedelta(days=1))
+    assert len(products) == 1
+    assert products[0]["roi_percentage"] == 95.0
+    assert products[0]["classification"] == "JACKPOT"
+
+    summary = await get_daily_summary(async_db_session, now.date())
+    assert summary.total == 1 and summary.jackpot == 1
+
+
+@pytest.mark.asyncio
+async def test_revenant_measured_against_earlier_sightings(async_db_session):
+    """The completing job's own picks do not count as the last sighting."""
+    now = datetime.utcnow()
+    await _job(async_db_session, now - timedelta(days=2), [("B00AAA", {})])
+    job = await _job(async_db_session, now - timedelta(minutes=1), [("B00AAA", {})])
+
+    await record_job_classifications(async_db_session, job.id, now=now)
+    await async_db_session.commit()
+
+    products = await load_review_products(async_db_session, now - timedelta(days=1))
+    assert products[0]["classification"] == "REVENANT"
+
+
+@pytest.mark.asyncio
+async def test_ignoring_a_pick_updates_review_and_summary(async_db_session):
+    now = datetime.utcnow()
+    job = await _job(async_db_session, now - timedelta(minutes=5), [("B00AAA", {}), ("B00BBB", {})])
+    await record_job_classifications(async_db_session, job.id, now=now)
+    await async_db_session.commit()
+    pick = (await async_db_session.execute(
+        select(AutoSourcingPick).where(AutoSourcingPick.asin == "B00AAA")
+    )).scalar_one()
+
+    service = AutoSourcingService(db_session=async_db_session, keepa_service=Mock())
+    await service.update_pick_action(pick.id, ActionStatus.IGNORED)
+
+    products = await load_review_products(async_db_session, now - timedelta(days=1))
+    assert [p["asin"] for p in products] == ["B00BBB"]
+    assert (await get_daily_summary(async_db_session, now.date())).total == 1
+
+
+@pytest.mark.asyncio
+async def test_execute_job_materializes_review_with_job(async_db_session):
+    keepa = Mock()
+    keepa.can_perform_action = AsyncMock(return_value={
+        "can_proceed": True, "current_balance": 300, "required_tokens": 200, "action": "auto_sourcing_job"
+    })
+    keepa.metrics = Mock(tokens_used=0)
+    service = AutoSourcingService(db_session=async_db_session, keepa_service=keepa)
+    job = await service.create_job(
+        discovery_config={"categories": ["Books"]}, scoring_config={}, profile_name="Daily"
+    )
+    job = await service.claim_job(job.id)
+
+    async def score(asins, scoring_config, job_id, on_progress=None):
+        return [_pick(job, asin, None) for asin in asins]
+
+    service._discover_products = AsyncMock(return_value=["B00AAA", "B00BBB"])
+    service._score_and_filter_products = score
+    service._remove_recent_duplicates = AsyncMock(side_effect=lambda picks: picks)
+
+    result = await service.execute_job(job)
+
+    assert result.status == JobStatus.SUCCESS
+    summary = await get_daily_summary(async_db_session, datetime.utcnow().date())
+    assert summary.total == 2 and summary.fluke == 2
+
+
+@pytest.mark.asyncio
+async def test_second_job_of_the_day_counts_both_jobs_items(async_db_session):
+    """Items and summary are upserted: a job finishing second adds to the day's rows."""
+    now = datetime.utcnow()
+    first = await _job(async_db_session, now - timedelta(hours=1), [("B00AAA", {}), ("B00BBB", {})])
+    await record_job_classifications(async_db_session, first.id, now=now)
+    await async_db_session.commit()
+    second = await _job(async_db_session, now - timedelta(minutes=5), [("B00BBB", {}), ("B00CCC", {})])
+    await record_job_classifications(async_db_session, second.id, now=now)
+    await async_db_session.commit()
+
+    products = await load_review_products(async_db_session, now - timedelta(days=1))
+    assert sorted(p["asin"] for p in products) == ["B00AAA", "B00BBB", "B00CCC"]
+
+    summary = await get_daily_summary(async_db_session, now.date())
+    assert summary.total == 3
+    assert summary.last_job_id == second.id
+
+
+@pytest.mark.asyncio
+async def test_backfill_classifies_jobs_completed_before_materialization(async_db_session):
+    now = datetime.utcnow()
+    older = await _job(async_db_session, now - timedelta(days=2), [("B00AAA", {})])
+    newer = await _job(async_db_session, now - timedelta(minutes=30), [("B00AAA", {}), ("B00BBB", {})])
+    older.completed_at = now - timedelta(days=2)
+    newer.completed_at = now - timedelta(minutes=20)
+    await async_db_session.commit()
+
+    assert await backfill_daily_reviews(async_db_session, now=now) == 2
+
+    products = {p["asin"]: p for p in await load_review_products(async_db_session, now - timedelta(days=1))}
+    assert products["B00AAA"]["classification"] == "REVENANT"
+    assert products["B00BBB"]["classification"] == "FLUKE"
+    assert (await get_daily_summary(async_db_session, newer.completed_at.date())).last_job_id == newer.id
+    assert (await get_daily_summary(async_db_session, older.completed_at.date())).total == 1
+
+    # Days already stored are not replayed
+    assert await backfill_daily_reviews(async_db_session, now=now) == 0
@@ -7,8 +7,10 @@ Tests cover:
 - Key verification (specific error messages)
 - Dual-auth dependency
 - Scope enforcement
+- Verified-key cache and coalesced last_used_at writes
 """
 
+import asyncio
 import hashlib
 import uuid
 from datetime import datetime, timedelta, timezone
@@ -21,8 +23,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.api_key_auth import (
     API_KEY_PREFIX,
+    APIKeyUsageRecorder,
+    api_key_usage,
     generate_api_key,
     hash_api_key,
+    invalidate_api_key_cache,
     verify_api_key,
     get_api_or_firebase_user,
     require_api_scopes,
@@ -282,3 +287,137 @@ class TestGetAPIOrFirebaseUser:
             )
 
         assert result.id == "u2"
+
+
+def _valid_key_db(scopes=("daily_review:read",)):
+    """Mock session returning an active key (id key-1) and its active owner."""
+    mock_api_key = MagicMock()
+    mock_api_key.id = "key-1"
+    mock_api_key.expires_at = None
+    mock_api_key.is_active = True
+    mock_api_key.user_id = "user-123"
+    mock_api_key.scopes = list(scopes)
+
+    mock_user = MagicMock()
+    mock_user.id = "user-123"
+    mock_user.email = "test@example.com"
+    mock_user.role = "admin"
+    mock_user.is_active = True
+
+    def execute(statement):
+        result = MagicMock()
+        is_key_query = "api_keys" in str(statement)
+        result.scalar_one_or_none.return_value = mock_api_key if is_key_query else mock_user
+        return result
+
+    mock_db = AsyncMock(spec=AsyncSession)
+    mock_db.execute.side_effect = execute
+    return mock_db
+
+
+class TestAPIKeyCache:
+    """Tests for the in-process verified-key cache."""
+
+    @pytest.mark.asyncio
+    async def test_cached_key_skips_database(self):
+        """A second request with the same key does no auth queries or commits."""
+        mock_db = _valid_key_db()
+
+        with patch("app.core.api_key_auth.set_user_context"):
+            await verify_api_key("avk_cached_key_padding_x", mock_db)
+            user = await verify_api_key("avk_cached_key_padding_x", mock_db)
+
+        assert user.id == "user-123"
+        assert mock_db.execute.call_count == 2
+        mock_db.commit.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_scopes_checked_on_cache_hit(self):
+        """Cached keys still get a 403 for scopes they lack."""
+        mock_db = _valid_key_db()
+
+        with patch("app.core.api_key_auth.set_user_context"):
+            await verify_api_key("avk_cached_key_padding_x", mock_db)
+            with pytest.raises(HTTPException) as exc_info:
+                await verify_api_key(
+                    "avk_cached_key_padding_x", mock_db, required_scopes={"autosourcing:write"}
+                )
+
+        assert exc_info.value.status_code == 403
+
+    @pytest.mark.asyncio
+    async def test_invalidation_forces_reverification(self):
+        """Revoking a key through /api-keys makes the next request hit the DB."""
+        mock_db = _valid_key_db()
+
+        with patch("app.core.api_key_auth.set_user_context"):
+            await verify_api_key("avk_cached_key_padding_x", mock_db)
+            invalidate_api_key_cache("key-1")
+            await verify_api_key("avk_cached_key_padding_x", mock_db)
+
+        assert mock_db.execute.call_count == 4
+
+    @pytest.mark.asyncio
+    async def test_entries_expire_after_ttl(self):
+        """Entries older than the TTL are re-verified."""
+        mock_db = _valid_key_db()
+
+        with patch("app.core.api_key_auth.set_user_context"), \
+             patch("app.core.api_key_auth.API_KEY_CACHE_TTL_SECONDS", -1):
+            await verify_api_key("avk_cached_key_padding_x", mock_db)
+            await verify_api_key("avk_cached_key_padding_x", mock_db)
+
+        assert mock_db.execute.call_count == 4
+
+
+class TestAPIKeyUsageRecorder:
+    """Tests for coalesced last_used_at writes."""
+
+    @staticmethod
+    def _session_factory(session):
+        factory = MagicMock()
+        factory.return_value.__aenter__ = AsyncMock(return_value=session)
+        factory.return_value.__aexit__ = AsyncMock(return_value=None)
+        return factory
+
+    @pytest.mark.asyncio
+    async def test_uses_are_coalesced_per_key(self):
+        """Verifications only record timestamps; the flush writes one row per key."""
+        mock_db = _valid_key_db()
+        with patch("app.core.api_key_auth.set_user_context"):
+            for _ in range(3):
+                await verify_api_key("avk_cached_key_padding_x", mock_db)
+
+        assert list(api_key_usage.pending()) == ["key-1"]
+
+        session = AsyncMock()
+        assert await api_key_usage.flush(self._session_factory(session)) == 1
+        params = session.execute.call_args.args[1]
+        assert [p["id"] for p in params] == ["key-1"]
+        session.commit.assert_awaited_once()
+        assert api_key_usage.pending() == {}
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_keeps_pending_timestamps(self):
+        """A DB error keeps the timestamps for the next flush."""
+        recorder = APIKeyUsageRecorder(flush_interval=3600)
+        recorder.record("key-1")
+        recorder.record("key-2")
+
+        session = AsyncMock()
+        session.execute.side_effect = RuntimeError("db down")
+
+        assert await recorder.flush(self._session_factory(session)) == 0
+        assert set(recorder.pending()) == {"key-1", "key-2"}
+        recorder.reset()
+
+    @pytest.mark.asyncio
+    async def test_flush_scheduled_after_first_use(self):
+        """The first recorded use schedules a single delayed flush."""
+        recorder = APIKeyUsageRecorder(flush_interval=0)
+        with patch.object(recorder, "flush", new_callable=AsyncMock) as mock_flush:
+            recorder.record("key-1")
+            recorder.record("key-1")
+            await asyncio.sleep(0.01)
+
+        mock_flush.assert_awaited_once()
@@ -0,0 +1,188 @@
+"""
+Tests for queued AutoSourcing jobs: claiming, recovery and progress reporting.
+"""
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, Mock
+from uuid import uuid4
+
+import pytest
+
+from app.api.v1.routers import autosourcing as autosourcing_router
+from app.api.v1.routers.autosourcing import job_progress_events
+from app.models.autosourcing import AutoSourcingJob, JobStatus
+from app.schemas.autosourcing_safeguards import TIMEOUT_PER_JOB
+from app.services.autosourcing_service import INTERRUPTED_JOB_GRACE_SECONDS, AutoSourcingService
+
+
+def _keepa():
+    keepa = Mock()
+    keepa.can_perform_action = AsyncMock(return_value={
+        "can_proceed": True,
+        "current_balance": 300,
+        "required_tokens": 200,
+        "action": "auto_sourcing_job"
+    })
+    keepa.metrics = Mock(tokens_used=0)
+    return keepa
+
+
+async def _create(service, name="Queued"):
+    return await service.create_job(
+        discovery_config={"categories": ["Books"], "max_results": 10},
+        scoring_config={"roi_min": 20},
+        profile_name=name
+    )
+
+
+@pytest.mark.asyncio
+async def test_create_job_queues_without_running_pipeline(async_db_session):
+    service = AutoSourcingService(db_session=async_db_session, keepa_service=_keepa())
+    service._discover_products = AsyncMock()
+
+    job = await _create(service)
+
+    assert job.status == JobStatus.PENDING
+    assert job.progress["stage"] == "queued"
+    assert job.picks == []
+    service._discover_products.assert_not_called()
+    assert await AutoSourcingService.get_pending_job_ids(async_db_session) == [job.id]
+
+
+@pytest.mark.asyncio
+async def test_claim_job_is_exclusive(async_db_session):
+    service = AutoSourcingService(db_session=async_db_session, keepa_service=_keepa())
+    job = await _create(service)
+
+    claimed = await service.claim_job(job.id)
+
+    assert claimed is not None and claimed.status == JobStatus.RUNNING
+    assert await service.claim_job(job.id) is None
+    assert await AutoSourcingService.get_pending_job_ids(async_db_session) == []
+
+
+@pytest.mark.asyncio
+async def test_execute_job_reports_stage_progress(async_db_session):
+    keepa = _keepa()
+    service = AutoSourcingService(db_session=async_db_session, keepa_service=keepa)
+    job = await _create(service)
+    job = await service.claim_job(job.id)
+
+    stages = []
+    original_commit = async_db_session.commit
+
+    async def recording_commit():
+        if job.progress:
+            stages.append(job.progress["stage"])
+        await original_commit()
+
+    async def discover(config):
+        keepa.metrics.tokens_used = 12
+        return ["B001TEST", "B002TEST", "B001TEST"]
+
+    async def score(asins, scoring_config, job_id, on_progress=None):
+        await on_progress("scoring", asins_scored=len(asins), picks_selected=0)
+        return []
+
+    async_db_session.commit = recording_commit
+    service._discover_products = discover
+    service._score_and_filter_products = score
+    service._remove_recent_duplicates = AsyncMock(return_value=[])
+
+    result = await service.execute_job(job)
+
+    assert result.status == JobStatus.SUCCESS
+    assert stages == ["discovering", "scoring", "scoring", "deduplicating", "completed"]
+    assert result.progress["asins_discovered"] == 3
+    assert result.progress["asins_unique"] == 2
+    assert result.progress["asins_scored"] == 2
+    assert result.progress["tokens_spent"] == 12
+
+
+@pytest.mark.asyncio
+async def test_stale_running_jobs_are_marked_failed(async_db_session):
+    stale = AutoSourcingJob(
+        profile_name="Stale", discovery_config={}, scoring_config={},
+        status=JobStatus.RUNNING, launched_at=datetime.utcnow() - timedelta(hours=1)
+    )
+    live = AutoSourcingJob(
+        profile_name="Live", discovery_config={}, scoring_config={},
+        status=JobStatus.RUNNING, launched_at=datetime.utcnow()
+    )
+    async_db_session.add_all([stale, live])
+    await async_db_session.commit()
+
+    assert await AutoSourcingService.fail_interrupted_jobs(async_db_session) == 1
+
+    await async_db_session.refresh(stale)
+    await async_db_session.refresh(live)
+    assert stale.status == JobStatus.ERROR
+    assert live.status == JobStatus.RUNNING
+
+
+@pytest.mark.asyncio
+async def test_recent_running_job_is_rechecked_after_timeout(async_db_session):
+    """A job a crash left RUNNING is too recent to fail at startup; recovery re-checks later."""
+    recent = AutoSourcingJob(
+        profile_name="Recent", discovery_config={}, scoring_config={},
+        status=JobStatus.RUNNING, launched_at=datetime.utcnow() - timedelta(seconds=10)
+    )
+    async_db_session.add(recent)
+    await async_db_session.commit()
+
+    assert await AutoSourcingService.fail_interrupted_jobs(async_db_session) == 0
+    delay = await AutoSourcingService.seconds_until_running_jobs_expire(async_db_session)
+    assert TIMEOUT_PER_JOB < delay < TIMEOUT_PER_JOB + INTERRUPTED_JOB_GRACE_SECONDS + 1
+
+    # Once the re-check runs, the job is past the timeout
+    recent.launched_at -= timedelta(seconds=delay)
+    await async_db_session.commit()
+    assert await AutoSourcingService.fail_interrupted_jobs(async_db_session) == 1
+    assert await AutoSourcingService.seconds_until_running_jobs_expire(async_db_session) is None
+
+
+@pytest.mark.asyncio
+async def test_recovery_recheck_resubmits_pending_jobs(monkeypatch):
+    submitted = []
+    monkeypatch.setattr(autosourcing_router, "recover_autosourcing_jobs", AsyncMock(return_value=["job-1"]))
+    monkeypatch.setattr(
+        autosourcing_router.background_jobs, "submit", lambda kind, job_id: submitted.append(job_id)
+    )
+
+    await autosourcing_router._recover_autosourcing_jobs_later(0)
+
+    assert submitted == ["job-1"]
+
+
+@pytest.mark.asyncio
+async def test_released_job_is_queued_again(async_db_session):
+    service = AutoSourcingService(db_session=async_db_session, keepa_service=_keepa())
+    job = await service.claim_job((await _create(service)).id)
+
+    await service.release_job(job.id)
+
+    await async_db_session.refresh(job)
+    assert job.status == JobStatus.PENDING
+    assert job.progress["stage"] == "queued"
+    assert await AutoSourcingService.get_pending_job_ids(async_db_session) == [job.id]
+
+
+@pytest.mark.asyncio
+async def test_progress_events_stream_until_complete(monkeypatch):
+    monkeypatch.setattr("app.api.v1.routers.autosourcing.PROGRESS_POLL_SECONDS", 0)
+    job_id = uuid4()
+    snapshots = iter([
+        {"status": "running", "progress": {"stage": "scoring", "asins_scored": 10}},
+        {"status": "running", "progress": {"stage": "scoring", "asins_scored": 20}},
+        {"status": "success", "progress": {"stage": "completed"}},
+    ])
+
+    async def load(_job_id):
+        return next(snapshots)
+
+    first = {"status": "running", "progress": {"stage": "scoring", "asins_scored": 10}}
+    frames = [frame async for frame in job_progress_events(job_id, first=first, load=load)]
+
+    assert [frame.split("\n")[0] for frame in frames] == [
+        "event: progress", "event: progress", "event: complete"
+    ]
+    assert '"asins_scored": 20' in frames[1]
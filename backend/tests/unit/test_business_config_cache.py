@@ -0,0 +1,148 @@
+"""
+Unit Tests for the BusinessConfigService effective-config cache.
+"""
+import asyncio
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.models.business_config import BusinessConfig
+from app.services.business_config_service import BusinessConfigService
+
+
+@pytest.fixture
+async def service(async_db_session, async_test_engine, monkeypatch):
+    """Service whose sessions come from the test engine (tables created by async_db_session)."""
+    async_db_session.add_all([
+        BusinessConfig(id=1, scope="global", data={"roi": {"target_pct": 30}, "fees": {"a": 1}}, version=1),
+        BusinessConfig(id=2, scope="domain:1", data={"roi": {"target_pct": 35}}, version=1),
+        BusinessConfig(id=3, scope="category:books", data={"fees": {"b": 2}}, version=1),
+    ])
+    await async_db_session.commit()
+
+    monkeypatch.setattr(
+        "app.services.business_config_service.db_manager.session",
+        async_sessionmaker(async_test_engine, expire_on_commit=False),
+    )
+    return BusinessConfigService()
+
+
+@pytest.fixture
+def select_count(async_test_engine):
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    event.listen(async_test_engine.sync_engine, "before_cursor_execute", count)
+    yield statements
+    event.remove(async_test_engine.sync_engine, "before_cursor_execute", count)
+
+
+class TestEffectiveConfigCache:
+    """Tests for single-query loads, single-flight misses and version invalidation."""
+
+    @pytest.mark.asyncio
+    async def test_scopes_loaded_in_one_query_and_merged(self, service, select_count):
+        """Global, domain and category scopes come back from a single IN query."""
+        config = await service.get_effective_config(domain_id=1, category="books")
+
+        assert len(select_count) == 1
+        assert config["roi"]["target_pct"] == 35
+        assert config["fees"] == {"a": 1, "b": 2}
+        assert config["_meta"]["sources"] == {"global": True, "domain": True, "category": True}
+
+        # Second read is a dict hit
+        assert await service.get_effective_config(domain_id=1, category="books") is config
+        assert len(select_count) == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_load(self, service):
+        """Concurrent callers for the same key await the same load."""
+        calls = []
+        original = service._load_configs_by_scopes
+
+        async def slow_load(session, scopes):
+            calls.append(scopes)
+            await asyncio.sleep(0.01)
+            return await original(session, scopes)
+
+        service._load_configs_by_scopes = slow_load
+
+        results = await asyncio.gather(*[service.get_effective_config() for _ in range(5)])
+
+        assert len(calls) == 1
+        assert all(result is results[0] for result in results)
+        assert service.get_cache_stats()["inflight_loads"] == 0
+
+    @pytest.mark.asyncio
+    async def test_update_bumps_version_and_invalidates(self, service):
+        """update_config invalidates through the version counter."""
+        before = await service.get_effective_config()
+        version = service.get_cache_stats()["version"]
+
+        await service.update_config("domain:1", {"roi": {"target_pct": 40}}, changed_by="test")
+
+        assert service.get_cache_stats()["version"] == version + 1
+        after = await service.get_effective_config()
+        assert after is not before
+        assert after["roi"]["target_pct"] == 40
+
+    @pytest.mark.asyncio
+    async def test_load_racing_an_update_is_not_cached(self, service):
+        """A load that started before an invalidation returns but is not cached."""
+        original = service._load_configs_by_scopes
+
+        async def load_then_invalidate(session, scopes):
+            result = await original(session, scopes)
+            service._invalidate_cache()
+            return result
+
+        service._load_configs_by_scopes = load_then_invalidate
+        await service.get_effective_config()
+
+        assert service.get_cache_stats()["total_entries"] == 0
+
+    @pytest.mark.asyncio
+    async def test_reader_after_update_does_not_join_older_load(self, service):
+        """A load in flight before an update is not shared with later readers."""
+        original = service._load_configs_by_scopes
+        loaded = asyncio.Event()
+        release = asyncio.Event()
+
+        async def blocked_load(session, scopes):
+            result = await original(session, scopes)
+            loaded.set()
+            await release.wait()
+            return result
+
+        service._load_configs_by_scopes = blocked_load
+        early = asyncio.create_task(service.get_effective_config())
+        await loaded.wait()
+
+        service._load_configs_by_scopes = original
+        await service.update_config("domain:1", {"roi": {"target_pct": 40}}, changed_by="test")
+        try:
+            after = await asyncio.wait_for(service.get_effective_config(), timeout=1)
+        finally:
+            release.set()
+
+        assert after["roi"]["target_pct"] == 40
+        assert (await early)["roi"]["target_pct"] == 35
+
+    @pytest.mark.asyncio
+    async def test_scoring_profile_compiled_once_per_config_version(self, service):
+        """Profiles are shared until the effective config changes."""
+        profile = await service.get_scoring_profile(strategy="textbooks_standard")
+
+        assert await service.get_scoring_profile(strategy="textbooks_standard") is profile
+        assert await service.get_scoring_profile() is not profile
+        assert profile.roi_target == 35.0
+
+        await service.update_config("domain:1", {"roi": {"target_pct": 25}}, changed_by="test")
+
+        recompiled = await service.get_scoring_profile(strategy="textbooks_standard")
+        assert recompiled is not profile
+        assert recompiled.roi_target == 25.0
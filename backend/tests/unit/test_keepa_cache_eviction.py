@@ -0,0 +1,104 @@
+"""
+Tests for KeepaCache capacity limits (LRU eviction, byte cap, expiry sweep).
+"""
+import json
+from datetime import datetime, timedelta
+
+from app.services.keepa_cache import KeepaCache
+
+
+def _payload(size: int) -> dict:
+    return {"blob": "x" * size}
+
+
+class TestKeepaCacheEviction:
+
+    def test_entry_cap_evicts_least_recently_used(self):
+        cache = KeepaCache(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+
+        # Touch "a" so "b" becomes least recently used
+        assert cache.get("a") == 1
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_byte_cap_evicts_until_within_budget(self):
+        cache = KeepaCache(max_entries=100, max_bytes=2500)
+        cache.set("a", _payload(1000))
+        cache.set("b", _payload(1000))
+        cache.set("c", _payload(1000))
+
+        stats = cache.get_stats()
+        assert stats["total_entries"] == 2
+        assert stats["estimated_bytes"] <= 2500
+        assert cache.get("a") is None
+
+    def test_oversized_entry_is_not_cached(self):
+        cache = KeepaCache(max_bytes=100)
+        cache.set("big", _payload(500))
+
+        assert cache.get("big") is None
+        assert cache.get_stats()["estimated_bytes"] == 0
+
+    def test_size_estimate_tracks_serialized_size(self):
+        series = list(range(100000, 110000))
+        product = {"asin": "B000000001", "csv": [series, None, series], "stats": {"current": [1500]}}
+
+        serialized = len(json.dumps(product, separators=(',', ':')))
+        assert serialized / 2 < KeepaCache._estimate_size(product) < serialized * 2
+
+    def test_csv_with_missing_first_series_is_fully_sized(self):
+        # No Amazon price history: csv[0] is None
+        csv = [None] + [list(range(100000, 120000)) for _ in range(20)]
+        history = {"csv": csv}
+
+        serialized = len(json.dumps(history, separators=(',', ':')))
+        estimate = KeepaCache._estimate_size(history)
+        assert serialized / 2 < estimate < serialized * 2
+
+        cache = KeepaCache(max_entries=100, max_bytes=int(estimate * 1.5))
+        cache.set("a", history, "history")
+        cache.set("b", history, "history")
+
+        assert cache.get("a") is None
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_overwrite_releases_previous_size(self):
+        cache = KeepaCache()
+        cache.set("a", _payload(1000))
+        cache.set("a", _payload(10))
+
+        assert cache.get_stats()["estimated_bytes"] < 100
+
+    def test_sweep_removes_expired_entries(self):
+        cache = KeepaCache()
+        cache.set("fresh", 1)
+        cache.set("stale", 2)
+        cache.cache["stale"].expires_at = datetime.now() - timedelta(seconds=1)
+
+        assert cache.sweep_expired() == 1
+        assert "stale" not in cache.cache
+        assert cache.get_stats()["expired_removals"] == 1
+
+    def test_periodic_sweep_runs_on_set(self):
+        cache = KeepaCache(sweep_interval_seconds=0)
+        cache.set("stale", 1)
+        cache.cache["stale"].expires_at = datetime.now() - timedelta(seconds=1)
+
+        cache.set("other", 2)
+
+        assert "stale" not in cache.cache
+
+    def test_clear_resets_byte_budget(self):
+        cache = KeepaCache()
+        cache.set("a", _payload(100))
+        cache.clear()
+
+        stats = cache.get_stats()
+        assert stats["estimated_bytes"] == 0
+        assert stats["evictions"] == 0
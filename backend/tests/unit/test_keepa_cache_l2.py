@@ -0,0 +1,235 @@
+"""
+Tests for the persistent second-tier (L2) Keepa response cache.
+"""
+import threading
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.services.keepa_cache import KeepaCache
+from app.services.keepa_cache_l2 import (
+    KeepaL2Backend,
+    PostgresKeepaL2,
+    SQLiteKeepaL2,
+    decode_payload,
+    encode_payload,
+    set_l2_backend,
+)
+from app.services.keepa_service import KeepaService
+
+
+@pytest.fixture
+def sqlite_l2(tmp_path):
+    return SQLiteKeepaL2(str(tmp_path / "keepa_cache.sqlite3"))
+
+
+@pytest.fixture(autouse=True)
+def _reset_backend():
+    yield
+    set_l2_backend(None)
+
+
+def test_payload_roundtrip_is_compressed():
+    data = {"asin": "B000000001", "csv": [[1, 2, 3] * 500]}
+    payload = encode_payload(data)
+
+    assert decode_payload(payload) == data
+    assert len(payload) < len(str(data))
+
+
+def test_payload_roundtrip_preserves_datetimes():
+    stamp = datetime(2026, 1, 2, 3, 4, 5)
+    data = {"data": {"NEW": [12.5], "NEW_time": [stamp]}}
+
+    decoded = decode_payload(encode_payload(data))
+
+    assert decoded["data"]["NEW_time"] == [stamp]
+    assert isinstance(decoded["data"]["NEW_time"][0], datetime)
+
+
+class TestSQLiteKeepaL2:
+
+    @pytest.mark.asyncio
+    async def test_set_then_get_many(self, sqlite_l2):
+        await sqlite_l2.set("k1", {"v": 1}, "pricing", timedelta(minutes=30))
+        await sqlite_l2.set("k2", {"v": 2}, "meta", timedelta(hours=24))
+
+        entries = await sqlite_l2.get_many(["k1", "k2", "k3"])
+
+        assert entries["k1"][0] == {"v": 1}
+        assert entries["k2"][1] == "meta"
+        assert "k3" not in entries
+        assert sqlite_l2.get_stats()["hits"] == 2
+        assert sqlite_l2.get_stats()["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_set_many_upserts_all_entries(self, sqlite_l2):
+        await sqlite_l2.set("k1", {"v": 0}, "pricing", timedelta(minutes=30))
+
+        await sqlite_l2.set_many({
+            "k1": ({"v": 1}, "pricing", timedelta(minutes=30)),
+            "k2": ({"v": 2}, "history", timedelta(hours=12)),
+        })
+
+        entries = await sqlite_l2.get_many(["k1", "k2"])
+        assert entries["k1"][0] == {"v": 1}
+        assert entries["k2"][1] == "history"
+        assert sqlite_l2.get_stats()["writes"] == 3
+
+    @pytest.mark.asyncio
+    async def test_payloads_are_encoded_and_decoded_off_the_event_loop(self, sqlite_l2, monkeypatch):
+        from app.services import keepa_cache_l2
+
+        threads = []
+
+        def tracking(fn):
+            def wrapper(*args):
+                threads.append(threading.current_thread())
+                return fn(*args)
+            return wrapper
+
+        monkeypatch.setattr(keepa_cache_l2, "encode_payload", tracking(encode_payload))
+        monkeypatch.setattr(keepa_cache_l2, "decode_payload", tracking(decode_payload))
+
+        await sqlite_l2.set_many({f"k{i}": ({"v": i}, "history", timedelta(hours=12)) for i in range(3)})
+        entries = await sqlite_l2.get_many(["k0", "k1", "k2"])
+
+        assert entries["k2"][0] == {"v": 2}
+        assert len(threads) == 6
+        assert threading.main_thread() not in threads
+
+    @pytest.mark.asyncio
+    async def test_expired_entries_are_misses_and_purged(self, sqlite_l2):
+        await sqlite_l2.set("old", {"v": 1}, "pricing", timedelta(seconds=-1))
+
+        assert await sqlite_l2.get("old") is None
+        assert await sqlite_l2._purge_expired() == 1
+
+    @pytest.mark.asyncio
+    async def test_failures_degrade_to_miss(self):
+        class BrokenL2(KeepaL2Backend):
+            name = "broken"
+
+            async def _get_many(self, cache_keys):
+                raise OSError("unavailable")
+
+            async def _set_many(self, rows):
+                raise OSError("unavailable")
+
+            async def _purge_expired(self):
+                raise OSError("unavailable")
+
+        backend = BrokenL2()
+
+        assert await backend.get("k") is None
+        await backend.set("k", {}, "pricing", timedelta(minutes=1))
+        assert backend.get_stats()["errors"] == 2
+
+
+class TestPostgresKeepaL2:
+
+    @pytest.mark.asyncio
+    async def test_set_many_is_one_statement_and_commit(self):
+        session = MagicMock(execute=AsyncMock(), commit=AsyncMock())
+
+        @asynccontextmanager
+        async def session_factory():
+            yield session
+
+        backend = PostgresKeepaL2(session_factory=session_factory)
+        await backend.set_many({
+            f"k{i}": ({"v": i}, "pricing", timedelta(minutes=30)) for i in range(3)
+        })
+
+        session.execute.assert_awaited_once()
+        session.commit.assert_awaited_once()
+        assert backend.get_stats()["writes"] == 3
+
+
+class TestKeepaCacheWithL2:
+
+    @pytest.mark.asyncio
+    async def test_l1_miss_is_served_from_l2_and_promoted(self, sqlite_l2):
+        writer = KeepaCache(l2=sqlite_l2)
+        await writer.aset("/product?asin=X&domain=1", {"asin": "X"}, "pricing")
+
+        # Fresh process: empty L1, same L2
+        reader = KeepaCache(l2=sqlite_l2)
+        assert await reader.aget("/product?asin=X&domain=1") == {"asin": "X"}
+        assert "/product?asin=X&domain=1" in reader.cache
+        assert reader.get_stats()["l2"]["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_without_l2_behaves_like_l1(self):
+        cache = KeepaCache()
+        await cache.aset("k", {"v": 1})
+
+        assert await cache.aget("k") == {"v": 1}
+        assert await cache.aget("missing") is None
+        assert cache.get_stats()["l2"] is None
+
+
+class TestKeepaServiceWithL2:
+
+    @pytest.mark.asyncio
+    async def test_restart_does_not_refetch_from_keepa(self, sqlite_l2):
+        set_l2_backend(sqlite_l2)
+
+        first = KeepaService(api_key="test_key")
+        first._query_products = AsyncMock(return_value=[{"asin": "B000000001"}])
+        await first.get_product_data("B000000001")
+
+        second = KeepaService(api_key="test_key")
+        second._query_products = AsyncMock(return_value=[])
+        product = await second.get_product_data("B000000001")
+
+        assert product == {"asin": "B000000001"}
+        second._query_products.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_product_facets_written_to_l2_in_one_batch(self, sqlite_l2):
+        sqlite_l2.set_many = AsyncMock(wraps=sqlite_l2.set_many)
+        set_l2_backend(sqlite_l2)
+
+        service = KeepaService(api_key="test_key")
+        service._query_products = AsyncMock(return_value=[{"asin": "B000000001", "csv": [], "stats": {}}])
+        await service.get_product_data("B000000001")
+
+        sqlite_l2.set_many.assert_awaited_once()
+        assert len(sqlite_l2.set_many.await_args.args[0]) == 3
+
+    @pytest.mark.asyncio
+    async def test_batch_chunk_written_to_l2_in_one_batch(self, sqlite_l2):
+        sqlite_l2.set_many = AsyncMock(wraps=sqlite_l2.set_many)
+        set_l2_backend(sqlite_l2)
+
+        service = KeepaService(api_key="test_key")
+        service._query_products = AsyncMock(
+            side_effect=lambda ids, *a, **kw: [{"asin": asin, "csv": [], "stats": {}} for asin in ids]
+        )
+        asins = [f"B{i:09d}" for i in range(1, 6)]
+        await service.get_products_batch(asins)
+
+        sqlite_l2.set_many.assert_awaited_once()
+        assert len(sqlite_l2.set_many.await_args.args[0]) == 3 * len(asins)
+
+    @pytest.mark.asyncio
+    async def test_batch_reads_l2_in_one_round_trip(self, sqlite_l2):
+        set_l2_backend(sqlite_l2)
+
+        first = KeepaService(api_key="test_key")
+        first._query_products = AsyncMock(
+            side_effect=lambda ids, *a, **kw: [{"asin": asin} for asin in ids]
+        )
+        await first.get_products_batch(["B000000001", "B000000002"])
+
+        second = KeepaService(api_key="test_key")
+        second._query_products = AsyncMock(
+            side_effect=lambda ids, *a, **kw: [{"asin": asin} for asin in ids]
+        )
+        results = await second.get_products_batch(["B000000001", "B000000002", "B000000003"])
+
+        assert second._query_products.await_args.args[0] == ["B000000003"]
+        assert results["B000000001"] == {"asin": "B000000001"}
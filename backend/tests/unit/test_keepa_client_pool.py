@@ -0,0 +1,172 @@
+"""
+Tests for the process-wide keepa library client pool.
+"""
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.services.keepa_client_pool import (
+    KeepaClientPool,
+    get_client_pool,
+    reset_client_pools,
+)
+
+
+@pytest.fixture(autouse=True)
+def _reset_pools():
+    reset_client_pools()
+    yield
+    reset_client_pools()
+
+
+def _counting_factory():
+    created = []
+
+    def factory(api_key):
+        client = MagicMock(name=f"client-{len(created)}")
+        created.append(client)
+        return client
+
+    return factory, created
+
+
+class TestKeepaClientPool:
+
+    def test_client_is_reused_across_borrows(self):
+        factory, created = _counting_factory()
+        pool = KeepaClientPool("key", max_size=2, client_factory=factory)
+
+        with pool.client() as first:
+            pass
+        with pool.client() as second:
+            pass
+
+        assert first is second
+        assert len(created) == 1
+
+    def test_warm_up_creates_clients_once(self):
+        factory, created = _counting_factory()
+        pool = KeepaClientPool("key", max_size=3, client_factory=factory)
+
+        assert pool.warm_up() == 3
+        assert pool.warm_up() == 3
+        assert len(created) == 3
+
+        with pool.client():
+            pass
+        assert len(created) == 3
+
+    def test_failed_client_is_discarded(self):
+        factory, created = _counting_factory()
+        pool = KeepaClientPool("key", max_size=1, client_factory=factory)
+
+        with pytest.raises(ConnectionError):
+            with pool.client():
+                raise ConnectionError("connection reset")
+
+        with pool.client() as api:
+            pass
+
+        assert api is created[1]
+        stats = pool.get_stats()
+        assert stats["discarded"] == 1
+        assert stats["created"] == 1
+
+    def test_auth_failure_discards_client(self):
+        factory, created = _counting_factory()
+        pool = KeepaClientPool("key", max_size=1, client_factory=factory)
+
+        with pytest.raises(RuntimeError):
+            with pool.client():
+                raise RuntimeError("PAYMENT_REQUIRED")
+
+        assert pool.get_stats()["discarded"] == 1
+
+    def test_query_error_keeps_client(self):
+        factory, created = _counting_factory()
+        pool = KeepaClientPool("key", max_size=1, client_factory=factory)
+
+        with pytest.raises(RuntimeError):
+            with pool.client():
+                raise RuntimeError("No products in response. Possibly invalid ASINs")
+
+        with pool.client() as api:
+            pass
+
+        assert api is created[0]
+        assert pool.get_stats()["discarded"] == 0
+
+    def test_pool_bounds_concurrent_clients(self):
+        factory, created = _counting_factory()
+        pool = KeepaClientPool("key", max_size=2, client_factory=factory)
+        in_use = []
+        peak = []
+        lock = threading.Lock()
+
+        def worker():
+            with pool.client():
+                with lock:
+                    in_use.append(1)
+                    peak.append(len(in_use))
+                time.sleep(0.02)
+                with lock:
+                    in_use.pop()
+
+        threads = [threading.Thread(target=worker) for _ in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert max(peak) <= 2
+        assert len(created) <= 2
+        stats = pool.get_stats()
+        assert stats["acquisitions"] == 6
+        assert stats["max_wait_ms"] > 0
+
+    def test_invalid_size_rejected(self):
+        with pytest.raises(ValueError):
+            KeepaClientPool("key", max_size=0)
+
+
+class TestClientPoolRegistry:
+
+    def test_same_key_shares_pool(self):
+        assert get_client_pool("a") is get_client_pool("a")
+        assert get_client_pool("a") is not get_client_pool("b")
+
+    def test_pool_size_read_from_settings(self):
+        with patch("app.services.keepa_client_pool.get_settings") as settings:
+            settings.return_value.keepa_client_pool_size = 7
+            pool = get_client_pool("sized")
+
+        assert pool.max_size == 7
+        assert get_client_pool("explicit", max_size=2).max_size == 2
+
+    def test_keepa_service_uses_shared_pool(self):
+        from app.services.keepa_service import KeepaService
+
+        first = KeepaService(api_key="shared_key")
+        second = KeepaService(api_key="shared_key")
+
+        assert first.client_pool is second.client_pool
+
+    @pytest.mark.asyncio
+    async def test_get_product_data_borrows_pooled_client(self):
+        from app.services.keepa_service import KeepaService
+
+        api = MagicMock()
+        api.query.return_value = [{"asin": "B00TEST123", "title": "Book"}]
+
+        with patch(
+            "app.services.keepa_client_pool._default_client_factory",
+            return_value=api,
+        ) as factory:
+            service = KeepaService(api_key="pool_key")
+            await service.get_product_data("B00TEST123", force_refresh=True)
+            await service.get_product_data("B00TEST456", force_refresh=True)
+
+        assert factory.call_count == 1
+        assert api.query.call_count == 2
@@ -0,0 +1,140 @@
+"""
+Tests for the AIMD concurrency limiter shared by KeepaService HTTP calls.
+"""
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.services.keepa_concurrency import AdaptiveConcurrencyLimiter
+from app.services.keepa_service import KeepaService
+
+
+async def _call(limiter, status_code=200, delay=0.01, tracker=None):
+    async with limiter.slot() as slot:
+        if tracker is not None:
+            tracker["current"] += 1
+            tracker["max"] = max(tracker["max"], tracker["current"])
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            if tracker is not None:
+                tracker["current"] -= 1
+        slot.status_code = status_code
+
+
+@pytest.mark.asyncio
+async def test_limit_caps_concurrent_calls():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=2)
+    tracker = {"current": 0, "max": 0}
+
+    tasks = [asyncio.create_task(_call(limiter, tracker=tracker)) for _ in range(6)]
+    await asyncio.sleep(0.001)
+    stats = limiter.get_stats()
+    await asyncio.gather(*tasks)
+
+    assert tracker["max"] == 2
+    assert stats["in_flight"] == 2 and stats["queued"] == 4
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_additive_increase_while_saturated_and_healthy():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=4)
+
+    await asyncio.gather(*(_call(limiter) for _ in range(30)))
+
+    assert limiter.limit == 4
+    decisions = limiter.get_stats()["recent_decisions"]
+    assert [d["action"] for d in decisions] == ["increase", "increase"]
+
+
+@pytest.mark.asyncio
+async def test_no_increase_when_limit_unused():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=4)
+
+    for _ in range(10):
+        await _call(limiter, delay=0)
+
+    assert limiter.limit == 2
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_backs_off_once_per_round_trip():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=8, max_limit=10)
+
+    # Four 429s land together: one multiplicative decrease, not four
+    await asyncio.gather(*(_call(limiter, status_code=429) for _ in range(4)))
+
+    stats = limiter.get_stats()
+    assert limiter.limit == 4
+    assert stats["rate_limited"] == 4
+    assert stats["recent_decisions"][-1]["reason"] == "429"
+
+
+@pytest.mark.asyncio
+async def test_server_errors_and_exceptions_back_off():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=4)
+    await _call(limiter, status_code=503)
+    assert limiter.limit == 2
+
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=4)
+    with pytest.raises(RuntimeError):
+        async with limiter.slot():
+            raise RuntimeError("connection reset")
+    assert limiter.limit == 2
+    assert limiter.get_stats()["errors"] == 1
+
+
+@pytest.mark.asyncio
+async def test_rising_latency_backs_off():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=5, max_limit=5)
+    for _ in range(3):
+        await _call(limiter, delay=0.01)
+
+    for _ in range(3):
+        await _call(limiter, delay=0.08)
+
+    assert limiter.limit == 4
+    assert limiter.get_stats()["recent_decisions"][-1]["reason"].startswith("latency")
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_leak_a_slot():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=1, max_limit=1)
+    holder = asyncio.create_task(_call(limiter, delay=0.05))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(_call(limiter))
+    await asyncio.sleep(0.01)
+
+    waiter.cancel()
+    await asyncio.gather(holder, waiter, return_exceptions=True)
+
+    assert limiter.in_flight == 0
+    await asyncio.wait_for(_call(limiter), timeout=0.5)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_call_does_not_back_off():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=8, max_limit=8)
+    call = asyncio.create_task(_call(limiter, delay=1))
+    await asyncio.sleep(0.01)
+
+    call.cancel()
+    await asyncio.gather(call, return_exceptions=True)
+
+    assert limiter.limit == 8
+    assert limiter.in_flight == 0
+    assert limiter.get_stats()["errors"] == 0
+
+
+@pytest.mark.asyncio
+async def test_health_check_exposes_concurrency():
+    service = KeepaService(api_key="test_key")
+    service.check_api_balance = AsyncMock(return_value=500)
+
+    health = await service.health_check()
+
+    assert health["concurrency"]["limit"] == 3
+    assert health["concurrency"]["in_flight"] == 0
+    assert health["concurrency"]["recent_decisions"] == []
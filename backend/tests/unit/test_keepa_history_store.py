@@ -0,0 +1,272 @@
+"""
+Tests for the incremental Keepa history store.
+"""
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock
+
+import numpy as np
+import pytest
+
+from app.core.velocity_calculations import _in_window
+from app.services.autosourcing_scoring import calculate_confidence_from_keepa
+from app.services.intrinsic_value_service import calculate_intrinsic_value_corridor
+from app.services.keepa_bsr_extractors import KeepaBSRExtractor
+from app.services.keepa_history_store import KeepaHistoryStore
+from app.services.keepa_parser_v2 import parse_keepa_product_unified
+from app.services.keepa_price_extractors import KeepaRawParser
+from app.services.keepa_service import KeepaService
+from app.utils.keepa_series import KeepaSeries
+from app.utils.keepa_utils import datetime_to_keepa, keepa_to_datetime
+
+
+# Keepa timestamps have minute precision
+NOW = datetime.now().replace(second=0, microsecond=0)
+
+
+def _days_ago(days):
+    return NOW - timedelta(days=days)
+
+
+def _data_section(points):
+    """keepa lib 'data' layout for (days_ago, price, bsr) points."""
+    return {
+        "NEW": [price for _, price, _ in points],
+        "NEW_time": [_days_ago(d) for d, _, _ in points],
+        "SALES": [bsr for _, _, bsr in points],
+        "SALES_time": [_days_ago(d) for d, _, _ in points],
+    }
+
+
+def _raw_history(points):
+    """Raw Keepa history keys (full-length csv, salesRanks) for (days_ago, price, bsr) points."""
+    csv = [None] * 32
+    csv[1] = [v for d, price, _ in points for v in (datetime_to_keepa(_days_ago(d)), int(price * 100))]
+    csv[3] = [v for d, _, bsr in points for v in (datetime_to_keepa(_days_ago(d)), bsr)]
+    return {"csv": csv, "salesRanks": {"283155": list(csv[3])}}
+
+
+class TestKeepaSeries:
+
+    def test_from_datetimes_drops_nulls_and_future_points(self):
+        times = [_days_ago(12), _days_ago(10), _days_ago(5), _days_ago(4), NOW + timedelta(days=1)]
+        values = [18.0, -1, 21.0, float("nan"), 30.0]
+
+        series = KeepaSeries.from_datetimes(times, values, now=NOW)
+
+        assert series == [(_days_ago(12), 18.0), (_days_ago(5), 21.0)]
+        assert series.minutes.dtype == np.int32
+        assert series.values.dtype == np.float32
+
+    def test_from_keepa_csv_converts_cents_and_minutes(self):
+        series = KeepaSeries.from_keepa_csv([7777548, 1999, 7777608, -1, 7777668, 2499])
+
+        assert series.value_list() == [19.99, 24.99]
+        assert series.times()[0] == keepa_to_datetime(7777548).replace(tzinfo=None)
+
+    def test_indexing_rounds_prices(self):
+        series = KeepaSeries.from_datetimes([_days_ago(2), _days_ago(1)], [19.99, 24.99], is_price=True)
+
+        assert series[-1] == (_days_ago(1), 24.99)
+        assert series[0][1] == 19.99
+
+    def test_since_and_after_minute_windows(self):
+        series = KeepaSeries.from_datetimes([_days_ago(d) for d in (30, 20, 10, 1)], [30.0, 20.0, 10.0, 1.0])
+
+        assert series.since(_days_ago(15)) == [(_days_ago(10), 10.0), (_days_ago(1), 1.0)]
+        assert series.after_minute(series.minutes[1]).value_list() == [10.0, 1.0]
+
+    def test_vectorized_statistics(self):
+        bsr = KeepaSeries.from_datetimes(
+            [_days_ago(d) for d in (4, 3, 2, 1)], [5000, 4000, 4500, 3000], is_price=False
+        )
+
+        assert bsr.count_drops() == 2
+        assert bsr.mean() == 4125.0
+        assert bsr.percentiles([50]) == [4250.0]
+        assert bsr.tolist()[-1] == (_days_ago(1), 3000.0)
+
+
+class TestKeepaHistoryStore:
+
+    def test_merge_and_days_since_sync(self):
+        store = KeepaHistoryStore()
+        assert store.days_since_sync("B000000001") is None
+
+        store.merge("B000000001", 1, _data_section([(20, 25.0, 5000), (2, 24.0, 4000)]))
+        # Not incremental until the full raw history is kept
+        assert store.days_since_sync("B000000001") is None
+
+        store.merge_raw("B000000001", 1, _raw_history([(20, 25.0, 5000), (2, 24.0, 4000)]), incremental=False)
+
+        assert store.days_since_sync("b000000001") == 1
+        history = store.get("B000000001")
+        assert len(history.price) == 2
+        assert history.bsr.last_time == _days_ago(2)
+
+    def test_merge_appends_only_newer_points(self):
+        store = KeepaHistoryStore()
+        store.merge("B000000001", 1, _data_section([(20, 25.0, 5000), (10, 24.0, 4000)]))
+
+        store.merge("B000000001", 1, _data_section([(10, 24.0, 4000), (3, 23.0, 3500)]))
+
+        history = store.get("B000000001")
+        assert history.price.value_list() == [25.0, 24.0, 23.0]
+        assert store.get_stats()["points_added"] == 6
+
+    def test_merge_raw_appends_only_newer_records(self):
+        store = KeepaHistoryStore()
+        assert store.merge_raw("B000000001", 1, _raw_history([(1, 10.0, 100)]), incremental=True) is None
+
+        full = _raw_history([(20, 25.0, 5000), (10, 24.0, 4000)])
+        store.merge_raw("B000000001", 1, full, incremental=False)
+        recent = _raw_history([(10, 24.0, 4000), (3, 23.0, 3500)])
+        recent["csv"][18] = [datetime_to_keepa(_days_ago(3)), 2300, 399]
+
+        merged = store.merge_raw("B000000001", 1, recent, incremental=True)
+
+        assert merged["csv"][3] == full["csv"][3] + recent["csv"][3][2:]
+        assert merged["salesRanks"]["283155"][-1] == 3500
+        assert merged["csv"][18] == recent["csv"][18]
+        assert merged["csv"][0] is None
+
+    def test_lru_bound(self):
+        store = KeepaHistoryStore(max_asins=2)
+        for asin in ("A1", "A2", "A3"):
+            store.merge(asin, 1, _data_section([(1, 10.0, 100)]))
+
+        assert store.get("A1") is None
+        assert store.get_stats()["evictions"] == 1
+
+
+class TestIncrementalFetch:
+
+    @pytest.fixture
+    def keepa_service(self):
+        service = KeepaService(api_key="test_key")
+        responses = []
+
+        async def fake_query(identifiers, domain=1, stats=180, history=True, offers=20, force_refresh=False, days=None):
+            return [responses.pop(0)]
+
+        service._query_products = AsyncMock(side_effect=fake_query)
+        service.responses = responses
+        return service
+
+    @pytest.mark.asyncio
+    async def test_refresh_requests_only_new_days_and_merges(self, keepa_service):
+        keepa_service.responses.append({
+            "asin": "B000000001",
+            "data": _data_section([(300, 30.0, 9000), (100, 28.0, 7000), (10, 26.0, 6000)]),
+        })
+        await keepa_service.get_product_data("B000000001")
+        assert keepa_service._query_products.await_args.kwargs["days"] is None
+
+        keepa_service._cache_manager.clear()
+        keepa_service.responses.append({
+            "asin": "B000000001",
+            # Keepa repeats the value in effect at the window start
+            "data": _data_section([(10, 26.0, 6000), (0.5, 25.0, 5500)]),
+        })
+        product = await keepa_service.get_product_data("B000000001")
+
+        assert keepa_service._query_products.await_args.kwargs["days"] == 1
+        assert product["data"]["NEW"] == [30.0, 28.0, 26.0, 25.0]
+        assert product["data"]["SALES_time"][-1] == _days_ago(0.5)
+
+    @pytest.mark.asyncio
+    async def test_incremental_fetch_caches_merged_history(self, keepa_service):
+        keepa_service.responses.append({
+            "asin": "B000000001",
+            **_raw_history([(300, 30.0, 9000), (10, 26.0, 6000)]),
+            "data": _data_section([(300, 30.0, 9000), (10, 26.0, 6000)]),
+        })
+        await keepa_service.get_product_data("B000000001")
+
+        keepa_service._cache_manager.clear()
+        keepa_service.responses.append({
+            "asin": "B000000001",
+            **_raw_history([(0.5, 25.0, 5500)]),
+            "data": _data_section([(0.5, 25.0, 5500)]),
+        })
+        product = await keepa_service.get_product_data("B000000001")
+
+        # Truncated csv is extended, not passed off as the full history
+        assert product["csv"][3][1::2] == [9000, 6000, 5500]
+        assert product["salesRanks"]["283155"][1::2] == [9000, 6000, 5500]
+        assert product["data"]["NEW"] == [30.0, 26.0, 25.0]
+
+        # Later lookups are served from the cached (merged) history
+        keepa_service._query_products.reset_mock()
+        for _ in range(3):
+            assert await keepa_service.get_product_data("B000000001") == product
+        keepa_service._query_products.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_refetch_keeps_bsr_source_and_confidence(self, keepa_service):
+        live = {"title": "Book", "salesRankReference": 283155, "lastUpdate": 7777777}
+        keepa_service.responses.append({
+            "asin": "B000000001", **live,
+            **_raw_history([(300, 30.0, 9000), (0.5, 26.0, 6000)]),
+            "data": _data_section([(300, 30.0, 9000), (0.5, 26.0, 6000)]),
+        })
+        first = await keepa_service.get_product_data("B000000001")
+
+        keepa_service._cache_manager.clear()
+        keepa_service.responses.append({
+            "asin": "B000000001", **live,
+            **_raw_history([(0.5, 26.0, 6000)]),
+            "data": _data_section([(0.5, 26.0, 6000)]),
+        })
+        second = await keepa_service.get_product_data("B000000001")
+
+        assert keepa_service._query_products.await_args.kwargs["days"] == 1
+        assert KeepaBSRExtractor.extract_current_bsr(second) == KeepaBSRExtractor.extract_current_bsr(first)
+        assert KeepaBSRExtractor.extract_current_bsr(second) == (6000, "salesRanks")
+        assert calculate_confidence_from_keepa(second) == calculate_confidence_from_keepa(first)
+        assert second["csv"] == first["csv"]
+
+    @pytest.mark.asyncio
+    async def test_parser_reuses_stored_series(self, keepa_service):
+        keepa_service.responses.append({
+            "asin": "B000000001",
+            "data": _data_section([(40, 30.0, 9000), (5, 26.0, 6000)]),
+        })
+        product = await keepa_service.get_product_data("B000000001")
+
+        parsed = parse_keepa_product_unified(product)
+
+        assert isinstance(parsed["price_history"], KeepaSeries)
+        assert parsed["price_history"] == [(_days_ago(40), 30.0), (_days_ago(5), 26.0)]
+        assert parsed["bsr_history"][-1] == (_days_ago(5), 6000.0)
+
+
+class TestAnalysisConsumers:
+
+    def test_extract_history_arrays_keeps_keepa_lib_dollars(self):
+        """keepa lib 'data' prices are already dollars: not divided by 100 again."""
+        product = {"asin": "B000000001", "data": _data_section([(5, 19.99, 45000)])}
+
+        history = KeepaRawParser.extract_history_arrays(product)
+
+        assert history["price_history"].value_list() == [19.99]
+        assert history["bsr_history"].value_list() == [45000.0]
+
+    def test_intrinsic_corridor_uses_series_window(self):
+        points = (
+            [(_days_ago(400 - d), 100.0) for d in range(0, 100)]
+            + [(_days_ago(60 - d), 20.0 + d % 3) for d in range(0, 60)]
+        )
+        series = KeepaSeries.from_datetimes([t for t, _ in points], [v for _, v in points])
+
+        corridor = calculate_intrinsic_value_corridor(series, window_days=90)
+
+        assert corridor["data_points"] == 60
+        assert corridor["median"] == 21.0
+
+    def test_velocity_window_matches_list_filter(self):
+        points = [(_days_ago(d), d) for d in (45, 31, 29, 2)]
+        cutoff = _days_ago(30)
+
+        series = KeepaSeries.from_datetimes([t for t, _ in points], [v for _, v in points], is_price=False)
+
+        assert _in_window(series, cutoff) == _in_window(points, cutoff)
@@ -0,0 +1,285 @@
+"""
+Tests for durable /keepa/ingest background jobs.
+"""
+import os
+os.environ.setdefault("DATABASE_URL", "sqlite:///test.db")
+
+import asyncio
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.api.v1.routers import keepa_jobs as keepa_jobs_router
+from app.api.v1.routers.keepa_jobs import get_ingest_job
+from app.models.keepa_ingest import IngestJobStatus, KeepaIngestJob
+from app.services.background_jobs import BackgroundJobPool
+from app.services.keepa_ingest_service import STALE_HEARTBEAT_SECONDS, KeepaIngestJobService
+
+
+IDENTIFIERS = ["B000000001", "B000000002", "B000000003", "B000000004", "B000000005"]
+
+
+def _analysis(asin):
+    return {
+        "asin": asin,
+        "title": f"Book {asin}",
+        "roi": {"roi_percentage": 42.0},
+        "velocity": {},
+        "velocity_score": 60,
+        "price_stability_score": 70,
+        "confidence_score": 80,
+        "overall_rating": "GOOD",
+        "score_breakdown": {},
+        "readable_summary": "ok",
+        "recommendation": "BUY",
+        "risk_factors": [],
+    }
+
+
+def _keepa_service(missing=(), fail_on_call=None):
+    service = AsyncMock()
+    calls = []
+
+    async def get_products_batch(asins, force_refresh=False):
+        calls.append(list(asins))
+        if fail_on_call is not None and len(calls) == fail_on_call:
+            raise RuntimeError("Keepa unavailable")
+        return {asin: {"asin": asin} for asin in asins if asin not in missing}
+
+    service.get_products_batch = AsyncMock(side_effect=get_products_batch)
+    service.__aenter__ = AsyncMock(return_value=service)
+    service.__aexit__ = AsyncMock(return_value=None)
+    service.calls = calls
+    return service
+
+
+async def _analyze(asin, keepa_data, config, keepa_service, options):
+    return _analysis(asin)
+
+
+async def _run(jobs, job_id, keepa_service):
+    return await jobs.run_job(
+        job_id,
+        keepa_service_factory=AsyncMock(return_value=keepa_service),
+        analyze=_analyze,
+        normalize=lambda identifier: identifier,
+        chunk_size=2,
+    )
+
+
+@pytest.fixture
+async def jobs(async_db_session, async_test_engine):
+    # async_db_session creates the tables; the service opens its own sessions
+    return KeepaIngestJobService(
+        session_factory=async_sessionmaker(async_test_engine, expire_on_commit=False)
+    )
+
+
+@pytest.mark.asyncio
+async def test_job_runs_in_batched_chunks_and_stores_results(jobs):
+    job = await jobs.create_job(IDENTIFIERS, {"roi": {}}, "batch-1", trace_id="t1")
+    keepa = _keepa_service(missing={"B000000003"})
+
+    status = await _run(jobs, job.id, keepa)
+
+    assert status == IngestJobStatus.SUCCESS
+    assert keepa.calls == [IDENTIFIERS[0:2], IDENTIFIERS[2:4], IDENTIFIERS[4:5]]
+
+    stored = await jobs.get_job(str(job.id))
+    assert stored.status == IngestJobStatus.SUCCESS
+    assert (stored.processed, stored.successful, stored.failed) == (5, 4, 1)
+    assert stored.completed_at is not None
+
+    results = await jobs.get_results(str(job.id))
+    assert [r.identifier for r in results] == IDENTIFIERS
+    assert results[2].status == "not_found"
+    assert results[0].analysis["roi"]["roi_percentage"] == 42.0
+
+
+@pytest.mark.asyncio
+async def test_interrupted_job_resumes_without_refetching(jobs, async_test_engine):
+    job = await jobs.create_job(IDENTIFIERS, {}, "batch-2")
+    assert await jobs.claim(str(job.id)) is not None
+    await jobs.record_chunk(str(job.id), [
+        {"position": 0, "identifier": IDENTIFIERS[0], "asin": IDENTIFIERS[0],
+         "status": "success", "analysis": _analysis(IDENTIFIERS[0]), "error": None},
+        {"position": 1, "identifier": IDENTIFIERS[1], "asin": IDENTIFIERS[1],
+         "status": "success", "analysis": _analysis(IDENTIFIERS[1]), "error": None},
+    ])
+
+    # Simulate the worker dying: still RUNNING, heartbeat goes stale
+    async with async_sessionmaker(async_test_engine)() as session:
+        await session.execute(
+            update(KeepaIngestJob)
+            .where(KeepaIngestJob.id == job.id)
+            .values(heartbeat_at=datetime.utcnow() - timedelta(minutes=10))
+        )
+        await session.commit()
+    assert await jobs.resumable_job_ids() == [str(job.id)]
+
+    keepa = _keepa_service()
+    assert await _run(jobs, job.id, keepa) == IngestJobStatus.SUCCESS
+
+    assert keepa.calls == [IDENTIFIERS[2:4], IDENTIFIERS[4:5]]
+    stored = await jobs.get_job(str(job.id))
+    assert (stored.processed, stored.successful, stored.attempts) == (5, 5, 2)
+    assert await jobs.resumable_job_ids() == []
+
+
+@pytest.mark.asyncio
+async def test_cancelled_job_is_released_for_the_next_start(jobs):
+    job = await jobs.create_job(IDENTIFIERS, {}, "batch-cancel")
+    keepa = _keepa_service()
+    blocked = asyncio.Event()
+    original = keepa.get_products_batch.side_effect
+
+    async def block_second_chunk(asins, force_refresh=False):
+        if keepa.calls:
+            blocked.set()
+            await asyncio.Event().wait()
+        return await original(asins, force_refresh)
+
+    keepa.get_products_batch.side_effect = block_second_chunk
+    task = asyncio.create_task(_run(jobs, job.id, keepa))
+    await blocked.wait()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    stored = await jobs.get_job(str(job.id))
+    assert stored.status == IngestJobStatus.PENDING
+    assert (stored.heartbeat_at, stored.worker_id, stored.processed) == (None, None, 2)
+
+    # A restarted process claims it at once and skips the stored chunk
+    keepa = _keepa_service()
+    assert await _run(jobs, job.id, keepa) == IngestJobStatus.SUCCESS
+    assert keepa.calls == [IDENTIFIERS[2:4], IDENTIFIERS[4:5]]
+
+
+@pytest.mark.asyncio
+async def test_live_job_cannot_be_claimed_twice(jobs):
+    job = await jobs.create_job(IDENTIFIERS, {}, "batch-3")
+
+    assert await jobs.claim(str(job.id), worker_id="a") is not None
+    assert await jobs.claim(str(job.id), worker_id="b") is None
+    assert await _run(jobs, job.id, _keepa_service()) is None
+
+    await jobs.finish(str(job.id))
+    assert await jobs.claim(str(job.id), worker_id="b") is None
+
+
+@pytest.mark.asyncio
+async def test_failure_marks_error_and_keeps_partial_results(jobs):
+    job = await jobs.create_job(IDENTIFIERS, {}, "batch-4")
+
+    status = await _run(jobs, job.id, _keepa_service(fail_on_call=2))
+
+    assert status == IngestJobStatus.ERROR
+    stored = await jobs.get_job(str(job.id))
+    assert stored.error_message == "Keepa unavailable"
+    assert stored.processed == 2
+    assert len(await jobs.get_results(str(job.id))) == 2
+
+
+@pytest.mark.asyncio
+async def test_job_endpoint_returns_progress_and_paginated_results(jobs):
+    job = await jobs.create_job(IDENTIFIERS, {}, "batch-5", trace_id="t5")
+    await _run(jobs, job.id, _keepa_service())
+
+    with patch("app.api.v1.routers.keepa_jobs.KeepaIngestJobService", return_value=jobs):
+        response = await get_ingest_job(str(job.id), offset=2, limit=2)
+        with pytest.raises(HTTPException) as exc_info:
+            await get_ingest_job("not-a-uuid", offset=0, limit=10)
+
+    assert response.status == "success"
+    assert response.processed == 5
+    assert [r.identifier for r in response.results] == IDENTIFIERS[2:4]
+    assert response.results[0].analysis.overall_rating == "GOOD"
+    assert exc_info.value.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_crashed_job_with_fresh_heartbeat_is_rechecked(jobs):
+    """A restart within STALE_HEARTBEAT_SECONDS of a crash cannot claim the job yet."""
+    job = await jobs.create_job(IDENTIFIERS, {}, "batch-9")
+    assert await jobs.claim(str(job.id), worker_id="crashed-worker") is not None
+    assert await jobs.seconds_until_orphans_claimable(worker_id="crashed-worker") is None
+
+    assert await jobs.claim(str(job.id)) is None
+    delay = await jobs.seconds_until_orphans_claimable()
+    assert STALE_HEARTBEAT_SECONDS - 5 < delay <= STALE_HEARTBEAT_SECONDS + 1
+
+
+@pytest.mark.asyncio
+async def test_stalled_worker_stops_when_another_reclaims_the_job(jobs, async_test_engine):
+    """A worker whose heartbeat went stale neither stores results nor finishes the job."""
+    job = await jobs.create_job(IDENTIFIERS, {}, "batch-stall")
+    keepa = _keepa_service()
+
+    async def stall_then_lose_claim(asins, force_refresh=False):
+        keepa.calls.append(list(asins))
+        if len(keepa.calls) == 2:
+            # Stalled past STALE_HEARTBEAT_SECONDS: a second worker reclaims the job
+            async with async_sessionmaker(async_test_engine)() as session:
+                await session.execute(
+                    update(KeepaIngestJob)
+                    .where(KeepaIngestJob.id == job.id)
+                    .values(heartbeat_at=datetime.utcnow() - timedelta(minutes=10))
+                )
+                await session.commit()
+            assert await jobs.claim(str(job.id), worker_id="second-worker") is not None
+        return {asin: {"asin": asin} for asin in asins}
+
+    keepa.get_products_batch = AsyncMock(side_effect=stall_then_lose_claim)
+
+    assert await _run(jobs, job.id, keepa) is None
+
+    stored = await jobs.get_job(str(job.id))
+    assert (stored.status, stored.worker_id) == (IngestJobStatus.RUNNING, "second-worker")
+    assert stored.processed == 2
+    assert [r.position for r in await jobs.get_results(str(job.id))] == [0, 1]
+    assert not await jobs.heartbeat(str(job.id))
+    assert not await jobs.finish(str(job.id))
+
+
+@pytest.mark.asyncio
+async def test_recovery_recheck_resubmits_jobs(monkeypatch):
+    submitted = []
+    monkeypatch.setattr(keepa_jobs_router, "recover_ingest_jobs", AsyncMock(return_value=["job-1"]))
+    monkeypatch.setattr(
+        keepa_jobs_router.background_jobs, "submit", lambda kind, job_id: submitted.append(job_id)
+    )
+
+    await keepa_jobs_router._recover_ingest_jobs_later(0)
+
+    assert submitted == ["job-1"]
+
+
+@pytest.mark.asyncio
+async def test_pool_deduplicates_and_recovers_jobs():
+    pool = BackgroundJobPool(workers=2)
+    seen = []
+    gate = asyncio.Event()
+
+    async def handler(job_id):
+        await gate.wait()
+        seen.append(job_id)
+
+    pool.register("demo", handler, recover=AsyncMock(return_value=["a", "b"]))
+
+    assert pool.submit("demo", "a") is True
+    assert pool.submit("demo", "a") is False
+    assert await pool.recover() == {"demo": 1}
+
+    gate.set()
+    await pool.join()
+    assert sorted(seen) == ["a", "b"]
+    assert pool.get_stats()["completed"] == 2
+
+    with pytest.raises(ValueError):
+        pool.submit("unknown", "x")
+    await pool.shutdown()
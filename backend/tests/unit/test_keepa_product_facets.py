@@ -0,0 +1,151 @@
+"""
+Tests for volatility-split product caching (meta / history / live facets).
+"""
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.services.keepa_product_facets import (
+    assemble_product,
+    merge_live_refresh,
+    split_product,
+)
+from app.services.keepa_service import KeepaService
+
+
+def _full_product(asin, price=1500):
+    return {
+        "asin": asin,
+        "title": f"Book {asin}",
+        "categoryTree": [{"catId": 283155}],
+        "csv": [[100, 1200, 200, 1300], None, None, [100, 50000]],
+        "salesRanks": {"283155": [100, 50000]},
+        "stats": {"current": [price]},
+        "offers": [{"offerId": 1}],
+        "lastPriceChange": 7000000,
+    }
+
+
+def _live_refresh(asin, price):
+    product = _full_product(asin, price)
+    product["csv"] = None
+    product.pop("salesRanks")
+    return product
+
+
+@pytest.fixture
+def keepa_service():
+    service = KeepaService(api_key="test_key")
+    prices = {"value": 1500}
+
+    async def fake_query(identifiers, domain=1, stats=180, history=True, offers=20, force_refresh=False, days=None):
+        if history:
+            return [_full_product(asin, prices["value"]) for asin in identifiers]
+        return [_live_refresh(asin, prices["value"]) for asin in identifiers]
+
+    service._query_products = AsyncMock(side_effect=fake_query)
+    service.prices = prices
+    return service
+
+
+def _expire(service, facet, asin):
+    entry = service._cache[service._facet_cache_key(asin, 1, facet)]
+    entry.expires_at = datetime.now() - timedelta(seconds=1)
+
+
+def test_split_and_assemble_round_trip():
+    product = _full_product("B000000001")
+
+    facets = split_product(product)
+
+    assert set(facets["history"]) == {"csv", "salesRanks"}
+    assert set(facets["live"]) == {"stats", "offers", "lastPriceChange"}
+    assert facets["meta"]["title"] == "Book B000000001"
+    assert assemble_product(**facets) == product
+
+
+def test_merge_live_refresh_keeps_cached_history():
+    history = split_product(_full_product("B000000001"))["history"]
+
+    merged = merge_live_refresh(_live_refresh("B000000001", 999), history)
+
+    assert merged["csv"] == history["csv"]
+    assert merged["salesRanks"] == history["salesRanks"]
+    assert merged["stats"] == {"current": [999]}
+
+
+@pytest.mark.asyncio
+async def test_facets_cached_with_their_own_ttl(keepa_service):
+    await keepa_service.get_product_data("B000000001")
+
+    cache_types = {
+        facet: keepa_service._cache[keepa_service._facet_cache_key("B000000001", 1, facet)].cache_type
+        for facet in ("meta", "history", "live")
+    }
+    assert cache_types == {"meta": "meta", "history": "history", "live": "pricing"}
+
+
+@pytest.mark.asyncio
+async def test_expired_live_facet_refreshes_without_history(keepa_service):
+    await keepa_service.get_product_data("B000000001")
+    _expire(keepa_service, "live", "B000000001")
+    keepa_service.prices["value"] = 1999
+    keepa_service._query_products.reset_mock()
+
+    product = await keepa_service.get_product_data("B000000001")
+
+    assert keepa_service._query_products.await_args.args[3] is False
+    assert product["stats"] == {"current": [1999]}
+    assert product["csv"] == _full_product("B000000001")["csv"]
+
+    # Refreshed live facet is served from cache afterwards
+    keepa_service._query_products.reset_mock()
+    assert await keepa_service.get_product_data("B000000001") == product
+    keepa_service._query_products.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_live_refresh_keeps_history_expiry(keepa_service):
+    await keepa_service.get_product_data("B000000001")
+    history_key = keepa_service._facet_cache_key("B000000001", 1, "history")
+    expires_at = keepa_service._cache[history_key].expires_at
+    _expire(keepa_service, "live", "B000000001")
+
+    await keepa_service.get_product_data("B000000001")
+
+    assert keepa_service._cache[history_key].expires_at == expires_at
+
+
+@pytest.mark.asyncio
+async def test_expired_history_triggers_full_fetch(keepa_service):
+    await keepa_service.get_product_data("B000000001")
+    _expire(keepa_service, "history", "B000000001")
+    keepa_service._query_products.reset_mock()
+
+    await keepa_service.get_product_data("B000000001")
+
+    assert keepa_service._query_products.await_args.args[3] is True
+
+
+@pytest.mark.asyncio
+async def test_batch_groups_live_refreshes_separately(keepa_service):
+    await keepa_service.get_products_batch(["B000000001", "B000000002"])
+    _expire(keepa_service, "live", "B000000001")
+    keepa_service._query_products.reset_mock()
+
+    results = await keepa_service.get_products_batch(["B000000001", "B000000002", "B000000003"])
+
+    calls = [(call.args[0], call.args[3]) for call in keepa_service._query_products.await_args_list]
+    assert calls == [(["B000000001"], False), (["B000000003"], True)]
+    assert results["B000000001"]["csv"] == _full_product("B000000001")["csv"]
+    assert results["B000000002"]["title"] == "Book B000000002"
+
+
+@pytest.mark.asyncio
+async def test_non_default_fetch_is_cached_whole(keepa_service):
+    await keepa_service.get_products_batch(["B000000001"], history=False, offers=0)
+
+    key = keepa_service._product_cache_key("B000000001", 1, 180, False, 0)
+    assert keepa_service._cache[key].cache_type == "pricing"
+    assert keepa_service._facet_cache_key("B000000001", 1, "live") not in keepa_service._cache
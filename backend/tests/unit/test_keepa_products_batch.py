@@ -0,0 +1,186 @@
+"""
+Tests for KeepaService.get_products_batch (multi-ASIN fetch).
+"""
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import keepa
+
+import pytest
+
+from app.services.keepa_service import KeepaService
+from app.services.keepa_throttle import KeepaPriority, keepa_priority
+
+
+def _product(asin):
+    return {"asin": asin, "title": f"Book {asin}"}
+
+
+@pytest.fixture
+def keepa_service():
+    service = KeepaService(api_key="test_key")
+
+    async def fake_query(identifiers, *args, **kwargs):
+        return [_product(asin) for asin in identifiers]
+
+    service._query_products = AsyncMock(side_effect=fake_query)
+    return service
+
+
+@pytest.mark.asyncio
+async def test_batch_uses_single_call_for_small_batch(keepa_service):
+    asins = [f"B00000{i:04d}" for i in range(50)]
+
+    results = await keepa_service.get_products_batch(asins)
+
+    assert keepa_service._query_products.await_count == 1
+    assert list(results) == asins
+    assert results[asins[7]]["asin"] == asins[7]
+
+
+@pytest.mark.asyncio
+async def test_batch_splits_into_100_asin_chunks(keepa_service):
+    asins = [f"B0000{i:05d}" for i in range(250)]
+
+    results = await keepa_service.get_products_batch(asins)
+
+    chunk_sizes = [len(call.args[0]) for call in keepa_service._query_products.await_args_list]
+    assert chunk_sizes == [100, 100, 50]
+    assert len(results) == 250
+
+
+@pytest.mark.asyncio
+async def test_batch_serves_cache_hits_locally(keepa_service):
+    await keepa_service.get_products_batch(["B000000001", "B000000002"])
+    keepa_service._query_products.reset_mock()
+
+    results = await keepa_service.get_products_batch(["B000000001", "B000000003"])
+
+    fetched = keepa_service._query_products.await_args.args[0]
+    assert fetched == ["B000000003"]
+    assert results["B000000001"]["title"] == "Book B000000001"
+
+
+@pytest.mark.asyncio
+async def test_batch_shares_cache_with_single_lookup(keepa_service):
+    await keepa_service.get_products_batch(["B000000001"])
+    keepa_service._query_products.reset_mock()
+
+    product = await keepa_service.get_product_data("B000000001")
+
+    assert product["asin"] == "B000000001"
+    keepa_service._query_products.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_batch_cache_is_keyed_by_fetch_options(keepa_service):
+    await keepa_service.get_products_batch(["B000000001"], history=False, offers=0)
+    keepa_service._query_products.reset_mock()
+
+    await keepa_service.get_products_batch(["B000000001"])
+
+    keepa_service._query_products.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_batch_deduplicates_input(keepa_service):
+    results = await keepa_service.get_products_batch(["B000000001", "B000000001"])
+
+    assert keepa_service._query_products.await_args.args[0] == ["B000000001"]
+    assert list(results) == ["B000000001"]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_batches_share_in_flight_fetch(keepa_service):
+    release = asyncio.Event()
+
+    async def slow_query(identifiers, *args, **kwargs):
+        await release.wait()
+        return [_product(asin) for asin in identifiers]
+
+    keepa_service._query_products = AsyncMock(side_effect=slow_query)
+
+    first = asyncio.create_task(keepa_service.get_products_batch(["B000000001", "B000000002"]))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(keepa_service.get_products_batch(["B000000002", "B000000003"]))
+    await asyncio.sleep(0)
+    release.set()
+
+    first_results, second_results = await asyncio.gather(first, second)
+
+    fetched = [call.args[0] for call in keepa_service._query_products.await_args_list]
+    assert fetched == [["B000000001", "B000000002"], ["B000000003"]]
+    assert second_results["B000000002"] is first_results["B000000002"]
+
+
+@pytest.mark.asyncio
+async def test_missing_products_map_to_none(keepa_service):
+    async def partial_query(identifiers, *args, **kwargs):
+        return [_product(identifiers[0])]
+
+    keepa_service._query_products = AsyncMock(side_effect=partial_query)
+
+    results = await keepa_service.get_products_batch(["B000000001", "B000000002"])
+
+    assert results["B000000001"]["asin"] == "B000000001"
+    assert results["B000000002"] is None
+
+
+@pytest.mark.asyncio
+async def test_failed_chunk_returns_none_and_releases_waiters(keepa_service):
+    keepa_service._query_products = AsyncMock(side_effect=RuntimeError("keepa down"))
+
+    results = await keepa_service.get_products_batch(["B000000001"])
+
+    assert results == {"B000000001": None}
+    assert keepa_service.single_flight.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_unsorted_chunk_through_keepa_query_matches_by_asin():
+    """keepa's query() sorts identifiers, so responses are not in request order."""
+    api = keepa.Keepa("test_key")
+    # keepa 1.3.x keeps the token status as a dict
+    api.status.update(refillRate=20, refillIn=1000)
+    sent = []
+
+    def product_query(items, product_code_is_asin=True, **kwargs):
+        sent.append(list(items))
+        return {"products": [_product(asin) for asin in items]}
+
+    api._product_query = product_query
+
+    with patch("app.services.keepa_client_pool._default_client_factory", return_value=api):
+        service = KeepaService(api_key="sorting_key")
+        results = await service.get_products_batch(["B00000000Z", "B00000000A", "B00000000M"])
+
+    assert sent == [["B00000000A", "B00000000M", "B00000000Z"]]
+    assert {asin: product["asin"] for asin, product in results.items()} == {
+        "B00000000Z": "B00000000Z",
+        "B00000000A": "B00000000A",
+        "B00000000M": "B00000000M",
+    }
+
+
+def test_match_products_by_returned_codes():
+    products = [{"asin": "B000000002"}, {"asin": "0306406152", "eanList": ["9780306406157"]}]
+
+    matched = KeepaService._match_products(["9780306406157", "b000000002", "B000000009"], products)
+
+    assert matched == {"9780306406157": products[1], "b000000002": products[0]}
+
+
+@pytest.mark.asyncio
+async def test_library_fetch_is_throttled_under_caller_priority():
+    api = MagicMock()
+    api.query.side_effect = lambda items, **kwargs: [_product(asin) for asin in items]
+    api.status = None
+
+    with patch("app.services.keepa_client_pool._default_client_factory", return_value=api):
+        service = KeepaService(api_key="throttled_key")
+        with keepa_priority(KeepaPriority.VERIFICATION):
+            await service.get_products_batch(["B000000001", "B000000002", "B000000003"])
+
+    verification = service.throttle.get_stats()["classes"]["verification"]
+    assert verification["acquired"] == 1
+    assert verification["tokens_spent"] == 3
@@ -0,0 +1,173 @@
+"""
+Tests for single-flight deduplication of concurrent Keepa requests.
+"""
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.services.keepa_cache import KeepaCache
+from app.services.keepa_service import KeepaService
+from app.services.keepa_single_flight import KeepaSingleFlight, keepa_single_flight
+
+
+@pytest.fixture(autouse=True)
+def _reset_single_flight():
+    keepa_single_flight.reset()
+    yield
+    keepa_single_flight.reset()
+
+
+class TestKeepaSingleFlight:
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_call(self):
+        flight = KeepaSingleFlight()
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"ok": True}
+
+        results = await asyncio.gather(*[
+            flight.run("/query?selection=x", fetch, cost=10) for _ in range(5)
+        ])
+
+        assert calls == 1
+        assert all(r is results[0] for r in results)
+        stats = flight.get_stats()
+        assert stats["deduplicated_requests"] == 4
+        assert stats["tokens_saved"] == 40
+        assert stats["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_sequential_callers_are_not_deduplicated(self):
+        flight = KeepaSingleFlight()
+        fetch = AsyncMock(return_value=1)
+
+        await flight.run("k", fetch)
+        await flight.run("k", fetch)
+
+        assert fetch.await_count == 2
+        assert flight.get_stats()["tokens_saved"] == 0
+
+    @pytest.mark.asyncio
+    async def test_leader_error_propagates_to_followers(self):
+        flight = KeepaSingleFlight()
+
+        async def failing():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("keepa down")
+
+        results = await asyncio.gather(
+            flight.run("k", failing),
+            flight.run("k", failing),
+            return_exceptions=True
+        )
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert flight.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_follower_cancellation_does_not_cancel_leader(self):
+        flight = KeepaSingleFlight()
+        release = asyncio.Event()
+
+        async def fetch():
+            await release.wait()
+            return "done"
+
+        leader = asyncio.create_task(flight.run("k", fetch))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flight.run("k", fetch))
+        await asyncio.sleep(0)
+        follower.cancel()
+        release.set()
+
+        assert await leader == "done"
+
+
+class TestCacheKeyNormalization:
+
+    def test_selection_json_key_order_is_normalized(self):
+        cache = KeepaCache()
+        first = cache.get_cache_key("/query", {
+            "domain": 1, "selection": '{"a": 1, "b": 2}'
+        })
+        second = cache.get_cache_key("/query", {
+            "selection": '{"b":2,"a":1}', "domain": 1
+        })
+        assert first == second
+
+    def test_api_key_is_excluded(self):
+        cache = KeepaCache()
+        assert cache.get_cache_key("/product", {"asin": "X", "key": "secret"}) == \
+            cache.get_cache_key("/product", {"asin": "X"})
+
+
+class TestKeepaServiceSingleFlight:
+
+    @pytest.mark.asyncio
+    async def test_make_request_shared_across_service_instances(self):
+        first = KeepaService(api_key="test_key")
+        second = KeepaService(api_key="test_key")
+
+        async def slow_send(endpoint, params):
+            await asyncio.sleep(0.01)
+            return {"asinList": ["B000000001"]}
+
+        first._send_request = AsyncMock(side_effect=slow_send)
+        second._send_request = AsyncMock(side_effect=slow_send)
+
+        params = {"domain": 1, "selection": '{"current_SALES_lte": 100}'}
+        results = await asyncio.gather(
+            first._make_request("/query", params),
+            second._make_request("/query", dict(params)),
+        )
+
+        assert first._send_request.await_count + second._send_request.await_count == 1
+        assert results[0] is results[1]
+        assert keepa_single_flight.get_stats()["deduplicated_requests"] == 1
+
+    @pytest.mark.asyncio
+    async def test_get_product_data_joins_in_flight_fetch(self):
+        service = KeepaService(api_key="test_key")
+
+        async def slow_query(identifiers, *args, **kwargs):
+            await asyncio.sleep(0.01)
+            return [{"asin": identifiers[0]}]
+
+        service._query_products = AsyncMock(side_effect=slow_query)
+
+        results = await asyncio.gather(*[
+            service.get_product_data("B000000001") for _ in range(3)
+        ])
+
+        assert service._query_products.await_count == 1
+        assert all(r["asin"] == "B000000001" for r in results)
+        assert keepa_single_flight.get_stats()["tokens_saved"] == 2
+
+    @pytest.mark.asyncio
+    async def test_single_lookup_joins_running_batch(self):
+        service = KeepaService(api_key="test_key")
+        release = asyncio.Event()
+
+        async def slow_query(identifiers, *args, **kwargs):
+            await release.wait()
+            return [{"asin": asin} for asin in identifiers]
+
+        service._query_products = AsyncMock(side_effect=slow_query)
+
+        batch = asyncio.create_task(
+            service.get_products_batch(["B000000001", "B000000002"])
+        )
+        await asyncio.sleep(0)
+        single = asyncio.create_task(service.get_product_data("B000000002"))
+        await asyncio.sleep(0)
+        release.set()
+
+        await batch
+        assert (await single)["asin"] == "B000000002"
+        assert service._query_products.await_count == 1
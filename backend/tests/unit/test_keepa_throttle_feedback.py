@@ -0,0 +1,131 @@
+"""
+Tests for KeepaThrottle adapting to tokensLeft/refillIn/refillRate feedback.
+"""
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+
+from app.services.keepa_service import KeepaService
+from app.services.keepa_throttle import KeepaThrottle, keepa_throttle
+
+
+def _status(tokens_left, refill_in_ms=30000, refill_rate=20, consumed=None):
+    body = {"tokensLeft": tokens_left, "refillIn": refill_in_ms, "refillRate": refill_rate}
+    if consumed is not None:
+        body["tokensConsumed"] = consumed
+    return body
+
+
+class TestObserve:
+
+    def test_adopts_keepa_balance_and_plan(self):
+        throttle = KeepaThrottle(tokens_per_minute=20, burst_capacity=200)
+        assert throttle.keepa_balance is None
+
+        throttle.observe(_status(950, refill_rate=60, consumed=5))
+
+        assert throttle.keepa_balance == 950
+        assert throttle.refill_per_minute == 60
+        assert throttle.capacity == 3600  # one hour of refill
+        assert throttle.tokens_consumed == 5
+        assert throttle.balance_age < 1
+
+    def test_keepa_status_object_and_missing_fields(self):
+        throttle = KeepaThrottle()
+        throttle.observe(SimpleNamespace(tokensLeft=None, refillIn=None, refillRate=None))
+        assert throttle.keepa_balance is None
+
+        throttle.observe(SimpleNamespace(tokensLeft=42, refillIn=1000, refillRate=20))
+        assert throttle.keepa_balance == 42
+
+    def test_in_flight_tokens_subtracted_from_reported_balance(self):
+        throttle = KeepaThrottle()
+
+        with throttle.in_flight(10):
+            with throttle.in_flight(5) as request:
+                request.observe(_status(100))
+                # The 10-token request has not been answered yet
+                assert throttle.available_tokens == 90
+            assert throttle.get_stats()["tokens_in_flight"] == 10
+        assert throttle.get_stats()["tokens_in_flight"] == 0
+
+    def test_refills_in_one_minute_steps(self):
+        throttle = KeepaThrottle()
+        throttle.observe(_status(10, refill_in_ms=0, refill_rate=20))
+
+        assert throttle.keepa_balance == 30  # refill already due
+        assert throttle.keepa_balance == 30  # not again until a minute later
+        # Shortfalls wait for whole refill steps
+        assert throttle._seconds_until(15) == pytest.approx(60, abs=0.5)
+        assert throttle._seconds_until(25) == pytest.approx(120, abs=0.5)
+
+    @pytest.mark.asyncio
+    async def test_wait_sized_to_next_refill_without_blind_cooldown(self):
+        throttle = KeepaThrottle(critical_threshold=40)
+        throttle.observe(_status(0, refill_in_ms=150, refill_rate=20))
+
+        start = time.perf_counter()
+        await asyncio.wait_for(throttle.acquire(cost=3), timeout=2)
+        elapsed = time.perf_counter() - start
+
+        assert 0.1 < elapsed < 0.5
+        assert throttle.available_tokens == 17
+
+    def test_reset_restores_configured_plan(self):
+        throttle = KeepaThrottle(tokens_per_minute=20, burst_capacity=200)
+        throttle.observe(_status(5, refill_rate=60))
+
+        throttle.reset()
+
+        assert throttle.keepa_balance is None
+        assert throttle.capacity == 200
+        assert throttle.available_tokens == 200
+
+
+class TestKeepaServiceFeedback:
+
+    @pytest.mark.asyncio
+    async def test_balance_probe_only_until_keepa_answered(self):
+        service = KeepaService(api_key="test_key")
+        service.client.get = AsyncMock(return_value=httpx.Response(200, json=_status(500)))
+
+        assert await service.check_api_balance() == 500
+        assert await service.check_api_balance() == 500
+
+        service.client.get.assert_awaited_once()
+        assert service.client.get.await_args.args[0].endswith("/token")
+
+    @pytest.mark.asyncio
+    async def test_stale_ledger_refreshed_from_token_endpoint(self, monkeypatch):
+        keepa_throttle.observe(_status(500))
+        service = KeepaService(api_key="test_key")
+        service.client.get = AsyncMock(return_value=httpx.Response(200, json=_status(420)))
+
+        assert await service.check_api_balance() == 500
+        service.client.get.assert_not_awaited()
+
+        monkeypatch.setattr(keepa_throttle, "_synced_at", time.monotonic() - 120)
+        assert service.balance_age_seconds >= 120
+        assert await service.check_api_balance() == 420
+        assert service.balance_age_seconds == 0
+        service.client.get.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_every_response_updates_the_throttle(self):
+        keepa_throttle.observe(_status(500))
+        service = KeepaService(api_key="test_key")
+        service.client.get = AsyncMock(return_value=httpx.Response(
+            200,
+            json={"products": [], **_status(488, consumed=12)},
+            request=httpx.Request("GET", "https://api.keepa.com/product"),
+        ))
+
+        await service._send_request("/product", {"asin": "B00TEST"})
+
+        assert keepa_throttle.keepa_balance == 488
+        assert keepa_throttle.get_stats()["tokens_in_flight"] == 0
+        service.client.get.assert_awaited_once()  # no balance probe
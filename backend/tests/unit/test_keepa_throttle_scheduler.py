@@ -0,0 +1,166 @@
+"""
+Tests for the priority-scheduled KeepaThrottle (weighted fair queuing).
+"""
+import asyncio
+import time
+
+import pytest
+
+from app.services import keepa_throttle as throttle_module
+from app.services.keepa_throttle import (
+    KeepaPriority,
+    KeepaThrottle,
+    current_keepa_priority,
+    keepa_priority,
+    with_keepa_priority,
+)
+
+
+def _throttle(tokens=0, rate_per_second=50, warning=0, critical=0):
+    throttle = KeepaThrottle(
+        tokens_per_minute=rate_per_second * 60,
+        burst_capacity=100,
+        warning_threshold=warning,
+        critical_threshold=critical,
+    )
+    throttle.tokens = float(tokens)
+    return throttle
+
+
+async def _acquire_all(throttle, requests):
+    """Queue (name, priority, cost[, preempt]) requests in order, return completion order."""
+    order = []
+
+    async def one(name, priority, cost, preempt=False):
+        await throttle.acquire(cost=cost, priority=priority, preempt=preempt)
+        order.append(name)
+
+    tasks = []
+    for request in requests:
+        tasks.append(asyncio.create_task(one(*request)))
+        await asyncio.sleep(0)  # enqueue in the given order
+    await asyncio.gather(*tasks)
+    return order
+
+
+@pytest.mark.asyncio
+async def test_waiters_served_by_priority_class():
+    throttle = _throttle()
+
+    order = await _acquire_all(throttle, [
+        ("tracking", KeepaPriority.TRACKING, 1),
+        ("autosourcing", KeepaPriority.AUTOSOURCING, 1),
+        ("verification", KeepaPriority.VERIFICATION, 1),
+        ("interactive", KeepaPriority.INTERACTIVE, 1),
+    ])
+
+    assert order == ["interactive", "verification", "autosourcing", "tracking"]
+
+
+@pytest.mark.asyncio
+async def test_background_class_still_gets_its_share():
+    throttle = _throttle(rate_per_second=200)
+
+    order = await _acquire_all(
+        throttle,
+        [(f"i{n}", KeepaPriority.INTERACTIVE, 1) for n in range(10)]
+        + [("tracking", KeepaPriority.TRACKING, 1)],
+    )
+
+    # Weight 1 vs 8: tracking is served before the ninth interactive call
+    assert order.index("tracking") < 10
+
+
+@pytest.mark.asyncio
+async def test_background_waiter_does_not_block_interactive():
+    # Background classes keep the 50-token warning reserve for user calls
+    throttle = _throttle(tokens=55, rate_per_second=10, warning=50)
+    background = asyncio.create_task(throttle.acquire(cost=10, priority=KeepaPriority.AUTOSOURCING))
+    await asyncio.sleep(0.01)
+
+    start = time.perf_counter()
+    await throttle.acquire(cost=1)
+
+    assert time.perf_counter() - start < 0.05
+    assert not background.done()
+    assert throttle.get_stats()["classes"]["autosourcing"]["queue_depth"] == 1
+    await asyncio.wait_for(background, timeout=2)
+
+
+@pytest.mark.asyncio
+async def test_blocked_foreground_head_sets_the_wait():
+    # Verification would fit, but is tagged after the interactive head
+    throttle = _throttle(tokens=7, rate_per_second=1)
+    loop = asyncio.get_running_loop()
+    throttle._enqueue(10, KeepaPriority.INTERACTIVE, loop, preempt=False)
+    throttle._enqueue(6, KeepaPriority.VERIFICATION, loop, preempt=False)
+
+    delay = throttle._dispatch()
+
+    assert throttle.queue_depth() == 2
+    assert delay == pytest.approx(3.0)
+
+
+@pytest.mark.asyncio
+async def test_preempt_jumps_the_queue():
+    throttle = _throttle()
+
+    order = await _acquire_all(throttle, [
+        ("verification", KeepaPriority.VERIFICATION, 3),
+        ("tracking", KeepaPriority.TRACKING, 1, True),
+    ])
+
+    assert order == ["tracking", "verification"]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_leaves_the_queue():
+    throttle = _throttle(rate_per_second=1)
+    waiter = asyncio.create_task(throttle.acquire(cost=5, priority=KeepaPriority.TRACKING))
+    await asyncio.sleep(0.01)
+    assert throttle.queue_depth(KeepaPriority.TRACKING) == 1
+
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    assert throttle.queue_depth() == 0
+    await asyncio.wait_for(throttle.acquire(cost=0), timeout=0.1)
+
+
+@pytest.mark.asyncio
+async def test_critical_cooldown_runs_once_without_holding_the_lock(monkeypatch):
+    monkeypatch.setattr(throttle_module, "CRITICAL_COOLDOWN_SECONDS", 0.2)
+    throttle = _throttle(tokens=5, rate_per_second=10, critical=10)
+
+    start = time.perf_counter()
+    waiters = asyncio.gather(*(throttle.acquire(cost=1) for _ in range(3)))
+    await asyncio.sleep(0.05)
+    stats = throttle.get_stats()  # must not wait for the cooldown
+    await waiters
+    elapsed = time.perf_counter() - start
+
+    assert stats["in_cooldown"] is True
+    assert stats["classes"]["interactive"]["queue_depth"] == 3
+    assert elapsed < 0.35  # one shared cooldown, not three in a row
+
+
+@pytest.mark.asyncio
+async def test_priority_context_and_per_class_stats():
+    throttle = _throttle(tokens=100)
+
+    @with_keepa_priority(KeepaPriority.VERIFICATION)
+    async def verify():
+        assert current_keepa_priority() is KeepaPriority.VERIFICATION
+        await throttle.acquire(cost=2)
+
+    await verify()
+    with keepa_priority("tracking"):
+        await throttle.acquire(cost=3)
+    await throttle.acquire(cost=1)
+
+    classes = throttle.get_stats()["classes"]
+    assert classes["verification"]["acquired"] == 1
+    assert classes["tracking"]["tokens_spent"] == 3
+    assert classes["interactive"]["acquired"] == 1
+    assert current_keepa_priority() is KeepaPriority.INTERACTIVE
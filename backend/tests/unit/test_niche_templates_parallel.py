@@ -0,0 +1,92 @@
+"""
+Tests for concurrent curated-niche validation and its per-template cache.
+"""
+import asyncio
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.services.niche_templates import (
+    CURATED_NICHES,
+    clear_validated_niche_cache,
+    discover_curated_niches,
+    stream_curated_niches,
+)
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    clear_validated_niche_cache()
+    yield
+    clear_validated_niche_cache()
+
+
+def _finder(available_tokens=10000, delays=None):
+    finder = MagicMock()
+    finder.keepa_service.throttle.available_tokens = available_tokens
+    finder.calls = []
+    in_flight = {"current": 0, "max": 0}
+
+    async def discover_with_scoring(domain, category, bsr_min, bsr_max, price_min, price_max,
+                                    max_results, max_fba_sellers=None, strategy=None):
+        finder.calls.append(bsr_min)
+        in_flight["current"] += 1
+        in_flight["max"] = max(in_flight["max"], in_flight["current"])
+        try:
+            await asyncio.sleep((delays or {}).get(len(finder.calls), 0.05))
+        finally:
+            in_flight["current"] -= 1
+        return [{"asin": "A1", "roi_percent": 40.0, "velocity_score": 50.0}]
+
+    finder.discover_with_scoring = discover_with_scoring
+    finder.in_flight = in_flight
+    return finder
+
+
+@pytest.mark.asyncio
+async def test_templates_validated_concurrently_in_template_order():
+    finder = _finder()
+
+    start = time.perf_counter()
+    niches = await discover_curated_niches(None, finder, count=3, shuffle=False)
+    elapsed = time.perf_counter() - start
+
+    assert finder.in_flight["max"] == 3
+    assert elapsed < 0.12
+    assert [n["id"] for n in niches] == [t["id"] for t in CURATED_NICHES[:3]]
+
+
+@pytest.mark.asyncio
+async def test_parallelism_bounded_by_setting_and_token_budget():
+    finder = _finder()
+    await discover_curated_niches(None, finder, count=4, shuffle=False, parallelism=2)
+    assert finder.in_flight["max"] == 2
+
+    clear_validated_niche_cache()
+    # 150 tokens budgeted per niche: 200 tokens -> one at a time
+    finder = _finder(available_tokens=200)
+    await discover_curated_niches(None, finder, count=3, shuffle=False)
+    assert finder.in_flight["max"] == 1
+
+
+@pytest.mark.asyncio
+async def test_stream_yields_niches_as_they_finish():
+    # First template is the slowest
+    finder = _finder(delays={1: 0.15, 2: 0.01, 3: 0.05})
+
+    streamed = [n["id"] async for n in stream_curated_niches(finder, count=3, shuffle=False)]
+
+    ids = [t["id"] for t in CURATED_NICHES[:3]]
+    assert streamed == [ids[1], ids[2], ids[0]]
+
+
+@pytest.mark.asyncio
+async def test_validated_niches_cached_per_template():
+    finder = _finder()
+    first = await discover_curated_niches(None, finder, count=2, shuffle=False)
+
+    again = await discover_curated_niches(None, finder, count=3, shuffle=False)
+
+    assert len(finder.calls) == 3  # only the third template was discovered again
+    assert again[:2] == first
@@ -0,0 +1,165 @@
+"""
+Unit tests for the vectorized Product Finder batch scoring.
+"""
+
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from app.schemas.config_types import FeeConfigUnified
+from app.services.keepa_product_finder import KeepaProductFinderService
+from app.services.product_finder_scoring import (
+    score_product_batch,
+    select_top_products,
+    velocity_scores,
+)
+from app.services.scoring_profile import ScoringProfile, fallback_scoring_profile
+
+
+TIERS = [
+    SimpleNamespace(bsr_threshold=10000, min_score=80, max_score=100),
+    SimpleNamespace(bsr_threshold=50000, min_score=60, max_score=80),
+    SimpleNamespace(bsr_threshold=100000, min_score=40, max_score=60),
+    SimpleNamespace(bsr_threshold=500000, min_score=20, max_score=40),
+]
+
+CONFIG = SimpleNamespace(
+    effective_roi=SimpleNamespace(
+        source_price_factor=Decimal("0.4"),
+        excellent_threshold=Decimal("50"),
+        target=Decimal("30"),
+        min_acceptable=Decimal("15"),
+    ),
+    effective_fees=FeeConfigUnified(),
+    effective_velocity=SimpleNamespace(tiers=TIERS),
+)
+
+# Compiled from the same thresholds, fees and tiers as CONFIG
+PROFILE = fallback_scoring_profile()
+
+
+@pytest.fixture
+def finder():
+    return KeepaProductFinderService(MagicMock(), MagicMock())
+
+
+def _product(asin, new_cents, bsr, amazon_cents=-1):
+    return {"asin": asin, "title": f"Book {asin}", "stats": {"current": [amazon_cents, new_cents, None, bsr]}}
+
+
+def _scored(asin, bsr, roi, velocity):
+    return {"asin": asin, "bsr": bsr, "roi_percent": roi, "velocity_score": velocity}
+
+
+class TestVelocityScores:
+
+    def test_matches_linear_tier_scan(self, finder):
+        bsr = [-1, 0, 1, 10000, 10001, 50000, 99999, 500000, 500001]
+
+        expected = [finder._calculate_velocity_score(b, TIERS) for b in bsr]
+
+        assert velocity_scores(np.array(bsr), TIERS).tolist() == expected
+
+    def test_unsorted_tiers_keep_first_match_semantics(self, finder):
+        tiers = [TIERS[2], TIERS[0], TIERS[3]]
+        bsr = [5000, 80000, 200000]
+
+        expected = [finder._calculate_velocity_score(b, tiers) for b in bsr]
+
+        assert velocity_scores(np.array(bsr), tiers).tolist() == expected
+
+
+class TestScoreProductBatch:
+
+    def test_matches_per_product_scoring(self, finder):
+        products = [_product("A1", 2500, 8000), _product("A2", 4000, 120000)]
+
+        results = score_product_batch(products, PROFILE)
+
+        for result in results:
+            price = Decimal(str(result["price"]))
+            source_price = price * CONFIG.effective_roi.source_price_factor
+            fees = finder._calculate_fees(price, CONFIG.effective_fees)
+            expected_roi = float((price - source_price - fees) / source_price * Decimal("100"))
+            assert result["roi_percent"] == pytest.approx(expected_roi)
+            assert result["recommendation"] == finder._get_recommendation(
+                result["roi_percent"], result["velocity_score"], CONFIG
+            )
+        assert [r["velocity_score"] for r in results] == [90.0, 30.0]
+
+    def test_filters_missing_data_and_amazon_sellers(self):
+        products = [
+            _product("A1", 2500, 8000),
+            _product("A2", -1, 8000),           # no price
+            _product("A3", 2500, None),          # no BSR
+            _product("A4", 2500, 8000, 1999),    # Amazon is selling
+            {"title": "no asin", "stats": {"current": [-1, 2500, None, 8000]}},
+        ]
+
+        results = score_product_batch(products, PROFILE)
+        assert [r["asin"] for r in results] == ["A1"]
+
+        results = score_product_batch(products, PROFILE, exclude_amazon_seller=False)
+        assert [r["asin"] for r in results] == ["A1", "A4"]
+
+    def test_min_roi_and_velocity_filters(self):
+        products = [_product("A1", 2500, 8000), _product("A2", 2500, 400000), _product("A3", 500, 8000)]
+
+        results = score_product_batch(products, PROFILE, min_roi=20, min_velocity=50)
+
+        assert [r["asin"] for r in results] == ["A1"]
+
+
+class TestScoringProfile:
+
+    def test_scalar_helpers_match_vectorized_and_linear(self, finder):
+        bsr = [-1, 0, 1, 10000, 10001, 99999, 500001]
+        assert [PROFILE.velocity_score(b) for b in bsr] == PROFILE.velocity_scores(np.array(bsr)).tolist()
+
+        for roi, velocity in [(60, 90), (35, 70), (20, 45), (10, 90)]:
+            assert PROFILE.recommendation(roi, velocity) == finder._get_recommendation(roi, velocity, CONFIG)
+
+    def test_strategy_selects_tiers_and_thresholds(self):
+        profile = fallback_scoring_profile("textbooks_patience")
+
+        assert profile.velocity_score(300000) == 45.0
+        assert profile.velocity_buy == 30
+        assert fallback_scoring_profile("textbooks_patience") is profile
+
+    def test_fees_precomputed_from_category_schedule(self):
+        config = {"fees": {"buffer_pct_default": 5.0, "books": {"referral_fee_pct": 12.0, "fba_fee_base": 3.0}}}
+
+        profile = ScoringProfile.from_config(config, category="books")
+
+        assert profile.referral_rate == pytest.approx(0.12)
+        assert profile.fixed_fees == pytest.approx(1.80 + 3.0 + 0.40 + 0.40 + 0.20)
+
+
+class TestSelectTopProducts:
+
+    def test_without_bsr_range_sorts_by_composite_score(self):
+        scored = [_scored("A1", 1, 10.0, 10), _scored("A2", 1, 50.0, 10), _scored("A3", 1, 50.0, 10)]
+
+        assert [p["asin"] for p in select_top_products(scored, 2)] == ["A2", "A3"]
+
+    def test_balanced_selection_represents_each_segment(self):
+        # Low-BSR products score best but every third must be represented
+        scored = (
+            [_scored(f"L{i}", 100 + i, 100.0, 90) for i in range(6)]
+            + [_scored(f"M{i}", 400 + i, 50.0, 50) for i in range(3)]
+            + [_scored(f"H{i}", 800 + i, 20.0, 30) for i in range(3)]
+        )
+
+        selected = select_top_products(scored, 6, bsr_min=1, bsr_max=1000)
+
+        assert [p["asin"] for p in selected] == ["L0", "L1", "M0", "M1", "H0", "H1"]
+
+    def test_leftover_slots_go_to_best_remaining(self):
+        scored = [_scored(f"L{i}", 100 + i, 100.0 - i, 90) for i in range(6)] + [_scored("H0", 900, 10.0, 10)]
+
+        selected = select_top_products(scored, 4, bsr_min=1, bsr_max=1000)
+
+        assert [p["asin"] for p in selected] == ["L0", "L1", "L2", "H0"]
@@ -0,0 +1,92 @@
+"""
+Tests for concurrent BSR sub-segment discovery in KeepaProductFinderService.
+"""
+import asyncio
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.services.keepa_product_finder import KeepaProductFinderService
+
+
+def _finder(available_tokens=200, delay=0.05, segment_asins=None, fail_segment=None, delays=None):
+    keepa_service = MagicMock()
+    keepa_service.throttle.available_tokens = available_tokens
+    finder = KeepaProductFinderService(keepa_service, MagicMock())
+    calls = []
+    in_flight = {"current": 0, "max": 0}
+
+    async def fake_query(domain, root_category, bsr_min, bsr_max, price_min, price_max,
+                         max_results, max_fba_sellers=None, exclude_amazon_seller=True):
+        calls.append(bsr_min)
+        in_flight["current"] += 1
+        in_flight["max"] = max(in_flight["max"], in_flight["current"])
+        try:
+            await asyncio.sleep((delays or {}).get(bsr_min, delay))
+            if bsr_min == fail_segment:
+                raise RuntimeError("segment down")
+            if segment_asins is not None:
+                return segment_asins[bsr_min]
+            return [f"B{bsr_min}-{n}" for n in range(max_results)]
+        finally:
+            in_flight["current"] -= 1
+
+    finder._single_product_finder_query = fake_query
+    finder.calls = calls
+    finder.in_flight = in_flight
+    return finder
+
+
+async def _discover(finder, max_results=90):
+    return await finder._discover_with_subsegments(
+        domain=1, root_category=283155, bsr_min=100000, bsr_max=250000,
+        price_min=None, price_max=None, max_results=max_results,
+    )
+
+
+@pytest.mark.asyncio
+async def test_segments_run_concurrently():
+    finder = _finder(delay=0.1)
+
+    start = time.perf_counter()
+    asins = await _discover(finder)
+    elapsed = time.perf_counter() - start
+
+    assert finder.in_flight["max"] == 3
+    assert elapsed < 0.25
+    # Merged in segment order regardless of completion order
+    assert asins[0].startswith("B100000-") and asins[-1].startswith("B200000-")
+
+
+@pytest.mark.asyncio
+async def test_token_budget_limits_concurrency():
+    # 60 tokens per segment (10 /query + 50 post-filter): 100 tokens -> 1 at a time
+    finder = _finder(available_tokens=100)
+
+    await _discover(finder)
+
+    assert finder.in_flight["max"] == 1
+    assert len(finder.calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_fast_upper_segment_does_not_stop_the_others():
+    # Upper third answers first with enough ASINs for the whole request
+    finder = _finder(delays={100000: 0.1, 150000: 0.08, 200000: 0.01})
+
+    asins = await _discover(finder, max_results=20)
+
+    assert sorted(finder.calls) == [100000, 150000, 200000]
+    # Same output as querying the segments one after another
+    assert asins == [f"B100000-{n}" for n in range(20)]
+
+
+@pytest.mark.asyncio
+async def test_results_deduplicated_and_failed_segment_ignored():
+    finder = _finder(
+        segment_asins={100000: ["A", "B"], 150000: ["B", "C"], 200000: ["D"]},
+        fail_segment=200000,
+    )
+
+    assert await _discover(finder) == ["A", "B", "C"]
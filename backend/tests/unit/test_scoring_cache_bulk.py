@@ -0,0 +1,137 @@
+"""
+Tests for bulk ProductScoringCache reads/writes used by discover_with_scoring.
+"""
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.product_cache import ProductScoringCache
+from app.services.cache_service import CacheService
+from app.services.keepa_product_finder import KeepaProductFinderService
+
+
+def _session(entries=()):
+    session = MagicMock(spec=AsyncSession)
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = list(entries)
+    session.execute = AsyncMock(return_value=result)
+    session.commit = AsyncMock()
+    return session
+
+
+def _entry(asin, created_at, roi=40.0):
+    return ProductScoringCache(
+        cache_key=CacheService._scoring_cache_key(asin),
+        asin=asin,
+        title=f"Book {asin}",
+        price=25.0,
+        bsr=5000,
+        roi_percent=roi,
+        velocity_score=90.0,
+        recommendation="BUY",
+        created_at=created_at,
+        expires_at=created_at + timedelta(hours=6),
+        hit_count=0,
+    )
+
+
+def _sql(statement):
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+class TestCacheServiceBulk:
+
+    @pytest.mark.asyncio
+    async def test_get_many_is_one_query_plus_batched_hit_count(self):
+        now = datetime.utcnow()
+        session = _session([_entry("A1", now - timedelta(hours=2), roi=10.0), _entry("A1", now), _entry("A2", now)])
+
+        hits = await CacheService(session).get_scoring_cache_many(["A1", "A2", "A3"])
+
+        assert set(hits) == {"A1", "A2"}
+        assert hits["A1"]["roi_percent"] == 40.0
+        select_stmt, update_stmt = [call.args[0] for call in session.execute.await_args_list]
+        assert " IN " in _sql(select_stmt)
+        assert "hit_count" in _sql(update_stmt)
+        session.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_get_many_miss_does_not_write(self):
+        session = _session()
+
+        assert await CacheService(session).get_scoring_cache_many(["A1"]) == {}
+
+        assert session.execute.await_count == 1
+        session.commit.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_set_many_is_single_upsert(self):
+        session = _session()
+        row = {
+            "asin": "A1", "title": "Book", "price": 25.0, "bsr": 5000,
+            "roi_percent": 40.0, "velocity_score": 90.0, "recommendation": "BUY",
+        }
+
+        keys = await CacheService(session).set_scoring_cache_many([row, {**row, "roi_percent": 41.0}, {**row, "asin": "A2"}])
+
+        assert keys == [CacheService._scoring_cache_key("A1"), CacheService._scoring_cache_key("A2")]
+        session.execute.assert_awaited_once()
+        sql = _sql(session.execute.await_args.args[0])
+        assert "ON CONFLICT (cache_key) DO UPDATE" in sql
+        assert "hit_count = (product_scoring_cache.hit_count +" in sql
+        session.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_discover_with_scoring_uses_constant_cache_round_trips():
+    products = [
+        {"asin": f"A{i}", "title": f"Book {i}", "stats": {"current": [-1, 2500, None, 5000 + i]}}
+        for i in range(20)
+    ]
+    keepa_service = MagicMock()
+    keepa_service._make_request = AsyncMock(return_value={"products": products})
+    config_service = MagicMock()
+    config_service.get_scoring_profile = AsyncMock(side_effect=Exception("no config"))
+
+    finder = KeepaProductFinderService(keepa_service, config_service)
+    finder.discover_products = AsyncMock(return_value=[p["asin"] for p in products])
+    finder.cache_service = SimpleNamespace(
+        get_discovery_cache=AsyncMock(return_value=None),
+        set_discovery_cache=AsyncMock(return_value="0" * 32),
+        get_scoring_cache_many=AsyncMock(return_value={
+            "A0": {"asin": "A0", "bsr": 5000, "roi_percent": 99.0, "velocity_score": 90.0},
+        }),
+        set_scoring_cache_many=AsyncMock(),
+    )
+
+    results = await finder.discover_with_scoring(domain=1, max_results=50)
+
+    assert len(results) == 20
+    assert results[0]["roi_percent"] == 99.0
+    finder.cache_service.get_scoring_cache_many.assert_awaited_once()
+    finder.cache_service.set_scoring_cache_many.assert_awaited_once()
+    assert len(finder.cache_service.set_scoring_cache_many.await_args.args[0]) == 19
+
+
+@pytest.mark.asyncio
+async def test_discover_with_scoring_keeps_duplicate_asins():
+    products = [
+        {"asin": asin, "title": f"Book {asin}", "stats": {"current": [-1, 2500, None, 5000]}}
+        for asin in ("A1", "A2", "A1")
+    ]
+    keepa_service = MagicMock()
+    keepa_service._make_request = AsyncMock(return_value={"products": products})
+    config_service = MagicMock()
+    config_service.get_scoring_profile = AsyncMock(side_effect=Exception("no config"))
+
+    finder = KeepaProductFinderService(keepa_service, config_service)
+    finder.discover_products = AsyncMock(return_value=["A1", "A2"])
+    finder.cache_service = None
+
+    results = await finder.discover_with_scoring(domain=1, max_results=50)
+
+    assert sorted(result["asin"] for result in results) == ["A1", "A1", "A2"]
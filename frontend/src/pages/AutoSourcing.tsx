@@ -40,9 +40,13 @@ interface Job {
   status: string;
   total_tested: number;
   total_selected: number;
+  progress?: Record<string, unknown> | null;
   picks: JobPick[];
 }
 
+const JOB_POLL_INTERVAL_MS = 2000
+const ACTIVE_JOB_STATUSES = ['pending', 'running']
+
 // Removed: was using a different env var (VITE_API_BASE_URL) and raw fetch without auth.
 // Now uses the shared `api` axios instance which handles Firebase auth tokens automatically.
 
@@ -77,6 +81,7 @@ export default function AutoSourcing() {
       setJobs([newJob, ...jobs])
       setSelectedJob(newJob)
       setIsModalOpen(false)
+      pollJob(newJob.id)
     } catch (err: any) {
       if (err?.response?.status === 429) {
         const tokenErrorInfo = parseTokenError(err.response)
@@ -86,6 +91,21 @@ export default function AutoSourcing() {
     }
   }
 
+  // run-custom only queues the job: poll until the background worker finishes it
+  const pollJob = async (jobId: string) => {
+    try {
+      const response = await api.get(`/api/v1/autosourcing/jobs/${jobId}`)
+      const job: Job = response.data
+      setJobs(current => current.map(j => (j.id === jobId ? job : j)))
+      setSelectedJob(current => (current?.id === jobId ? job : current))
+      if (ACTIVE_JOB_STATUSES.includes(job.status)) {
+        setTimeout(() => pollJob(jobId), JOB_POLL_INTERVAL_MS)
+      }
+    } catch (err) {
+      console.error('Error polling job:', err)
+    }
+  }
+
   const handleViewJobResults = async (jobId: string) => {
     try {
       const response = await api.get(`/api/v1/autosourcing/jobs/${jobId}`)